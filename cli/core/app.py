@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 import subprocess
 import sys
 from dataclasses import dataclass
@@ -9,12 +10,36 @@ from typing import List
 from cli.core.colors import Fore, Style, color_text
 from cli.core.discovery import resolve_command_module
 from cli.core.git import git_clean_repo
-from cli.core.help import (
-    print_global_help,
-    show_full_help_for_all,
-    show_help_for_directory,
+from cli.core.run import (
+    RunConfig,
+    open_log_file,
+    run_command_once,
+    run_module_in_process,
 )
-from cli.core.run import RunConfig, open_log_file, run_command_once
+
+# Opt-in for wrappers that call the CLI in tight loops, equivalent to
+# passing --in-process on every invocation.
+IN_PROCESS_ENV = "INFINITO_CLI_IN_PROCESS"
+
+
+def print_global_help(cli_dir: Path) -> None:
+    # The help screens (manifest, AST parsing) are only imported when asked
+    # for, keeping them off the dispatch path.
+    from cli.core.help import print_global_help as _print_global_help
+
+    _print_global_help(cli_dir)
+
+
+def show_full_help_for_all(cli_dir: Path) -> None:
+    from cli.core.help import show_full_help_for_all as _show_full_help_for_all
+
+    _show_full_help_for_all(cli_dir)
+
+
+def show_help_for_directory(cli_dir: Path, dir_parts: List[str]) -> bool:
+    from cli.core.help import show_help_for_directory as _show_help_for_directory
+
+    return _show_help_for_directory(cli_dir, dir_parts)
 
 
 @dataclass
@@ -23,6 +48,8 @@ class Flags:
     git_clean: bool = False
     infinite: bool = False
     help_all: bool = False
+    in_process: bool = False
+    profile_imports: bool = False
 
 
 def _first_non_flag_token(argv: List[str]) -> str | None:
@@ -100,10 +127,34 @@ def parse_flags(argv: List[str]) -> Flags:
     flags.git_clean = "--git-clean" in argv and (argv.remove("--git-clean") or True)
     flags.infinite = "--infinite" in argv and (argv.remove("--infinite") or True)
     flags.help_all = "--help-all" in argv and (argv.remove("--help-all") or True)
+    flags.in_process = "--in-process" in argv and (argv.remove("--in-process") or True)
+    flags.profile_imports = "--profile-imports" in argv and (
+        argv.remove("--profile-imports") or True
+    )
+    if os.environ.get(IN_PROCESS_ENV, "").strip().lower() in ("1", "true", "yes"):
+        flags.in_process = True
 
     return flags
 
 
+def _profile_imports(module: str, args: List[str]) -> None:
+    # `-X importtime` only works from interpreter start-up, so profiling
+    # always uses a fresh child process, run once.
+    from cli.core.importtime import run_with_import_profile
+
+    raise SystemExit(run_with_import_profile(module, args))
+
+
+def _forward_help(module: str, help_flag: str, flags: Flags) -> None:
+    if flags.profile_imports:
+        _profile_imports(module, [help_flag])
+    if flags.in_process:
+        run_module_in_process(module, [help_flag])
+    else:
+        subprocess.run([sys.executable, "-m", module, help_flag])
+    raise SystemExit(0)
+
+
 def main() -> None:
     argv = sys.argv[:]  # keep sys.argv for external tools, but parse on a copy
     flags = parse_flags(argv)
@@ -134,8 +185,7 @@ def main() -> None:
         # First: if "<path>" is a real command, forward help to its argparse
         module, remaining = resolve_command_module(cli_dir, args[:-1])
         if module and not remaining:
-            subprocess.run([sys.executable, "-m", module, "--help"])
-            raise SystemExit(0)
+            _forward_help(module, "--help", flags)
 
         # Otherwise: treat it as a folder overview
         dir_parts = args[:-1]
@@ -150,8 +200,10 @@ def main() -> None:
 
     # If user requested help for the resolved command, forward directly
     if remaining and remaining[0] in ("-h", "--help"):
-        subprocess.run([sys.executable, "-m", module, remaining[0]])
-        raise SystemExit(0)
+        _forward_help(module, remaining[0], flags)
+
+    if flags.profile_imports:
+        _profile_imports(module, remaining)
 
     log_file = None
     if flags.log_dir is not None:
@@ -165,6 +217,11 @@ def main() -> None:
     )
 
     try:
+        if flags.in_process and not flags.infinite and log_file is None:
+            # Logging needs the child's pty and --infinite needs a fresh
+            # module state per run; both keep using the subprocess path.
+            run_module_in_process(module, remaining)
+            raise SystemExit(0)
         if flags.infinite:
             print(color_text("Starting infinite execution mode...", Fore.CYAN))
             count = 1
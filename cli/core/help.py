@@ -4,10 +4,11 @@ import subprocess
 import sys
 import textwrap
 from pathlib import Path
-from typing import List
+from typing import List, Tuple
 
 from cli.core.colors import Fore, Style, color_text
 from cli.core.discovery import discover_commands
+from cli.core.manifest import CommandManifest
 
 
 def format_command_help(
@@ -23,6 +24,9 @@ def format_command_help(
 def extract_description_via_help(module: str) -> str:
     """
     Best-effort: run "python -m <module> --help" and extract the first paragraph after usage.
+
+    Slow (one interpreter per call); the help screens use the static
+    `cli.core.manifest` instead. Kept for callers that need the rendered text.
     """
     try:
         result = subprocess.run(
@@ -53,8 +57,25 @@ def extract_description_via_help(module: str) -> str:
         return "-"
 
 
+def _capture_help(module: str) -> Tuple[str, str]:
+    """Run "python -m <module> --help" and return (stdout, stderr)."""
+    try:
+        result = subprocess.run(
+            [sys.executable, "-m", module, "--help"],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        return (result.stdout or "").rstrip(), (result.stderr or "").rstrip()
+    except Exception as e:
+        return "", f"Failed to get help for {module}: {e}"
+
+
 def print_global_help(cli_dir: Path) -> None:
     commands = discover_commands(cli_dir)
+    manifest = CommandManifest(cli_dir)
+    descriptions = manifest.descriptions(commands)
+    manifest.save()
 
     print(color_text("Infinito.Nexus CLI 🦫🌐🖥️", Fore.CYAN + Style.BRIGHT))
     print()
@@ -66,6 +87,8 @@ def print_global_help(cli_dir: Path) -> None:
             "[--log <LOG_DIR>] "
             "[--git-clean] "
             "[--infinite] "
+            "[--in-process] "
+            "[--profile-imports] "
             "[--help-all] "
             "[-h|--help] "
             "<command> [options]",
@@ -92,6 +115,19 @@ def print_global_help(cli_dir: Path) -> None:
             Fore.YELLOW,
         )
     )
+    print(
+        color_text(
+            "  --in-process      Run the command inside the dispatcher process "
+            "(also: INFINITO_CLI_IN_PROCESS=1)",
+            Fore.YELLOW,
+        )
+    )
+    print(
+        color_text(
+            "  --profile-imports Print an import-time breakdown of the command to stderr",
+            Fore.YELLOW,
+        )
+    )
     print(
         color_text(
             "  --help-all        Show full --help for all CLI commands", Fore.YELLOW
@@ -112,7 +148,7 @@ def print_global_help(cli_dir: Path) -> None:
                 print()
             current_folder = cmd.folder
 
-        desc = extract_description_via_help(cmd.module)
+        desc = descriptions[cmd.module]
         print(color_text(format_command_help(cmd.name, desc, indent=2), ""), "\n")
 
     print()
@@ -151,6 +187,9 @@ def print_global_help(cli_dir: Path) -> None:
 
 def show_full_help_for_all(cli_dir: Path) -> None:
     commands = discover_commands(cli_dir)
+    manifest = CommandManifest(cli_dir)
+    helps = manifest.full_help(commands, _capture_help)
+    manifest.save()
 
     print(
         color_text("Infinito.Nexus CLI – Full Help Overview", Fore.CYAN + Style.BRIGHT)
@@ -166,19 +205,11 @@ def show_full_help_for_all(cli_dir: Path) -> None:
         print(color_text(f"File: {file_path}", Fore.CYAN))
         print(color_text("-" * 80, Fore.BLUE))
 
-        try:
-            result = subprocess.run(
-                [sys.executable, "-m", cmd.module, "--help"],
-                capture_output=True,
-                text=True,
-                check=False,
-            )
-            if result.stdout:
-                print(result.stdout.rstrip())
-            if result.stderr:
-                print(color_text(result.stderr.rstrip(), Fore.RED))
-        except Exception as e:
-            print(color_text(f"Failed to get help for {file_path}: {e}", Fore.RED))
+        stdout, stderr = helps[cmd.module]
+        if stdout:
+            print(stdout)
+        if stderr:
+            print(color_text(stderr, Fore.RED))
 
         print()
 
@@ -193,6 +224,9 @@ def show_help_for_directory(cli_dir: Path, dir_parts: List[str]) -> bool:
 
     commands = discover_commands(cli_dir)
     prefix = "/".join(dir_parts)
+    manifest = CommandManifest(cli_dir)
+    descriptions = manifest.descriptions(commands)
+    manifest.save()
 
     print(color_text(f"Overview of commands in: {prefix}", Fore.CYAN + Style.BRIGHT))
     print()
@@ -200,7 +234,7 @@ def show_help_for_directory(cli_dir: Path, dir_parts: List[str]) -> bool:
     shown = False
     for cmd in commands:
         if (cmd.folder or "") == prefix:
-            desc = extract_description_via_help(cmd.module)
+            desc = descriptions[cmd.module]
             print(color_text(format_command_help(cmd.name, desc, indent=2), ""))
             shown = True
 
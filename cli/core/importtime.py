@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import List, Optional, TextIO
+
+IMPORT_TIME_PREFIX = "import time:"
+
+
+@dataclass(frozen=True)
+class ImportRecord:
+    """One line of `python -X importtime` output (times in microseconds)."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_import_time_line(line: str) -> Optional[ImportRecord]:
+    """
+    Parse a `-X importtime` line such as
+
+      import time:       412 |       2213 |   cli.core.run
+
+    Returns None for the header and for anything that is not a timing line.
+    """
+    if not line.startswith(IMPORT_TIME_PREFIX):
+        return None
+    fields = line[len(IMPORT_TIME_PREFIX) :].rstrip("\n").split("|", 2)
+    if len(fields) != 3:
+        return None
+    try:
+        self_us = int(fields[0])
+        cumulative_us = int(fields[1])
+    except ValueError:
+        return None
+    name = fields[2]
+    module = name.strip()
+    # One leading space separates the column, every nesting level adds two.
+    depth = max(0, (len(name) - len(name.lstrip(" ")) - 1) // 2)
+    return ImportRecord(module, self_us, cumulative_us, depth)
+
+
+def format_import_report(
+    module: str, records: List[ImportRecord], top: int = 15
+) -> str:
+    """Render the slowest top-level and self-time imports as a text table."""
+    total_us = sum(r.cumulative_us for r in records if r.depth == 0)
+    lines = [
+        f"Import profile for {module}: {len(records)} modules, "
+        f"{total_us / 1000:.1f} ms total",
+        "",
+        "Slowest top-level imports (cumulative):",
+        f"  {'cumulative [ms]':>15} | {'self [ms]':>9} | module",
+    ]
+    top_level = sorted(
+        (r for r in records if r.depth == 0),
+        key=lambda r: r.cumulative_us,
+        reverse=True,
+    )
+    for r in top_level[:top]:
+        lines.append(
+            f"  {r.cumulative_us / 1000:>15.1f} | {r.self_us / 1000:>9.1f} | {r.module}"
+        )
+
+    lines += [
+        "",
+        "Slowest modules (self):",
+        f"  {'self [ms]':>15} | {'depth':>9} | module",
+    ]
+    for r in sorted(records, key=lambda r: r.self_us, reverse=True)[:top]:
+        lines.append(f"  {r.self_us / 1000:>15.1f} | {r.depth:>9} | {r.module}")
+    return "\n".join(lines)
+
+
+def run_with_import_profile(
+    module: str, args: List[str], out: TextIO | None = None, top: int = 15
+) -> int:
+    """
+    Run `python -X importtime -m <module> <args>` and report its import costs.
+
+    The command's own stderr is passed through unchanged; the timing lines
+    are collected and summarised on `out` (stderr by default) once the
+    command has finished. Returns the command's exit code.
+    """
+    out = out or sys.stderr
+    proc = subprocess.Popen(
+        [sys.executable, "-X", "importtime", "-m", module, *args],
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    records: List[ImportRecord] = []
+    assert proc.stderr is not None
+    for line in proc.stderr:
+        if line.startswith(IMPORT_TIME_PREFIX):
+            record = parse_import_time_line(line)
+            if record is not None:
+                records.append(record)
+            continue
+        sys.stderr.write(line)
+    rc = proc.wait()
+
+    print(format_import_report(module, records, top=top), file=out)
+    return rc
@@ -0,0 +1,393 @@
+from __future__ import annotations
+
+import ast
+import json
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from cli.core.discovery import Command
+
+MANIFEST_ENV = "INFINITO_CLI_MANIFEST"
+MANIFEST_VERSION = 2
+
+# Signature of a command package: (file name, st_mtime_ns, st_size) for every
+# *.py file directly inside the command directory. Nested directories are
+# separate commands with their own signature.
+Signature = Tuple[Tuple[str, int, int], ...]
+
+
+@dataclass
+class ManifestEntry:
+    """
+    One discovered command as recorded in the manifest.
+
+    `help` is the captured `--help` output; it is filled lazily by
+    `--help-all`. Besides the entry's own signature it is tied to
+    `help_deps`, the signature of the repository modules the command
+    imports (see `help_dependencies`).
+    """
+
+    module: str
+    subcommand: str
+    description: str
+    signature: List[List]
+    help: Optional[str] = None
+    help_deps: Optional[List[List]] = None
+
+
+def default_manifest_path() -> Path:
+    """
+    Return the manifest location.
+
+    $INFINITO_CLI_MANIFEST wins; otherwise the file lives in the XDG cache
+    directory so read-only checkouts keep working.
+    """
+    override = os.environ.get(MANIFEST_ENV)
+    if override:
+        return Path(override).expanduser()
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join("~", ".cache")
+    return Path(cache_home).expanduser() / "infinito-nexus" / "cli-manifest.json"
+
+
+def command_signature(main_path: Path) -> Signature | None:
+    """Return the mtime/size signature of a command, or None if unreadable."""
+    try:
+        entries = []
+        for entry in os.scandir(main_path.parent):
+            if entry.is_file() and entry.name.endswith(".py"):
+                st = entry.stat()
+                entries.append((entry.name, st.st_mtime_ns, st.st_size))
+    except OSError:
+        return None
+    if not entries:
+        return None
+    return tuple(sorted(entries))
+
+
+def _module_files(root: Path, dotted: str) -> List[Path]:
+    """Files executed when importing `dotted` from `root`: the module itself
+    and the `__init__.py` of every package on the way."""
+    parts = dotted.split(".")
+    files: List[Path] = []
+    for i in range(1, len(parts) + 1):
+        base = root.joinpath(*parts[:i])
+        if (base / "__init__.py").is_file():
+            files.append(base / "__init__.py")
+        elif i == len(parts) and base.with_suffix(".py").is_file():
+            files.append(base.with_suffix(".py"))
+        elif not base.is_dir():
+            break
+    return files
+
+
+def _imported_files(tree: ast.Module, path: Path, root: Path) -> List[Path]:
+    """Repository files imported anywhere in `tree` (the module at `path`)."""
+    names: List[str] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                package = path.parent
+                for _ in range(node.level - 1):
+                    package = package.parent
+                try:
+                    prefix = ".".join(package.relative_to(root).parts)
+                except ValueError:
+                    continue
+                base = ".".join(p for p in (prefix, node.module) if p)
+            else:
+                base = node.module or ""
+            if not base:
+                continue
+            names.append(base)
+            # `from pkg import mod` imports the submodule pkg.mod.
+            names.extend(f"{base}.{alias.name}" for alias in node.names)
+    files: List[Path] = []
+    for name in names:
+        files.extend(_module_files(root, name))
+    return files
+
+
+def help_dependencies(main_path: Path, root: Path) -> Signature:
+    """
+    Return the (relative path, st_mtime_ns, st_size) signature of every
+    repository module the command at `main_path` imports, transitively.
+
+    `root` is the directory imports are resolved against (the parent of the
+    CLI package). The command's own files are covered by its signature and
+    are left out; third-party and stdlib imports do not resolve below
+    `root` and are ignored.
+    """
+    root = root.resolve()
+    command_dir = main_path.resolve().parent
+    pending = list(command_dir.glob("*.py"))
+    seen = set(pending)
+    deps = []
+    while pending:
+        path = pending.pop()
+        if path.parent != command_dir:
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            deps.append((path.relative_to(root).as_posix(), st.st_mtime_ns, st.st_size))
+        tree = _parse(path)
+        if tree is None:
+            continue
+        for dep in _imported_files(tree, path, root):
+            if dep not in seen:
+                seen.add(dep)
+                pending.append(dep)
+    return tuple(sorted(deps))
+
+
+def _help_deps_current(deps: List[List], root: Path) -> bool:
+    for rel, mtime_ns, size in deps:
+        try:
+            st = (root / rel).stat()
+        except OSError:
+            return False
+        if (st.st_mtime_ns, st.st_size) != (mtime_ns, size):
+            return False
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Static description extraction
+# ---------------------------------------------------------------------------
+
+
+def _first_paragraph(text: str) -> str:
+    para = re.split(r"\n\s*\n", text.strip(), maxsplit=1)[0]
+    return " ".join(para.split())
+
+
+def _literal_str(node: ast.AST, module_doc: str | None) -> str | None:
+    """Evaluate string constants, `"a" "b"`, `"a" + "b"` and `__doc__`."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+        left = _literal_str(node.left, module_doc)
+        right = _literal_str(node.right, module_doc)
+        if left is not None and right is not None:
+            return left + right
+        return None
+    if isinstance(node, ast.Name) and node.id == "__doc__":
+        return module_doc
+    return None
+
+
+def _is_argument_parser_call(node: ast.AST) -> bool:
+    if not isinstance(node, ast.Call):
+        return False
+    func = node.func
+    if isinstance(func, ast.Attribute):
+        return func.attr == "ArgumentParser"
+    return isinstance(func, ast.Name) and func.id == "ArgumentParser"
+
+
+def _parse(path: Path) -> ast.Module | None:
+    try:
+        return ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    except (OSError, SyntaxError, UnicodeDecodeError):
+        return None
+
+
+def _description_from_tree(tree: ast.Module) -> str | None:
+    module_doc = ast.get_docstring(tree)
+    for node in ast.walk(tree):
+        if not _is_argument_parser_call(node):
+            continue
+        for kw in node.keywords:
+            if kw.arg == "description":
+                value = _literal_str(kw.value, module_doc)
+                if value and value.strip():
+                    return _first_paragraph(value)
+    return None
+
+
+def _sibling_modules(tree: ast.Module, package_dir: Path) -> List[Path]:
+    """Modules pulled in via `from .x import ...` from the same package."""
+    siblings: List[Path] = []
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and node.level == 1 and node.module:
+            candidate = package_dir / (node.module.split(".")[0] + ".py")
+            if candidate.is_file() and candidate not in siblings:
+                siblings.append(candidate)
+    return siblings
+
+
+def extract_description_via_ast(main_path: Path) -> str:
+    """
+    Extract a command's argparse description without executing it.
+
+    Looks at `ArgumentParser(description=...)` in `__main__.py`, then in the
+    sibling modules it imports relatively (e.g. `from .command import main`).
+    Falls back to the first paragraph of the module docstring, then "-".
+    """
+    tree = _parse(main_path)
+    if tree is None:
+        return "-"
+
+    trees = [tree]
+    trees.extend(
+        t
+        for t in (_parse(p) for p in _sibling_modules(tree, main_path.parent))
+        if t is not None
+    )
+
+    for candidate in trees:
+        desc = _description_from_tree(candidate)
+        if desc:
+            return desc
+
+    for candidate in trees:
+        doc = ast.get_docstring(candidate)
+        if doc and doc.strip():
+            return _first_paragraph(doc)
+    return "-"
+
+
+# ---------------------------------------------------------------------------
+# Manifest persistence
+# ---------------------------------------------------------------------------
+
+
+def _read(path: Path, cli_dir: Path) -> Dict[str, ManifestEntry]:
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if (
+        not isinstance(raw, dict)
+        or raw.get("version") != MANIFEST_VERSION
+        or raw.get("cli_dir") != str(cli_dir)
+    ):
+        return {}
+    entries: Dict[str, ManifestEntry] = {}
+    for module, data in (raw.get("entries") or {}).items():
+        try:
+            entries[module] = ManifestEntry(**data)
+        except TypeError:
+            continue
+    return entries
+
+
+def _write(path: Path, cli_dir: Path, entries: Dict[str, ManifestEntry]) -> None:
+    payload = {
+        "version": MANIFEST_VERSION,
+        "cli_dir": str(cli_dir),
+        "entries": {m: asdict(e) for m, e in sorted(entries.items())},
+    }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh, indent=1)
+        os.replace(tmp, path)
+    except OSError:
+        # The manifest is a pure cache: failing to persist it only costs
+        # the next invocation a re-scan.
+        pass
+
+
+class CommandManifest:
+    """
+    Cached (module, subcommand, description[, help]) records for CLI commands.
+
+    Entries are rebuilt from the AST whenever the command's files change
+    (see `command_signature`); everything else is served from the JSON file.
+    """
+
+    def __init__(self, cli_dir: Path, path: Optional[Path] = None) -> None:
+        self.cli_dir = cli_dir.resolve()
+        self.path = path or default_manifest_path()
+        self._entries = _read(self.path, self.cli_dir)
+        self._dirty = False
+
+    def _fresh_entry(self, cmd: Command) -> Tuple[ManifestEntry, bool]:
+        """Return (entry, cacheable) for cmd, reusing the stored one if valid."""
+        sig = command_signature(cmd.main_path)
+        stored = self._entries.get(cmd.module)
+        if (
+            sig is not None
+            and stored is not None
+            and [list(s) for s in sig] == stored.signature
+        ):
+            return stored, True
+
+        entry = ManifestEntry(
+            module=cmd.module,
+            subcommand=cmd.subcommand,
+            description=extract_description_via_ast(cmd.main_path),
+            signature=[list(s) for s in sig] if sig is not None else [],
+        )
+        return entry, sig is not None
+
+    def entries(self, commands: Iterable[Command]) -> List[ManifestEntry]:
+        result: List[ManifestEntry] = []
+        for cmd in commands:
+            entry, cacheable = self._fresh_entry(cmd)
+            if cacheable and self._entries.get(cmd.module) is not entry:
+                self._entries[cmd.module] = entry
+                self._dirty = True
+            result.append(entry)
+        return result
+
+    def descriptions(self, commands: Iterable[Command]) -> Dict[str, str]:
+        return {e.module: e.description for e in self.entries(commands)}
+
+    def full_help(
+        self,
+        commands: List[Command],
+        capture: Callable[[str], Tuple[str, str]],
+        max_workers: int = 8,
+    ) -> Dict[str, Tuple[str, str]]:
+        """
+        Return {module: (stdout, stderr)} of each command's `--help`.
+
+        Cached help text is reused while the command's files and the
+        repository modules it imports are unchanged; missing ones are
+        captured concurrently via `capture(module)`. Failures (non-empty
+        stderr) are never cached.
+        """
+        root = self.cli_dir.parent
+        entries = self.entries(commands)
+        main_paths = {cmd.module: cmd.main_path for cmd in commands}
+        out: Dict[str, Tuple[str, str]] = {}
+        missing = []
+        for entry in entries:
+            if (
+                entry.help is not None
+                and entry.help_deps is not None
+                and _help_deps_current(entry.help_deps, root)
+            ):
+                out[entry.module] = (entry.help, "")
+            else:
+                missing.append(entry)
+
+        if missing:
+            # Taken before capturing, so an edit during the capture
+            # invalidates the stored help on the next run.
+            deps = [help_dependencies(main_paths[e.module], root) for e in missing]
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                captured = list(executor.map(lambda e: capture(e.module), missing))
+            for entry, entry_deps, (stdout, stderr) in zip(missing, deps, captured):
+                out[entry.module] = (stdout, stderr)
+                if not stderr and entry.signature:
+                    entry.help = stdout
+                    entry.help_deps = [list(d) for d in entry_deps]
+                    self._entries[entry.module] = entry
+                    self._dirty = True
+        return out
+
+    def save(self) -> None:
+        if self._dirty:
+            _write(self.path, self.cli_dir, self._entries)
+            self._dirty = False
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import os
 import pty
+import runpy
 import subprocess
+import sys
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -83,3 +85,20 @@ def run_command_once(
     except Exception as e:
         print(color_text(f"Exception running command: {e}", Fore.RED))
         raise SystemExit(1)
+
+
+def run_module_in_process(module: str, args: List[str]) -> None:
+    """
+    Execute `python -m <module> <args>` inside the current interpreter.
+
+    Saves the second interpreter start-up and re-import of everything the
+    dispatcher already loaded. SystemExit raised by the command propagates
+    unchanged, so exit codes match the subprocess path.
+    """
+    saved_argv = sys.argv[:]
+    # runpy replaces argv[0] with the module's file path, like `python -m`.
+    sys.argv = [module, *args]
+    try:
+        runpy.run_module(module, run_name="__main__", alter_sys=True)
+    finally:
+        sys.argv = saved_argv
@@ -1,5 +1,13 @@
 from __future__ import annotations
 
-from .cli import main
-
 __all__ = ["main"]
+
+
+def __getattr__(name: str):
+    # Resolved lazily: importing a helper such as `.services_disabler` must
+    # not drag in the whole inventory-generation stack via `.cli`.
+    if name == "main":
+        from .cli import main
+
+        return main
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
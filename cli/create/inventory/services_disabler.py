@@ -4,9 +4,6 @@ import os
 from pathlib import Path
 from typing import Optional
 
-from ruamel.yaml import YAML
-from ruamel.yaml.comments import CommentedMap
-
 from utils.cache.yaml import load_yaml_any
 from utils.service_registry import (
     build_service_registry_from_roles_dir,
@@ -110,6 +107,11 @@ def remove_roles_from_inventory(
     if not inventory_file.exists() or not application_ids:
         return
 
+    # ruamel is only needed by the writers; the deploy commands import the
+    # parsing helpers above on every start.
+    from ruamel.yaml import YAML
+    from ruamel.yaml.comments import CommentedMap
+
     yaml_rt = YAML(typ="rt")
     yaml_rt.preserve_quotes = True
 
@@ -164,6 +166,9 @@ def apply_services_disabled(
     if not services:
         return
 
+    from ruamel.yaml import YAML
+    from ruamel.yaml.comments import CommentedMap
+
     # --- host_vars: disable services ---
     yaml_rt = YAML(typ="rt")
     yaml_rt.preserve_quotes = True
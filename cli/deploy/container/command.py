@@ -5,11 +5,12 @@ import os
 import shlex
 import subprocess
 import sys
-import time
 import uuid
 from pathlib import Path
 from typing import List, Tuple
 
+from utils.docker.wait import poll_until
+
 INFINITO_SRC_DIR = "/opt/src/infinito"
 
 
@@ -105,32 +106,36 @@ def wait_for_docker_socket(container: str, timeout: int = 60) -> None:
             f"[diag stderr]\n{diag.stderr}\n"
         )
 
-    # 2) Poll docker info
-    last_out = ""
-    last_err = ""
-    for _ in range(timeout):
+    # 2) Poll docker info. The inner daemon emits no events the host could
+    # subscribe to, so this backs off instead of re-checking every second.
+    last: dict[str, str] = {"out": "", "err": ""}
+
+    def _probe() -> bool | None:
         result = _docker_exec_capture(
             container, ["sh", "-lc", "docker info >/dev/null 2>&1; echo $?"]
         )
-        rc = (result.stdout or "").strip()
-        if rc == "0":
-            print(">>> Docker is usable inside container.")
-            return
+        if (result.stdout or "").strip() == "0":
+            return True
 
         # capture a bit more detail for later
         dv = _docker_exec_capture(
             container, ["sh", "-lc", "docker version 2>&1 || true"]
         )
-        last_out = dv.stdout
-        last_err = dv.stderr
-        time.sleep(1)
+        last["out"] = dv.stdout
+        last["err"] = dv.stderr
+        return None
+
+    usable, seconds = poll_until(_probe, timeout_s=timeout)
+    if usable:
+        print(f">>> Docker is usable inside container (after {seconds:.1f}s).")
+        return
 
     raise RuntimeError(
         "Docker did not become usable inside container in time.\n\n"
         "Most common causes:\n"
         "  - DOCKER_HOST is wrong\n\n"
-        f"[last docker version stdout]\n{last_out}\n"
-        f"[last docker version stderr]\n{last_err}\n"
+        f"[last docker version stdout]\n{last['out']}\n"
+        f"[last docker version stderr]\n{last['err']}\n"
     )
 
 
@@ -5,6 +5,7 @@ import subprocess
 from typing import Any, Dict, List, Optional, Tuple
 
 from .apps import validate_application_ids
+from .facts import DEFAULT_FACT_CACHE_TTL, FACT_CACHE_TTL_ENV, default_fact_cache_ttl
 from .modes import add_dynamic_mode_args, build_modes_from_args, load_modes_from_yaml
 from .paths import INVENTORY_VALIDATOR_PATH, MODES_FILE, PLAYBOOK_PATH, REPO_ROOT
 from .runner import run_ansible_playbook
@@ -136,6 +137,38 @@ def build_parser() -> argparse.ArgumentParser:
         help="Increase verbosity (e.g. -vvv).",
     )
     parser.add_argument("--diff", action="store_true", help="Enable Ansible diff mode.")
+    parser.add_argument(
+        "--vault-cache",
+        action="store_true",
+        help=(
+            "Share decrypted vault values between Ansible forks via a "
+            "per-run tmpfs store that is wiped when the run ends."
+        ),
+    )
+    parser.add_argument(
+        "--fact-cache-ttl",
+        type=int,
+        default=default_fact_cache_ttl(),
+        metavar="SECONDS",
+        help=(
+            "Reuse gathered facts from the local JSON fact cache for this "
+            f"long (default: ${FACT_CACHE_TTL_ENV} or "
+            f"{DEFAULT_FACT_CACHE_TTL}; 0 disables the cache)."
+        ),
+    )
+    parser.add_argument(
+        "--refresh-facts",
+        action="store_true",
+        help="Drop the cached facts of all inventory hosts and gather them again.",
+    )
+    parser.add_argument(
+        "--serial-preflight",
+        action="store_true",
+        help=(
+            "Run the pre-flight phases (cleanup, build, inventory checks) one "
+            "after another instead of concurrently."
+        ),
+    )
 
     return parser
 
@@ -212,6 +245,10 @@ def main(argv: Optional[List[str]] = None) -> int:
         skip_build=args.skip_build,
         diff=args.diff,
         ansible_args=passthrough,
+        vault_cache=args.vault_cache,
+        fact_cache_ttl=args.fact_cache_ttl,
+        refresh_facts=args.refresh_facts,
+        preflight_workers=1 if args.serial_preflight else None,
     )
 
     return 0
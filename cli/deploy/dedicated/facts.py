@@ -0,0 +1,49 @@
+"""Local JSON-file fact cache for repeated deploys.
+
+Facts are stored per host in ``$INFINITO_FACT_CACHE_DIR`` or
+``$XDG_CACHE_HOME/infinito-nexus/facts`` (``~/.cache/...`` by default)
+and reused until they are older than the TTL. The stages only gather
+the fact subsets they declare (tasks/utils/facts/gather.yml), and
+subsets found in the cache are not gathered again.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Dict
+
+FACT_CACHE_DIR_ENV = "INFINITO_FACT_CACHE_DIR"
+FACT_CACHE_TTL_ENV = "INFINITO_FACT_CACHE_TTL"
+DEFAULT_FACT_CACHE_TTL = 3600
+
+
+def default_fact_cache_dir() -> Path:
+    override = os.environ.get(FACT_CACHE_DIR_ENV)
+    if override:
+        return Path(override).expanduser()
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join("~", ".cache")
+    return Path(cache_home).expanduser() / "infinito-nexus" / "facts"
+
+
+def default_fact_cache_ttl() -> int:
+    raw = os.environ.get(FACT_CACHE_TTL_ENV, "").strip()
+    if not raw:
+        return DEFAULT_FACT_CACHE_TTL
+    try:
+        return int(raw)
+    except ValueError:
+        raise SystemExit(
+            f"{FACT_CACHE_TTL_ENV} must be an integer number of seconds, got {raw!r}"
+        )
+
+
+def fact_cache_env(ttl: int) -> Dict[str, str]:
+    """Ansible settings enabling the cache; empty when `ttl` is 0 (disabled)."""
+    if ttl <= 0:
+        return {}
+    return {
+        "ANSIBLE_CACHE_PLUGIN": "jsonfile",
+        "ANSIBLE_CACHE_PLUGIN_CONNECTION": str(default_fact_cache_dir()),
+        "ANSIBLE_CACHE_PLUGIN_TIMEOUT": str(ttl),
+    }
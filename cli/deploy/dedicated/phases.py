@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class Phase:
+    """
+    One pre-flight step of a deploy run.
+
+    `action` receives the run-wide cancel event and should hand it to
+    `proc.run` / `proc.run_make` so a failing sibling can stop it early.
+    `requires` names the phases that must have finished successfully first.
+    """
+
+    name: str
+    action: Callable[[threading.Event], None]
+    requires: Tuple[str, ...] = ()
+
+
+def _check_graph(phases: List[Phase]) -> None:
+    names = [p.name for p in phases]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate phase names: {names}")
+    known = set(names)
+    for phase in phases:
+        missing = [r for r in phase.requires if r not in known]
+        if missing:
+            raise ValueError(f"Phase '{phase.name}' requires unknown {missing}")
+
+    # Kahn's algorithm; anything left over sits on a cycle.
+    remaining = {p.name: set(p.requires) for p in phases}
+    while True:
+        ready = [n for n, deps in remaining.items() if not deps]
+        if not ready:
+            break
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    if remaining:
+        raise ValueError(f"Phase dependency cycle: {sorted(remaining)}")
+
+
+def run_phases(
+    phases: List[Phase], *, max_workers: Optional[int] = None
+) -> Dict[str, float]:
+    """
+    Run phases as a DAG, starting every phase as soon as its requirements
+    are done. Returns {phase name: wall time in seconds}.
+
+    Fail-fast: the first phase that raises (including SystemExit) sets the
+    cancel event, no further phases are started, the running siblings are
+    awaited (cancellable subprocesses terminate promptly) and the original
+    exception is re-raised. `max_workers=1` runs the phases one by one in
+    list order.
+    """
+    _check_graph(phases)
+    workers = max_workers or max(1, len(phases))
+
+    cancel = threading.Event()
+    timings: Dict[str, float] = {}
+    done: set[str] = set()
+    pending: List[Phase] = list(phases)
+    running: Dict[Future, Tuple[Phase, float]] = {}
+    failure: Optional[BaseException] = None
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while pending or running:
+            if failure is None:
+                for phase in list(pending):
+                    if len(running) >= workers:
+                        break
+                    if all(r in done for r in phase.requires):
+                        pending.remove(phase)
+                        future = executor.submit(phase.action, cancel)
+                        running[future] = (phase, time.monotonic())
+            else:
+                pending.clear()
+
+            if not running:
+                break
+
+            finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in finished:
+                phase, started = running.pop(future)
+                elapsed = time.monotonic() - started
+                timings[phase.name] = elapsed
+                exc = future.exception()
+                if exc is None:
+                    done.add(phase.name)
+                    print(f"\n⏱️  Phase '{phase.name}' finished in {elapsed:.1f}s\n")
+                elif failure is None:
+                    failure = exc
+                    cancel.set()
+                    print(f"\n⏱️  Phase '{phase.name}' failed after {elapsed:.1f}s\n")
+
+    if failure is not None:
+        raise failure
+    return timings
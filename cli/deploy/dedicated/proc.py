@@ -1,31 +1,83 @@
 from __future__ import annotations
 
+import shutil
 import subprocess
 import sys
+import tempfile
+import threading
 from typing import List, Optional
 
+# Seconds between cancel checks while a cancellable command runs, and the
+# grace period between SIGTERM and SIGKILL once it is cancelled.
+_POLL_INTERVAL = 0.2
+_TERMINATE_GRACE = 10.0
+
+# Serialises the replay of buffered output of concurrently running commands.
+_OUTPUT_LOCK = threading.Lock()
+
+
+class ProcessCancelled(RuntimeError):
+    """Raised when a cancellable command was stopped via its cancel event."""
+
 
 def run(
     cmd: List[str],
     *,
     cwd: Optional[str] = None,
     check: bool = True,
+    cancel: Optional[threading.Event] = None,
 ) -> subprocess.CompletedProcess:
     """
     Run a command with stdout/stderr passthrough.
 
     Note: Many repo commands (e.g. `make`) must run in the repo root so the Makefile is found.
+
+    With `cancel`, the command may run next to other commands: its output is
+    buffered and replayed as one block when it ends, and it is terminated
+    (raising ProcessCancelled) as soon as the event is set.
     """
-    return subprocess.run(
-        cmd,
-        cwd=cwd,
-        check=check,
-        stdout=sys.stdout,
-        stderr=sys.stderr,
-    )
+    if cancel is None:
+        return subprocess.run(
+            cmd,
+            cwd=cwd,
+            check=check,
+            stdout=sys.stdout,
+            stderr=sys.stderr,
+        )
+
+    with tempfile.TemporaryFile(mode="w+", encoding="utf-8") as output:
+        proc = subprocess.Popen(cmd, cwd=cwd, stdout=output, stderr=subprocess.STDOUT)
+        cancelled = False
+        while True:
+            try:
+                returncode = proc.wait(timeout=_POLL_INTERVAL)
+                break
+            except subprocess.TimeoutExpired:
+                if cancel.is_set():
+                    cancelled = True
+                    proc.terminate()
+                    try:
+                        returncode = proc.wait(timeout=_TERMINATE_GRACE)
+                    except subprocess.TimeoutExpired:
+                        proc.kill()
+                        returncode = proc.wait()
+                    break
+
+        output.seek(0)
+        with _OUTPUT_LOCK:
+            shutil.copyfileobj(output, sys.stdout)
+            sys.stdout.flush()
+
+    if cancelled:
+        raise ProcessCancelled(f"Cancelled: {' '.join(cmd)}")
+    if check and returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd)
+    return subprocess.CompletedProcess(cmd, returncode)
 
 
-def run_make(repo_root: str, *targets: str) -> None:
+def run_make(
+    repo_root: str, *targets: str, cancel: Optional[threading.Event] = None
+) -> None:
     """
     Run `make <targets...>` from the repo root.
 
@@ -33,4 +85,4 @@ def run_make(repo_root: str, *targets: str) -> None:
       make: *** No rule to make target 'clean'.  Stop.
     """
     final_targets = targets or ("help",)
-    run(["make", *final_targets], cwd=repo_root, check=True)
+    run(["make", *final_targets], cwd=repo_root, check=True, cancel=cancel)
@@ -4,14 +4,20 @@ import datetime
 import os
 import subprocess
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from cli.create.inventory.services_disabler import (
     ServicesDisabledConflictError,
     assert_services_disabled_inventory_consistency_from_env,
 )
 
+from utils.cache.vault import VAULT_CACHE_DIR_ENV, create_run_store, wipe_run_store
+
+from .facts import fact_cache_env
+from .phases import Phase, run_phases
 from .proc import run, run_make
 
 
@@ -29,60 +35,97 @@ def run_ansible_playbook(
     skip_build: bool = False,
     diff: bool = False,
     ansible_args: Optional[List[str]] = None,
+    vault_cache: bool = False,
+    preflight_workers: Optional[int] = None,
+    fact_cache_ttl: int = 0,
+    refresh_facts: bool = False,
 ) -> None:
-    """Run ansible-playbook with the given parameters and execution modes."""
+    """
+    Run ansible-playbook with the given parameters and execution modes.
+
+    `preflight_workers=1` runs the pre-flight phases one after another.
+    `fact_cache_ttl` > 0 enables the local fact cache (see facts.py);
+    `refresh_facts` drops the cached facts first.
+    """
     start_time = datetime.datetime.now()
     print(f"\n▶️ Script started at: {start_time.isoformat()}\n")
 
     # ---------------------------------------------------------
-    # 1) Cleanup Phase (wrapper-level)
+    # 1-4) Pre-flight phases
+    #
+    # Cleanup removes git-ignored files and therefore runs first. After
+    # that, the build only needs the source tree while the
+    # SERVICES_DISABLED guard and the inventory validation only read the
+    # inventory, so those three run concurrently.
     # ---------------------------------------------------------
+    phases: List[Phase] = []
+    after_cleanup: Tuple[str, ...] = ()
+
     if modes.get("MODE_CLEANUP", False):
-        print("\n🧹 Cleaning up...\n", flush=True)
-        run_make(repo_root, "clean")
+
+        def _cleanup(cancel: threading.Event) -> None:
+            print("\n🧹 Cleaning up...\n", flush=True)
+            run_make(repo_root, "clean", cancel=cancel)
+
+        phases.append(Phase("cleanup", _cleanup))
+        after_cleanup = ("cleanup",)
     else:
         print("\n🧹 Cleanup skipped (MODE_CLEANUP not set or False)\n")
 
-    # ---------------------------------------------------------
-    # 2) Build Phase
-    # ---------------------------------------------------------
     if not skip_build:
-        print("\n🛠️  Running project build (make setup)...\n")
-        run_make(repo_root, "setup")
+
+        def _build(cancel: threading.Event) -> None:
+            print("\n🛠️  Running project build (make setup)...\n", flush=True)
+            run_make(repo_root, "setup", cancel=cancel)
+
+        phases.append(Phase("build", _build, after_cleanup))
     else:
         print("\n🛠️  Build skipped (--skip-build)\n")
 
-    # ---------------------------------------------------------
-    # 3) SERVICES_DISABLED consistency guard
-    # ---------------------------------------------------------
-    try:
-        assert_services_disabled_inventory_consistency_from_env(
-            inventory_dir=Path(inventory).resolve().parent,
-            roles_dir=Path(repo_root).resolve() / "roles",
-        )
-    except ServicesDisabledConflictError as exc:
-        print(f"\n[ERROR] {exc}\n", file=sys.stderr)
-        sys.exit(1)
+    def _services_disabled_guard(_cancel: threading.Event) -> None:
+        try:
+            assert_services_disabled_inventory_consistency_from_env(
+                inventory_dir=Path(inventory).resolve().parent,
+                roles_dir=Path(repo_root).resolve() / "roles",
+            )
+        except ServicesDisabledConflictError as exc:
+            print(f"\n[ERROR] {exc}\n", file=sys.stderr)
+            sys.exit(1)
+
+    phases.append(Phase("services-disabled", _services_disabled_guard, after_cleanup))
 
-    # ---------------------------------------------------------
-    # 4) Inventory Validation Phase
-    # ---------------------------------------------------------
     if modes.get("MODE_ASSERT", None) is False:
         print("\n🔍 Inventory assertion explicitly disabled (MODE_ASSERT=false)\n")
     else:
-        print("\n🔍 Validating inventory before deployment...\n")
-        try:
-            run(
-                [sys.executable, inventory_validator_path, os.path.dirname(inventory)],
-                cwd=repo_root,
-                check=True,
-            )
-        except subprocess.CalledProcessError:
-            print(
-                "\n[ERROR] Inventory validation failed. Aborting deployment.\n",
-                file=sys.stderr,
-            )
-            sys.exit(1)
+
+        def _validate_inventory(cancel: threading.Event) -> None:
+            print("\n🔍 Validating inventory before deployment...\n", flush=True)
+            try:
+                run(
+                    [
+                        sys.executable,
+                        inventory_validator_path,
+                        os.path.dirname(inventory),
+                    ],
+                    cwd=repo_root,
+                    check=True,
+                    cancel=cancel,
+                )
+            except subprocess.CalledProcessError:
+                print(
+                    "\n[ERROR] Inventory validation failed. Aborting deployment.\n",
+                    file=sys.stderr,
+                )
+                sys.exit(1)
+
+        phases.append(Phase("inventory-validation", _validate_inventory, after_cleanup))
+
+    preflight_start = time.monotonic()
+    timings = run_phases(phases, max_workers=preflight_workers)
+    print(
+        f"\n⏱️  Pre-flight finished in {time.monotonic() - preflight_start:.1f}s "
+        f"(phases: {sum(timings.values()):.1f}s)\n"
+    )
 
     # ---------------------------------------------------------
     # 5) Build ansible-playbook command
@@ -113,12 +156,42 @@ def run_ansible_playbook(
     if verbose:
         cmd.append("-" + "v" * verbose)
 
+    if refresh_facts:
+        cmd.append("--flush-cache")
+
     # Native ansible-playbook flags passthrough (must come last for override behavior)
     if ansible_args:
         cmd.extend(ansible_args)
 
+    env = {**os.environ, **fact_cache_env(fact_cache_ttl)}
+    if fact_cache_ttl > 0:
+        print(
+            f"🗂️  Fact cache: {env['ANSIBLE_CACHE_PLUGIN_CONNECTION']} "
+            f"(ttl {fact_cache_ttl}s{', refreshing' if refresh_facts else ''})\n"
+        )
+
     print("\n🚀 Launching Ansible Playbook...\n")
-    result = subprocess.run(cmd, cwd=repo_root)
+    store = create_run_store() if vault_cache else None
+    if vault_cache and store is None:
+        print(
+            "[WARN] No writable tmpfs for the vault decryption cache; "
+            "using the in-memory cache only.\n",
+            file=sys.stderr,
+        )
+    if store is not None:
+        # Per-run tmpfs store shared by all forks; holds plaintext, so it
+        # is wiped no matter how the playbook ends.
+        print(f"🔐 Vault decryption cache: {store}\n")
+        try:
+            result = subprocess.run(
+                cmd,
+                cwd=repo_root,
+                env={**env, VAULT_CACHE_DIR_ENV: str(store)},
+            )
+        finally:
+            wipe_run_store(store)
+    else:
+        result = subprocess.run(cmd, cwd=repo_root, env=env)
 
     if result.returncode != 0:
         print(
@@ -85,13 +85,14 @@ def resolve_container() -> str:
     return container
 
 
-def make_compose() -> Compose:
+def make_compose(**kwargs) -> Compose:
+    """Build the Compose wrapper; kwargs select an isolated stack."""
     from .compose import Compose
 
     distro = resolve_distro()
     # Surface env-script gap here rather than as a cryptic compose error later.
     resolve_container()
-    return Compose(repo_root=repo_root_from_here(), distro=distro)
+    return Compose(repo_root=repo_root_from_here(), distro=distro, **kwargs)
 
 
 def resolve_deploy_ids_for_app(compose: Compose, app_id: str) -> list[str]:
@@ -2,8 +2,12 @@ from __future__ import annotations
 
 import os
 import subprocess
+import sys
 import time
 from pathlib import Path
+from typing import TextIO
+
+from utils.docker.wait import WaitResult, wait_for_health
 
 from .common import cache_env_overrides, compose_file_args
 from .coredns import CoreDNSCorefileRenderer
@@ -13,15 +17,37 @@ from .profile import Profile
 
 
 class Compose:
-    """Wrapper around `docker compose` for the dev/CI stack."""
+    """Wrapper around `docker compose` for the dev/CI stack.
+
+    `project`, `env_overrides` and `corefile_relpath` select an isolated
+    stack (see stacks.py); `output` receives all output of this stack
+    instead of the terminal.
+    """
 
-    def __init__(self, repo_root: Path, distro: str) -> None:
+    def __init__(
+        self,
+        repo_root: Path,
+        distro: str,
+        *,
+        project: str | None = None,
+        env_overrides: dict[str, str] | None = None,
+        corefile_relpath: str | None = None,
+        output: TextIO | None = None,
+    ) -> None:
         self.repo_root = repo_root
         self.distro = distro
         self.profile = Profile()
+        self.project = project
+        self.env_overrides = dict(env_overrides or {})
+        self.corefile_relpath = corefile_relpath
+        self.output = output
+
+    def _print(self, *parts: object) -> None:
+        print(*parts, file=self.output or sys.stdout, flush=True)
 
     def _base_env(self) -> dict[str, str]:
         env = dict(os.environ)
+        env.update(self.env_overrides)
         env["INFINITO_DISTRO"] = self.distro
         outer_network_mtu = detect_outer_network_mtu(env)
         if outer_network_mtu:
@@ -55,6 +81,7 @@ class Compose:
         cmd = [
             "docker",
             "compose",
+            *(["--project-name", self.project] if self.project else []),
             *compose_file_args(),
             *self.profile.args(),
             *args,
@@ -64,8 +91,10 @@ class Compose:
             env.update({k: str(v) for k, v in extra_env.items()})
 
         if live:
-            r = run_streaming(cmd, cwd=self.repo_root, env=env, text=text)
-        else:
+            r = run_streaming(
+                cmd, cwd=self.repo_root, env=env, text=text, sink=self.output
+            )
+        elif capture or self.output is None:
             r = subprocess.run(
                 cmd,
                 cwd=self.repo_root,
@@ -74,6 +103,16 @@ class Compose:
                 capture_output=capture,
                 text=text,
             )
+        else:
+            r = subprocess.run(
+                cmd,
+                cwd=self.repo_root,
+                env=env,
+                check=False,
+                stdout=self.output,
+                stderr=subprocess.STDOUT,
+                text=text,
+            )
 
         if check and int(r.returncode) != 0:
             raise subprocess.CalledProcessError(
@@ -102,7 +141,7 @@ class Compose:
                 if i >= int(attempts):
                     raise
 
-                print(
+                self._print(
                     f">>> WARNING: compose up failed (attempt {i}/{attempts}): {exc}\n"
                     f">>> Retrying in {int(delay_s)}s..."
                 )
@@ -114,7 +153,7 @@ class Compose:
     def _bootstrap_package_cache(self, env: dict[str, str]) -> None:
         """Run the host-side Nexus bootstrap helper. Idempotent."""
         helper = self.repo_root / "scripts" / "docker" / "cache" / "package.sh"
-        print(">>> Bootstrapping package-cache proxy repos")
+        self._print(">>> Bootstrapping package-cache proxy repos")
         r = subprocess.run(
             [str(helper)],
             cwd=self.repo_root,
@@ -123,7 +162,7 @@ class Compose:
             text=True,
         )
         if r.returncode != 0:
-            print(
+            self._print(
                 f">>> WARNING: package-cache bootstrap exited rc={r.returncode}; "
                 f"re-run {helper} manually or inspect docker logs infinito-package-cache"
             )
@@ -137,7 +176,7 @@ class Compose:
             / "cache"
             / "package-frontend-certs.sh"
         )
-        print(">>> Generating package-cache-frontend CA + per-hostname certs")
+        self._print(">>> Generating package-cache-frontend CA + per-hostname certs")
         subprocess.run(
             [str(helper)],
             cwd=self.repo_root,
@@ -148,14 +187,14 @@ class Compose:
 
     def _install_package_frontend_ca_in_runner(self) -> None:
         """Install the frontend CA in the runner trust store. Idempotent."""
-        print(">>> Installing package-cache-frontend CA into runner trust store")
+        self._print(">>> Installing package-cache-frontend CA into runner trust store")
         r = self.exec(
             ["sh", "-lc", "/usr/local/bin/package-frontend-ca.sh"],
             check=False,
             live=False,
         )
         if r.returncode != 0:
-            print(
+            self._print(
                 ">>> WARNING: package-frontend-ca installer exited "
                 f"rc={r.returncode}; cache TLS via DNS-hijack may fail. "
                 "Re-run /usr/local/bin/package-frontend-ca.sh inside the "
@@ -163,19 +202,26 @@ class Compose:
             )
 
     def _render_coredns_corefile(self) -> None:
-        renderer = CoreDNSCorefileRenderer(repo_root=self.repo_root)
-        out = renderer.render(show_preview=True, preview_lines=25)
-        print(f"[compose] Corefile generated at: {out}")
-        print(
+        if self.corefile_relpath:
+            renderer = CoreDNSCorefileRenderer(
+                repo_root=self.repo_root,
+                output_relpath=self.corefile_relpath,
+                overrides=self.env_overrides,
+            )
+        else:
+            renderer = CoreDNSCorefileRenderer(repo_root=self.repo_root)
+        out = renderer.render(show_preview=self.output is None, preview_lines=25)
+        self._print(f"[compose] Corefile generated at: {out}")
+        self._print(
             f"[compose] Corefile exists={out.exists()} "
             f"size={out.stat().st_size if out.exists() else 'n/a'}"
         )
 
     def up(self, *, run_entry_init: bool = True) -> None:
-        print(">>> Rendering CoreDNS Corefile from template")
+        self._print(">>> Rendering CoreDNS Corefile from template")
         self._render_coredns_corefile()
 
-        print(">>> Starting compose stack (coredns + infinito)")
+        self._print(">>> Starting compose stack (coredns + infinito)")
         env = self._base_env()
         keys = [
             "INFINITO_DISTRO",
@@ -185,8 +231,8 @@ class Compose:
             "INFINITO_NO_BUILD",
             "GITHUB_SHA",
         ]
-        print(">>> env:", {k: env.get(k) for k in keys})
-        print(">>> NIX_CONFIG:", "<set>" if env.get("NIX_CONFIG") else "<empty>")
+        self._print(">>> env:", {k: env.get(k) for k in keys})
+        self._print(">>> NIX_CONFIG:", "<set>" if env.get("NIX_CONFIG") else "<empty>")
 
         no_build = env.get("INFINITO_NO_BUILD", "0") == "1"
         # Compose env-file precedence: later files override earlier ones.
@@ -194,10 +240,10 @@ class Compose:
 
         env_local = self.repo_root / "env.development"
         if env_local.exists():
-            print(f">>> Using local env override: {env_local}")
+            self._print(f">>> Using local env override: {env_local}")
             args += ["--env-file", "env.development"]
         else:
-            print(">>> No env.local found (skipping)")
+            self._print(">>> No env.local found (skipping)")
 
         args += ["up", "-d"]
         if no_build:
@@ -218,7 +264,7 @@ class Compose:
             self._install_package_frontend_ca_in_runner()
 
         if run_entry_init:
-            print(">>> Running infinito entry.sh init")
+            self._print(">>> Running infinito entry.sh init")
             r = self.exec(
                 ["sh", "-lc", "/opt/src/infinito/scripts/docker/entry.sh true"],
                 workdir="/opt/src/infinito",
@@ -236,6 +282,16 @@ class Compose:
 
     def down(self) -> None:
         """Tear down the stack."""
+        if self.project:
+            # Isolated stacks only drop their own project; the CI docker
+            # root wipe of down_stack() would hit every stack at once.
+            self._print(f">>> Stopping compose stack {self.project}")
+            self.run(
+                ["--env-file", "env.ci", "down", "--remove-orphans", "-v"],
+                check=False,
+            )
+            return
+
         from .down import down_stack
 
         down_stack(repo_root=self.repo_root, distro=self.distro)
@@ -290,64 +346,57 @@ class Compose:
 
         return cid
 
-    def wait_for_healthy(self, *, timeout_s: int | None = None) -> None:
-        """Wait for the infinito container's healthcheck."""
+    def wait_for_healthy(self, *, timeout_s: int | None = None) -> WaitResult:
+        """Wait for the infinito container's healthcheck and return how
+        long it took."""
         if timeout_s is None:
             timeout_s = int(os.environ.get("INFINITO_WAIT_HEALTH_TIMEOUT_S", "200"))
 
-        print(">>> Waiting for infinito container to become healthy")
-
-        cid = self._get_infinito_container_id()
-        start = time.time()
-
-        while True:
-            r = subprocess.run(
-                ["docker", "inspect", "-f", "{{.State.Health.Status}}", cid],
-                cwd=self.repo_root,
-                capture_output=True,
-                text=True,
-                check=False,
-            )
-
-            status = r.stdout.strip() if r.returncode == 0 else ""
-
-            if status == "healthy":
-                print(">>> infinito container is healthy")
-                return
+        self._print(">>> Waiting for infinito container to become healthy")
 
+        def _report(status: str) -> None:
             if status == "unhealthy":
-                print(">>> infinito container is unhealthy")
+                self._print(">>> infinito container is unhealthy")
 
-            if (time.time() - start) > timeout_s:
-                print(
-                    ">>> ERROR: infinito container not healthy, dumping last 200 log lines\n"
-                )
+        cid = self._get_infinito_container_id()
+        result = wait_for_health(
+            cid, timeout_s=timeout_s, cwd=str(self.repo_root), on_status=_report
+        )
+        self._print(
+            f">>> time-to-healthy infinito: {result.seconds:.1f}s "
+            f"(status={result.status or '<unknown>'}, via {result.via})"
+        )
+        if result.ready:
+            self._print(">>> infinito container is healthy")
+            return result
 
-                logs = self.exec(
-                    ["sh", "-lc", "journalctl -n 200 --no-pager || true"],
-                    check=False,
-                    capture=True,
-                )
+        self._print(
+            ">>> ERROR: infinito container not healthy, dumping last 200 log lines\n"
+        )
 
-                print("===== journalctl (last 200 lines) =====")
-                print(logs.stdout or "<no output>")
-                print("======================================\n")
+        logs = self.exec(
+            ["sh", "-lc", "journalctl -n 200 --no-pager || true"],
+            check=False,
+            capture=True,
+        )
 
-                docker_logs = subprocess.run(
-                    ["docker", "logs", "--tail", "200", cid],
-                    cwd=self.repo_root,
-                    capture_output=True,
-                    text=True,
-                    check=False,
-                )
+        self._print("===== journalctl (last 200 lines) =====")
+        self._print(logs.stdout or "<no output>")
+        self._print("======================================\n")
 
-                print("===== docker logs (last 200 lines) =====")
-                print(docker_logs.stdout or "<no output>")
-                print("=======================================\n")
+        docker_logs = subprocess.run(
+            ["docker", "logs", "--tail", "200", cid],
+            cwd=self.repo_root,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
 
-                raise RuntimeError(
-                    f"infinito container not healthy after {timeout_s}s "
-                    f"(last status: {status})"
-                )
+        self._print("===== docker logs (last 200 lines) =====")
+        self._print(docker_logs.stdout or "<no output>")
+        self._print("=======================================\n")
 
-            time.sleep(2)
+        raise RuntimeError(
+            f"infinito container not healthy after {result.seconds:.0f}s "
+            f"(last status: {result.status})"
+        )
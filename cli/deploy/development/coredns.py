@@ -4,7 +4,7 @@ import itertools
 import os
 import shutil
 import subprocess
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 
@@ -14,7 +14,8 @@ class CoreDNSCorefileRenderer:
     Render compose/coredns/Corefile from compose/coredns/Corefile.tmpl using envsubst.
 
     What this does:
-      - Reads variables from env file (default: env.ci)
+      - Reads variables from env file (default: env.ci), then applies
+        `overrides` (e.g. the addresses of a parallel matrix stack)
       - Runs `envsubst` to substitute variables into the Corefile template
       - Writes the output atomically (tmp -> rename)
       - Optionally prints a preview of the first N lines
@@ -31,6 +32,7 @@ class CoreDNSCorefileRenderer:
     env_filename: str = "env.ci"
     template_relpath: str = "compose/coredns/Corefile.tmpl"
     output_relpath: str = "compose/coredns/Corefile"
+    overrides: dict[str, str] = field(default_factory=dict)
 
     def _log(self, msg: str) -> None:
         print(f"[coredns-corefile] {msg}")
@@ -94,6 +96,7 @@ class CoreDNSCorefileRenderer:
                 loaded += 1
 
         self._log(f"Loaded {loaded} variables from env file")
+        env.update(self.overrides)
         return env
 
     def _preview(self, path: Path, *, max_lines: int) -> None:
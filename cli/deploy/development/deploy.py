@@ -4,7 +4,8 @@ import argparse
 import json
 import os
 import subprocess
-from typing import Any, Mapping
+import sys
+from typing import Any, Mapping, TextIO
 
 from cli.create.inventory.services_disabler import (
     find_provider_roles,
@@ -103,7 +104,9 @@ def _run_deploy(
     return int(r.returncode)
 
 
-def _purge_app_entities(*, container: str, app_ids: list[str]) -> None:
+def _purge_app_entities(
+    *, container: str, app_ids: list[str], output: TextIO | None = None
+) -> None:
     """Run the per-app cleanup script for every app whose variant just
     changed between matrix-deploy rounds.
 
@@ -124,13 +127,17 @@ def _purge_app_entities(*, container: str, app_ids: list[str]) -> None:
     env["INFINITO_CONTAINER"] = container
     print(
         "=== matrix-deploy: purging entities between rounds for "
-        f"{', '.join(app_ids)} ==="
+        f"{', '.join(app_ids)} ===",
+        file=output or sys.stdout,
+        flush=True,
     )
     subprocess.run(
         ["bash", str(purge_script)],
         cwd=str(repo_root),
         env=env,
         check=True,
+        stdout=output,
+        stderr=subprocess.STDOUT if output else None,
     )
 
 
@@ -193,6 +200,35 @@ def add_parser(sub: argparse._SubParsersAction) -> None:
             "FULL_CYCLE environment variable (true|false) when set."
         ),
     )
+    p.add_argument(
+        "--parallel",
+        type=int,
+        default=1,
+        metavar="N",
+        help=(
+            "Distribute the matrix rounds over N isolated compose stacks "
+            "(own project, network, CoreDNS and loopback address each) "
+            "instead of running them one after another. Inventories are "
+            "copied from the main container, so run `init` first. "
+            "Default: 1 (sequential)."
+        ),
+    )
+    p.add_argument(
+        "--log-dir",
+        default=None,
+        help=(
+            "Directory for the per-stack logs of --parallel "
+            "(default: a fresh temporary directory)."
+        ),
+    )
+    p.add_argument(
+        "--keep-stacks",
+        action="store_true",
+        help=(
+            "Do not tear down the --parallel stacks afterwards. Stacks "
+            "with a failed round are always kept for inspection."
+        ),
+    )
     p.add_argument(
         "ansible_args",
         nargs=argparse.REMAINDER,
@@ -258,6 +294,22 @@ def handler(args: argparse.Namespace) -> int:
     except ValueError as exc:
         raise SystemExit(f"--variant: {exc}")
 
+    if args.parallel < 1:
+        raise SystemExit("--parallel must be at least 1")
+    if args.parallel > 1:
+        from .parallel import run_parallel_matrix
+
+        return run_parallel_matrix(
+            plan=plan,
+            disabled_app_ids=disabled_app_ids,
+            parallel=args.parallel,
+            log_dir=args.log_dir,
+            keep_stacks=bool(args.keep_stacks),
+            debug=bool(args.debug),
+            passthrough=passthrough,
+            full_cycle=bool(args.full_cycle),
+        )
+
     # INFINITO_CONTAINER is the single SPOT — defaults.sh keeps it in
     # lock-step with INFINITO_DISTRO across matrix iterations. Read it
     # strictly here; no fallback derivation, no env-vs-arg ambiguity.
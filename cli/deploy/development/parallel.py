@@ -0,0 +1,378 @@
+"""Parallel matrix deploys (`deploy --parallel N`).
+
+The rounds of the matrix plan are put on a work queue and deployed on N
+isolated stacks (see stacks.py), one worker thread per stack. Every
+stack logs into its own file; the rounds are reported in one combined
+summary at the end.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TextIO
+
+from .common import make_compose, repo_root_from_here, resolve_container, resolve_distro
+from .deploy import _purge_app_entities, _run_deploy
+from .log_utils import log_path
+from .stacks import StackSpec, read_env_file, stack_specs
+
+
+@dataclass(frozen=True)
+class _RoundJob:
+    round_index: int
+    inv_dir: str
+    variants: dict[str, int]
+    include: list[str]
+    # Apps with a real variant for this round (round 0: the whole include).
+    variant_apps: list[str]
+
+
+@dataclass(frozen=True)
+class _RoundResult:
+    round_index: int
+    stack: int
+    rc: int
+    seconds: float
+
+
+@dataclass
+class _Stack:
+    spec: StackSpec
+    compose: Any
+    log_file: Path
+    log: TextIO
+
+
+def _round_jobs(plan, disabled_app_ids: set[str]) -> list[_RoundJob]:
+    """Translate the matrix plan into independent jobs, dropping rounds
+    without any real variant (the sequential loop skips those too)."""
+    jobs: list[_RoundJob] = []
+    for round_index, inv_dir, round_variants, include_R in plan:
+        include = [role for role in include_R if role not in disabled_app_ids]
+        if round_index == 0:
+            variant_apps = list(include)
+        else:
+            variant_apps = [
+                app_id
+                for app_id in include
+                if round_variants.get(app_id) == round_index
+            ]
+            if not variant_apps:
+                print(
+                    f"=== matrix-deploy: round {round_index + 1}/{len(plan)} "
+                    f"skipped (no apps with a real variant {round_index}) ==="
+                )
+                continue
+        jobs.append(
+            _RoundJob(round_index, inv_dir, dict(round_variants), include, variant_apps)
+        )
+    return jobs
+
+
+def _stack_passthrough(passthrough: list[str]) -> list[str]:
+    # The repository checkout is bind-mounted into every stack, so `make
+    # clean` / `make setup` run once up front instead of concurrently from
+    # several stacks (a clean removes generated files another stack is
+    # deploying from). This also disables MODE_CLEANUP inside the roles,
+    # which has nothing stale to remove on freshly created stacks.
+    return ["--skip-cleanup", "--skip-build", *passthrough]
+
+
+def _prepare_checkout(stack: _Stack, passthrough: list[str]) -> int:
+    targets = []
+    if "--skip-cleanup" not in passthrough:
+        targets.append("clean")
+    if "--skip-build" not in passthrough and "-B" not in passthrough:
+        targets.append("setup")
+    if not targets:
+        return 0
+    print(f"=== matrix-deploy: make {' '.join(targets)} (stack {stack.spec.index}) ===")
+    r = stack.compose.exec(
+        ["make", *targets], workdir="/opt/src/infinito", check=False, live=True
+    )
+    return int(r.returncode)
+
+
+def _copy_inventory(
+    *, source: str, target: str, inventory_dir: str, output: TextIO
+) -> None:
+    """Copy one inventory folder built by `init` in the main container
+    into a stack container (inventories live inside the container)."""
+    inv_root = str(inventory_dir).rstrip("/")
+    parent, name = os.path.split(inv_root)
+    pack = subprocess.Popen(
+        ["docker", "exec", source, "tar", "-C", parent, "-cf", "-", name],
+        stdout=subprocess.PIPE,
+        stderr=output,
+    )
+    try:
+        unpack = subprocess.run(
+            [
+                "docker",
+                "exec",
+                "-i",
+                target,
+                "sh",
+                "-c",
+                f'mkdir -p "{parent}" && tar -C "{parent}" -xf -',
+            ],
+            stdin=pack.stdout,
+            stdout=output,
+            stderr=subprocess.STDOUT,
+            check=False,
+        )
+    finally:
+        if pack.stdout is not None:
+            pack.stdout.close()
+        pack_rc = pack.wait()
+    if pack_rc != 0 or unpack.returncode != 0:
+        raise RuntimeError(
+            f"copying inventory {inv_root} from {source} to {target} failed"
+        )
+
+
+def _stack_worker(
+    stack: _Stack,
+    jobs: "queue.Queue[_RoundJob]",
+    results: list[_RoundResult],
+    lock: threading.Lock,
+    *,
+    source_container: str,
+    total_rounds: int,
+    debug: bool,
+    passthrough: list[str],
+    full_cycle: bool,
+) -> None:
+    """
+    Deploy rounds from the queue on one stack until the queue is empty.
+
+    A stack only ever holds what its own rounds deployed, so every round
+    deploys its real-variant apps plus whatever of its include set this
+    stack has not deployed yet, and purges apps whose variant changed
+    since this stack last deployed them. After a failed round the stack's
+    state is unknown and it stops taking work.
+    """
+    on_stack: dict[str, int] = {}
+    inventories: set[str] = set()
+    while True:
+        try:
+            job = jobs.get_nowait()
+        except queue.Empty:
+            return
+
+        wanted = set(job.variant_apps) | {a for a in job.include if a not in on_stack}
+        deploy_ids = [a for a in job.include if a in wanted]
+        changed = sorted(
+            a
+            for a in deploy_ids
+            if a in on_stack and on_stack[a] != job.variants.get(a, 0)
+        )
+        label = (
+            f"matrix-deploy: round {job.round_index + 1}/{total_rounds} "
+            f"stack={stack.spec.index} inv={job.inv_dir} apps={deploy_ids}"
+        )
+        print(f"=== {label} started (log: {stack.log_file}) ===", flush=True)
+        print(f"=== {label} PASS 1 (sync) ===", file=stack.log, flush=True)
+
+        started = time.monotonic()
+        try:
+            if job.inv_dir not in inventories:
+                _copy_inventory(
+                    source=source_container,
+                    target=stack.spec.container,
+                    inventory_dir=job.inv_dir,
+                    output=stack.log,
+                )
+                inventories.add(job.inv_dir)
+            if changed:
+                _purge_app_entities(
+                    container=stack.spec.container, app_ids=changed, output=stack.log
+                )
+            rc = _run_deploy(
+                stack.compose,
+                deploy_ids=deploy_ids,
+                debug=debug,
+                passthrough=passthrough,
+                inventory_dir=job.inv_dir,
+            )
+            if rc == 0 and full_cycle:
+                print(f"=== {label} PASS 2 (async) ===", file=stack.log, flush=True)
+                rc = _run_deploy(
+                    stack.compose,
+                    deploy_ids=deploy_ids,
+                    debug=debug,
+                    passthrough=passthrough,
+                    inventory_dir=job.inv_dir,
+                    extra_ansible_vars={"ASYNC_ENABLED": True},
+                )
+        except Exception as exc:
+            print(f"!!! {label}: {exc}", file=stack.log, flush=True)
+            rc = 1
+        seconds = time.monotonic() - started
+
+        with lock:
+            results.append(_RoundResult(job.round_index, stack.spec.index, rc, seconds))
+        status = "PASS" if rc == 0 else f"FAIL (rc={rc})"
+        print(f"=== {label} {status} after {seconds:.0f}s ===", flush=True)
+        if rc != 0:
+            return
+        for app_id in deploy_ids:
+            on_stack[app_id] = job.variants.get(app_id, 0)
+
+
+def _print_summary(
+    jobs: list[_RoundJob],
+    results: list[_RoundResult],
+    stacks: list[_Stack],
+    total_rounds: int,
+) -> int:
+    by_round = {r.round_index: r for r in results}
+    logs = {s.spec.index: s.log_file for s in stacks}
+    print(f"\n=== matrix-deploy summary ({len(stacks)} stacks) ===")
+    failed = not_run = 0
+    rc = 0
+    for job in jobs:
+        head = f"round {job.round_index + 1}/{total_rounds}"
+        res = by_round.get(job.round_index)
+        if res is None:
+            not_run += 1
+            print(f"  {head}  NOT RUN")
+            continue
+        if res.rc != 0:
+            failed += 1
+            rc = rc or res.rc
+        status = "PASS" if res.rc == 0 else f"FAIL rc={res.rc}"
+        print(
+            f"  {head}  stack {res.stack}  {status:<11} {res.seconds:7.0f}s  "
+            f"{logs[res.stack]}"
+        )
+    if failed or not_run:
+        print(f"=== matrix-deploy: FAILED ({failed} failed, {not_run} not run) ===")
+        return rc or 1
+    print(f"=== matrix-deploy: PASSED ({len(jobs)} rounds) ===")
+    return 0
+
+
+def run_parallel_matrix(
+    *,
+    plan,
+    disabled_app_ids: set[str],
+    parallel: int,
+    log_dir: str | None,
+    keep_stacks: bool,
+    debug: bool,
+    passthrough: list[str],
+    full_cycle: bool,
+) -> int:
+    """Distribute the matrix rounds over `parallel` isolated stacks."""
+    jobs = _round_jobs(plan, disabled_app_ids)
+    if not jobs:
+        return 0
+
+    # The cache layer has fixed container names and addresses; isolated
+    # stacks run without it.
+    os.environ["INFINITO_NO_CACHE"] = "1"
+
+    repo_root = repo_root_from_here()
+    defaults = read_env_file(repo_root / "env.ci")
+    env_development = repo_root / "env.development"
+    if env_development.exists():
+        defaults.update(read_env_file(env_development))
+    source_container = resolve_container()
+    specs = stack_specs(
+        min(parallel, len(jobs)), container=source_container, defaults=defaults
+    )
+
+    logs_root = Path(log_dir or tempfile.mkdtemp(prefix="infinito-matrix-"))
+    distro = resolve_distro()
+    stacks: list[_Stack] = []
+    for spec in specs:
+        path = log_path(logs_root, "matrix", distro, f"stack-{spec.index}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        log = path.open("a", encoding="utf-8", buffering=1)
+        compose = make_compose(
+            project=spec.project,
+            env_overrides=spec.env,
+            corefile_relpath=spec.corefile_relpath,
+            output=log,
+        )
+        stacks.append(_Stack(spec, compose, path, log))
+    print(
+        f"=== matrix-deploy: {len(jobs)} rounds on {len(stacks)} stacks, "
+        f"logs in {logs_root} ==="
+    )
+
+    results: list[_RoundResult] = []
+    try:
+        ready = _start_stacks(stacks)
+        if ready and _prepare_checkout(ready[0], passthrough) != 0:
+            print("=== matrix-deploy: preparing the checkout failed ===")
+            ready = []
+
+        work: "queue.Queue[_RoundJob]" = queue.Queue()
+        for job in jobs:
+            work.put(job)
+        lock = threading.Lock()
+        stack_args = _stack_passthrough(passthrough)
+        with ThreadPoolExecutor(max_workers=max(1, len(ready))) as executor:
+            workers = [
+                executor.submit(
+                    _stack_worker,
+                    stack,
+                    work,
+                    results,
+                    lock,
+                    source_container=source_container,
+                    total_rounds=len(plan),
+                    debug=debug,
+                    passthrough=stack_args,
+                    full_cycle=full_cycle,
+                )
+                for stack in ready
+            ]
+        for worker in workers:
+            worker.result()
+        rc = _print_summary(jobs, results, stacks, len(plan))
+    finally:
+        failed_stacks = {r.stack for r in results if r.rc != 0}
+        for stack in stacks:
+            if keep_stacks or stack.spec.index in failed_stacks:
+                print(
+                    f"=== matrix-deploy: keeping stack {stack.spec.index} "
+                    f"({stack.spec.project}) ==="
+                )
+            else:
+                try:
+                    stack.compose.down()
+                except Exception as exc:
+                    print(f"!!! stack {stack.spec.index}: teardown failed: {exc}")
+            stack.log.close()
+    return rc
+
+
+def _start_stacks(stacks: list[_Stack]) -> list[_Stack]:
+    """Bring all stacks up concurrently; return the ones that came up."""
+
+    def _up(stack: _Stack) -> bool:
+        try:
+            stack.compose.up(run_entry_init=True)
+            return True
+        except Exception as exc:
+            print(f"!!! stack {stack.spec.index}: {exc}", file=stack.log, flush=True)
+            print(
+                f"=== matrix-deploy: stack {stack.spec.index} failed to start "
+                f"(log: {stack.log_file}) ==="
+            )
+            return False
+
+    with ThreadPoolExecutor(max_workers=len(stacks)) as executor:
+        started = list(executor.map(_up, stacks))
+    return [stack for stack, ok in zip(stacks, started) if ok]
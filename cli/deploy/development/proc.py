@@ -32,9 +32,11 @@ def run_streaming(
     cwd,
     env: dict[str, str],
     text: bool = True,
+    sink: TextIO | None = None,
 ) -> subprocess.CompletedProcess:
     """
-    Run a subprocess and stream stdout/stderr live to the terminal.
+    Run a subprocess and stream stdout/stderr live to the terminal, or to
+    `sink` for both streams when given.
     """
     p = subprocess.Popen(
         cmd,
@@ -51,11 +53,11 @@ def run_streaming(
 
     t_out = threading.Thread(
         target=_drain_stream,
-        kwargs={"stream": p.stdout, "sink": sys.stdout},
+        kwargs={"stream": p.stdout, "sink": sink or sys.stdout},
     )
     t_err = threading.Thread(
         target=_drain_stream,
-        kwargs={"stream": p.stderr, "sink": sys.stderr},
+        kwargs={"stream": p.stderr, "sink": sink or sys.stderr},
     )
 
     t_out.daemon = True
@@ -17,7 +17,12 @@ class Profile:
         )
 
     def registry_cache_active(self) -> bool:
-        """True iff the cache stack should be loaded (local dev only)."""
+        """True iff the cache stack should be loaded (local dev only).
+
+        INFINITO_NO_CACHE=1 opts out, e.g. for parallel matrix stacks.
+        """
+        if os.environ.get("INFINITO_NO_CACHE", "0") == "1":
+            return False
         return not self.is_ci()
 
     def args(self) -> list[str]:
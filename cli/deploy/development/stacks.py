@@ -0,0 +1,113 @@
+"""Isolated compose stacks for parallel matrix deploys.
+
+Every stack is a separate compose project with its own infinito and
+CoreDNS containers, network, loopback bind address and volumes. The
+addresses are derived from the base stack in env.ci by shifting the
+subnet: stack 1 of 172.30.0.0/24 lives in 172.30.1.0/24 and so on, with
+DNS_IP, IP4 and GATEWAY keeping their host offsets.
+"""
+
+from __future__ import annotations
+
+import ipaddress
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Mapping
+
+NETWORK_KEYS: tuple[str, ...] = ("GATEWAY", "DNS_IP", "IP4")
+
+
+@dataclass(frozen=True)
+class StackSpec:
+    """Names and environment of one isolated stack (index >= 1)."""
+
+    index: int
+    project: str
+    container: str
+    corefile_relpath: str
+    env: dict[str, str]
+
+
+def read_env_file(path: Path) -> dict[str, str]:
+    """Parse a KEY=VALUE env file such as env.ci."""
+    values: dict[str, str] = {}
+    with path.open("r", encoding="utf-8") as fh:
+        for raw in fh:
+            line = raw.strip()
+            if not line or line.startswith("#") or "=" not in line:
+                continue
+            key, value = line.split("=", 1)
+            values[key.strip()] = value.strip()
+    return values
+
+
+def _shift(
+    address: str, base: ipaddress.IPv4Network, target: ipaddress.IPv4Network
+) -> str:
+    offset = int(ipaddress.IPv4Address(address)) - int(base.network_address)
+    if not 0 < offset < base.num_addresses:
+        raise SystemExit(f"{address} is not inside the base subnet {base}")
+    return str(target.network_address + offset)
+
+
+def stack_specs(
+    count: int,
+    *,
+    container: str,
+    defaults: Mapping[str, str],
+    environ: Mapping[str, str] | None = None,
+) -> list[StackSpec]:
+    """
+    Return `count` stack specs.
+
+    `defaults` are the env.ci values; `environ` (default: os.environ)
+    overrides them the same way the shell overrides `--env-file` for
+    compose.
+    """
+    env_in = dict(defaults)
+    env_in.update(os.environ if environ is None else environ)
+
+    base = ipaddress.IPv4Network(env_in.get("SUBNET", "172.30.0.0/24"), strict=True)
+    bind_ip = ipaddress.IPv4Address(env_in.get("BIND_IP", "127.0.0.1"))
+    if not bind_ip.is_loopback:
+        raise SystemExit(
+            f"--parallel needs a loopback BIND_IP to give every stack its own "
+            f"host ports, got {bind_ip}"
+        )
+    docker_volume = env_in.get("INFINITO_DOCKER_VOLUME", "").strip().rstrip("/")
+
+    specs: list[StackSpec] = []
+    for index in range(1, count + 1):
+        subnet = ipaddress.IPv4Network(
+            (int(base.network_address) + index * base.num_addresses, base.prefixlen)
+        )
+        stack_container = f"{container}_{index}"
+        corefile = f"compose/coredns/Corefile.{index}"
+        env = {
+            "SUBNET": str(subnet),
+            "BIND_IP": str(bind_ip + index),
+            "INFINITO_CONTAINER": stack_container,
+            "INFINITO_COREDNS_CONTAINER": f"infinito-coredns-{index}",
+            "INFINITO_COREDNS_COREFILE": f"./{corefile}",
+            # A bind-mounted docker root must not be shared between stacks;
+            # the named volume is project-scoped already.
+            "INFINITO_DOCKER_VOLUME": (
+                f"{docker_volume}/stack-{index}"
+                if docker_volume.startswith("/")
+                else "docker"
+            ),
+        }
+        for key in NETWORK_KEYS:
+            if env_in.get(key):
+                env[key] = _shift(env_in[key], base, subnet)
+        specs.append(
+            StackSpec(
+                index=index,
+                project=stack_container,
+                container=stack_container,
+                corefile_relpath=corefile,
+                env=env,
+            )
+        )
+    return specs
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Report deploy timings recorded by the `timing_store` callback plugin.
+
+Examples:
+  infinito meta timings slowest --limit 15
+  infinito meta timings trend web-app-nextcloud
+  infinito meta timings regressions --threshold 25 --strict
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from utils.timing_store import TimingStore, default_timings_db_path  # noqa: E402
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Report slowest roles, per-role trends and task regressions from "
+            "the local deploy timing history."
+        )
+    )
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=None,
+        help=f"Timings database (default: {default_timings_db_path()}).",
+    )
+    sub = parser.add_subparsers(dest="report", required=True)
+
+    slowest = sub.add_parser("slowest", help="Roles with the highest median duration.")
+    slowest.add_argument("--limit", type=int, default=10)
+    slowest.add_argument(
+        "--runs", type=int, default=20, help="Number of recent runs to consider."
+    )
+
+    trend = sub.add_parser("trend", help="Duration of one role per run.")
+    trend.add_argument("role", help="Role / application id, e.g. web-app-nextcloud.")
+    trend.add_argument("--runs", type=int, default=20)
+
+    regressions = sub.add_parser(
+        "regressions",
+        help="Tasks of the latest run that got slower than their rolling median.",
+    )
+    regressions.add_argument(
+        "--threshold",
+        type=float,
+        default=20.0,
+        help="Report tasks more than this many percent slower (default: 20).",
+    )
+    regressions.add_argument(
+        "--window",
+        type=int,
+        default=10,
+        help="Number of earlier runs the rolling median is taken over.",
+    )
+    regressions.add_argument(
+        "--min-seconds",
+        type=float,
+        default=1.0,
+        help="Ignore tasks faster than this in the latest run.",
+    )
+    regressions.add_argument(
+        "--strict",
+        action="store_true",
+        help="Exit with status 1 when regressions are found.",
+    )
+    return parser.parse_args(argv)
+
+
+def _fmt_time(ts: float) -> str:
+    return datetime.datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M")
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    db = args.db or default_timings_db_path()
+    if not db.exists():
+        print(f"No timing history found at {db}", file=sys.stderr)
+        return 1
+
+    with TimingStore(db) as store:
+        if args.report == "slowest":
+            rows = store.slowest_roles(limit=args.limit, last_runs=args.runs)
+            print(f"{'median [s]':>10}  {'last [s]':>9}  {'max [s]':>9}  runs  role")
+            for r in rows:
+                print(
+                    f"{r.median:>10.1f}  {r.last:>9.1f}  {r.slowest:>9.1f}  "
+                    f"{r.runs:>4}  {r.role}"
+                )
+            return 0
+
+        if args.report == "trend":
+            points = store.role_trend(args.role, last_runs=args.runs)
+            if not points:
+                print(f"No recorded runs for role '{args.role}'", file=sys.stderr)
+                return 1
+            print(f"{'run':>5}  {'started':<16}  {'commit':<10}  seconds")
+            for p in points:
+                print(
+                    f"{p.run_id:>5}  {_fmt_time(p.started_at):<16}  "
+                    f"{p.git_commit[:10]:<10}  {p.seconds:.1f}"
+                )
+            return 0
+
+        found = store.task_regressions(
+            threshold_pct=args.threshold,
+            window=args.window,
+            min_seconds=args.min_seconds,
+        )
+        if not found:
+            print(f"No task is more than {args.threshold:g}% slower than its median.")
+            return 0
+        print(f"{'slower':>7}  {'now [s]':>8}  {'median [s]':>10}  role / task")
+        for r in found:
+            print(
+                f"{r.slowdown_pct:>6.0f}%  {r.seconds:>8.1f}  {r.median:>10.1f}  "
+                f"{r.role or '-'} / {r.task}"
+            )
+        return 1 if args.strict else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
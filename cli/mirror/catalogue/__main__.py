@@ -0,0 +1,72 @@
+"""
+Print the deduplicated image catalogue of all roles as JSON.
+
+Every upstream image:tag is listed once with the roles and services that
+use it. With --resolve, the source manifest digest of every image is
+added; digests are cached on disk (see utils/docker/image/catalogue.py).
+
+Usage:
+    python -m cli.mirror.catalogue [--repo-root .] [--resolve] \\
+        [--cache PATH] [--ttl SECONDS] [--output PATH]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from utils.docker.image.catalogue import (
+    DEFAULT_DIGEST_TTL,
+    DigestCache,
+    build_catalogue,
+    catalogue_to_json,
+    default_digest_cache_path,
+    resolve_digests,
+)
+from utils.docker.image.discovery import iter_role_images
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repo-root", default=".")
+    parser.add_argument(
+        "--resolve",
+        action="store_true",
+        help="Add the source manifest digest of every image (uses skopeo).",
+    )
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        default=None,
+        help="Digest cache file (default: $INFINITO_IMAGE_DIGEST_CACHE or "
+        "~/.cache/infinito-nexus/image-digests.json).",
+    )
+    parser.add_argument(
+        "--ttl",
+        type=int,
+        default=DEFAULT_DIGEST_TTL,
+        help=f"Seconds a cached digest stays valid (default: {DEFAULT_DIGEST_TTL}).",
+    )
+    parser.add_argument(
+        "--output", default=None, help="Write the JSON to this file instead of stdout."
+    )
+    args = parser.parse_args()
+
+    entries = build_catalogue(iter_role_images(Path(args.repo_root).resolve()))
+    if args.resolve:
+        cache = DigestCache(args.cache or default_digest_cache_path(), ttl=args.ttl)
+        entries = resolve_digests(entries, cache)
+        cache.save()
+
+    text = json.dumps(catalogue_to_json(entries), indent=2) + "\n"
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,13 +3,30 @@ from __future__ import annotations
 
 import argparse
 from abc import ABC, abstractmethod
+import json
 import subprocess
-from typing import List
+import threading
+from typing import Callable, Dict, FrozenSet, List, Optional
+
+from utils.docker.image.catalogue import manifest_digest
 
 from .model import ImageRef
 
 
 class RegistryProvider(ABC):
+    """
+    Destination registry of the mirror.
+
+    Tag lookups are answered from one ``skopeo list-tags`` per destination
+    repository, cached for the lifetime of the provider (one sync run).
+    The cache is safe to use from several worker threads.
+    """
+
+    def __init__(self) -> None:
+        self._tags: Dict[str, FrozenSet[str]] = {}
+        self._tags_lock = threading.Lock()
+        self._repo_locks: Dict[str, threading.Lock] = {}
+
     @abstractmethod
     def image_base(self, image: ImageRef) -> str:
         pass
@@ -18,13 +35,74 @@ class RegistryProvider(ABC):
     def mirror(self, image: ImageRef) -> None:
         pass
 
-    @abstractmethod
+    def _list_tags(self, repository: str) -> FrozenSet[str]:
+        r = subprocess.run(
+            ["skopeo", "list-tags", f"docker://{repository}"],
+            check=False,
+            capture_output=True,
+            text=True,
+        )
+        if r.returncode != 0:
+            # Repository does not exist yet OR cannot be accessed (auth/network)
+            return frozenset()
+        try:
+            tags = json.loads(r.stdout or "{}").get("Tags") or []
+        except (ValueError, AttributeError):
+            return frozenset()
+        return frozenset(str(t) for t in tags)
+
+    def tags(self, repository: str) -> FrozenSet[str]:
+        """Tags of the destination *repository*, fetched once per run."""
+        with self._tags_lock:
+            cached = self._tags.get(repository)
+            if cached is not None:
+                return cached
+            lock = self._repo_locks.setdefault(repository, threading.Lock())
+        with lock:
+            with self._tags_lock:
+                cached = self._tags.get(repository)
+            if cached is None:
+                cached = self._list_tags(repository)
+                with self._tags_lock:
+                    self._tags[repository] = cached
+            return cached
+
+    def _remember_tag(self, image: ImageRef) -> None:
+        repository = self.image_base(image)
+        with self._tags_lock:
+            known = self._tags.get(repository)
+            if known is not None:
+                self._tags[repository] = known | {image.version}
+
     def tag_exists(self, image: ImageRef) -> bool:
-        pass
+        """Return True if the destination tag already exists."""
+        return image.version in self.tags(self.image_base(image))
+
+    def is_identical(
+        self,
+        image: ImageRef,
+        before_source: Optional[Callable[[], None]] = None,
+    ) -> bool:
+        """
+        Return True if the destination tag exists and points to the same
+        manifest digest as the source, i.e. copying would change nothing.
+
+        The source manifest GET counts as a pull on Docker Hub;
+        `before_source` is called right before it so callers can throttle it.
+        """
+        if not self.tag_exists(image):
+            return False
+        dest = manifest_digest(f"docker://{self.image_base(image)}:{image.version}")
+        if dest is None:
+            return False
+        if before_source is not None:
+            before_source()
+        return manifest_digest(f"docker://{image.source}") == dest
 
 
 class GHCRProvider(RegistryProvider):
     def __init__(self, namespace: str, repository: str, prefix: str = "mirror") -> None:
+        super().__init__()
         self.namespace = namespace.lower()
         self.repository = repository.lower()
         self.prefix = prefix.strip("/")
@@ -44,24 +122,6 @@ class GHCRProvider(RegistryProvider):
     def image_base(self, image: ImageRef) -> str:
         return f"ghcr.io/{self.namespace}/{self.repository}/{self.prefix}/{image.registry}/{image.name}"
 
-    def tag_exists(self, image: ImageRef) -> bool:
-        """
-        Return True if the destination tag already exists in GHCR.
-
-        Uses: skopeo inspect docker://<dest>
-        Exit code:
-          - 0 => exists
-          - !=0 => does not exist OR cannot be accessed (auth/network)
-        """
-        dest = f"{self.image_base(image)}:{image.version}"
-        r = subprocess.run(
-            ["skopeo", "inspect", f"docker://{dest}"],
-            check=False,
-            capture_output=True,
-            text=True,
-        )
-        return r.returncode == 0
-
     def _run_copy(self, *, src: str, dest: str, extra: List[str] | None = None) -> None:
         cmd = [
             "skopeo",
@@ -108,26 +168,28 @@ class GHCRProvider(RegistryProvider):
             if output.strip():
                 print(output, flush=True)
 
+            if not self._looks_like_blob_reuse_problem(e):
+                raise
+
             # Fallback: force recompress (avoids cross-repo blob reuse)
-            if self._looks_like_blob_reuse_problem(e):
-                self._run_copy(
-                    src=src,
-                    dest=dest,
-                    extra=[
-                        "--dest-compress-format",
-                        "gzip",
-                        "--dest-compress-level",
-                        "1",
-                        "--dest-force-compress-format",
-                    ],
-                )
-                return
+            self._run_copy(
+                src=src,
+                dest=dest,
+                extra=[
+                    "--dest-compress-format",
+                    "gzip",
+                    "--dest-compress-level",
+                    "1",
+                    "--dest-force-compress-format",
+                ],
+            )
 
-            raise
+        self._remember_tag(image)
 
 
 class GiteaProvider(RegistryProvider):
     def __init__(self, registry: str, namespace: str, prefix: str = "mirror") -> None:
+        super().__init__()
         self.registry = registry.rstrip("/")
         self.namespace = namespace
         self.prefix = prefix.strip("/")
@@ -135,24 +197,6 @@ class GiteaProvider(RegistryProvider):
     def image_base(self, image: ImageRef) -> str:
         return f"{self.registry}/{self.namespace}/{self.prefix}/{image.registry}/{image.name}"
 
-    def tag_exists(self, image: ImageRef) -> bool:
-        """
-        Return True if the destination tag already exists in the target registry.
-
-        Uses: skopeo inspect docker://<dest>
-        Exit code:
-          - 0 => exists
-          - !=0 => does not exist OR cannot be accessed (auth/network)
-        """
-        dest = f"{self.image_base(image)}:{image.version}"
-        r = subprocess.run(
-            ["skopeo", "inspect", f"docker://{dest}"],
-            check=False,
-            capture_output=True,
-            text=True,
-        )
-        return r.returncode == 0
-
     def mirror(self, image: ImageRef) -> None:
         dest = f"{self.image_base(image)}:{image.version}"
         src = f"docker://{image.source}"
@@ -180,3 +224,5 @@ class GiteaProvider(RegistryProvider):
             if output.strip():
                 print(output, flush=True)
             raise
+
+        self._remember_tag(image)
@@ -4,6 +4,7 @@ import json
 from pathlib import Path
 from utils.cache.yaml import dump_yaml_str
 
+from utils.docker.image.catalogue import build_catalogue
 from utils.docker.image.discovery import iter_role_images
 from cli.mirror.providers import GHCRProvider
 
@@ -21,21 +22,20 @@ def main() -> int:
     applications: dict = {}
     images: dict = {}
 
-    for img in iter_role_images(repo_root):
-        if img.source_file == "defaults/main.yml":
-            role_images = images.setdefault(img.role, {})
-            role_images[str(img.service)] = {
-                "image": provider.image_base(img),
-                "version": img.version,
-            }
-            continue
-
-        app = applications.setdefault(img.role, {})
-        services = app.setdefault("services", {})
-        services[str(img.service)] = {
-            "image": provider.image_base(img),
-            "version": img.version,
+    for entry in build_catalogue(iter_role_images(repo_root)):
+        mirrored = {
+            "image": provider.image_base(entry.ref),
+            "version": entry.ref.version,
         }
+        for use in entry.uses:
+            if use.source_file == "defaults/main.yml":
+                role_images = images.setdefault(use.role, {})
+                role_images[str(use.service)] = dict(mirrored)
+                continue
+
+            app = applications.setdefault(use.role, {})
+            services = app.setdefault("services", {})
+            services[str(use.service)] = dict(mirrored)
 
     result = {"applications": applications, "images": images}
 
@@ -1,14 +1,22 @@
 from __future__ import annotations
 
 import argparse
+import json
 import subprocess
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
-from cli.mirror.providers import GHCRProvider
+from cli.mirror.model import ImageRef
+from cli.mirror.providers import GHCRProvider, RegistryProvider
+from utils.docker.image.catalogue import build_catalogue
 from utils.docker.image.discovery import iter_role_images
+from utils.rate_limit import TokenBucket
+
+DEFAULT_JOBS = 4
 
 
 def _validate_positive_int(value: str) -> int:
@@ -21,33 +29,162 @@ def _validate_positive_int(value: str) -> int:
     return n
 
 
-def _throttle_before_next_copy(
-    *, images_per_hour: Optional[int], last_start_ts: Optional[float]
-) -> float:
-    """
-    If images_per_hour is set, ensure at least (3600 / images_per_hour) seconds
-    have elapsed since last_start_ts before returning.
+def _validate_positive_float(value: str) -> float:
+    try:
+        n = float(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError("must be a number") from e
+    if n <= 0:
+        raise argparse.ArgumentTypeError("must be > 0")
+    return n
 
-    Returns the (possibly updated) start timestamp for the next copy.
-    """
-    if not images_per_hour:
-        return time.monotonic()
 
-    min_interval = 3600.0 / float(images_per_hour)
-    now = time.monotonic()
+@dataclass
+class MirrorResult:
+    role: str
+    service: str
+    image: str
+    source: str
+    destination: str
+    # "mirrored", "skipped" (destination exists) or "failed"
+    status: str
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+def _copies_per_minute(args: argparse.Namespace) -> Optional[float]:
+    if args.copies_per_minute:
+        return args.copies_per_minute
+    if args.images_per_hour:
+        return args.images_per_hour / 60.0
+    return None
+
+
+def _mirror_one(
+    provider: RegistryProvider,
+    img: ImageRef,
+    *,
+    only_missing: bool,
+    skip_identical: bool,
+    bucket: Optional[TokenBucket],
+) -> MirrorResult:
+    src = f"docker://{img.source}"
+    dest = f"docker://{provider.image_base(img)}:{img.version}"
+    label = f"{img.role}:{img.service} ({img.name}:{img.version})"
+    result = MirrorResult(
+        role=img.role,
+        service=img.service,
+        image=f"{img.name}:{img.version}",
+        source=src,
+        destination=dest,
+        status="mirrored",
+    )
+
+    start = time.monotonic()
+    throttled = False
 
-    if last_start_ts is not None:
-        elapsed = now - last_start_ts
-        remaining = min_interval - elapsed
-        if remaining > 0:
+    def throttle() -> None:
+        # One token per image, taken before the first request against the
+        # source registry (digest lookup or copy).
+        nonlocal start, throttled
+        if bucket is None or throttled:
+            return
+        throttled = True
+        waited = bucket.acquire()
+        if waited > 0:
+            print(f"[mirror] {label}: throttled for {waited:.1f}s", flush=True)
+        start = time.monotonic()
+
+    try:
+        if only_missing and provider.tag_exists(img):
             print(
-                f"[mirror] throttling: sleeping {remaining:.1f}s "
-                f"(limit={images_per_hour} images/hour)",
+                f"[mirror] {label}: destination exists, skipping ({dest})", flush=True
+            )
+            result.status = "skipped"
+            return result
+
+        if skip_identical and provider.is_identical(img, before_source=throttle):
+            print(
+                f"[mirror] {label}: destination is identical, skipping ({dest})",
                 flush=True,
             )
-            time.sleep(remaining)
+            result.status = "skipped"
+            return result
+
+        throttle()
+        print(f"[mirror] {label}: {src} -> {dest}", flush=True)
+        # Retries and the blob-reuse fallback live in the provider.
+        provider.mirror(img)
+
+    except subprocess.CalledProcessError as e:
+        # keep going, but remember the failure
+        result.status = "failed"
+        result.error = f"exit={e.returncode}, cmd: {' '.join(map(str, e.cmd or []))}"
+        print(f"[mirror] {label}: FAILED, continuing...", file=sys.stderr, flush=True)
+    except Exception as e:
+        result.status = "failed"
+        result.error = f"unexpected error: {e!r}"
+        print(
+            f"[mirror] {label}: FAILED (unexpected), continuing...",
+            file=sys.stderr,
+            flush=True,
+        )
+    finally:
+        result.seconds = round(time.monotonic() - start, 3)
+    return result
+
+
+def mirror_images(
+    provider: RegistryProvider,
+    images: List[ImageRef],
+    *,
+    jobs: int = DEFAULT_JOBS,
+    copies_per_minute: Optional[float] = None,
+    burst: Optional[int] = None,
+    only_missing: bool = False,
+    skip_identical: bool = False,
+) -> List[MirrorResult]:
+    """
+    Mirror `images` with `jobs` concurrent copies. With `copies_per_minute`
+    copy starts are limited by a token bucket holding up to `burst` tokens
+    (default: `jobs`); `burst=1` keeps a minimum spacing between copies.
+
+    Results are returned in the order of `images`.
+    """
+    bucket = (
+        TokenBucket(copies_per_minute / 60.0, capacity=burst or jobs)
+        if copies_per_minute
+        else None
+    )
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="mirror") as pool:
+        futures = [
+            pool.submit(
+                _mirror_one,
+                provider,
+                img,
+                only_missing=only_missing,
+                skip_identical=skip_identical,
+                bucket=bucket,
+            )
+            for img in images
+        ]
+        return [f.result() for f in futures]
+
+
+def summarize(results: List[MirrorResult]) -> Dict[str, Any]:
+    counts = {"mirrored": 0, "skipped": 0, "failed": 0}
+    for r in results:
+        counts[r.status] = counts.get(r.status, 0) + 1
+    return {
+        "total": len(results),
+        **counts,
+        "images": [asdict(r) for r in results],
+    }
 
-    return time.monotonic()
+
+def _write_summary(summary: Dict[str, Any], path: str) -> None:
+    Path(path).write_text(json.dumps(summary, indent=2) + "\n", encoding="utf-8")
+    print(f"[mirror] summary written to {path}", flush=True)
 
 
 def main() -> int:
@@ -60,70 +197,70 @@ def main() -> int:
         help="Mirror only images that do not exist in the destination registry.",
     )
     parser.add_argument(
+        "--skip-identical",
+        action="store_true",
+        help="Skip images whose destination tag has the same manifest digest as the source.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=_validate_positive_int,
+        default=DEFAULT_JOBS,
+        help=f"Concurrent copies (default: {DEFAULT_JOBS}).",
+    )
+    rate = parser.add_mutually_exclusive_group()
+    rate.add_argument(
+        "--copies-per-minute",
+        type=_validate_positive_float,
+        default=None,
+        help="Optional throttle: max copies started per minute (token bucket, "
+        "up to --jobs copies may start back to back).",
+    )
+    rate.add_argument(
         "--images-per-hour",
         type=_validate_positive_int,
         default=None,
-        help="Optional throttle: max images to mirror per hour (best-effort).",
+        help="Optional throttle: max images to mirror per hour, with at least "
+        "3600/N seconds between copy starts.",
+    )
+    parser.add_argument(
+        "--summary",
+        default=None,
+        metavar="PATH",
+        help="Write a JSON summary with the outcome of every image to PATH.",
     )
     args = parser.parse_args()
 
     provider = GHCRProvider.from_args(args)
     repo_root = Path(args.repo_root).resolve()
 
-    failures: List[str] = []
-    total = 0
-
-    last_start_ts: Optional[float] = None
-
-    for img in iter_role_images(repo_root):
-        # Optional throttling (only when --images-per-hour is set)
-        last_start_ts = _throttle_before_next_copy(
-            images_per_hour=args.images_per_hour,
-            last_start_ts=last_start_ts,
-        )
+    # Images shared by several roles are mirrored once.
+    catalogue = build_catalogue(iter_role_images(repo_root))
+    print(
+        f"[mirror] {sum(len(e.uses) for e in catalogue)} image references, "
+        f"{len(catalogue)} unique images",
+        flush=True,
+    )
 
-        total += 1
-        src = f"docker://{img.source}"
-        dest = f"docker://{provider.image_base(img)}:{img.version}"
-        label = f"{img.role}:{img.service} ({img.name}:{img.version})"
-
-        try:
-            if args.only_missing:
-                if provider.tag_exists(img):
-                    print(
-                        f"[mirror] {label}: destination exists, skipping ({dest})",
-                        flush=True,
-                    )
-                    continue
-
-            print(f"[mirror] {label}: {src} -> {dest}", flush=True)
-            provider.mirror(img)
-
-        except subprocess.CalledProcessError as e:
-            # keep going, but remember the failure
-            msg = (
-                f"{label}: FAILED (exit={e.returncode})\n"
-                f"  cmd: {' '.join(map(str, e.cmd))}"
-            )
-            failures.append(msg)
-            print(
-                f"[mirror] {label}: FAILED, continuing...",
-                file=sys.stderr,
-                flush=True,
-            )
-        except Exception as e:
-            msg = f"{label}: FAILED (unexpected error: {e!r})"
-            failures.append(msg)
-            print(
-                f"[mirror] {label}: FAILED (unexpected), continuing...",
-                file=sys.stderr,
-                flush=True,
-            )
+    results = mirror_images(
+        provider,
+        [entry.ref for entry in catalogue],
+        jobs=args.jobs,
+        copies_per_minute=_copies_per_minute(args),
+        # --images-per-hour is a hard spacing limit, not a burst budget.
+        burst=1 if args.images_per_hour else None,
+        only_missing=args.only_missing,
+        skip_identical=args.skip_identical,
+    )
+    summary = summarize(results)
+    if args.summary:
+        _write_summary(summary, args.summary)
 
+    total = summary["total"]
+    failures = [r for r in results if r.status == "failed"]
     if failures:
         print("\n[mirror] SUMMARY: some images failed:", file=sys.stderr)
-        for f in failures:
-            print(f"- {f}", file=sys.stderr)
+        for r in failures:
+            print(f"- {r.role}:{r.service} ({r.image}): {r.error}", file=sys.stderr)
         print(f"\n[mirror] Result: {len(failures)}/{total} failed.", file=sys.stderr)
         return 1
 
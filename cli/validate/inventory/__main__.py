@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
 import argparse
-import re
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+import yaml
 
 # Ensure imports work when invoked as a script (subprocess without PYTHONPATH).
 repo_root = Path(__file__).resolve().parents[3]
@@ -12,22 +16,34 @@ if str(repo_root) not in sys.path:
 from utils.cache.applications import get_application_defaults  # noqa: E402
 from utils.cache.files import read_text  # noqa: E402
 from utils.cache.users import get_user_defaults  # noqa: E402
-from utils.cache.yaml import load_yaml_str  # noqa: E402
+
+VAULT_PLACEHOLDER = "<vaulted>"
+
+# libyaml's C parser is several times faster than the pure-Python one and
+# behaves identically for the safe subset, so prefer it when available.
+_BaseLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+class _InventoryLoader(_BaseLoader):
+    """Safe loader that understands Ansible's ``!vault`` tag.
+
+    Vaulted scalars are never needed for key validation, so they resolve
+    to :data:`VAULT_PLACEHOLDER` instead of being decrypted.
+    """
+
+
+def _vault_constructor(loader, node):
+    return VAULT_PLACEHOLDER
+
+
+_InventoryLoader.add_constructor("!vault", _vault_constructor)
 
 
 def load_yaml_file(path):
-    # Inline preprocessing: strip !vault entries (which would fail YAML
-    # parsing) before handing the text to the cached string parser. The
-    # cache's path-keyed loader is bypassed on purpose — this caller
-    # mutates content per call, so each parse is intentionally fresh.
+    # The path-keyed cache in utils.cache.yaml only knows the plain safe
+    # loader; inventories need the vault-aware one, so parse directly.
     try:
-        content = read_text(str(path))
-        content = re.sub(
-            r"(?m)^([ \t]*[^\s:]+):\s*!vault[\s\S]+?(?=^\S|\Z)",
-            r"\1: \"<vaulted>\"\n",
-            content,
-        )
-        return load_yaml_str(content)
+        return yaml.load(read_text(str(path)), Loader=_InventoryLoader)  # noqa: direct-yaml
     except Exception as e:
         print(f"Warning: Could not parse {path}: {e}", file=sys.stderr)
         return None
@@ -43,15 +59,30 @@ def recursive_keys(d, prefix=""):
     return keys
 
 
-def compare_application_keys(applications, application_defaults, source):
+def build_default_key_sets(application_defaults) -> Dict[str, FrozenSet[str]]:
+    """Flatten every application's defaults into its dotted key-set once."""
+    return {
+        app_id: frozenset(recursive_keys(default))
+        for app_id, default in application_defaults.items()
+    }
+
+
+def compare_application_keys(
+    applications, application_defaults, source, default_key_sets=None
+):
     errs = []
+    if default_key_sets is None:
+        default_key_sets = {}
     for app_id, conf in applications.items():
         if app_id not in application_defaults:
             errs.append(f"{source}: Unknown application '{app_id}'")
             continue
-        default = application_defaults[app_id]
+        def_keys = default_key_sets.get(app_id)
+        if def_keys is None:
+            def_keys = default_key_sets[app_id] = frozenset(
+                recursive_keys(application_defaults[app_id])
+            )
         app_keys = recursive_keys(conf)
-        def_keys = recursive_keys(default)
         for key in app_keys:
             if key.startswith("credentials"):
                 continue
@@ -61,13 +92,18 @@ def compare_application_keys(applications, application_defaults, source):
 
 
 def compare_user_keys(users, user_defaults, source):
-    errs = []
+    errs, warnings = _user_issues(users, user_defaults, source)
+    for w in warnings:
+        print(w, file=sys.stderr)
+    return errs
+
+
+def _user_issues(users, user_defaults, source) -> Tuple[List[str], List[str]]:
+    errs: List[str] = []
+    warnings: List[str] = []
     for user, conf in users.items():
         if user not in user_defaults:
-            print(
-                f"Warning: {source}: Unknown user '{user}'",
-                file=sys.stderr,
-            )
+            warnings.append(f"Warning: {source}: Unknown user '{user}'")
             continue
         def_conf = user_defaults[user]
         for key in conf:
@@ -75,26 +111,43 @@ def compare_user_keys(users, user_defaults, source):
                 continue
             if key not in def_conf:
                 errs.append(f"Missing default for user '{user}': key '{key}'")
-    return errs
+    return errs, warnings
+
+
+def _host_errors(data, source, app_ids) -> List[str]:
+    all_node = data.get("all", {})
+    children = all_node.get("children") if isinstance(all_node, dict) else None
+    if not isinstance(children, dict):
+        return []
+    return [
+        f"{source}: Invalid group '{grp}' (not in application_ids)"
+        for grp in children.keys()
+        if grp not in app_ids
+    ]
+
+
+def _is_application_source(path: Path, inv_dir: Path) -> bool:
+    """Top-level YAMLs and everything below a top-level ``*_vars`` dir."""
+    rel = path.relative_to(inv_dir)
+    return len(rel.parts) == 1 or rel.parts[0].endswith("_vars")
+
+
+def collect_inventory_files(inv_dir) -> List[Path]:
+    """Every YAML file below *inv_dir*, sorted for deterministic output."""
+    return sorted(Path(inv_dir).rglob("*.yml"))
 
 
 def load_inventory_files(inv_dir):
     all_data = {}
     p = Path(inv_dir)
-    for f in p.glob("*.yml"):
+    for f in collect_inventory_files(p):
+        if not _is_application_source(f, p):
+            continue
         data = load_yaml_file(f)
         if isinstance(data, dict):
             apps = data.get("applications")
             if apps:
                 all_data[str(f)] = apps
-    for d in p.glob("*_vars"):
-        if d.is_dir():
-            for f in d.rglob("*.yml"):
-                data = load_yaml_file(f)
-                if isinstance(data, dict):
-                    apps = data.get("applications")
-                    if apps:
-                        all_data[str(f)] = apps
     return all_data
 
 
@@ -102,20 +155,86 @@ def validate_host_keys(app_ids, inv_dir):
     errs = []
     p = Path(inv_dir)
     # Scan all top-level YAMLs for 'all.children'
-    for f in p.glob("*.yml"):
+    for f in sorted(p.glob("*.yml")):
         data = load_yaml_file(f)
-        if not isinstance(data, dict):
-            continue
-        all_node = data.get("all", {})
-        children = all_node.get("children")
-        if not isinstance(children, dict):
-            continue
-        for grp in children.keys():
-            if grp not in app_ids:
-                errs.append(f"{f}: Invalid group '{grp}' (not in application_ids)")
+        if isinstance(data, dict):
+            errs.extend(_host_errors(data, f, app_ids))
     return errs
 
 
+# Read-only validation context. Set once per process: directly for the
+# sequential path, via the pool initializer for worker processes, so the
+# (large) default key-sets are shipped to each worker exactly once.
+_CONTEXT: Dict[str, Any] = {}
+
+
+def _init_context(
+    application_defaults: Mapping[str, Any],
+    default_key_sets: Mapping[str, FrozenSet[str]],
+    user_defaults: Mapping[str, Any],
+) -> None:
+    _CONTEXT["application_defaults"] = application_defaults
+    _CONTEXT["default_key_sets"] = dict(default_key_sets)
+    _CONTEXT["user_defaults"] = user_defaults
+
+
+def validate_inventory_file(path: Path, inv_dir: Path) -> Dict[str, List[str]]:
+    """Parse *path* once and run every check that applies to it."""
+    result: Dict[str, List[str]] = {
+        "app_errs": [],
+        "user_errs": [],
+        "user_warnings": [],
+        "host_errs": [],
+    }
+    data = load_yaml_file(path)
+    if not isinstance(data, dict):
+        return result
+
+    application_defaults = _CONTEXT["application_defaults"]
+    if _is_application_source(path, inv_dir):
+        apps = data.get("applications")
+        if apps:
+            result["app_errs"] = compare_application_keys(
+                apps, application_defaults, str(path), _CONTEXT["default_key_sets"]
+            )
+    if "users" in data:
+        result["user_errs"], result["user_warnings"] = _user_issues(
+            data["users"], _CONTEXT["user_defaults"], str(path)
+        )
+    if path.parent == inv_dir:
+        result["host_errs"] = _host_errors(data, path, application_defaults)
+    return result
+
+
+def validate_inventory(
+    inv_dir, application_defaults, user_defaults, workers: Optional[int] = None
+) -> List[Dict[str, List[str]]]:
+    """Validate every inventory file, in parallel when it pays off.
+
+    Results are returned in :func:`collect_inventory_files` order
+    regardless of which worker finished first.
+    """
+    inv_dir = Path(inv_dir)
+    files = collect_inventory_files(inv_dir)
+    default_key_sets = build_default_key_sets(application_defaults)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(files)))
+
+    if workers == 1:
+        _init_context(application_defaults, default_key_sets, user_defaults)
+        return [validate_inventory_file(f, inv_dir) for f in files]
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_context,
+        initargs=(application_defaults, default_key_sets, user_defaults),
+    ) as executor:
+        return list(
+            executor.map(validate_inventory_file, files, [inv_dir] * len(files))
+        )
+
+
 def main():
     p = argparse.ArgumentParser()
     p.add_argument("inventory_dir")
@@ -124,6 +243,12 @@ def main():
         default=str(repo_root / "roles"),
         help="Path to the repository roles directory.",
     )
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Parallel worker processes (default: CPU count, 1 disables).",
+    )
     args = p.parse_args()
     application_defaults = get_application_defaults(roles_dir=args.roles_dir)
     user_defaults = get_user_defaults(roles_dir=args.roles_dir)
@@ -136,19 +261,20 @@ def main():
     if not user_defaults:
         print("Error: No user defaults discovered in roles directory", file=sys.stderr)
         sys.exit(1)
+    results = validate_inventory(
+        args.inventory_dir, application_defaults, user_defaults, args.workers
+    )
     app_errs = []
-    inv_files = load_inventory_files(args.inventory_dir)
-    for src, apps in inv_files.items():
-        app_errs.extend(compare_application_keys(apps, application_defaults, src))
+    host_errs = []
     user_errs = []
-    for fpath in Path(args.inventory_dir).rglob("*.yml"):
-        data = load_yaml_file(fpath)
-        if isinstance(data, dict) and "users" in data:
-            errs = compare_user_keys(data["users"], user_defaults, str(fpath))
-            for e in errs:
-                print(e, file=sys.stderr)
-            user_errs.extend(errs)
-    host_errs = validate_host_keys(set(application_defaults), args.inventory_dir)
+    for result in results:
+        app_errs.extend(result["app_errs"])
+        host_errs.extend(result["host_errs"])
+        for w in result["user_warnings"]:
+            print(w, file=sys.stderr)
+        for e in result["user_errs"]:
+            print(e, file=sys.stderr)
+        user_errs.extend(result["user_errs"])
     app_errs.extend(host_errs)
     if app_errs or user_errs:
         if app_errs:
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Aggregate callback that records per-host task durations of every playbook
+# run in the local timings database (see utils/timing_store.py). Reported by
+# `infinito meta timings`.
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ansible.plugins.callback import CallbackBase
+
+# Callbacks load for every ansible command, also ones started without the
+# project root on PYTHONPATH.
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.append(_PROJECT_ROOT)
+
+from utils.timing_store import (  # noqa: E402
+    TaskTiming,
+    TimingStore,
+    current_git_commit,
+)
+
+DOCUMENTATION = """
+    name: timing_store
+    type: aggregate
+    short_description: Record task durations in the local timings database
+    description:
+      - Stores per-host task, role and run durations together with the git
+        commit and the deployed applications in a SQLite database.
+      - The database path is taken from INFINITO_TIMINGS_DB, defaulting to
+        $XDG_STATE_HOME/infinito-nexus/timings.sqlite.
+    requirements:
+      - enable in ansible.cfg via callbacks_enabled
+"""
+
+
+def _applications(extra_vars: Dict[str, Any]) -> List[str]:
+    raw = extra_vars.get("allowed_applications") or ""
+    if isinstance(raw, str):
+        return [a.strip() for a in raw.split(",") if a.strip()]
+    if isinstance(raw, (list, tuple)):
+        return [str(a) for a in raw]
+    return []
+
+
+def _role_name(task: Any) -> str:
+    role = getattr(task, "_role", None)
+    if role is None:
+        return ""
+    try:
+        return role.get_name(include_role_fqcn=False)
+    except TypeError:
+        return role.get_name()
+
+
+class CallbackModule(CallbackBase):
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = "aggregate"
+    CALLBACK_NAME = "timing_store"
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._store: Optional[TimingStore] = None
+        self._run_id: Optional[int] = None
+        self._playbook = ""
+        self._basedir: Optional[str] = None
+        self._starts: Dict[Tuple[str, str], float] = {}
+        self._timings: List[TaskTiming] = []
+
+    def _warn(self, message: str) -> None:
+        # Timing history is diagnostics only and must never fail a deploy.
+        self._display.warning(f"timing_store: {message}")
+
+    def v2_playbook_on_start(self, playbook):
+        self._playbook = os.path.basename(getattr(playbook, "_file_name", "") or "")
+        self._basedir = getattr(playbook, "_basedir", None)
+
+    def v2_playbook_on_play_start(self, play):
+        if self._run_id is not None:
+            return
+        try:
+            extra_vars = play.get_variable_manager().extra_vars
+        except Exception:
+            extra_vars = {}
+        try:
+            self._store = TimingStore()
+            self._run_id = self._store.start_run(
+                git_commit=current_git_commit(self._basedir),
+                playbook=self._playbook,
+                applications=_applications(extra_vars),
+            )
+        except Exception as exc:
+            self._warn(f"disabled ({exc})")
+            self._store = None
+
+    def v2_runner_on_start(self, host, task):
+        self._starts[(host.get_name(), task._uuid)] = time.monotonic()
+
+    def _record(self, result, status: str) -> None:
+        host = result._host.get_name()
+        task = result._task
+        started = self._starts.pop((host, task._uuid), None)
+        if started is None or self._store is None:
+            return
+        self._timings.append(
+            TaskTiming(
+                host=host,
+                role=_role_name(task),
+                # The raw (untemplated) name is stable across runs and,
+                # unlike get_name(), carries no "<role> : " prefix.
+                task=task.name or task.get_name(),
+                path=task.get_path() or "",
+                duration=time.monotonic() - started,
+                status=status,
+            )
+        )
+
+    def v2_runner_on_ok(self, result):
+        self._record(result, "ok")
+
+    def v2_runner_on_failed(self, result, ignore_errors=False):
+        self._record(result, "ignored" if ignore_errors else "failed")
+
+    def v2_runner_on_unreachable(self, result):
+        self._record(result, "unreachable")
+
+    def v2_runner_on_skipped(self, result):
+        # Skipped tasks cost nothing worth tracking; just drop the start mark.
+        self._starts.pop((result._host.get_name(), result._task._uuid), None)
+
+    def v2_playbook_on_stats(self, stats):
+        if self._store is None or self._run_id is None:
+            return
+        failed = bool(getattr(stats, "failures", None) or getattr(stats, "dark", None))
+        try:
+            self._store.finish_run(
+                self._run_id, self._timings, status="failed" if failed else "ok"
+            )
+        except Exception as exc:
+            self._warn(f"could not store timings ({exc})")
+        finally:
+            self._store.close()
+            self._store = None
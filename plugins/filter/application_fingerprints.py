@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+# Filters deciding which applications MODE_INCREMENTAL may skip and what
+# to record on the host after a successful run.
+# See utils/applications/fingerprint.py.
+
+from ansible.errors import AnsibleFilterError
+
+from plugins.filter.application_allowed import application_allowed
+from utils.applications.fingerprint import (
+    compose_project_health,
+    recorded_state,
+    unchanged_applications,
+)
+from utils.entity_name_utils import get_entity_name
+
+
+def _lines(container_ps):
+    if container_ps is None:
+        return []
+    if isinstance(container_ps, str):
+        return container_ps.splitlines()
+    if isinstance(container_ps, (list, tuple)):
+        return [str(line) for line in container_ps]
+    raise AnsibleFilterError(
+        f"container_ps must be a string or a list of lines, got {type(container_ps)}"
+    )
+
+
+def _mapping(value, name):
+    if value is None:
+        return {}
+    if not isinstance(value, dict):
+        raise AnsibleFilterError(f"{name} must be a mapping, got {type(value)}")
+    return value
+
+
+def _project_names(app_ids):
+    return {app_id: get_entity_name(app_id) for app_id in app_ids}
+
+
+def unchanged_applications_filter(fingerprints, state, container_ps=None):
+    """
+    Return the application ids whose fingerprint matches `state` and whose
+    compose project is healthy according to `container_ps` (output of
+    `container ps -a` with "<project>\\t<state>\\t<status>" lines).
+    """
+    fingerprints = _mapping(fingerprints, "fingerprints")
+    return unchanged_applications(
+        fingerprints,
+        _mapping(state, "state"),
+        compose_project_health(_lines(container_ps)),
+        _project_names(fingerprints),
+    )
+
+
+def application_fingerprint_state(
+    fingerprints, state, container_ps, group_names, allowed_applications=None
+):
+    """
+    Return the host state to persist after a successful run: the entries
+    of every application deployed in this run (see `application_allowed`)
+    are replaced by their current fingerprint.
+    """
+    fingerprints = _mapping(fingerprints, "fingerprints")
+    deployed = [
+        app_id
+        for app_id in fingerprints
+        if application_allowed(app_id, group_names, allowed_applications or [])
+    ]
+    return recorded_state(
+        _mapping(state, "state"),
+        fingerprints,
+        deployed,
+        compose_project_health(_lines(container_ps)),
+        _project_names(fingerprints),
+    )
+
+
+class FilterModule(object):
+    def filters(self):
+        return {
+            "unchanged_applications": unchanged_applications_filter,
+            "application_fingerprint_state": application_fingerprint_state,
+        }
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+# Turn the fact subsets a stage needs into the `gather_subset` argument
+# for ansible.builtin.setup, leaving out subsets the host already has.
+# See tasks/utils/facts/gather.yml.
+
+from ansible.errors import AnsibleFilterError
+
+
+def _subsets(value, name):
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, (list, tuple)):
+        raise AnsibleFilterError(f"{name} must be a list of subsets, got {type(value)}")
+    subsets = []
+    for item in value:
+        item = str(item).strip()
+        if not item or item.startswith("!"):
+            raise AnsibleFilterError(
+                f"{name} must list subsets to gather, got {item!r}"
+            )
+        if item not in subsets:
+            subsets.append(item)
+    return subsets
+
+
+def fact_gather_subset(requested, gathered=None):
+    """
+    Return the `gather_subset` list that collects exactly the subsets of
+    `requested` missing from `gathered`, or [] when nothing is missing.
+
+    setup always adds `min` unless it is excluded, so `!min` is passed
+    whenever `min` itself is not missing.
+    """
+    have = set(_subsets(gathered, "gathered"))
+    if "all" in have:
+        return []
+    missing = [s for s in _subsets(requested, "requested") if s not in have]
+    if not missing:
+        return []
+    if "all" in missing:
+        return ["all"]
+    if "min" in missing:
+        return ["!all"] + missing
+    return ["!all", "!min"] + missing
+
+
+class FilterModule(object):
+    def filters(self):
+        return {"fact_gather_subset": fact_gather_subset}
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, List, Optional
+
+from ansible.errors import AnsibleError
+from ansible.plugins.lookup import LookupBase
+
+from utils.applications.fingerprint import application_fingerprints
+from utils.cache.applications import get_merged_applications
+
+
+class LookupModule(LookupBase):
+    """
+    Return {application_id: fingerprint} for the given application ids
+    (default: the host's group_names that are roles).
+
+    See utils/applications/fingerprint.py for what goes into a fingerprint.
+
+    Usage:
+      APPLICATION_FINGERPRINTS: "{{ lookup('application_fingerprints') }}"
+      one: "{{ lookup('application_fingerprints', 'web-app-nextcloud') }}"
+    """
+
+    def run(
+        self,
+        terms: List[Any],
+        variables: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[Dict[str, str]]:
+        vars_ = variables or getattr(self._templar, "available_variables", {}) or {}
+
+        app_ids: List[str] = []
+        for term in terms or [vars_.get("group_names", []) or []]:
+            if isinstance(term, (list, tuple)):
+                app_ids.extend(str(t) for t in term)
+            else:
+                app_ids.append(str(term))
+
+        applications = get_merged_applications(
+            variables=vars_,
+            templar=getattr(self, "_templar", None),
+        )
+
+        try:
+            fingerprints = application_fingerprints(
+                app_ids,
+                applications,
+                project_root=self._get_project_root(),
+                variables=vars_,
+            )
+        except ValueError as exc:
+            raise AnsibleError(f"application_fingerprints: {exc}") from exc
+        return [fingerprints]
+
+    def _get_project_root(self) -> str:
+        plugin_dir = os.path.dirname(__file__)
+        return os.path.abspath(os.path.join(plugin_dir, "..", ".."))
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, List, Optional
+
+from ansible.errors import AnsibleError
+from ansible.plugins.lookup import LookupBase
+
+from utils.entity_name_utils import get_entity_name
+from utils.roles.meta_lookup import get_role_run_after
+
+
+class LookupModule(LookupBase):
+    """
+    Return the run_after order of the host's applications keyed by their
+    compose project directory: {entity: [entities it runs after]}.
+
+    Only run_after entries naming applications of the host are kept, and
+    applications without such entries are left out. Used to restart the
+    projects below DIR_COMPOSITIONS in deploy order.
+
+    Usage:
+      order: "{{ lookup('compose_run_after') }}"
+      some:  "{{ lookup('compose_run_after', ['web-app-a', 'web-app-b']) }}"
+    """
+
+    def run(
+        self,
+        terms: List[Any],
+        variables: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[Dict[str, List[str]]]:
+        vars_ = variables or getattr(self._templar, "available_variables", {}) or {}
+
+        app_ids: List[str] = []
+        for term in terms:
+            if isinstance(term, (list, tuple)):
+                app_ids.extend(str(t) for t in term)
+            else:
+                app_ids.append(str(term))
+        if not terms:
+            app_ids = [str(g) for g in vars_.get("group_names", []) or []]
+
+        roles_dir = os.path.join(self._get_project_root(), "roles")
+        app_ids = [
+            a
+            for a in app_ids
+            if os.path.isfile(os.path.join(roles_dir, a, "meta", "services.yml"))
+        ]
+        selected = set(app_ids)
+
+        order: Dict[str, List[str]] = {}
+        try:
+            for app_id in app_ids:
+                deps = [
+                    get_entity_name(dep)
+                    for dep in get_role_run_after(
+                        os.path.join(roles_dir, app_id), role_name=app_id
+                    )
+                    if dep in selected
+                ]
+                if deps:
+                    order[get_entity_name(app_id)] = deps
+        except ValueError as exc:
+            raise AnsibleError(f"compose_run_after: {exc}") from exc
+        return [order]
+
+    def _get_project_root(self) -> str:
+        plugin_dir = os.path.dirname(__file__)
+        return os.path.abspath(os.path.join(plugin_dir, "..", ".."))
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, List, Optional
+
+from ansible.errors import AnsibleError
+from ansible.plugins.lookup import LookupBase
+
+from plugins.filter.application_allowed import application_allowed
+from utils.cache.applications import get_merged_applications
+from utils.docker.image.prefetch import GROUP_ORDER, prefetch_images
+from utils.roles.meta_lookup import get_role_run_after
+
+
+class LookupModule(LookupBase):
+    """
+    Return the image references to prefetch for the given application ids
+    in deploy order (run_after waves within each role group).
+
+    Without terms, the applications of this run are used: the host's
+    web-svc/web-app/web-opt groups that pass `application_allowed` and are
+    not in UNCHANGED_APPLICATIONS.
+
+    See utils/docker/image/prefetch.py.
+
+    Usage:
+      refs: "{{ lookup('image_prefetch') }}"
+      one: "{{ lookup('image_prefetch', 'web-app-nextcloud') }}"
+    """
+
+    def run(
+        self,
+        terms: List[Any],
+        variables: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[List[str]]:
+        vars_ = variables or getattr(self._templar, "available_variables", {}) or {}
+
+        app_ids: List[str] = []
+        for term in terms:
+            if isinstance(term, (list, tuple)):
+                app_ids.extend(str(t) for t in term)
+            else:
+                app_ids.append(str(term))
+        if not terms:
+            app_ids = self._run_applications(vars_)
+
+        roles_dir = os.path.join(self._get_project_root(), "roles")
+        app_ids = [a for a in app_ids if os.path.isdir(os.path.join(roles_dir, a))]
+
+        applications = get_merged_applications(
+            variables=vars_,
+            templar=getattr(self, "_templar", None),
+        )
+
+        try:
+            run_after = {
+                app_id: get_role_run_after(
+                    os.path.join(roles_dir, app_id), role_name=app_id
+                )
+                for app_id in app_ids
+            }
+            return [prefetch_images(app_ids, applications, run_after)]
+        except ValueError as exc:
+            raise AnsibleError(f"image_prefetch: {exc}") from exc
+
+    @staticmethod
+    def _run_applications(vars_: Dict[str, Any]) -> List[str]:
+        group_names = list(vars_.get("group_names", []) or [])
+        allowed = list(vars_.get("allowed_applications", []) or [])
+        unchanged = set(vars_.get("UNCHANGED_APPLICATIONS", []) or [])
+        return [
+            app_id
+            for app_id in group_names
+            if app_id.startswith(GROUP_ORDER)
+            and app_id not in unchanged
+            and application_allowed(app_id, group_names, allowed)
+        ]
+
+    def _get_project_root(self) -> str:
+        plugin_dir = os.path.dirname(__file__)
+        return os.path.abspath(os.path.join(plugin_dir, "..", ".."))
@@ -1,40 +1,199 @@
 #!/usr/bin/env python3
 
-import sys
-import subprocess
-import os
-import glob
+import argparse
 import datetime
+import glob
+import hashlib
+import json
+import os
+import random
+import stat
+import subprocess
+import sys
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterator, Optional, Tuple
 
+# Written into every version directory once the copy has finished.
+MANIFEST_NAME = ".backup-manifest.jsonl"
+MANIFEST_FORMAT = 1
+HASH_ALGORITHM = "blake2b-128"
+HASH_CHUNK_SIZE = 1024 * 1024
+DEFAULT_SAMPLE_RATE = 0.01
 
-def main():
-    source_path = sys.argv[1]
-    print(f"source path: {source_path}")
 
-    backup_to_usb_destination_path = sys.argv[2]
-    print(f"backup to usb destination path: {backup_to_usb_destination_path}")
+@dataclass
+class ManifestEntry:
+    path: str
+    size: int
+    mtime_ns: int
+    hash: str
 
-    if not os.path.isdir(backup_to_usb_destination_path):
-        print(f"Directory {backup_to_usb_destination_path} does not exist")
-        sys.exit(1)
 
+def file_hash(path: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def iter_files(root: str) -> Iterator[Tuple[str, os.stat_result]]:
+    """Yield (relative path, lstat) of every regular file below `root`."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            full_path = os.path.join(dirpath, name)
+            relative_path = os.path.relpath(full_path, root)
+            if relative_path == MANIFEST_NAME:
+                continue
+            st = os.lstat(full_path)
+            if stat.S_ISREG(st.st_mode):
+                yield relative_path, st
+
+
+def load_manifest(version_path: str) -> Optional[Dict[str, ManifestEntry]]:
+    """Return the manifest of `version_path` by relative path, None if absent."""
+    manifest_path = os.path.join(version_path, MANIFEST_NAME)
+    if not os.path.isfile(manifest_path):
+        return None
+    entries: Dict[str, ManifestEntry] = {}
+    with open(manifest_path, encoding="utf-8") as fh:
+        header = json.loads(fh.readline() or "{}")
+        if header.get("format") != MANIFEST_FORMAT:
+            print(f"Ignoring manifest {manifest_path} with unknown format")
+            return None
+        for line in fh:
+            if line.strip():
+                entry = ManifestEntry(**json.loads(line))
+                entries[entry.path] = entry
+    return entries
+
+
+def write_manifest(version_path: str, entries: Dict[str, ManifestEntry]) -> None:
+    manifest_path = os.path.join(version_path, MANIFEST_NAME)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        header = {
+            "format": MANIFEST_FORMAT,
+            "hash": HASH_ALGORITHM,
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        }
+        fh.write(json.dumps(header) + "\n")
+        for entry in entries.values():
+            fh.write(json.dumps(asdict(entry)) + "\n")
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp_path, manifest_path)
+
+
+def build_manifest(
+    version_path: str, previous: Optional[Dict[str, ManifestEntry]] = None
+) -> Tuple[Dict[str, ManifestEntry], int]:
+    """
+    Return the manifest of `version_path` and the number of hashed files.
+
+    Files whose size and mtime match the `previous` manifest are the ones
+    rsync hard-linked from the previous version, so their hash is reused.
+    """
+    previous = previous or {}
+    entries: Dict[str, ManifestEntry] = {}
+    hashed = 0
+    for relative_path, st in iter_files(version_path):
+        known = previous.get(relative_path)
+        if known and known.size == st.st_size and known.mtime_ns == st.st_mtime_ns:
+            digest = known.hash
+        else:
+            digest = file_hash(os.path.join(version_path, relative_path))
+            hashed += 1
+        entries[relative_path] = ManifestEntry(
+            relative_path, st.st_size, st.st_mtime_ns, digest
+        )
+    return entries, hashed
+
+
+def verify_version(
+    version_path: str,
+    sample_rate: float = DEFAULT_SAMPLE_RATE,
+    rng: Optional[random.Random] = None,
+) -> dict:
+    """
+    Check `version_path` against its manifest.
+
+    Only files whose size or mtime differ from the manifest are re-hashed,
+    plus a random `sample_rate` share of the others to catch silent
+    corruption. Files missing on disk or with a different hash are listed
+    in the report.
+    """
+    manifest = load_manifest(version_path)
+    if manifest is None:
+        raise FileNotFoundError(f"No manifest in {version_path}")
+    rng = rng or random.Random()
+
+    report = {
+        "version": version_path,
+        "files": len(manifest),
+        "rehashed": 0,
+        "sampled": 0,
+        "missing": [],
+        "corrupt": [],
+        "unexpected": [],
+    }
+    on_disk = set()
+    for relative_path, st in iter_files(version_path):
+        on_disk.add(relative_path)
+        entry = manifest.get(relative_path)
+        if entry is None:
+            report["unexpected"].append(relative_path)
+            continue
+        if entry.size != st.st_size:
+            report["corrupt"].append(relative_path)
+            continue
+        if entry.mtime_ns != st.st_mtime_ns:
+            report["rehashed"] += 1
+        elif rng.random() < sample_rate:
+            report["sampled"] += 1
+        else:
+            continue
+        if file_hash(os.path.join(version_path, relative_path)) != entry.hash:
+            report["corrupt"].append(relative_path)
+
+    report["missing"] = sorted(set(manifest) - on_disk)
+    report["ok"] = not report["missing"] and not report["corrupt"]
+    return report
+
+
+def machine_versions_path(destination_path: str) -> str:
     machine_id = subprocess.run(
         ["sha256sum", "/etc/machine-id"], capture_output=True, text=True
     ).stdout.strip()[:64]
     print(f"machine id: {machine_id}")
+    return os.path.join(destination_path, f"{machine_id}/svc-bkp-loc-2-usb/")
 
-    versions_path = os.path.join(
-        backup_to_usb_destination_path, f"{machine_id}/svc-bkp-loc-2-usb/"
+
+def latest_version(versions_path: str) -> Optional[str]:
+    return max(
+        (path for path in glob.glob(f"{versions_path}*") if os.path.isdir(path)),
+        key=os.path.getmtime,
+        default=None,
     )
+
+
+def backup(source_path: str, backup_to_usb_destination_path: str) -> int:
+    print(f"source path: {source_path}")
+    print(f"backup to usb destination path: {backup_to_usb_destination_path}")
+
+    if not os.path.isdir(backup_to_usb_destination_path):
+        print(f"Directory {backup_to_usb_destination_path} does not exist")
+        return 1
+
+    versions_path = machine_versions_path(backup_to_usb_destination_path)
     print(f"versions path: {versions_path}")
 
     if not os.path.isdir(versions_path):
         print(f"Creating {versions_path}...")
         os.makedirs(versions_path, exist_ok=True)
 
-    previous_version_path = max(
-        glob.glob(f"{versions_path}*"), key=os.path.getmtime, default=None
-    )
+    previous_version_path = latest_version(versions_path)
     print(f"previous versions path: {previous_version_path}")
 
     current_version_path = os.path.join(
@@ -57,7 +216,6 @@ def main():
 
         print(rsync_output)
         print("Synchronization finished")
-        sys.exit(0)
     except subprocess.CalledProcessError as e:
         print(e.output)
         if (
@@ -65,10 +223,85 @@ def main():
             in e.output
         ):
             print("Synchronization finished with rsync warning")
-            sys.exit(0)
         else:
             print("Synchronization failed")
-            sys.exit(1)
+            return 1
+
+    print("Writing manifest...")
+    previous_manifest = (
+        load_manifest(previous_version_path) if previous_version_path else None
+    )
+    entries, hashed = build_manifest(current_version_path, previous_manifest)
+    write_manifest(current_version_path, entries)
+    print(f"Manifest written: {len(entries)} files, {hashed} hashed")
+    return 0
+
+
+def verify(path: str, sample_rate: float, report_path: Optional[str]) -> int:
+    version_path = path
+    if not os.path.isfile(os.path.join(path, MANIFEST_NAME)):
+        # A backup destination: verify this machine's latest version.
+        version_path = latest_version(machine_versions_path(path))
+        if version_path is None:
+            print(f"No backup versions found in {path}")
+            return 1
+    print(f"verifying: {version_path}")
+
+    try:
+        report = verify_version(version_path, sample_rate)
+    except FileNotFoundError as e:
+        print(e)
+        return 1
+
+    summary = json.dumps(report, indent=2)
+    print(summary)
+    if report_path:
+        with open(report_path, "w", encoding="utf-8") as fh:
+            fh.write(summary + "\n")
+    if not report["ok"]:
+        print(
+            f"Verification failed: {len(report['missing'])} missing, "
+            f"{len(report['corrupt'])} corrupt"
+        )
+        return 1
+    print("Verification finished")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Back up a directory to a USB drive, or verify a backup."
+    )
+    parser.add_argument("source", nargs="?", help="Directory to back up")
+    parser.add_argument(
+        "destination",
+        help="USB backup destination (with --verify: destination or version directory)",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Verify a backup version against its manifest instead of backing up",
+    )
+    parser.add_argument(
+        "--sample-rate",
+        type=float,
+        default=DEFAULT_SAMPLE_RATE,
+        help="Share of unchanged files re-hashed at random during --verify "
+        f"(default: {DEFAULT_SAMPLE_RATE})",
+    )
+    parser.add_argument(
+        "--report",
+        default=None,
+        metavar="PATH",
+        help="Write the JSON verification report to PATH",
+    )
+    args = parser.parse_args()
+
+    if args.verify:
+        sys.exit(verify(args.destination, args.sample_rate, args.report))
+    if args.source is None:
+        parser.error("the source directory is required unless --verify is given")
+    sys.exit(backup(args.source, args.destination))
 
 
 if __name__ == "__main__":
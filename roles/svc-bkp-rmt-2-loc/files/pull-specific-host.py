@@ -1,10 +1,23 @@
 #!/usr/bin/env python3
 import argparse
+import json
 import os
+import re
+import shutil
 import subprocess
 import sys
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from pathlib import Path
+from typing import List, Optional
+
+DEFAULT_JOBS = 2
+DEFAULT_MAX_RETRIES = 12
+# First retry waits this long; every further retry doubles it up to the cap.
+DEFAULT_RETRY_DELAY = 30
+MAX_RETRY_DELAY = 1800
 
 
 def run_command(
@@ -37,18 +50,147 @@ def run_command(
         raise
 
 
-def pull_backups(hostname: str, backups_dir: str) -> None:
-    backups_dir = backups_dir.rstrip("/")
-    print(f"pulling backups from: {hostname}")
+class SSHSession:
+    """
+    One multiplexed SSH connection per host: the first command opens a
+    control master, all later commands and the rsync transfers reuse it.
+    """
+
+    def __init__(self, remote_host: str, control_dir: str) -> None:
+        self.remote_host = remote_host
+        # %C is a hash of the connection parameters; it keeps the socket
+        # path short enough for the unix socket limit.
+        self.control_path = os.path.join(control_dir, "%C")
+
+    @property
+    def options(self) -> str:
+        # Unquoted: the options are also embedded in rsync's -e "ssh ...".
+        return (
+            f"-o ControlMaster=auto "
+            f"-o ControlPath={self.control_path} "
+            f"-o ControlPersist=600"
+        )
+
+    def command(self, remote_command: str) -> str:
+        return f'ssh {self.options} "{self.remote_host}" {remote_command}'
+
+    def run(self, remote_command: str) -> str:
+        return run_command(self.command(remote_command))
+
+    def close(self) -> None:
+        run_command(
+            f'ssh -o ControlPath={self.control_path} -O exit "{self.remote_host}"',
+            check=False,
+        )
+
+
+@dataclass
+class Transfer:
+    backup_type: str
+    source: str
+    destination: str
+    link_dest: str
+
+
+@dataclass
+class TransferReport:
+    backup_type: str
+    source: str
+    destination: str
+    # "succeeded" or "failed"
+    status: str
+    bytes: int = 0
+    seconds: float = 0.0
+    retries: int = 0
+
+
+def parse_received_bytes(rsync_output: str) -> int:
+    """Return "Total bytes received" from rsync --stats output (0 if absent)."""
+    match = re.search(r"^Total bytes received:\s*([\d,.]+)", rsync_output, re.M)
+    if not match:
+        return 0
+    return int(re.sub(r"\D", "", match.group(1)))
+
+
+def retry_delay(retry: int, base_delay: float) -> float:
+    """Seconds to wait before retry number `retry` (1-based)."""
+    return min(base_delay * 2 ** (retry - 1), MAX_RETRY_DELAY)
+
+
+def rsync_command(
+    session: SSHSession, transfer: Transfer, bwlimit: Optional[int] = None
+) -> str:
+    # The remote ssh-wrapper.sh only accepts the exact server command these
+    # options produce. --partial, --stats and --link-dest stay on the
+    # receiving side; --bwlimit is accepted by the wrapper as well.
+    command = (
+        f"rsync -ab --partial --stats --delete --delete-excluded "
+        f'-e "ssh {session.options}" '
+        f'--rsync-path="sudo rsync" '
+        f'--link-dest="{transfer.link_dest}" '
+    )
+    if bwlimit:
+        command += f"--bwlimit={bwlimit} "
+    return command + f'"{transfer.source}" "{transfer.destination}"'
+
+
+def pull_backup_type(
+    session: SSHSession,
+    transfer: Transfer,
+    *,
+    bwlimit: Optional[int] = None,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    base_delay: float = DEFAULT_RETRY_DELAY,
+) -> TransferReport:
+    """
+    Run the rsync for one backup type. Failed attempts are retried with
+    exponential backoff; --partial lets each retry resume interrupted files.
+    """
+    label = f"[{transfer.backup_type}]"
+    command = rsync_command(session, transfer, bwlimit)
+    report = TransferReport(
+        backup_type=transfer.backup_type,
+        source=transfer.source,
+        destination=transfer.destination,
+        status="failed",
+    )
+    print(f"{label} executing: {command}", flush=True)
+
+    start = time.monotonic()
+    for attempt in range(1, max_retries + 1):
+        if attempt > 1:
+            delay = retry_delay(attempt - 1, base_delay)
+            print(f"{label} retrying in {delay:.0f}s", flush=True)
+            time.sleep(delay)
+            report.retries += 1
+        print(f"{label} attempt {attempt}/{max_retries}", flush=True)
+
+        result = subprocess.run(command, shell=True, capture_output=True, text=True)
+        output = result.stdout or ""
+        report.bytes += parse_received_bytes(output)
+        if result.returncode == 0:
+            report.status = "succeeded"
+            for line in output.strip().splitlines():
+                print(f"{label} {line}", flush=True)
+            break
+        print(
+            f"{label} rsync failed (exit {result.returncode}): "
+            f"{(result.stderr or '').strip()}",
+            file=sys.stderr,
+            flush=True,
+        )
+
+    report.seconds = round(time.monotonic() - start, 3)
+    return report
+
 
+def plan_transfers(session: SSHSession, backups_dir: str) -> List[Transfer]:
+    """Load the remote meta data and return one transfer per backup type."""
     print("loading meta data...")
-    remote_host = f"backup@{hostname}"
-    print(f"host address:         {remote_host}")
+    print(f"host address:         {session.remote_host}")
 
     # required: machine id
-    remote_machine_id = run_command(f'ssh "{remote_host}" sha256sum /etc/machine-id')[
-        :64
-    ]
+    remote_machine_id = session.run("sha256sum /etc/machine-id")[:64]
     print(f"remote machine id:    {remote_machine_id}")
 
     general_backup_machine_dir = f"{backups_dir}/{remote_machine_id}/"
@@ -57,35 +199,29 @@ def pull_backups(hostname: str, backups_dir: str) -> None:
 
     # IMPORTANT:
     # This command MUST stay exactly like this to match ssh-wrapper.sh
-    remote_backup_types = run_command(
-        f'ssh "{remote_host}" '
+    remote_backup_types = session.run(
         f'"find {general_backup_machine_dir} -maxdepth 1 -type d -execdir basename {{}} ;"'
     ).splitlines()
     print(f"backup types:          {' '.join(remote_backup_types)}")
 
+    transfers: List[Transfer] = []
     for backup_type in remote_backup_types:
         if backup_type == remote_machine_id:
             continue
 
         print(f"backup type:              {backup_type}")
 
-        general_backup_type_dir = f"{general_backup_machine_dir}{backup_type}/"
-        general_versions_dir = general_backup_type_dir
+        general_versions_dir = f"{general_backup_machine_dir}{backup_type}/"
 
         # Optional: local previous version (may not exist)
-        local_previous_version_dir = ""
-        try:
-            local_previous_version_dir = run_command(
-                f"ls -d {general_versions_dir}* | tail -1",
-                check=False,
-            )
-        except subprocess.CalledProcessError:
-            local_previous_version_dir = ""
+        local_previous_version_dir = run_command(
+            f"ls -d {general_versions_dir}* | tail -1",
+            check=False,
+        )
         print(f"last local backup:      {local_previous_version_dir}")
 
         # Required: remote versions
-        remote_backup_versions = run_command(
-            f'ssh "{remote_host}" '
+        remote_backup_versions = session.run(
             f'"ls -d {backups_dir}/{remote_machine_id}/{backup_type}/*"'
         ).splitlines()
         print(f"remote backup versions:   {' '.join(remote_backup_versions)}")
@@ -94,66 +230,97 @@ def pull_backups(hostname: str, backups_dir: str) -> None:
             remote_backup_versions[-1] if remote_backup_versions else ""
         )
         if not remote_last_backup_dir:
-            raise RuntimeError(f"No remote backups found for {hostname}:{backup_type}")
-
+            raise RuntimeError(
+                f"No remote backups found for {session.remote_host}:{backup_type}"
+            )
         print(f"last remote backup:       {remote_last_backup_dir}")
 
-        remote_source_path = f"{remote_host}:{remote_last_backup_dir}/"
-        print(f"source path:              {remote_source_path}")
-
-        local_backup_destination_path = (
-            f"{backups_dir}/{remote_machine_id}/{backup_type}/"
-            f"{Path(remote_last_backup_dir).name}"
-        )
-        print(f"backup destination:       {local_backup_destination_path}")
-
-        print("creating local backup destination folder...")
-        os.makedirs(local_backup_destination_path, exist_ok=True)
-
-        rsync_command = (
-            f"rsync -abP --delete --delete-excluded "
-            f'--rsync-path="sudo rsync" '
-            f'--link-dest="{local_previous_version_dir}" '
-            f'"{remote_source_path}" "{local_backup_destination_path}"'
+        transfer = Transfer(
+            backup_type=backup_type,
+            source=f"{session.remote_host}:{remote_last_backup_dir}/",
+            destination=(
+                f"{backups_dir}/{remote_machine_id}/{backup_type}/"
+                f"{Path(remote_last_backup_dir).name}"
+            ),
+            link_dest=local_previous_version_dir,
         )
+        print(f"source path:              {transfer.source}")
+        print(f"backup destination:       {transfer.destination}")
+        transfers.append(transfer)
+    return transfers
+
+
+def pull_backups(
+    hostname: str,
+    backups_dir: str,
+    *,
+    jobs: int = DEFAULT_JOBS,
+    bwlimit: Optional[int] = None,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    base_delay: float = DEFAULT_RETRY_DELAY,
+    report_path: Optional[str] = None,
+) -> List[TransferReport]:
+    """
+    Pull the latest backup version of every backup type of `hostname`.
 
-        print("starting backup...")
-        print(f"executing:                {rsync_command}")
-
-        retry_count = 0
-        max_retries = 12
-        retry_delay = 300  # 5 minutes
-        last_retry_start = 0
-        max_retry_duration = 43200  # 12 hours
-
-        rsync_exit_code = 1
-        while retry_count < max_retries:
-            print(f"Retry attempt: {retry_count + 1}")
-
-            if retry_count > 0:
-                current_time = int(time.time())
-                last_retry_duration = current_time - last_retry_start
-                if last_retry_duration >= max_retry_duration:
-                    # keep original semantics
-                    print(
-                        "Last retry took more than 12 hours, increasing max retries to 12."
-                    )
-                    max_retries = 12
+    Up to `jobs` backup types are transferred at the same time; `bwlimit`
+    (KiB/s) is the bandwidth budget shared by those transfers.
+    """
+    backups_dir = backups_dir.rstrip("/")
+    print(f"pulling backups from: {hostname}")
 
-            last_retry_start = int(time.time())
-            rsync_exit_code = os.system(rsync_command)
+    control_dir = tempfile.mkdtemp(prefix="bkp-ssh-")
+    session = SSHSession(f"backup@{hostname}", control_dir)
+    try:
+        transfers = plan_transfers(session, backups_dir)
+        if not transfers:
+            return []
+
+        for transfer in transfers:
+            print(f"creating local backup destination {transfer.destination}...")
+            os.makedirs(transfer.destination, exist_ok=True)
+
+        workers = max(1, min(jobs, len(transfers)))
+        per_transfer_bwlimit = max(1, bwlimit // workers) if bwlimit else None
+        print(f"starting {len(transfers)} transfer(s) with {workers} worker(s)...")
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            reports = list(
+                pool.map(
+                    lambda transfer: pull_backup_type(
+                        session,
+                        transfer,
+                        bwlimit=per_transfer_bwlimit,
+                        max_retries=max_retries,
+                        base_delay=base_delay,
+                    ),
+                    transfers,
+                )
+            )
+    finally:
+        session.close()
+        shutil.rmtree(control_dir, ignore_errors=True)
 
-            if rsync_exit_code == 0:
-                break
+    summary = json.dumps(
+        {"host": hostname, "transfers": [asdict(r) for r in reports]}, indent=2
+    )
+    print(f"transfer report:\n{summary}")
+    if report_path:
+        Path(report_path).write_text(summary + "\n", encoding="utf-8")
+
+    failed = [r.backup_type for r in reports if r.status != "succeeded"]
+    if failed:
+        raise RuntimeError(
+            f"rsync failed after {max_retries} attempts "
+            f"for {hostname}:{','.join(failed)}"
+        )
+    return reports
 
-            retry_count += 1
-            time.sleep(retry_delay)
 
-        if rsync_exit_code != 0:
-            raise RuntimeError(
-                f"rsync failed after {max_retries} attempts "
-                f"for {hostname}:{backup_type}"
-            )
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError("must be > 0")
+    return number
 
 
 def main() -> None:
@@ -170,10 +337,42 @@ def main() -> None:
         help="Remote and local backup root directory "
         "(default: /var/lib/infinito/backup)",
     )
+    parser.add_argument(
+        "--jobs",
+        type=_positive_int,
+        default=DEFAULT_JOBS,
+        help=f"Backup types transferred concurrently (default: {DEFAULT_JOBS})",
+    )
+    parser.add_argument(
+        "--bwlimit",
+        type=_positive_int,
+        default=None,
+        help="Bandwidth budget in KiB/s shared by all concurrent transfers "
+        "(default: unlimited)",
+    )
+    parser.add_argument(
+        "--retries",
+        type=_positive_int,
+        default=DEFAULT_MAX_RETRIES,
+        help=f"rsync attempts per backup type (default: {DEFAULT_MAX_RETRIES})",
+    )
+    parser.add_argument(
+        "--report",
+        default=None,
+        metavar="PATH",
+        help="Write the JSON transfer report to PATH",
+    )
     args = parser.parse_args()
 
     try:
-        pull_backups(args.hostname, args.folder)
+        pull_backups(
+            args.hostname,
+            args.folder,
+            jobs=args.jobs,
+            bwlimit=args.bwlimit,
+            max_retries=args.retries,
+            report_path=args.report,
+        )
         sys.exit(0)
     except Exception as e:
         print(
@@ -2,7 +2,6 @@ import psutil
 import shutil
 import os
 import argparse
-import subprocess
 import time
 
 # Validating arguments
@@ -32,16 +31,49 @@ def print_used_disc_space(backup_dir):
     )
 
 
-def is_directory_used_by_another_process(directory_path):
-    command = "lsof " + directory_path
-    process = subprocess.Popen(
-        [command], stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True
-    )
-    process.communicate()
-    # @See https://stackoverflow.com/questions/29841984/non-zero-exit-code-for-lsof
-    if process.wait() > bool(0):
-        return False
-    return True
+def collect_busy_directories(proc_dir="/proc"):
+    """
+    Scan the open file descriptors and working directories of all
+    processes once and return every directory that contains (or is) one
+    of those paths. A version directory is in use if it is in the set.
+    """
+    own_pid = str(os.getpid())
+    busy = set()
+    try:
+        pids = [entry for entry in os.listdir(proc_dir) if entry.isdigit()]
+    except OSError:
+        return busy
+    for pid in pids:
+        if pid == own_pid:
+            continue
+        pid_dir = os.path.join(proc_dir, pid)
+        links = [os.path.join(pid_dir, "cwd")]
+        fd_dir = os.path.join(pid_dir, "fd")
+        try:
+            links += [os.path.join(fd_dir, fd) for fd in os.listdir(fd_dir)]
+        except OSError:
+            # Process exited or belongs to another user.
+            pass
+        for link in links:
+            try:
+                target = os.readlink(link)
+            except OSError:
+                continue
+            if not target.startswith("/"):
+                # Sockets, pipes and anonymous inodes.
+                continue
+            while target not in busy:
+                busy.add(target)
+                parent = os.path.dirname(target)
+                if parent == target:
+                    break
+                target = parent
+    return busy
+
+
+def is_directory_used_by_another_process(directory_path, busy_directories):
+    # /proc links point to resolved paths; the backup root may be a symlink.
+    return os.path.realpath(directory_path) in busy_directories
 
 
 def isSmallerThenMaximumBackupSize(maximum_backup_size_percent, backup_dir):
@@ -49,7 +81,7 @@ def isSmallerThenMaximumBackupSize(maximum_backup_size_percent, backup_dir):
     return current_disc_usage_percent > maximum_backup_size_percent
 
 
-def isDirectoryDeletable(version, versions, version_path):
+def isDirectoryDeletable(version, versions, version_path, busy_directories):
     print("Checking directory %s ..." % (version_path))
     if version == versions[-1]:
         print(
@@ -58,7 +90,7 @@ def isDirectoryDeletable(version, versions, version_path):
         )
         return False
 
-    if is_directory_used_by_another_process(version_path):
+    if is_directory_used_by_another_process(version_path, busy_directories):
         print("Directory %s is used by another process. Skipped." % (version_path))
         return False
 
@@ -75,39 +107,51 @@ def deleteVersion(version_path, backup_dir):
     print("{:6.2f} %% of drive freed".format(difference_percent))
 
 
-def count_total_application_directories(backup_dir):
-    total_app_directories = 0
-    for host_backup_directory_name in os.listdir(backup_dir):
-        host_backup_directory_path = os.path.join(
-            backup_dir, host_backup_directory_name
-        )
-        total_app_directories += sum(
-            os.path.isdir(os.path.join(host_backup_directory_path, d))
-            for d in os.listdir(host_backup_directory_path)
-        )
-    return total_app_directories
+def _subdirectories(path):
+    return sorted(
+        name for name in os.listdir(path) if os.path.isdir(os.path.join(path, name))
+    )
 
 
-def count_total_version_folders(backup_dir):
-    total_version_folders = 0
-    for host_backup_directory_name in os.listdir(backup_dir):
-        host_backup_directory_path = os.path.join(
-            backup_dir, host_backup_directory_name
+class BackupIndex:
+    """
+    In-memory view of <backup_dir>/<host>/<application>/<version>.
+
+    The tree is listed once per run; deleted versions are removed from the
+    index instead of listing the directories again.
+    """
+
+    def __init__(self, backup_dir):
+        self.backup_dir = backup_dir
+        # {host: {application: [version, ...]}}, versions sorted oldest first
+        self.hosts = {}
+        for host in _subdirectories(backup_dir):
+            host_path = os.path.join(backup_dir, host)
+            self.hosts[host] = {
+                application: _subdirectories(os.path.join(host_path, application))
+                for application in _subdirectories(host_path)
+            }
+
+    def version_path(self, host, application, version):
+        return os.path.join(self.backup_dir, host, application, version)
+
+    def count_application_directories(self):
+        return sum(len(applications) for applications in self.hosts.values())
+
+    def count_version_folders(self):
+        return sum(
+            len(versions)
+            for applications in self.hosts.values()
+            for versions in applications.values()
         )
-        for application_directory in os.listdir(host_backup_directory_path):
-            versions_directory = os.path.join(
-                host_backup_directory_path, application_directory
-            )
-            total_version_folders += sum(
-                os.path.isdir(os.path.join(versions_directory, d))
-                for d in os.listdir(versions_directory)
-            )
-    return total_version_folders
 
+    def remove_version(self, host, application, version):
+        self.hosts[host][application].remove(version)
 
-def average_version_directories_per_application(backup_dir):
-    total_app_directories = count_total_application_directories(backup_dir)
-    total_version_folders = count_total_version_folders(backup_dir)
+
+def average_version_directories_per_application(index):
+    total_app_directories = index.count_application_directories()
+    total_version_folders = index.count_version_folders()
 
     if total_app_directories == 0:
         return 0
@@ -129,30 +173,30 @@ def getAmountOfIteration(versions, average_version_directories_per_application):
     return amount_of_iterations
 
 
-def deleteIteration(backup_dir, average_version_directories_per_application):
-    for host_backup_directory_name in os.listdir(backup_dir):
+def deleteIteration(index, average_version_directories_per_application):
+    busy_directories = collect_busy_directories()
+    for host_backup_directory_name, applications in index.hosts.items():
         print(f"Iterating over host: {host_backup_directory_name}")
-        host_backup_directory_path = os.path.join(
-            backup_dir, host_backup_directory_name
-        )
-        for application_directory in os.listdir(host_backup_directory_path):
+        for application_directory, indexed_versions in applications.items():
             print(f"Iterating over backup application: {application_directory}")
-            # The directory which contains all backup versions of the application
-            versions_directory = (
-                os.path.join(host_backup_directory_path, application_directory) + "/"
-            )
-
-            versions = os.listdir(versions_directory)
-            versions.sort(reverse=False)
+            # Snapshot: deleted versions are dropped from the index below.
+            versions = list(indexed_versions)
             version_iteration = 0
             while version_iteration < getAmountOfIteration(
                 versions, average_version_directories_per_application
             ):
-                print_used_disc_space(backup_dir)
+                print_used_disc_space(index.backup_dir)
                 version = versions[version_iteration]
-                version_path = os.path.join(versions_directory, version)
-                if isDirectoryDeletable(version, versions, version_path):
-                    deleteVersion(version_path, backup_dir)
+                version_path = index.version_path(
+                    host_backup_directory_name, application_directory, version
+                )
+                if isDirectoryDeletable(
+                    version, versions, version_path, busy_directories
+                ):
+                    deleteVersion(version_path, index.backup_dir)
+                    index.remove_version(
+                        host_backup_directory_name, application_directory, version
+                    )
                 version_iteration += 1
 
 
@@ -196,13 +240,14 @@ maximum_backup_size_percent = args.maximum_backup_size_percent
 start_time = time.time()
 time_limit = 3600
 itteration_counter = 1
+backup_index = BackupIndex(backup_dir)
 while isSmallerThenMaximumBackupSize(maximum_backup_size_percent, backup_dir):
     print(f"Delete Iteration: {itteration_counter}")
     if not check_time_left(start_time, time_limit):
         raise TimeLimitExceededException()
 
     average_version_directories = average_version_directories_per_application(
-        backup_dir
+        backup_index
     )
     if average_version_directories <= 0:
         print(
@@ -212,7 +257,7 @@ while isSmallerThenMaximumBackupSize(maximum_backup_size_percent, backup_dir):
     print(
         f"Average version directories per application directory: {average_version_directories}"
     )
-    deleteIteration(backup_dir, average_version_directories)
+    deleteIteration(backup_index, average_version_directories)
     itteration_counter += 1
 
 print_used_disc_space(backup_dir)
@@ -1,10 +1,18 @@
 #!/usr/bin/env python3
 
+import hashlib
+import json
 import os
 import re
+import ssl
 import subprocess
 import sys
 import argparse
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
@@ -17,6 +25,9 @@ LISTEN_443_RE = re.compile(r"^\s*listen\s+[^;]*\b443\b", re.IGNORECASE)
 LISTEN_80_RE = re.compile(r"^\s*listen\s+[^;]*\b80\b", re.IGNORECASE)
 LISTEN_SSL_RE = re.compile(r"^\s*listen\s+[^;]*\bssl\b", re.IGNORECASE)
 
+# Passed domains are re-crawled at least this often, even if unchanged.
+DEFAULT_CACHE_MAX_AGE = 24 * 3600
+
 
 def extract_domains_from_filenames(config_path: str) -> list[str] | None:
     """
@@ -168,6 +179,114 @@ def run_checker(
         return 1
 
 
+def fetch_csp_header(url: str, timeout: float = 10) -> str | None:
+    """
+    Return the Content-Security-Policy header `url` is served with ("" if
+    it has none), or None if the site cannot be reached.
+    """
+    context = None
+    ca_trust_cert_host = os.environ.get("CA_TRUST_CERT_HOST", "").strip()
+    if ca_trust_cert_host and os.path.isfile(ca_trust_cert_host):
+        context = ssl.create_default_context(cafile=ca_trust_cert_host)
+    request = urllib.request.Request(url, method="HEAD")
+    try:
+        with urllib.request.urlopen(request, timeout=timeout, context=context) as r:
+            return r.headers.get("Content-Security-Policy", "")
+    except urllib.error.HTTPError as exc:
+        return exc.headers.get("Content-Security-Policy", "")
+    except (OSError, ValueError):
+        return None
+
+
+def domain_cache_key(conf_path: Path, csp_header: str, checker: str) -> str | None:
+    """Hash of the rendered nginx conf, the served CSP header and the checker."""
+    try:
+        conf = conf_path.read_bytes()
+    except OSError:
+        return None
+    digest = hashlib.sha256()
+    for part in (conf, csp_header.encode(), checker.encode()):
+        digest.update(hashlib.sha256(part).digest())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    JSON file of {domain: {"key", "checked_at"}} for domains whose last
+    check passed. A domain is skipped while its key is unchanged and the
+    entry is younger than `max_age` seconds.
+    """
+
+    def __init__(self, path: str, max_age: float = DEFAULT_CACHE_MAX_AGE) -> None:
+        self.path = Path(path)
+        self.max_age = max_age
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        self.entries: dict = data if isinstance(data, dict) else {}
+
+    def is_fresh(self, domain: str, key: str, now: float) -> bool:
+        entry = self.entries.get(domain)
+        if not isinstance(entry, dict) or entry.get("key") != key:
+            return False
+        return now - float(entry.get("checked_at", 0)) < self.max_age
+
+    def record_pass(self, domain: str, key: str, now: float) -> None:
+        self.entries[domain] = {"key": key, "checked_at": now}
+
+    def forget(self, domain: str) -> None:
+        self.entries.pop(domain, None)
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=str(self.path.parent), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(self.entries, fh, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+def split_shards(urls: list[str], shards: int) -> list[list[str]]:
+    """Distribute `urls` round-robin over at most `shards` non-empty shards."""
+    count = max(1, min(shards, len(urls)))
+    return [urls[i::count] for i in range(count)]
+
+
+def check_urls(
+    urls: list[str],
+    shards: int,
+    isolate_failures: bool,
+    **checker_kwargs,
+) -> dict[str, int]:
+    """
+    Run one checker container per shard in parallel and return the exit
+    code per URL. A URL inherits the code of its shard; with
+    `isolate_failures`, the URLs of a failed shard are re-checked one by
+    one so passing sites are not blamed for a failing neighbour.
+    """
+    parts = split_shards(urls, shards)
+
+    def run(shard_urls: list[str]) -> int:
+        return run_checker(urls=shard_urls, always_pull=False, **checker_kwargs)
+
+    results: dict[str, int] = {}
+    with ThreadPoolExecutor(max_workers=len(parts)) as pool:
+        for shard_urls, rc in zip(parts, pool.map(run, parts)):
+            for url in shard_urls:
+                results[url] = rc
+
+        if isolate_failures:
+            retry = [
+                url
+                for shard_urls in parts
+                if len(shard_urls) > 1 and results[shard_urls[0]] != 0
+                for url in shard_urls
+            ]
+            for url, rc in zip(retry, pool.map(lambda u: run([u]), retry)):
+                results[url] = rc
+    return results
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Extract NGINX domains and build URL(s) (http/https) from listen directives, then run CSP checker (Docker)."
@@ -203,6 +322,23 @@ def main() -> None:
         action="store_true",
         help="Disable --network host for container run (default is to use host network).",
     )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=1,
+        help="Split the domains over this many checker containers running in parallel.",
+    )
+    parser.add_argument(
+        "--cache-file",
+        default=None,
+        help="JSON file remembering passed domains; unchanged domains are not re-crawled.",
+    )
+    parser.add_argument(
+        "--cache-max-age",
+        type=int,
+        default=DEFAULT_CACHE_MAX_AGE,
+        help=f"Re-crawl passed domains after this many seconds (default: {DEFAULT_CACHE_MAX_AGE}).",
+    )
 
     args = parser.parse_args()
 
@@ -219,15 +355,80 @@ def main() -> None:
         print("No URLs built to check.")
         sys.exit(0)
 
-    rc = run_checker(
+    checker_kwargs = dict(
         image=args.image,
-        urls=urls,
         short_mode=bool(args.short),
         ignore_network_blocks_from=list(args.ignore_network_blocks_from or []),
-        always_pull=bool(args.always_pull),
         use_host_network=not bool(args.no_host_network),
     )
-    sys.exit(rc)
+
+    if args.shards <= 1 and not args.cache_file:
+        rc = run_checker(
+            urls=urls, always_pull=bool(args.always_pull), **checker_kwargs
+        )
+        sys.exit(rc)
+
+    domain_by_url = dict(zip(urls, domains))
+    cache = keys = None
+    if args.cache_file:
+        cache = ResultCache(args.cache_file, args.cache_max_age)
+        checker = json.dumps(
+            [
+                args.image,
+                bool(args.short),
+                sorted(checker_kwargs["ignore_network_blocks_from"]),
+            ]
+        )
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            headers = list(pool.map(fetch_csp_header, urls))
+        keys = {
+            url: (
+                domain_cache_key(
+                    Path(args.nginx_config_dir) / f"{domain_by_url[url]}.conf",
+                    header,
+                    checker,
+                )
+                if header is not None
+                else None
+            )
+            for url, header in zip(urls, headers)
+        }
+        now = time.time()
+        unchanged = [
+            url
+            for url in urls
+            if keys[url] and cache.is_fresh(domain_by_url[url], keys[url], now)
+        ]
+        urls = [url for url in urls if url not in unchanged]
+        print(f"Skipping {len(unchanged)} unchanged domain(s), checking {len(urls)}.")
+
+    if not urls:
+        sys.exit(0)
+
+    if args.always_pull:
+        subprocess.run(["container", "pull", args.image], check=False)
+
+    results = check_urls(
+        urls,
+        args.shards,
+        isolate_failures=cache is not None,
+        **checker_kwargs,
+    )
+
+    if cache is not None:
+        now = time.time()
+        for url, rc in results.items():
+            if rc == 0 and keys[url]:
+                cache.record_pass(domain_by_url[url], keys[url], now)
+            else:
+                cache.forget(domain_by_url[url])
+        cache.save()
+
+    failed = [url for url in urls if results[url] != 0]
+    if failed:
+        print(f"CSP check failed for: {' '.join(failed)}", file=sys.stderr)
+        sys.exit(results[failed[0]])
+    sys.exit(0)
 
 
 if __name__ == "__main__":
@@ -3,15 +3,113 @@
 Ultra-thin checker: consume a JSON mapping of {domain: [expected_status_codes]}
 and verify HTTP HEAD responses. All mapping logic is done in the filter
 `web_health_expectations`.
+
+Domains are probed concurrently over one pooled session. Per-domain latency
+and TLS handshake time can be exported in the Prometheus textfile format.
 """
 
 import argparse
 import json
 import os
 import sys
-from typing import Dict, List
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+DEFAULT_WORKERS = 8
+TIMEOUT_SECONDS = 10
+METRIC_PREFIX = "infinito_web_health"
+
+# Connection timings of the probe running in the current thread.
+_timings = threading.local()
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def _new_conn(self):
+        start = time.monotonic()
+        sock = super()._new_conn()
+        _timings.tcp_connect = time.monotonic() - start
+        return sock
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def _new_conn(self):
+        start = time.monotonic()
+        sock = super()._new_conn()
+        _timings.tcp_connect = time.monotonic() - start
+        return sock
+
+    def connect(self):
+        start = time.monotonic()
+        super().connect()
+        # connect() = TCP connect (timed in _new_conn) + TLS handshake
+        _timings.tls_handshake = max(
+            0.0, time.monotonic() - start - (_timings.tcp_connect or 0.0)
+        )
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections record TCP connect and TLS handshake time."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+@dataclass
+class ProbeResult:
+    domain: str
+    expected: List[int]
+    status_code: Optional[int] = None
+    # Wall time of the HEAD request including connect and TLS handshake
+    latency_seconds: Optional[float] = None
+    tcp_connect_seconds: Optional[float] = None
+    tls_handshake_seconds: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return (
+            self.error is None
+            and bool(self.expected)
+            and (self.status_code in self.expected)
+        )
+
+    def message(self) -> str:
+        if self.error is not None:
+            return f"{self.domain}: error due to {self.error}"
+        latency = f" ({self.latency_seconds * 1000:.0f} ms)"
+        if self.ok:
+            return f"{self.domain}: OK{latency}"
+        if not self.expected:
+            # If somehow empty list slipped through, treat as failure to be explicit
+            return (
+                f"{self.domain}: ERROR: No expectations provided. "
+                f"Got {self.status_code}.{latency}"
+            )
+        return (
+            f"{self.domain}: ERROR: Expected {self.expected}. "
+            f"Got {self.status_code}.{latency}"
+        )
 
 
 def parse_args(argv=None):
@@ -27,6 +125,18 @@ def parse_args(argv=None):
     p.add_argument(
         "--expectations", required=True, help='JSON STRING: {"domain": [codes], ...}'
     )
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Domains probed concurrently (default: {DEFAULT_WORKERS})",
+    )
+    p.add_argument(
+        "--prometheus-textfile",
+        default=None,
+        metavar="PATH",
+        help="Also write the results as Prometheus textfile-collector metrics to PATH",
+    )
     return p.parse_args(argv)
 
 
@@ -50,6 +160,95 @@ def _parse_json_mapping(name: str, value: str) -> Dict[str, List[int]]:
     return clean
 
 
+def make_session(workers: int) -> requests.Session:
+    session = requests.Session()
+    adapter = TimedAdapter(pool_connections=max(1, workers), pool_maxsize=1)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def probe(
+    session: requests.Session, protocol: str, domain: str, expected: List[int], verify
+) -> ProbeResult:
+    result = ProbeResult(domain=domain, expected=expected)
+    _timings.tcp_connect = None
+    _timings.tls_handshake = None
+    start = time.monotonic()
+    try:
+        r = session.head(
+            f"{protocol}://{domain}",
+            allow_redirects=False,
+            timeout=TIMEOUT_SECONDS,
+            verify=verify,
+        )
+        result.status_code = r.status_code
+    except requests.RequestException as e:
+        result.error = str(e)
+    result.latency_seconds = time.monotonic() - start
+    result.tcp_connect_seconds = _timings.tcp_connect
+    result.tls_handshake_seconds = _timings.tls_handshake
+    return result
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_metrics(results: List[ProbeResult], timestamp: float) -> str:
+    series = [
+        (
+            "up",
+            "1 if the domain answered with an expected status code.",
+            lambda r: 1 if r.ok else 0,
+        ),
+        (
+            "status_code",
+            "HTTP status code of the HEAD probe (0 on error).",
+            lambda r: r.status_code or 0,
+        ),
+        (
+            "latency_seconds",
+            "Duration of the HEAD probe.",
+            lambda r: r.latency_seconds,
+        ),
+        (
+            "tcp_connect_seconds",
+            "Duration of the TCP connect.",
+            lambda r: r.tcp_connect_seconds,
+        ),
+        (
+            "tls_handshake_seconds",
+            "Duration of the TLS handshake.",
+            lambda r: r.tls_handshake_seconds,
+        ),
+    ]
+    lines: List[str] = []
+    for name, help_text, value_of in series:
+        metric = f"{METRIC_PREFIX}_{name}"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} gauge")
+        for r in results:
+            value = value_of(r)
+            if value is not None:
+                lines.append(f'{metric}{{domain="{_label(r.domain)}"}} {value:g}')
+    metric = f"{METRIC_PREFIX}_last_run_timestamp_seconds"
+    lines.append(f"# HELP {metric} Unix time of the last health check run.")
+    lines.append(f"# TYPE {metric} gauge")
+    lines.append(f"{metric} {timestamp:.0f}")
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path: str, content: str) -> None:
+    # Write and rename so the collector never reads a partial file.
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".web-health-", suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+        fh.write(content)
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, path)
+
+
 def main(argv=None) -> int:
     args = parse_args(argv)
     expectations = _parse_json_mapping("expectations", args.expectations)
@@ -63,27 +262,34 @@ def main(argv=None) -> int:
             return 1
         verify = ca_trust_cert_host
 
-    errors = 0
-    for domain in sorted(expectations.keys()):
-        expected = expectations[domain] or []
-        url = f"{args.web_protocol}://{domain}"
-        try:
-            r = requests.head(url, allow_redirects=False, timeout=10, verify=verify)
-            if expected and r.status_code in expected:
-                print(f"{domain}: OK")
-            elif not expected:
-                # If somehow empty list slipped through, treat as failure to be explicit
-                print(
-                    f"{domain}: ERROR: No expectations provided. Got {r.status_code}."
+    workers = max(1, args.workers)
+    domains = sorted(expectations.keys())
+    with make_session(workers) as session:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(
+                pool.map(
+                    lambda domain: probe(
+                        session,
+                        args.web_protocol,
+                        domain,
+                        expectations[domain] or [],
+                        verify,
+                    ),
+                    domains,
                 )
-                errors += 1
-            else:
-                print(f"{domain}: ERROR: Expected {expected}. Got {r.status_code}.")
-                errors += 1
-        except requests.RequestException as e:
-            print(f"{domain}: error due to {e}")
+            )
+
+    errors = 0
+    for result in results:
+        print(result.message())
+        if not result.ok:
             errors += 1
 
+    if args.prometheus_textfile:
+        write_textfile(
+            args.prometheus_textfile, prometheus_metrics(results, time.time())
+        )
+
     if errors:
         print(
             f"Warning: {errors} domains responded with an unexpected https status code."
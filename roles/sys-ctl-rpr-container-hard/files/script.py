@@ -1,8 +1,35 @@
 #!/usr/bin/env python3
+"""
+Hard restart (down + up -d) of the compose projects below a parent directory.
+
+Projects are restarted in waves: a project only starts once every project it
+runs after (--order, {project: [projects]}) has finished. Within a wave up to
+--jobs projects are restarted concurrently. With --health-timeout a project
+counts as done only once all its containers are running and healthy.
+"""
+
 import os
 import sys
+import json
+import time
 import subprocess
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+DEFAULT_JOBS = 1
+HEALTH_POLL_INTERVAL = 5
+
+
+@dataclass
+class RestartResult:
+    project: str
+    path: str
+    # "restarted", "unhealthy" (health timeout) or "failed"
+    status: str
+    seconds: float = 0.0
+    error: Optional[str] = None
 
 
 def run(cmd: list[str], cwd: str) -> None:
@@ -13,48 +40,152 @@ def hard_restart_docker_services(dir_path: str) -> None:
     """
     Perform a hard restart of compose services in the given directory
     using compose wrapper (auto env + overrides).
+    Raises CalledProcessError if down or up fails.
     """
-    try:
-        abs_dir = os.path.abspath(dir_path)
-        project = os.path.basename(abs_dir)
-
-        print(f"Performing hard restart for compose project '{project}' in: {abs_dir}")
-
-        # down + up -d (wrapper resolves env + overrides automatically)
-        run(
-            ["compose", "--chdir", abs_dir, "--project", project, "down"],
-            cwd=abs_dir,
-        )
-        run(
-            ["compose", "--chdir", abs_dir, "--project", project, "up", "-d"],
-            cwd=abs_dir,
-        )
-
-        print(f"Hard restart completed successfully in: {abs_dir}")
-    except subprocess.CalledProcessError as e:
-        print(f"Error during hard restart in {dir_path}: {e}", file=sys.stderr)
-        sys.exit(1)
+    abs_dir = os.path.abspath(dir_path)
+    project = os.path.basename(abs_dir)
 
+    print(f"Performing hard restart for compose project '{project}' in: {abs_dir}")
 
-def main() -> None:
-    parser = argparse.ArgumentParser(
-        description="Restart compose services in subdirectories (with compose wrapper)."
+    # down + up -d (wrapper resolves env + overrides automatically)
+    run(
+        ["compose", "--chdir", abs_dir, "--project", project, "down"],
+        cwd=abs_dir,
     )
-    parser.add_argument(
-        "parent_directory",
-        help="Path to the parent directory containing compose projects",
+    run(
+        ["compose", "--chdir", abs_dir, "--project", project, "up", "-d"],
+        cwd=abs_dir,
     )
-    parser.add_argument(
-        "--only", nargs="+", help="Restart only the specified subdirectories (by name)"
+
+    print(f"Hard restart completed successfully in: {abs_dir}")
+
+
+def container_states(project: str) -> List[str]:
+    """Return the `docker ps` status line of every container of `project`."""
+    out = subprocess.run(
+        [
+            "container",
+            "ps",
+            "-a",
+            "--filter",
+            f"label=com.docker.compose.project={project}",
+            "--format",
+            "{{.Status}}",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return [line.strip() for line in out.splitlines() if line.strip()]
+
+
+def is_settled(status: str) -> bool:
+    """
+    True for containers that are up without a pending or failed health
+    check, and for one-shot containers that exited successfully.
+    """
+    if status.startswith("Exited (0)"):
+        return True
+    if not status.startswith("Up"):
+        return False
+    return "(health: starting)" not in status and "(unhealthy)" not in status
+
+
+def wait_until_healthy(project: str, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while True:
+        states = container_states(project)
+        if states and all(is_settled(s) for s in states):
+            return True
+        if time.monotonic() >= deadline:
+            print(f"Project '{project}' not healthy after {timeout:.0f}s: {states}")
+            return False
+        time.sleep(HEALTH_POLL_INTERVAL)
+
+
+def restart_project(dir_path: str, health_timeout: float = 0) -> RestartResult:
+    abs_dir = os.path.abspath(dir_path)
+    result = RestartResult(
+        project=os.path.basename(abs_dir), path=abs_dir, status="restarted"
     )
-    args = parser.parse_args()
+    start = time.monotonic()
+    try:
+        hard_restart_docker_services(dir_path)
+        if health_timeout > 0 and not wait_until_healthy(
+            result.project, health_timeout
+        ):
+            result.status = "unhealthy"
+    except subprocess.CalledProcessError as e:
+        print(f"Error during hard restart in {dir_path}: {e}", file=sys.stderr)
+        result.status = "failed"
+        result.error = str(e)
+    result.seconds = round(time.monotonic() - start, 1)
+    return result
 
-    parent_directory = args.parent_directory
 
-    if not os.path.isdir(parent_directory):
-        print(f"Error: {parent_directory} is not a valid directory.", file=sys.stderr)
-        sys.exit(1)
+def restart_waves(projects: List[str], order: Dict[str, List[str]]) -> List[List[str]]:
+    """
+    Group `projects` (directory names) into waves along the `order` edges.
+    Edges to projects that are not being restarted are ignored. A cycle
+    drops the ordering and restarts everything in one wave.
+    """
+    pending = {
+        project: {
+            dep for dep in order.get(project, []) if dep in projects and dep != project
+        }
+        for project in projects
+    }
+    waves: List[List[str]] = []
+    while pending:
+        wave = sorted(project for project, deps in pending.items() if not deps)
+        if not wave:
+            print(
+                "Warning: run_after cycle between "
+                + ", ".join(sorted(pending))
+                + "; ignoring the order."
+            )
+            return [sorted(projects)]
+        waves.append(wave)
+        for project in wave:
+            del pending[project]
+        for deps in pending.values():
+            deps.difference_update(wave)
+    return waves
+
 
+def restart_all(
+    parent_directory: str,
+    projects: List[str],
+    *,
+    jobs: int = DEFAULT_JOBS,
+    order: Optional[Dict[str, List[str]]] = None,
+    health_timeout: float = 0,
+) -> List[RestartResult]:
+    results: List[RestartResult] = []
+    waves = restart_waves(projects, order or {})
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        for number, wave in enumerate(waves, start=1):
+            if len(waves) > 1:
+                print(f"Restarting wave {number}/{len(waves)}: {', '.join(wave)}")
+            results.extend(
+                pool.map(
+                    lambda name: restart_project(
+                        os.path.join(parent_directory, name), health_timeout
+                    ),
+                    wave,
+                )
+            )
+    return results
+
+
+def print_summary(results: List[RestartResult]) -> None:
+    print("Restart durations:")
+    for r in sorted(results, key=lambda r: r.seconds, reverse=True):
+        print(f"  {r.project:<40} {r.status:<10} {r.seconds:>8.1f}s")
+
+
+def find_projects(parent_directory: str, only: Optional[List[str]]) -> List[str]:
+    projects = []
     for dir_entry in os.scandir(parent_directory):
         if not dir_entry.is_dir():
             continue
@@ -68,12 +199,85 @@ def main() -> None:
             print(f"No compose.yml found in {dir_path}. Skipping.")
             continue
 
-        if args.only and dir_name not in args.only:
+        if only and dir_name not in only:
             print(f"Skipping {dir_name} (not in --only list).")
             continue
 
-        hard_restart_docker_services(dir_path)
+        projects.append(dir_name)
+    return projects
 
+
+def _parse_order(value: str) -> Dict[str, List[str]]:
+    try:
+        obj = json.loads(value)
+    except json.JSONDecodeError as e:
+        raise argparse.ArgumentTypeError(f"must be a valid JSON string: {e}")
+    if not isinstance(obj, dict):
+        raise argparse.ArgumentTypeError("must be a JSON object (mapping)")
+    return {str(k): [str(d) for d in (v or [])] for k, v in obj.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Restart compose services in subdirectories (with compose wrapper)."
+    )
+    parser.add_argument(
+        "parent_directory",
+        help="Path to the parent directory containing compose projects",
+    )
+    parser.add_argument(
+        "--only", nargs="+", help="Restart only the specified subdirectories (by name)"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"Projects restarted concurrently (default: {DEFAULT_JOBS})",
+    )
+    parser.add_argument(
+        "--order",
+        type=_parse_order,
+        default=None,
+        help='JSON STRING: {"project": ["projects it restarts after"], ...}',
+    )
+    parser.add_argument(
+        "--health-timeout",
+        type=float,
+        default=0,
+        help="Seconds to wait for the containers of a project to become healthy "
+        "(default: 0, do not wait)",
+    )
+    parser.add_argument(
+        "--report",
+        default=None,
+        metavar="PATH",
+        help="Write the JSON restart summary to PATH",
+    )
+    args = parser.parse_args()
+
+    parent_directory = args.parent_directory
+
+    if not os.path.isdir(parent_directory):
+        print(f"Error: {parent_directory} is not a valid directory.", file=sys.stderr)
+        sys.exit(1)
+
+    results = restart_all(
+        parent_directory,
+        find_projects(parent_directory, args.only),
+        jobs=args.jobs,
+        order=args.order,
+        health_timeout=args.health_timeout,
+    )
+    print_summary(results)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as fh:
+            json.dump([asdict(r) for r in results], fh, indent=2)
+            fh.write("\n")
+
+    failed = [r.project for r in results if r.status != "restarted"]
+    if failed:
+        print(f"Hard restart failed for: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
     print("Finished hard restart procedure.")
 
 
@@ -23,7 +23,7 @@ import subprocess
 import time
 import os
 import argparse
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 
 # ---------------------------
@@ -108,14 +108,11 @@ def wait_while_manipulation_running(
 
     start = time.time()
     while True:
-        any_active = False
-        for svc in services:
-            res = subprocess.run(f"systemctl is-active --quiet {svc}", shell=True)
-            if res.returncode == 0:
-                any_active = True
-                break
-
-        if any_active:
+        # One query for all services: is-active succeeds if any unit is active.
+        res = subprocess.run(
+            f"systemctl is-active --quiet {' '.join(services)}", shell=True
+        )
+        if res.returncode == 0:
             elapsed = time.time() - start
             if timeout and elapsed >= timeout:
                 print(
@@ -164,11 +161,115 @@ def get_compose_project_info(container: str) -> Tuple[str, str]:
     return project, workdir
 
 
+INSPECT_FIELDS = (
+    "{{ .Name }}",
+    '{{ index .Config.Labels "com.docker.compose.project" }}',
+    '{{ index .Config.Labels "com.docker.compose.project.working_dir" }}',
+    '{{ index .Config.Labels "com.docker.compose.service" }}',
+)
+
+
+def _label_value(value: str) -> str:
+    value = value.strip()
+    return "" if value == "<no value>" else value
+
+
+def inspect_compose_labels(containers: List[str]) -> Dict[str, Tuple[str, str, str]]:
+    """
+    Read project, working dir and service label of all `containers` with a
+    single `container inspect`. Containers without both project labels or
+    missing from the output are left out; callers fall back to
+    get_compose_project_info() for them.
+    """
+    if not containers:
+        return {}
+    try:
+        lines = print_bash(
+            f"container inspect -f '{chr(9).join(INSPECT_FIELDS)}' "
+            + list_to_string(containers)
+        )
+    except Exception as e:
+        # e.g. a container vanished between `ps` and `inspect`
+        print(f"Batched container inspect failed: {e}")
+        return {}
+
+    labels: Dict[str, Tuple[str, str, str]] = {}
+    for line in lines:
+        fields = line.split("\t")
+        if len(fields) != len(INSPECT_FIELDS):
+            continue
+        name, project, workdir, service = (_label_value(f) for f in fields)
+        if project and workdir:
+            labels[name.lstrip("/")] = (project, workdir, service)
+    return labels
+
+
+def group_by_project(
+    containers: List[str],
+) -> Tuple[Dict[Tuple[str, str], List[str]], int]:
+    """
+    Map (project, working_dir) to the compose services to restart. An empty
+    service list means the whole project. Returns the groups in first-seen
+    order and the number of containers whose labels could not be read.
+    """
+    labels = inspect_compose_labels(containers)
+    groups: Dict[Tuple[str, str], List[str]] = {}
+    errors = 0
+    for container in containers:
+        if container in labels:
+            project, workdir, service = labels[container]
+        else:
+            try:
+                project, workdir = get_compose_project_info(container)
+            except Exception as e:
+                print(f"Error reading compose labels for {container}: {e}")
+                errors += 1
+                continue
+            service = ""
+
+        services = groups.setdefault((project, workdir), [])
+        if not service:
+            # Unknown service: restart the whole project.
+            services.append("")
+        elif service not in services:
+            services.append(service)
+
+    return {
+        key: ([] if "" in services else services) for key, services in groups.items()
+    }, errors
+
+
+def restart_project(project: str, project_path: str, services: List[str]) -> int:
+    """Restart `services` (all if empty) of one project; returns the error count."""
+    try:
+        print(
+            "Restarting unhealthy/exited containers via project:",
+            project_path,
+            list_to_string(services) or "(all services)",
+        )
+        print_bash(
+            compose_cmd(list_to_string(["restart", *services]), project_path, project)
+        )
+    except Exception as e:
+        if "port is already allocated" in str(e):
+            print("Detected port allocation problem. Executing recovery steps...")
+            try:
+                print_bash(compose_cmd("down", project_path, project))
+                print_bash("systemctl restart docker")
+                print_bash(compose_cmd("up -d", project_path, project))
+            except Exception as e2:
+                print("Unhandled exception during recovery:", e2)
+                return 1
+        else:
+            print("Unhandled exception during restart:", e)
+            return 1
+    return 0
+
+
 def main(
     base_directory: str, manipulation_services: List[str], timeout: Optional[int]
 ) -> int:
     _ = base_directory  # unused in STRICT label mode
-    errors = 0
     wait_while_manipulation_running(
         manipulation_services, waiting_time=600, timeout=timeout
     )
@@ -179,44 +280,22 @@ def main(
     exited_container_names = print_bash(
         "container ps --filter label=com.docker.compose.project --filter status=exited --format '{{.Names}}'"
     )
-    failed_containers = unhealthy_container_names + exited_container_names
-
-    for container in failed_containers:
-        try:
-            project, workdir = get_compose_project_info(container)
-        except Exception as e:
-            print(f"Error reading compose labels for {container}: {e}")
-            errors += 1
-            continue
+    failed_containers = list(
+        dict.fromkeys(unhealthy_container_names + exited_container_names)
+    )
 
+    groups, errors = group_by_project(failed_containers)
+    for (project, workdir), services in groups.items():
         compose_file_path = os.path.join(workdir, "compose.yml")
         if not os.path.isfile(compose_file_path):
             # STRICT: we only trust labels; if file not there, error out.
             print(
-                f"Error: compose.yml not found at {compose_file_path} for container {container}"
+                f"Error: compose.yml not found at {compose_file_path} for project {project}"
             )
             errors += 1
             continue
 
-        project_path = os.path.dirname(compose_file_path)
-        try:
-            print(
-                "Restarting unhealthy/exited container via project:", compose_file_path
-            )
-            print_bash(compose_cmd("restart", project_path, project))
-        except Exception as e:
-            if "port is already allocated" in str(e):
-                print("Detected port allocation problem. Executing recovery steps...")
-                try:
-                    print_bash(compose_cmd("down", project_path, project))
-                    print_bash("systemctl restart docker")
-                    print_bash(compose_cmd("up -d", project_path, project))
-                except Exception as e2:
-                    print("Unhandled exception during recovery:", e2)
-                    errors += 1
-            else:
-                print("Unhandled exception during restart:", e)
-                errors += 1
+        errors += restart_project(project, os.path.dirname(compose_file_path), services)
 
     print("Finished restart procedure.")
     return errors
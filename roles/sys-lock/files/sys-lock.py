@@ -1,11 +1,32 @@
 #!/usr/bin/env python3
+"""
+Block until none of the given systemd units is active or activating.
+
+All unit states are read with one `systemctl show` per round. If jeepney is
+installed and the system bus is reachable, the lock sleeps until systemd
+signals a state change of one of the units; otherwise it polls every
+BREAK_TIME_SECONDS.
+"""
+
 import argparse
 import subprocess
 import time
 from datetime import datetime
 
+try:
+    from jeepney import DBusAddress, HeaderFields, MatchRule, message_bus
+    from jeepney import new_method_call
+    from jeepney.io.blocking import open_dbus_connection
+except ImportError:  # pragma: no cover - depends on the host
+    open_dbus_connection = None
+
 # Global variable definition
 BREAK_TIME_SECONDS = 5
+# Re-read the states at least this often while waiting for D-Bus signals,
+# in case a signal was missed.
+SIGNAL_RECHECK_SECONDS = 60
+ACTIVE_STATES = ("active", "activating")
+UNIT_PATH_PREFIX = "/org/freedesktop/systemd1/unit"
 
 
 class AttemptException(Exception):
@@ -30,24 +51,36 @@ def parse_time_to_seconds(time_str):
     return int(number) * units[unit]
 
 
-def check_service_active(service_name):
+def query_unit_states(services):
     """
-    Check if a systemd service is currently active or activating.
+    Return {service: ActiveState} for all services with one `systemctl show`.
+    systemctl prints one block per unit, in argument order.
     """
+    if not services:
+        return {}
     result = subprocess.run(
-        ["systemctl", "is-active", service_name], stdout=subprocess.PIPE
+        ["systemctl", "show", "--property=ActiveState", "--", *services],
+        stdout=subprocess.PIPE,
     )
-    service_status = result.stdout.decode("utf-8").strip()
-    is_active = service_status in ["active", "activating"]
-    print(f"Service {service_name} is {'active' if is_active else 'not active'}.")
-    return is_active
+    blocks = result.stdout.decode("utf-8").strip().split("\n\n")
+    states = {}
+    for service, block in zip(services, blocks):
+        state = block.strip().partition("=")[2]
+        states[service] = state or "unknown"
+    for service in services[len(blocks) :]:
+        states[service] = "unknown"
+    return states
 
 
-def check_any_service_active(services):
+def active_services(services):
     """
-    Check if any service in a given list is active or activating.
+    Return the services in a given list that are active or activating.
     """
-    return any(check_service_active(service) for service in services)
+    states = query_unit_states(services)
+    active = [service for service in services if states[service] in ACTIVE_STATES]
+    for service in active:
+        print(f"Service {service} is {states[service]}.")
+    return active
 
 
 def filter_services(services, ignored_services):
@@ -57,26 +90,124 @@ def filter_services(services, ignored_services):
     return [service for service in services if service not in ignored_services]
 
 
-def wait_for_all_services_to_stop(filtered_services, max_attempts, attempt):
+def unit_object_path(unit):
     """
-    Wait until all services in the list have stopped, with a maximum number of attempts.
+    D-Bus object path of a systemd unit (sd_bus_path_encode): every byte
+    except letters, and digits after the first position, becomes _xx.
     """
-    for service in filtered_services:
-        while check_service_active(service):
-            attempt += 1
-            if attempt > max_attempts:
-                raise AttemptException(
-                    f"Maximum attempts ({max_attempts}) reached. Exiting."
-                )
-            print(
-                f"{datetime.now().isoformat()}#{attempt}/{max_attempts}: Waiting for {BREAK_TIME_SECONDS} seconds for {service} to stop..."
+    escaped = "".join(
+        chr(b)
+        if chr(b).isascii() and (chr(b).isalpha() or (i > 0 and chr(b).isdigit()))
+        else f"_{b:02x}"
+        for i, b in enumerate(unit.encode("utf-8"))
+    )
+    return f"{UNIT_PATH_PREFIX}/{escaped}"
+
+
+class UnitSignals:
+    """
+    Wakes up on PropertiesChanged signals of the given units on the system
+    bus. Use open() to get an instance; it returns None without D-Bus.
+    """
+
+    def __init__(self, connection, units):
+        self.connection = connection
+        self.paths = {unit_object_path(unit) for unit in units}
+        self.rule = MatchRule(
+            type="signal",
+            interface="org.freedesktop.DBus.Properties",
+            member="PropertiesChanged",
+            path_namespace=UNIT_PATH_PREFIX,
+        )
+        # Register the filter first so no signal after AddMatch is dropped.
+        self._filter = connection.filter(self.rule, bufsize=64)
+        connection.send_and_get_reply(message_bus.AddMatch(self.rule))
+        # systemd only emits unit signals while a client is subscribed.
+        connection.send_and_get_reply(
+            new_method_call(
+                DBusAddress(
+                    "/org/freedesktop/systemd1",
+                    bus_name="org.freedesktop.systemd1",
+                    interface="org.freedesktop.systemd1.Manager",
+                ),
+                "Subscribe",
             )
-            time.sleep(BREAK_TIME_SECONDS)
-    return attempt
+        )
+
+    @classmethod
+    def open(cls, units):
+        if open_dbus_connection is None:
+            print("jeepney is not installed; polling for unit states.")
+            return None
+        connection = None
+        try:
+            connection = open_dbus_connection(bus="SYSTEM")
+            return cls(connection, units)
+        except Exception as e:
+            if connection is not None:
+                connection.close()
+            print(f"System bus unavailable ({e}); polling for unit states.")
+            return None
 
+    def wait(self, timeout):
+        """Return True once one of the units changed, False on timeout."""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                msg = self.connection.recv_until_filtered(
+                    self._filter.queue, timeout=remaining
+                )
+            except TimeoutError:
+                return False
+            if msg.header.fields.get(HeaderFields.path) in self.paths:
+                return True
+
+    def close(self):
+        self._filter.close()
+        self.connection.close()
 
-def get_max_attempts(timeout_sec):
-    return timeout_sec // BREAK_TIME_SECONDS
+
+def wait_for_all_services_to_stop(filtered_services, timeout_sec, signals=None):
+    """
+    Wait until all services in the list have stopped, at most timeout_sec.
+    Returns {service: seconds waited for it}.
+    """
+    start = time.monotonic()
+    deadline = start + timeout_sec
+    waited = {service: 0.0 for service in filtered_services}
+    attempt = 0
+    active = active_services(filtered_services)
+    while active:
+        now = time.monotonic()
+        for service in active:
+            waited[service] = now - start
+        if now >= deadline:
+            raise AttemptException(
+                f"Timeout ({timeout_sec}s) reached while waiting for "
+                f"{', '.join(active)}. Exiting."
+            )
+        attempt += 1
+        if signals is not None:
+            print(
+                f"{datetime.now().isoformat()}#{attempt}: Waiting for a state "
+                f"change of {', '.join(active)}..."
+            )
+            signals.wait(min(SIGNAL_RECHECK_SECONDS, deadline - now))
+        else:
+            print(
+                f"{datetime.now().isoformat()}#{attempt}: Waiting for "
+                f"{BREAK_TIME_SECONDS} seconds for {', '.join(active)} to stop..."
+            )
+            time.sleep(min(BREAK_TIME_SECONDS, deadline - now))
+        still_active = active_services(filtered_services)
+        now = time.monotonic()
+        for service in set(active) - set(still_active):
+            waited[service] = now - start
+        active = still_active
+    return waited
 
 
 def main(services, ignored_services, timeout_sec):
@@ -90,12 +221,18 @@ def main(services, ignored_services, timeout_sec):
 
     print("Waiting for services to stop.")
 
-    attempt = 0
-    max_attempts = get_max_attempts(timeout_sec)
-    while check_any_service_active(filtered_services):
-        attempt = wait_for_all_services_to_stop(
-            filtered_services, max_attempts, attempt
-        )
+    signals = None
+    if active_services(filtered_services):
+        signals = UnitSignals.open(filtered_services)
+    try:
+        waited = wait_for_all_services_to_stop(filtered_services, timeout_sec, signals)
+    finally:
+        if signals is not None:
+            signals.close()
+
+    for service, seconds in sorted(waited.items(), key=lambda i: -i[1]):
+        if seconds > 0:
+            print(f"Waited {seconds:.1f}s for {service}.")
     print("All required services have stopped.")
 
 
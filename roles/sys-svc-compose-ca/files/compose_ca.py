@@ -12,8 +12,11 @@ import re
 import shlex
 import subprocess
 import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
 
 # This script is deployed to the target host via `ansible.builtin.copy`
 # (see roles/sys-svc-compose-ca/tasks/01_core.yml). The deploy target
@@ -23,6 +26,10 @@ from typing import Any, Dict, List, Tuple
 # `tests/lint/repository/test_no_direct_yaml_calls.py` honours.
 import yaml
 
+DEFAULT_JOBS = 4
+# Entries of images that were not seen for this long are dropped on save.
+IMAGE_CACHE_MAX_AGE = 30 * 24 * 3600
+
 
 def die(msg: str, code: int = 2) -> "None":
     print(f"[compose_ca] {msg}", file=sys.stderr)
@@ -194,25 +201,21 @@ def escape_compose_vars(argv: List[str]) -> List[str]:
     return [s.replace("$", "$$") for s in argv]
 
 
-def docker_image_inspect(
-    image: str, *, cwd: Path, env: Dict[str, str]
-) -> Tuple[List[str], List[str]]:
-    """
-    Return (Entrypoint, Cmd) for the given image in exec-form list[str].
-    """
-    rc, out, err = run(["docker", "image", "inspect", image], cwd=cwd, env=env)
-    if rc != 0:
-        die(f"container image inspect failed for '{image}' (rc={rc}): {err.strip()}")
+class ImageInfo(NamedTuple):
+    id: str
+    entrypoint: List[str]
+    cmd: List[str]
 
-    try:
-        data = json.loads(out)
-    except json.JSONDecodeError as e:
-        die(f"container image inspect returned invalid JSON for '{image}': {e}")
 
-    if not isinstance(data, list) or not data:
-        die(f"container image inspect returned empty result for '{image}'")
+def _image_info(image: str, data: Any) -> ImageInfo:
+    """
+    Validate one `docker image inspect` object and return its Id,
+    Entrypoint and Cmd in exec-form list[str].
+    """
+    if not isinstance(data, dict):
+        die(f"container image inspect returned an invalid entry for '{image}'")
 
-    cfg = data[0].get("Config")
+    cfg = data.get("Config")
     if cfg is None:
         cfg = {}
     if not isinstance(cfg, dict):
@@ -235,7 +238,108 @@ def docker_image_inspect(
     else:
         die(f"Unexpected Cmd type for image '{image}': {type(cmd)}")
 
-    return ep_list, cmd_list
+    return ImageInfo(id=str(data.get("Id") or ""), entrypoint=ep_list, cmd=cmd_list)
+
+
+def docker_images_inspect(
+    images: List[str], *, cwd: Path, env: Dict[str, str]
+) -> Dict[str, ImageInfo]:
+    """
+    Inspect all `images` with one `docker image inspect` and return
+    {image: ImageInfo} for the images that exist locally.
+
+    docker prints one object per argument, in order, but skips missing
+    images and then exits non-zero. In that case the images are inspected
+    one by one so every result can be attributed to its reference.
+    """
+    images = list(dict.fromkeys(i for i in images if i))
+    if not images:
+        return {}
+
+    rc, out, _err = run(["docker", "image", "inspect", *images], cwd=cwd, env=env)
+    if rc == 0:
+        try:
+            data = json.loads(out)
+        except json.JSONDecodeError as e:
+            die(f"container image inspect returned invalid JSON: {e}")
+        if not isinstance(data, list) or len(data) != len(images):
+            die(
+                f"container image inspect returned {len(data) if isinstance(data, list) else 0} "
+                f"results for {len(images)} images"
+            )
+        return {image: _image_info(image, d) for image, d in zip(images, data)}
+
+    infos: Dict[str, ImageInfo] = {}
+    if len(images) == 1:
+        return infos
+    for image in images:
+        infos.update(docker_images_inspect([image], cwd=cwd, env=env))
+    return infos
+
+
+class ImageCache:
+    """
+    On-host JSON cache {image id: {entrypoint, cmd, has_sh, seen}}.
+
+    Image ids are content addresses, so an entry stays valid for as long as
+    the image exists; the expensive part it saves is the /bin/sh probe,
+    which starts a throwaway container.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if path is None:
+            return
+        try:
+            with open(path, encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict):
+            self.entries = {
+                k: v
+                for k, v in data.items()
+                if isinstance(v, dict) and isinstance(v.get("has_sh"), bool)
+            }
+
+    def has_sh(self, info: ImageInfo) -> Optional[bool]:
+        entry = self.entries.get(info.id) if info.id else None
+        if entry is None:
+            return None
+        entry["seen"] = time.time()
+        return entry["has_sh"]
+
+    def record(self, info: ImageInfo, has_sh: bool) -> None:
+        if info.id:
+            self.entries[info.id] = {
+                "entrypoint": info.entrypoint,
+                "cmd": info.cmd,
+                "has_sh": has_sh,
+                "seen": time.time(),
+            }
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        cutoff = time.time() - IMAGE_CACHE_MAX_AGE
+        entries = {k: v for k, v in self.entries.items() if v.get("seen", 0) >= cutoff}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=str(self.path.parent), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(entries, fh, indent=2, sort_keys=True)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            # The cache is an optimisation; never fail the injection over it.
+            print(f"[compose_ca] could not write image cache {self.path}: {e}")
+
+
+def _parallel(fn: Callable[[str], Any], items: List[str], jobs: int) -> List[Any]:
+    if len(items) <= 1 or jobs <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(fn, items))
 
 
 def docker_image_exists(image: str, *, cwd: Path, env: Dict[str, str]) -> bool:
@@ -436,6 +540,83 @@ def _load_services_via_config(
     return services
 
 
+def resolve_images(
+    services: Dict[str, Any],
+    service_to_compose_cmd: Dict[str, List[str]],
+    *,
+    cwd: Path,
+    env: Dict[str, str],
+    cache: Optional[ImageCache] = None,
+    jobs: int = DEFAULT_JOBS,
+) -> Dict[str, Tuple[ImageInfo, bool]]:
+    """
+    Return {image: (ImageInfo, has /bin/sh)} for every image referenced by
+    `services`.
+
+    All images are inspected in one call. Missing images are built or
+    pulled and /bin/sh is probed for images unknown to `cache`, both with
+    up to `jobs` images in parallel.
+    """
+    users: Dict[str, str] = {}
+    for name, svc in services.items():
+        image = svc.get("image") if isinstance(svc, dict) else None
+        if isinstance(image, str) and image.strip():
+            users.setdefault(image.strip(), name)
+    if not users:
+        return {}
+    cache = cache or ImageCache()
+
+    images = list(users)
+    infos = docker_images_inspect(images, cwd=cwd, env=env)
+    missing = [image for image in images if image not in infos]
+    if missing:
+
+        def ensure(image: str) -> None:
+            name = users[image]
+            compose_cmd = service_to_compose_cmd.get(name)
+            if not compose_cmd:
+                die(f"Internal error: missing compose cmd mapping for service '{name}'")
+            ensure_image_available(
+                service_name=name,
+                svc=services[name],
+                image=image,
+                services=services,
+                service_to_compose_cmd=service_to_compose_cmd,
+                compose_base_cmd=compose_cmd,
+                cwd=cwd,
+                env=env,
+            )
+
+        _parallel(ensure, missing, jobs)
+        infos.update(docker_images_inspect(missing, cwd=cwd, env=env))
+        for image in missing:
+            if image not in infos:
+                die(f"Image '{image}' is still missing after build/pull")
+
+    # Probe each image id once; tags sharing an id share the result.
+    has_sh: Dict[str, bool] = {}
+    to_probe: Dict[str, str] = {}
+    for image in images:
+        info = infos[image]
+        key = info.id or image
+        cached = cache.has_sh(info)
+        if cached is not None:
+            has_sh[key] = cached
+        elif key not in has_sh:
+            to_probe.setdefault(key, image)
+
+    probed = _parallel(
+        lambda image: docker_image_has_bin_sh(image, cwd=cwd, env=env),
+        list(to_probe.values()),
+        jobs,
+    )
+    for key, result in zip(to_probe, probed):
+        has_sh[key] = result
+        cache.record(infos[to_probe[key]], result)
+
+    return {image: (infos[image], has_sh[infos[image].id or image]) for image in images}
+
+
 def render_override(
     services: Dict[str, Any],
     service_to_compose_cmd: Dict[str, List[str]],
@@ -445,6 +626,8 @@ def render_override(
     ca_host: str,
     wrapper_host: str,
     trust_name: str,
+    cache: Optional[ImageCache] = None,
+    jobs: int = DEFAULT_JOBS,
 ) -> Dict[str, Any]:
     """
     Generate a compose override that injects CA trust into every service by:
@@ -461,13 +644,16 @@ def render_override(
     ca_container = "/tmp/infinito/ca/root-ca.crt"
     wrapper_container = "/tmp/infinito/bin/with-ca-trust.sh"
 
-    out_services: Dict[str, Any] = {}
-    sh_cache: Dict[str, bool] = {}
-
     for name, svc in services.items():
         if not isinstance(svc, dict):
             die(f"Service '{name}' must be a mapping in compose config")
 
+    images = resolve_images(
+        services, service_to_compose_cmd, cwd=cwd, env=env, cache=cache, jobs=jobs
+    )
+    out_services: Dict[str, Any] = {}
+
+    for name, svc in services.items():
         svc_ep = normalize_entrypoint(svc.get("entrypoint"))
         svc_cmd = normalize_cmd(svc.get("command"))
 
@@ -482,23 +668,9 @@ def render_override(
             img_name = ""
         else:
             img_name = image.strip()
-            compose_cmd = service_to_compose_cmd.get(name)
-            if not compose_cmd:
-                die(f"Internal error: missing compose cmd mapping for service '{name}'")
-
-            ensure_image_available(
-                service_name=name,
-                svc=svc,
-                image=img_name,
-                services=services,
-                service_to_compose_cmd=service_to_compose_cmd,
-                compose_base_cmd=compose_cmd,
-                cwd=cwd,
-                env=env,
-            )
-            img_ep, img_cmd = docker_image_inspect(img_name, cwd=cwd, env=env)
-            img_ep = normalize_entrypoint(img_ep)
-            img_cmd = normalize_cmd(img_cmd)
+            info = images[img_name][0]
+            img_ep = normalize_entrypoint(info.entrypoint)
+            img_cmd = normalize_cmd(info.cmd)
 
         final_ep = svc_ep if svc_ep else img_ep
         final_cmd = svc_cmd if svc_cmd else img_cmd
@@ -530,13 +702,7 @@ def render_override(
         }
 
         # Only override entrypoint/command when /bin/sh exists (otherwise distroless breaks).
-        has_sh = False
-        if img_name:
-            if img_name in sh_cache:
-                has_sh = sh_cache[img_name]
-            else:
-                has_sh = docker_image_has_bin_sh(img_name, cwd=cwd, env=env)
-                sh_cache[img_name] = has_sh
+        has_sh = images[img_name][1] if img_name else False
 
         if has_sh:
             override_svc["entrypoint"] = [wrapper_container]
@@ -576,6 +742,17 @@ def main() -> int:
         required=True,
         help="Trust anchor name for CA installation inside containers (CA_TRUST_NAME)",
     )
+    ap.add_argument(
+        "--image-cache",
+        default="",
+        help="Optional JSON file caching image metadata and /bin/sh probes by image id",
+    )
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"Images pulled/built/probed in parallel (default: {DEFAULT_JOBS})",
+    )
     args = ap.parse_args()
 
     cwd = Path(args.chdir)
@@ -651,6 +828,9 @@ def main() -> int:
     if not merged_services:
         die("No services found after merging default + profile configs")
 
+    image_cache_path = str(args.image_cache).strip()
+    cache = ImageCache(Path(image_cache_path) if image_cache_path else None)
+
     override_doc = render_override(
         merged_services,
         service_to_compose_cmd,
@@ -659,7 +839,10 @@ def main() -> int:
         ca_host=ca_host,
         wrapper_host=wrapper_host,
         trust_name=trust_name,
+        cache=cache,
+        jobs=max(1, args.jobs),
     )
+    cache.save()
 
     out_path = Path(args.out)
     if not out_path.is_absolute():
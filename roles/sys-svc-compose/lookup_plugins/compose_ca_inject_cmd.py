@@ -168,6 +168,17 @@ class LookupModule(LookupBase):
             variables=variables,
         )
 
+        # Optional: cache of image metadata and /bin/sh probes on the host
+        image_cache = ""
+        if _as_str(ca_trust.get("image_cache")):
+            image_cache = render_ansible_strict(
+                templar=templar,
+                raw=_require(ca_trust, "image_cache", str, label="CA_TRUST"),
+                var_name="CA_TRUST.image_cache",
+                err_prefix="compose_ca_inject_cmd",
+                variables=variables,
+            )
+
         # ---------------------------------------------------------------------
         # Resolve compose files (without CA override!)
         # ---------------------------------------------------------------------
@@ -213,5 +224,7 @@ class LookupModule(LookupBase):
             "--trust-name",
             _shell_quote(trust_name),
         ]
+        if _as_str(image_cache):
+            cmd += ["--image-cache", _shell_quote(_as_str(image_cache))]
 
         return [" ".join(cmd)]
@@ -1,7 +1,7 @@
 #!/usr/bin/env bash
 # Mirrors Docker Hub images to GHCR (only missing, best-effort).
 # Required env vars: GHCR_NAMESPACE, GHCR_REPOSITORY, GHCR_PREFIX, REPO_ROOT
-# Optional env vars: IMAGES_PER_HOUR
+# Optional env vars: IMAGES_PER_HOUR, MIRROR_JOBS, MIRROR_SUMMARY
 set -euo pipefail
 
 echo ">>> Mirror namespace:  ${GHCR_NAMESPACE}"
@@ -10,11 +10,18 @@ echo ">>> Mirror prefix:     ${GHCR_PREFIX}"
 echo ">>> Repo root:         ${REPO_ROOT}"
 echo ">>> Mode:              only-missing"
 echo ">>> Throttle:          ${IMAGES_PER_HOUR:-<disabled>} images/hour"
+echo ">>> Jobs:              ${MIRROR_JOBS:-<default>}"
 
 EXTRA_ARGS=()
 if [[ -n "${IMAGES_PER_HOUR:-}" ]]; then
 	EXTRA_ARGS+=(--images-per-hour "${IMAGES_PER_HOUR}")
 fi
+if [[ -n "${MIRROR_JOBS:-}" ]]; then
+	EXTRA_ARGS+=(--jobs "${MIRROR_JOBS}")
+fi
+if [[ -n "${MIRROR_SUMMARY:-}" ]]; then
+	EXTRA_ARGS+=(--summary "${MIRROR_SUMMARY}")
+fi
 
 python -m cli.mirror.sync \
 	--repo-root "${REPO_ROOT}" \
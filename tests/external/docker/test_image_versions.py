@@ -32,8 +32,7 @@ from pathlib import Path
 
 from utils.annotations.message import warning
 from utils.docker.version_updater import (
-    fetch_dockerhub_tags,
-    fetch_ghcr_tags,
+    fetch_image_tags,
     is_dockerhub,
     is_ghcr,
     is_semver,
@@ -116,16 +115,8 @@ class TestDockerImageVersions(unittest.TestCase):
         entries = _collect_entries()
         self.assertTrue(entries, "No semver-versioned config entries found")
 
-        # Deduplicate registry queries per image
-        image_tags: dict[str, list[str]] = {}
-        for e in entries:
-            img = e["image"]
-            if img in image_tags:
-                continue
-            if is_dockerhub(img):
-                image_tags[img] = fetch_dockerhub_tags(img)
-            elif is_ghcr(img):
-                image_tags[img] = fetch_ghcr_tags(img)
+        # One concurrent, cached registry query per distinct image
+        image_tags = fetch_image_tags(e["image"] for e in entries)
 
         outdated: list[dict] = []
         unchecked: list[dict] = []
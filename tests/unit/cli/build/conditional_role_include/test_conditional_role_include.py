@@ -83,5 +83,11 @@ class TestGeneratePlaybook(unittest.TestCase):
         c_index = text.index("setup c")
         self.assertTrue(a_index < b_index < c_index)
 
+    def test_gen_condi_role_incl_skips_unchanged_applications(self):
+        text = ''.join(gen_condi_role_incl(self.temp_dir))
+        self.assertIn(
+            "    - ('a' not in (UNCHANGED_APPLICATIONS | default([])))\n", text
+        )
+
 if __name__ == '__main__':
     unittest.main()
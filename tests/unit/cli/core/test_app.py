@@ -1,9 +1,10 @@
+import os
 import sys
 import unittest
 from pathlib import Path
 from unittest.mock import patch
 
-from cli.core.app import parse_flags, main as app_main
+from cli.core.app import IN_PROCESS_ENV, parse_flags, main as app_main
 
 
 class TestApp(unittest.TestCase):
@@ -72,6 +73,36 @@ class TestApp(unittest.TestCase):
         finally:
             sys.argv = old_argv
 
+    def test_parse_flags_in_process_and_profile(self):
+        with patch.dict(os.environ, {IN_PROCESS_ENV: ""}):
+            argv = ["infinito", "--in-process", "--profile-imports", "build", "tree"]
+            flags = parse_flags(argv)
+            self.assertTrue(flags.in_process)
+            self.assertTrue(flags.profile_imports)
+            self.assertEqual(argv, ["infinito", "build", "tree"])
+
+            self.assertFalse(parse_flags(["infinito", "build"]).in_process)
+
+        with patch.dict(os.environ, {IN_PROCESS_ENV: "1"}):
+            self.assertTrue(parse_flags(["infinito", "build"]).in_process)
+
+    @patch("cli.core.app.resolve_command_module", return_value=("cli.x", ["--y"]))
+    @patch("cli.core.app.run_command_once")
+    @patch("cli.core.app.run_module_in_process")
+    def test_app_main_in_process_skips_subprocess(
+        self, mock_inproc, mock_run, _mock_resolve
+    ):
+        old_argv = sys.argv
+        try:
+            sys.argv = ["infinito", "--in-process", "x", "--y"]
+            with self.assertRaises(SystemExit) as cm:
+                app_main()
+            self.assertEqual(cm.exception.code, 0)
+        finally:
+            sys.argv = old_argv
+        mock_inproc.assert_called_once_with("cli.x", ["--y"])
+        mock_run.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
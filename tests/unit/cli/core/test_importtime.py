@@ -0,0 +1,76 @@
+import io
+import unittest
+from unittest.mock import Mock, patch
+
+from cli.core.importtime import (
+    format_import_report,
+    parse_import_time_line,
+    run_with_import_profile,
+)
+
+
+class TestImportTime(unittest.TestCase):
+    def test_parse_import_time_line(self):
+        record = parse_import_time_line(
+            "import time:       412 |       2213 |   cli.core.run\n"
+        )
+        self.assertEqual(record.module, "cli.core.run")
+        self.assertEqual(record.self_us, 412)
+        self.assertEqual(record.cumulative_us, 2213)
+        self.assertEqual(record.depth, 1)
+
+        top = parse_import_time_line("import time:        10 |         10 | site")
+        self.assertEqual(top.depth, 0)
+
+    def test_parse_ignores_header_and_other_lines(self):
+        self.assertIsNone(
+            parse_import_time_line(
+                "import time: self [us] | cumulative | imported package"
+            )
+        )
+        self.assertIsNone(parse_import_time_line("Traceback (most recent call last):"))
+
+    def test_format_import_report_orders_by_cost(self):
+        records = [
+            parse_import_time_line(line)
+            for line in (
+                "import time:      5000 |       5000 |     heavy.leaf",
+                "import time:       100 |       5100 |   heavy",
+                "import time:       250 |        250 | light",
+                "import time:        50 |       5150 | cmd",
+            )
+        ]
+        report = format_import_report("cli.x", records)
+        self.assertIn("cli.x: 4 modules, 5.4 ms total", report)
+        top_level, self_time = report.split("Slowest modules (self):")
+        self.assertLess(top_level.index("| cmd"), top_level.index("| light"))
+        self.assertNotIn("heavy.leaf", top_level)
+        self.assertLess(self_time.index("heavy.leaf"), self_time.index("light"))
+
+    @patch("cli.core.importtime.subprocess.Popen")
+    def test_run_with_import_profile_splits_stderr(self, mock_popen):
+        proc = Mock()
+        proc.stderr = iter(
+            [
+                "import time: self [us] | cumulative | imported package\n",
+                "import time:       300 |        300 | cli.x\n",
+                "real warning\n",
+            ]
+        )
+        proc.wait.return_value = 4
+        mock_popen.return_value = proc
+
+        out = io.StringIO()
+        with patch("cli.core.importtime.sys.stderr", new_callable=io.StringIO) as err:
+            rc = run_with_import_profile("cli.x", ["--a"], out=out)
+
+        self.assertEqual(rc, 4)
+        cmd = mock_popen.call_args.args[0]
+        self.assertEqual(cmd[1:5], ["-X", "importtime", "-m", "cli.x"])
+        self.assertEqual(cmd[5:], ["--a"])
+        self.assertEqual(err.getvalue(), "real warning\n")
+        self.assertIn("cli.x: 1 modules", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
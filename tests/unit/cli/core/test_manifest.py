@@ -0,0 +1,158 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from cli.core.discovery import discover_commands
+from cli.core.manifest import (
+    MANIFEST_ENV,
+    CommandManifest,
+    default_manifest_path,
+    extract_description_via_ast,
+)
+
+
+class TestExtractDescriptionViaAst(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, rel: str, content: str) -> Path:
+        path = self.root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+        return path
+
+    def test_direct_description(self):
+        main = self._write(
+            "cmd/__main__.py",
+            "import argparse\n"
+            "p = argparse.ArgumentParser(description='Do a thing.\\n\\nDetails.')\n",
+        )
+        self.assertEqual(extract_description_via_ast(main), "Do a thing.")
+
+    def test_implicit_concatenation_and_plus(self):
+        main = self._write(
+            "cmd/__main__.py",
+            "from argparse import ArgumentParser\n"
+            "p = ArgumentParser(description='Build ' 'the ' + 'tree.')\n",
+        )
+        self.assertEqual(extract_description_via_ast(main), "Build the tree.")
+
+    def test_description_from_sibling_module(self):
+        self._write(
+            "cmd/command.py",
+            "import argparse\n"
+            "def main():\n"
+            "    argparse.ArgumentParser(description='From sibling.')\n",
+        )
+        main = self._write("cmd/__main__.py", "from .command import main\nmain()\n")
+        self.assertEqual(extract_description_via_ast(main), "From sibling.")
+
+    def test_docstring_fallback_and_dash(self):
+        main = self._write("a/__main__.py", '"""Docstring summary.\n\nMore."""\n')
+        self.assertEqual(extract_description_via_ast(main), "Docstring summary.")
+        main = self._write("b/__main__.py", "x = 1\n")
+        self.assertEqual(extract_description_via_ast(main), "-")
+
+
+class TestCommandManifest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        self.cli_dir = root / "cli"
+        self.main = self.cli_dir / "tool" / "__main__.py"
+        self.main.parent.mkdir(parents=True)
+        self.main.write_text(
+            "import argparse\nargparse.ArgumentParser(description='First.')\n",
+            encoding="utf-8",
+        )
+        self.manifest_path = root / "cache" / "manifest.json"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _descriptions(self):
+        manifest = CommandManifest(self.cli_dir, path=self.manifest_path)
+        result = manifest.descriptions(discover_commands(self.cli_dir))
+        manifest.save()
+        return result
+
+    def test_cached_entries_are_reused_until_files_change(self):
+        self.assertEqual(self._descriptions(), {"cli.tool": "First."})
+        self.assertTrue(self.manifest_path.is_file())
+
+        with patch(
+            "cli.core.manifest.extract_description_via_ast", side_effect=AssertionError
+        ):
+            self.assertEqual(self._descriptions(), {"cli.tool": "First."})
+
+        self.main.write_text(
+            "import argparse\nargparse.ArgumentParser(description='Second one.')\n",
+            encoding="utf-8",
+        )
+        self.assertEqual(self._descriptions(), {"cli.tool": "Second one."})
+
+    def test_full_help_caches_successful_captures_only(self):
+        commands = discover_commands(self.cli_dir)
+        capture = Mock(return_value=("usage: tool", ""))
+
+        manifest = CommandManifest(self.cli_dir, path=self.manifest_path)
+        self.assertEqual(
+            manifest.full_help(commands, capture), {"cli.tool": ("usage: tool", "")}
+        )
+        manifest.save()
+
+        manifest = CommandManifest(self.cli_dir, path=self.manifest_path)
+        manifest.full_help(commands, capture)
+        capture.assert_called_once_with("cli.tool")
+
+        failing = Mock(return_value=("", "boom"))
+        other = self.cli_dir / "other" / "__main__.py"
+        other.parent.mkdir()
+        other.write_text("x = 1\n", encoding="utf-8")
+        commands = discover_commands(self.cli_dir)
+        manifest = CommandManifest(self.cli_dir, path=self.manifest_path)
+        manifest.full_help(commands, failing)
+        manifest.full_help(commands, failing)
+        self.assertEqual(failing.call_count, 2)
+
+    def test_full_help_is_recaptured_when_an_imported_helper_changes(self):
+        helper = self.cli_dir.parent / "utils" / "args.py"
+        helper.parent.mkdir()
+        (helper.parent / "__init__.py").write_text("", encoding="utf-8")
+        helper.write_text("FLAG = '--one'\n", encoding="utf-8")
+        self.main.write_text(
+            "from utils.args import FLAG\nimport argparse\n", encoding="utf-8"
+        )
+        commands = discover_commands(self.cli_dir)
+        capture = Mock(return_value=("usage: tool", ""))
+
+        manifest = CommandManifest(self.cli_dir, path=self.manifest_path)
+        manifest.full_help(commands, capture)
+        manifest.save()
+        self.assertEqual(
+            sorted(d[0] for d in manifest._entries["cli.tool"].help_deps),
+            ["utils/__init__.py", "utils/args.py"],
+        )
+
+        manifest = CommandManifest(self.cli_dir, path=self.manifest_path)
+        manifest.full_help(commands, capture)
+        self.assertEqual(capture.call_count, 1)
+
+        helper.write_text("FLAG = '--other'\n", encoding="utf-8")
+        manifest = CommandManifest(self.cli_dir, path=self.manifest_path)
+        manifest.full_help(commands, capture)
+        self.assertEqual(capture.call_count, 2)
+
+    def test_manifest_path_env_override(self):
+        with patch.dict(os.environ, {MANIFEST_ENV: str(self.manifest_path)}):
+            self.assertEqual(default_manifest_path(), self.manifest_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
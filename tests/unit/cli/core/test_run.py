@@ -1,9 +1,15 @@
+import sys
 import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import patch
 
-from cli.core.run import RunConfig, open_log_file, run_command_once
+from cli.core.run import (
+    RunConfig,
+    open_log_file,
+    run_command_once,
+    run_module_in_process,
+)
 
 
 class TestRun(unittest.TestCase):
@@ -42,6 +48,31 @@ class TestRun(unittest.TestCase):
         ok = run_command_once(["python", "-c", "print(1)"], cfg, log_file=None)
         self.assertTrue(ok)
 
+    def test_run_module_in_process_passes_args_and_exit_code(self):
+        with tempfile.TemporaryDirectory() as td:
+            pkg = Path(td) / "infinito_inproc_cmd"
+            pkg.mkdir()
+            (pkg / "__init__.py").write_text("", encoding="utf-8")
+            argv_file = Path(td) / "argv.txt"
+            (pkg / "__main__.py").write_text(
+                "import pathlib, sys\n"
+                f"pathlib.Path({str(argv_file)!r}).write_text(' '.join(sys.argv[1:]))\n"
+                "raise SystemExit(int(sys.argv[1]))\n",
+                encoding="utf-8",
+            )
+            sys.path.insert(0, td)
+            old_argv = sys.argv[:]
+            try:
+                with self.assertRaises(SystemExit) as cm:
+                    run_module_in_process("infinito_inproc_cmd", ["3", "--flag"])
+            finally:
+                sys.path.remove(td)
+                sys.modules.pop("infinito_inproc_cmd", None)
+
+            self.assertEqual(cm.exception.code, 3)
+            self.assertEqual(argv_file.read_text(), "3 --flag")
+            self.assertEqual(sys.argv, old_argv)
+
 
 if __name__ == "__main__":
     unittest.main()
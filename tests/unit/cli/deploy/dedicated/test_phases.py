@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import threading
+import unittest
+
+from cli.deploy.dedicated.phases import Phase, run_phases
+
+
+class TestRunPhases(unittest.TestCase):
+    def test_independent_phases_run_concurrently_after_requirements(self):
+        order = []
+        barrier = threading.Barrier(2, timeout=5)
+
+        def record(name, sync=False):
+            def _action(_cancel):
+                order.append(f"{name}:start")
+                if sync:
+                    # Only passes if both siblings run at the same time.
+                    barrier.wait()
+                order.append(f"{name}:end")
+
+            return _action
+
+        timings = run_phases(
+            [
+                Phase("clean", record("clean")),
+                Phase("a", record("a", sync=True), ("clean",)),
+                Phase("b", record("b", sync=True), ("clean",)),
+                Phase("final", record("final"), ("a", "b")),
+            ]
+        )
+
+        self.assertEqual(set(timings), {"clean", "a", "b", "final"})
+        self.assertEqual(order[:2], ["clean:start", "clean:end"])
+        self.assertEqual(order[-2:], ["final:start", "final:end"])
+
+    def test_failure_cancels_siblings_and_skips_dependents(self):
+        started = []
+
+        def slow(cancel):
+            started.append("slow")
+            self.assertTrue(cancel.wait(timeout=5))
+
+        def failing(_cancel):
+            started.append("failing")
+            raise SystemExit(3)
+
+        with self.assertRaises(SystemExit) as ctx:
+            run_phases(
+                [
+                    Phase("slow", slow),
+                    Phase("failing", failing),
+                    Phase("after", lambda _c: started.append("after"), ("slow",)),
+                ]
+            )
+
+        self.assertEqual(ctx.exception.code, 3)
+        self.assertNotIn("after", started)
+
+    def test_serial_mode_keeps_list_order(self):
+        order = []
+        run_phases(
+            [Phase(name, lambda _c, n=name: order.append(n)) for name in "xyz"],
+            max_workers=1,
+        )
+        self.assertEqual(order, ["x", "y", "z"])
+
+    def test_invalid_graphs_are_rejected(self):
+        noop = lambda _c: None  # noqa: E731
+        with self.assertRaises(ValueError):
+            run_phases([Phase("a", noop, ("missing",))])
+        with self.assertRaises(ValueError):
+            run_phases([Phase("a", noop, ("b",)), Phase("b", noop, ("a",))])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import io
 import subprocess
+import sys
+import threading
 import unittest
 
 from cli.deploy.dedicated import proc
@@ -34,6 +37,26 @@ class TestProcRun(unittest.TestCase):
         self.assertEqual(kwargs["cwd"], "/repo")
         self.assertTrue(kwargs["check"])
 
+    def test_cancellable_run_replays_output_and_checks_rc(self):
+        cancel = threading.Event()
+        with unittest.mock.patch("sys.stdout", new_callable=io.StringIO) as out:
+            result = proc.run(
+                [sys.executable, "-c", "print('hello')"], check=True, cancel=cancel
+            )
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(out.getvalue(), "hello\n")
+
+        with self.assertRaises(subprocess.CalledProcessError):
+            proc.run([sys.executable, "-c", "raise SystemExit(2)"], cancel=cancel)
+
+    def test_cancellable_run_terminates_when_cancelled(self):
+        cancel = threading.Event()
+        cancel.set()
+        with self.assertRaises(proc.ProcessCancelled):
+            proc.run(
+                [sys.executable, "-c", "import time; time.sleep(30)"], cancel=cancel
+            )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,14 +1,46 @@
 from __future__ import annotations
 
+import contextlib
+import io
+import os
 import subprocess
+import threading
 import unittest
 from typing import Any, Dict, List, Tuple
 
 from cli.create.inventory.services_disabler import ServicesDisabledConflictError
-from cli.deploy.dedicated import runner
+from cli.deploy.dedicated import proc, runner
+from utils.cache.vault import VAULT_CACHE_DIR_ENV
+
+
+class _RunBackedPopen:
+    """Stand-in for subprocess.Popen that routes the cancellable pre-flight
+    commands through the (mocked) subprocess.run, so every test sees one
+    uniform call log."""
+
+    def __init__(self, cmd, **kwargs):
+        kwargs.pop("stdout", None)
+        kwargs.pop("stderr", None)
+        self.returncode = subprocess.run(cmd, **kwargs).returncode
+
+    def wait(self, timeout=None):
+        return self.returncode
+
+    def terminate(self):
+        pass
+
+    def kill(self):
+        pass
 
 
 class TestRunAnsiblePlaybook(unittest.TestCase):
+    def setUp(self):
+        patcher = unittest.mock.patch(
+            "cli.deploy.dedicated.proc.subprocess.Popen", _RunBackedPopen
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     def _fake_run_side_effect(
         self,
         calls_store: List[Tuple[List[str], Dict[str, Any]]],
@@ -308,6 +340,126 @@ class TestRunAnsiblePlaybook(unittest.TestCase):
             any(call_cmd and call_cmd[0] == "ansible-playbook" for call_cmd, _ in calls)
         )
 
+    @unittest.mock.patch("subprocess.run")
+    def test_vault_cache_passes_store_to_playbook_and_wipes_it(self, mock_run):
+        calls: List[Tuple[List[str], Dict[str, Any]]] = []
+        mock_run.side_effect = self._fake_run_side_effect(calls, ansible_rc=4)
+
+        with unittest.mock.patch(
+            "cli.deploy.dedicated.runner.assert_services_disabled_inventory_consistency_from_env"
+        ):
+            with self.assertRaises(SystemExit):
+                runner.run_ansible_playbook(
+                    repo_root="/repo",
+                    playbook_path="/repo/playbook.yml",
+                    inventory_validator_path="/repo/cli/validate/inventory/__main__.py",
+                    inventory="/etc/inventories/github-ci/devices.yml",
+                    modes={"MODE_CLEANUP": False, "MODE_ASSERT": False},
+                    skip_build=True,
+                    vault_cache=True,
+                )
+
+        last_cmd, last_kw = calls[-1]
+        self.assertEqual(last_cmd[0], "ansible-playbook")
+        store = last_kw["env"][VAULT_CACHE_DIR_ENV]
+        self.assertTrue(store)
+        # Wiped even though the playbook failed.
+        self.assertFalse(os.path.exists(store))
+
+    @unittest.mock.patch("cli.deploy.dedicated.runner.create_run_store")
+    @unittest.mock.patch("subprocess.run")
+    def test_vault_cache_without_tmpfs_falls_back_to_memory(self, mock_run, mock_store):
+        mock_store.return_value = None
+        calls: List[Tuple[List[str], Dict[str, Any]]] = []
+        mock_run.side_effect = self._fake_run_side_effect(calls, ansible_rc=0)
+
+        stderr = io.StringIO()
+        with (
+            unittest.mock.patch(
+                "cli.deploy.dedicated.runner.assert_services_disabled_inventory_consistency_from_env"
+            ),
+            contextlib.redirect_stderr(stderr),
+        ):
+            runner.run_ansible_playbook(
+                repo_root="/repo",
+                playbook_path="/repo/playbook.yml",
+                inventory_validator_path="/repo/cli/validate/inventory/__main__.py",
+                inventory="/etc/inventories/github-ci/devices.yml",
+                modes={"MODE_CLEANUP": False, "MODE_ASSERT": False},
+                skip_build=True,
+                vault_cache=True,
+            )
+
+        last_cmd, last_kw = calls[-1]
+        self.assertEqual(last_cmd[0], "ansible-playbook")
+        self.assertNotIn(VAULT_CACHE_DIR_ENV, last_kw["env"])
+        self.assertIn("in-memory cache only", stderr.getvalue())
+
+    @unittest.mock.patch.dict(os.environ, {"INFINITO_FACT_CACHE_DIR": "/tmp/facts"})
+    @unittest.mock.patch("subprocess.run")
+    def test_fact_cache_is_configured_and_refresh_flushes_it(self, mock_run):
+        calls: List[Tuple[List[str], Dict[str, Any]]] = []
+        mock_run.side_effect = self._fake_run_side_effect(calls, ansible_rc=0)
+
+        with unittest.mock.patch(
+            "cli.deploy.dedicated.runner.assert_services_disabled_inventory_consistency_from_env"
+        ):
+            runner.run_ansible_playbook(
+                repo_root="/repo",
+                playbook_path="/repo/playbook.yml",
+                inventory_validator_path="/repo/cli/validate/inventory/__main__.py",
+                inventory="/etc/inventories/github-ci/devices.yml",
+                modes={"MODE_CLEANUP": False, "MODE_ASSERT": False},
+                skip_build=True,
+                fact_cache_ttl=600,
+                refresh_facts=True,
+            )
+
+        last_cmd, last_kw = calls[-1]
+        self.assertEqual(last_cmd[0], "ansible-playbook")
+        self.assertIn("--flush-cache", last_cmd)
+        self.assertEqual(last_kw["env"]["ANSIBLE_CACHE_PLUGIN"], "jsonfile")
+        self.assertEqual(
+            last_kw["env"]["ANSIBLE_CACHE_PLUGIN_CONNECTION"], "/tmp/facts"
+        )
+        self.assertEqual(last_kw["env"]["ANSIBLE_CACHE_PLUGIN_TIMEOUT"], "600")
+
+    @unittest.mock.patch("subprocess.run")
+    def test_failing_validation_cancels_running_build(self, mock_run):
+        build_started = threading.Event()
+        build_cancelled = threading.Event()
+
+        def _fake_run_make(_repo_root, target, cancel=None):
+            if target == "setup":
+                build_started.set()
+                if cancel.wait(timeout=5):
+                    build_cancelled.set()
+                    raise proc.ProcessCancelled("make setup")
+
+        def _fake_run(cmd, cwd=None, check=True, cancel=None):
+            build_started.wait(timeout=5)
+            raise subprocess.CalledProcessError(1, cmd)
+
+        with (
+            unittest.mock.patch(
+                "cli.deploy.dedicated.runner.assert_services_disabled_inventory_consistency_from_env"
+            ),
+            unittest.mock.patch.object(runner, "run_make", _fake_run_make),
+            unittest.mock.patch.object(runner, "run", _fake_run),
+        ):
+            with self.assertRaises(SystemExit) as ctx:
+                runner.run_ansible_playbook(
+                    repo_root="/repo",
+                    playbook_path="/repo/playbook.yml",
+                    inventory_validator_path="/repo/cli/validate/inventory/__main__.py",
+                    inventory="/etc/inventories/github-ci/devices.yml",
+                    modes={"MODE_CLEANUP": False, "MODE_ASSERT": True},
+                )
+
+        self.assertEqual(ctx.exception.code, 1)
+        self.assertTrue(build_cancelled.is_set())
+        mock_run.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -138,6 +138,36 @@ class TestComposeUpRetries(unittest.TestCase):
         self.assertNotIn("COMPOSE_PROFILES", env)
         self.assertNotIn("INFINITO_REGISTRY_CACHE_PROXY_CONF", env)
 
+    @patch.dict(
+        os.environ,
+        {
+            "INFINITO_IMAGE": "test-image/arch",
+            "GITHUB_ACTIONS": "true",
+            "BIND_IP": "127.0.0.1",
+        },
+        clear=False,
+    )
+    @patch("subprocess.run", autospec=True)
+    def test_run_targets_isolated_project_with_env_overrides(
+        self, run_mock: MagicMock
+    ) -> None:
+        compose = Compose(
+            repo_root=Path("/tmp/infinito-nexus"),
+            distro="arch",
+            project="infinito_1",
+            env_overrides={"BIND_IP": "127.0.0.2"},
+        )
+        run_mock.return_value = subprocess.CompletedProcess(
+            ["docker", "compose"], 0, stdout="", stderr=""
+        )
+
+        compose.run(["ps"], check=False, capture=True)
+
+        cmd = run_mock.call_args.args[0]
+        env = run_mock.call_args.kwargs["env"]
+        self.assertEqual(cmd[:4], ["docker", "compose", "--project-name", "infinito_1"])
+        self.assertEqual(env["BIND_IP"], "127.0.0.2")
+
     @patch.dict(
         os.environ,
         {
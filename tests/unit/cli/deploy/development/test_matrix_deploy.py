@@ -46,6 +46,9 @@ def _args(
         debug=False,
         variant=variant,
         full_cycle=full_cycle,
+        parallel=1,
+        log_dir=None,
+        keep_stacks=False,
         ansible_args=[],
     )
 
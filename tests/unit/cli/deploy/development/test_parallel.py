@@ -0,0 +1,155 @@
+"""Unit tests for `deploy --parallel N` (cli.deploy.development.parallel):
+rounds are spread over isolated stacks and reported in one summary."""
+
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from cli.deploy.development.deploy import handler
+
+
+def _args(*, apps: list[str], log_dir: str, parallel: int) -> argparse.Namespace:
+    return argparse.Namespace(
+        inventory_dir="/srv/inv",
+        apps=None,
+        id=apps,
+        debug=False,
+        variant=None,
+        full_cycle=False,
+        parallel=parallel,
+        log_dir=log_dir,
+        keep_stacks=False,
+        ansible_args=[],
+    )
+
+
+def _entry(round_index, inv_dir, round_variants):
+    return (round_index, inv_dir, round_variants, tuple(round_variants))
+
+
+def _make_compose_mock() -> MagicMock:
+    compose = MagicMock()
+    compose.repo_root = Path("/tmp/infinito-nexus")
+    return compose
+
+
+class TestHandlerParallelMatrixDeploy(unittest.TestCase):
+    def setUp(self) -> None:
+        self.log_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.log_dir, True)
+        self.stack_composes: dict[str, MagicMock] = {}
+
+        def _make_compose(**kwargs):
+            compose = _make_compose_mock()
+            # `make clean setup` on the first stack.
+            compose.exec.return_value.returncode = 0
+            self.stack_composes[kwargs["project"]] = compose
+            return compose
+
+        self.patchers = [
+            patch.dict(os.environ, {"BIND_IP": "127.0.0.1"}),
+            patch(
+                "cli.deploy.development.deploy.make_compose",
+                return_value=_make_compose_mock(),
+            ),
+            patch(
+                "cli.deploy.development.parallel.make_compose",
+                side_effect=_make_compose,
+            ),
+            patch(
+                "cli.deploy.development.parallel.resolve_container",
+                return_value="infinito_debian",
+            ),
+            patch(
+                "cli.deploy.development.parallel.read_env_file",
+                return_value={"SUBNET": "172.30.0.0/24", "IP4": "172.30.0.2"},
+            ),
+            patch(
+                "cli.deploy.development.parallel.resolve_distro", return_value="debian"
+            ),
+            patch("cli.deploy.development.parallel._copy_inventory", autospec=True),
+            patch("cli.deploy.development.parallel._purge_app_entities", autospec=True),
+            patch("sys.stdout", new_callable=io.StringIO),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        self.addCleanup(lambda: [p.stop() for p in reversed(self.patchers)])
+
+    def _run(self, plan, run_deploy_side_effect, **kwargs):
+        with (
+            patch(
+                "cli.deploy.development.deploy.plan_dev_inventory_matrix",
+                return_value=plan,
+            ),
+            patch(
+                "cli.deploy.development.parallel._run_deploy",
+                side_effect=run_deploy_side_effect,
+            ) as run_deploy_mock,
+        ):
+            rc = handler(
+                _args(
+                    apps=["web-app-a", "web-app-b"],
+                    log_dir=self.log_dir,
+                    **kwargs,
+                )
+            )
+        return rc, run_deploy_mock
+
+    def test_rounds_are_distributed_over_isolated_stacks(self) -> None:
+        plan = [
+            _entry(0, "/srv/inv-0", {"web-app-a": 0, "web-app-b": 0}),
+            _entry(1, "/srv/inv-1", {"web-app-a": 1, "web-app-b": 0}),
+            _entry(2, "/srv/inv-2", {"web-app-a": 2, "web-app-b": 0}),
+        ]
+        rc, run_deploy_mock = self._run(plan, lambda *a, **kw: 0, parallel=2)
+
+        self.assertEqual(rc, 0)
+        self.assertEqual(
+            sorted(self.stack_composes),
+            ["infinito_debian_1", "infinito_debian_2"],
+        )
+        inventories = sorted(
+            call.kwargs["inventory_dir"] for call in run_deploy_mock.call_args_list
+        )
+        self.assertEqual(inventories, ["/srv/inv-0", "/srv/inv-1", "/srv/inv-2"])
+        for call in run_deploy_mock.call_args_list:
+            self.assertEqual(
+                call.kwargs["passthrough"][:2], ["--skip-cleanup", "--skip-build"]
+            )
+            # A stack only has what its own rounds deployed, so both apps
+            # are deployed in every round that runs on a fresh stack.
+            self.assertIn("web-app-a", call.kwargs["deploy_ids"])
+        for compose in self.stack_composes.values():
+            compose.up.assert_called_once_with(run_entry_init=True)
+            compose.down.assert_called_once()
+        self.assertIn("PASSED (3 rounds)", sys.stdout.getvalue())
+
+    def test_failed_round_fails_the_summary_and_keeps_its_stack(self) -> None:
+        plan = [
+            _entry(0, "/srv/inv-0", {"web-app-a": 0, "web-app-b": 0}),
+            _entry(1, "/srv/inv-1", {"web-app-a": 1, "web-app-b": 0}),
+        ]
+
+        def _deploy(compose, **kwargs):
+            return 2 if kwargs["inventory_dir"] == "/srv/inv-1" else 0
+
+        rc, _ = self._run(plan, _deploy, parallel=2)
+
+        self.assertEqual(rc, 2)
+        downs = sorted(c.down.call_count for c in self.stack_composes.values())
+        self.assertEqual(downs, [0, 1])
+        output = sys.stdout.getvalue()
+        self.assertIn("FAIL rc=2", output)
+        self.assertIn("FAILED (1 failed, 0 not run)", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -64,6 +64,10 @@ class TestProfileRegistryCacheActive(unittest.TestCase):
     def test_inactive_under_generic_ci_signal(self) -> None:
         self.assertFalse(Profile().registry_cache_active())
 
+    @patch.dict(os.environ, {**_BLANK_CI_ENV, "INFINITO_NO_CACHE": "1"}, clear=False)
+    def test_inactive_when_cache_is_switched_off(self) -> None:
+        self.assertFalse(Profile().registry_cache_active())
+
     @patch.dict(os.environ, {**_BLANK_CI_ENV, "RUNNING_ON_GITHUB": "true"}, clear=False)
     def test_is_strict_inverse_of_is_ci(self) -> None:
         p = Profile()
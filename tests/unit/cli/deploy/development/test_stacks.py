@@ -0,0 +1,87 @@
+"""Unit tests for the isolated stacks of `deploy --parallel`."""
+
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from cli.deploy.development.stacks import read_env_file, stack_specs
+
+_DEFAULTS = {
+    "SUBNET": "172.30.0.0/24",
+    "GATEWAY": "172.30.0.1",
+    "DNS_IP": "172.30.0.3",
+    "IP4": "172.30.0.2",
+    "BIND_IP": "127.0.0.1",
+}
+
+
+class TestStackSpecs(unittest.TestCase):
+    def test_stacks_get_shifted_subnets_and_loopback_addresses(self) -> None:
+        specs = stack_specs(
+            2, container="infinito_debian", defaults=_DEFAULTS, environ={}
+        )
+
+        self.assertEqual([s.index for s in specs], [1, 2])
+        second = specs[1]
+        self.assertEqual(second.project, "infinito_debian_2")
+        self.assertEqual(second.container, "infinito_debian_2")
+        self.assertEqual(second.corefile_relpath, "compose/coredns/Corefile.2")
+        self.assertEqual(second.env["SUBNET"], "172.30.2.0/24")
+        self.assertEqual(second.env["GATEWAY"], "172.30.2.1")
+        self.assertEqual(second.env["DNS_IP"], "172.30.2.3")
+        self.assertEqual(second.env["IP4"], "172.30.2.2")
+        self.assertEqual(second.env["BIND_IP"], "127.0.0.3")
+        self.assertEqual(second.env["INFINITO_COREDNS_CONTAINER"], "infinito-coredns-2")
+        self.assertEqual(second.env["INFINITO_DOCKER_VOLUME"], "docker")
+
+    def test_environment_overrides_env_file(self) -> None:
+        specs = stack_specs(
+            1,
+            container="c",
+            defaults=_DEFAULTS,
+            environ={
+                "SUBNET": "10.0.0.0/16",
+                "GATEWAY": "10.0.0.1",
+                "DNS_IP": "10.0.0.3",
+                "IP4": "10.0.0.5",
+            },
+        )
+        self.assertEqual(specs[0].env["SUBNET"], "10.1.0.0/16")
+        self.assertEqual(specs[0].env["IP4"], "10.1.0.5")
+
+    def test_bind_mounted_docker_root_is_split_per_stack(self) -> None:
+        specs = stack_specs(
+            1,
+            container="c",
+            defaults=_DEFAULTS,
+            environ={"INFINITO_DOCKER_VOLUME": "/mnt/docker/"},
+        )
+        self.assertEqual(specs[0].env["INFINITO_DOCKER_VOLUME"], "/mnt/docker/stack-1")
+
+    def test_non_loopback_bind_ip_is_rejected(self) -> None:
+        with self.assertRaises(SystemExit):
+            stack_specs(
+                1, container="c", defaults=_DEFAULTS, environ={"BIND_IP": "0.0.0.0"}
+            )
+
+    def test_address_outside_subnet_is_rejected(self) -> None:
+        with self.assertRaises(SystemExit):
+            stack_specs(
+                1, container="c", defaults=_DEFAULTS, environ={"IP4": "192.168.0.2"}
+            )
+
+
+class TestReadEnvFile(unittest.TestCase):
+    def test_skips_comments_and_blank_lines(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "env.ci"
+            path.write_text("# comment\n\nSUBNET=172.30.0.0/24\nDOMAIN = a=b\n")
+            self.assertEqual(
+                read_env_file(path), {"SUBNET": "172.30.0.0/24", "DOMAIN": "a=b"}
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import io
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import cli.meta.timings.__main__ as mod
+from utils.timing_store import TaskTiming, TimingStore
+
+
+class TestMetaTimings(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db = Path(self._tmp.name) / "timings.sqlite"
+        with TimingStore(self.db) as store:
+            for seconds in (5.0, 5.0, 5.0, 9.0):
+                run_id = store.start_run(git_commit="abcdef1234567")
+                store.finish_run(
+                    run_id,
+                    [TaskTiming("h1", "web-app-foo", "pull", "", seconds, "ok")],
+                    status="ok",
+                )
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _main(self, *argv):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            rc = mod.main(["--db", str(self.db), *argv])
+        return rc, out.getvalue()
+
+    def test_slowest_and_trend(self):
+        rc, out = self._main("slowest")
+        self.assertEqual(rc, 0)
+        self.assertIn("web-app-foo", out)
+
+        rc, out = self._main("trend", "web-app-foo")
+        self.assertEqual(rc, 0)
+        self.assertEqual(out.count("abcdef1234"), 4)
+
+    def test_regressions_strict_exit_code(self):
+        rc, out = self._main("regressions")
+        self.assertEqual(rc, 0)
+        self.assertIn("80%", out)
+        self.assertIn("web-app-foo / pull", out)
+
+        rc, _ = self._main("regressions", "--strict")
+        self.assertEqual(rc, 1)
+
+    def test_missing_database(self):
+        rc = mod.main(["--db", str(Path(self._tmp.name) / "none.sqlite"), "slowest"])
+        self.assertEqual(rc, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
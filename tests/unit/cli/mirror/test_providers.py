@@ -1,9 +1,65 @@
 from __future__ import annotations
 
+import json
+import subprocess
+import threading
 import unittest
+from typing import Dict, List
+from unittest.mock import patch
 
 from cli.mirror.model import ImageRef
-from cli.mirror.providers import GHCRProvider
+from cli.mirror.providers import GHCRProvider, GiteaProvider
+
+
+class FakeRegistry:
+    """
+    Answers the skopeo calls of the providers from an in-memory
+    {repository: {tag: raw manifest}} store, like a local registry:2.
+    """
+
+    def __init__(self, repos: Dict[str, Dict[str, bytes]]) -> None:
+        self.repos = repos
+        self.calls: List[List[str]] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _split(ref: str) -> tuple[str, str]:
+        ref = ref.removeprefix("docker://")
+        repo, _, tag = ref.rpartition(":")
+        return repo, tag
+
+    def run(self, cmd, **kwargs):
+        with self._lock:
+            self.calls.append(list(cmd))
+        text = kwargs.get("text", False)
+
+        def _done(rc: int, out: str | bytes = ""):
+            if text and isinstance(out, bytes):
+                out = out.decode()
+            if not text and isinstance(out, str):
+                out = out.encode()
+            return subprocess.CompletedProcess(cmd, rc, stdout=out, stderr="")
+
+        if cmd[:2] == ["skopeo", "list-tags"]:
+            repo = cmd[2].removeprefix("docker://")
+            if repo not in self.repos:
+                return _done(1)
+            return _done(
+                0, json.dumps({"Repository": repo, "Tags": list(self.repos[repo])})
+            )
+        if cmd[:3] == ["skopeo", "inspect", "--raw"]:
+            repo, tag = self._split(cmd[3])
+            manifest = self.repos.get(repo, {}).get(tag)
+            return _done(1) if manifest is None else _done(0, manifest)
+        if cmd[:2] == ["skopeo", "copy"]:
+            repo, tag = self._split(cmd[-1])
+            src_repo, src_tag = self._split(cmd[-2])
+            self.repos.setdefault(repo, {})[tag] = self.repos[src_repo][src_tag]
+            return _done(0)
+        raise AssertionError(f"unexpected command: {cmd}")
+
+    def count(self, *prefix: str) -> int:
+        return sum(1 for c in self.calls if c[: len(prefix)] == list(prefix))
 
 
 class TestGHCRProviderImageBase(unittest.TestCase):
@@ -60,5 +116,64 @@ class TestGHCRProviderImageBase(unittest.TestCase):
         self.assertEqual(provider.repository, "myrepo")
 
 
+class TestProviderTagCache(unittest.TestCase):
+    DEST = "ghcr.io/acme/myrepo/mirror/docker.io/nextcloud"
+
+    def _image(self, version: str) -> ImageRef:
+        return ImageRef(
+            role="web-app-nextcloud",
+            service="app",
+            name="nextcloud",
+            version=version,
+            source=f"docker.io/library/nextcloud:{version}",
+            registry="docker.io",
+        )
+
+    def _registry(self) -> FakeRegistry:
+        return FakeRegistry(
+            {
+                "docker.io/library/nextcloud": {"30": b"m30", "31": b"m31-new"},
+                self.DEST: {"30": b"m30", "31": b"m31-old"},
+            }
+        )
+
+    def test_lists_tags_once_per_repository(self) -> None:
+        registry = self._registry()
+        provider = GHCRProvider("acme", "myrepo")
+        with patch("cli.mirror.providers.subprocess.run", side_effect=registry.run):
+            self.assertTrue(provider.tag_exists(self._image("30")))
+            self.assertTrue(provider.tag_exists(self._image("31")))
+            self.assertFalse(provider.tag_exists(self._image("32")))
+
+        self.assertEqual(registry.count("skopeo", "list-tags"), 1)
+        self.assertEqual(registry.count("skopeo", "inspect"), 0)
+
+    def test_missing_repository_has_no_tags(self) -> None:
+        registry = FakeRegistry({})
+        provider = GiteaProvider("git.example.org", "acme")
+        with patch("cli.mirror.providers.subprocess.run", side_effect=registry.run):
+            self.assertFalse(provider.tag_exists(self._image("30")))
+
+    def test_mirrored_tag_is_remembered(self) -> None:
+        registry = self._registry()
+        provider = GHCRProvider("acme", "myrepo")
+        image = self._image("32")
+        registry.repos["docker.io/library/nextcloud"]["32"] = b"m32"
+        with patch("cli.mirror.providers.subprocess.run", side_effect=registry.run):
+            self.assertFalse(provider.tag_exists(image))
+            provider.mirror(image)
+            self.assertTrue(provider.tag_exists(image))
+
+        self.assertEqual(registry.count("skopeo", "list-tags"), 1)
+
+    def test_is_identical_compares_manifest_digests(self) -> None:
+        registry = self._registry()
+        provider = GHCRProvider("acme", "myrepo")
+        with patch("cli.mirror.providers.subprocess.run", side_effect=registry.run):
+            self.assertTrue(provider.is_identical(self._image("30")))
+            self.assertFalse(provider.is_identical(self._image("31")))
+            self.assertFalse(provider.is_identical(self._image("32")))
+
+
 if __name__ == "__main__":  # pragma: no cover
     unittest.main()
@@ -1,12 +1,40 @@
 from __future__ import annotations
 
+import json
+import subprocess
+import tempfile
+import threading
 import unittest
-from unittest.mock import patch
+from pathlib import Path
+from unittest.mock import MagicMock, patch
 
 from cli.mirror.model import ImageRef
 import cli.mirror.sync.__main__ as sync_main
 
 
+def _image(name: str, version: str = "1") -> ImageRef:
+    return ImageRef(
+        role=f"web-app-{name}",
+        service=name,
+        name=name,
+        version=version,
+        source=f"docker.io/library/{name}:{version}",
+        registry="docker.io",
+    )
+
+
+def _fail_on_bad(img: ImageRef) -> None:
+    if img.name == "bad":
+        raise subprocess.CalledProcessError(1, ["skopeo", "copy"])
+
+
+def _provider() -> MagicMock:
+    provider = MagicMock()
+    provider.image_base.side_effect = lambda img: f"ghcr.io/acme/r/mirror/{img.name}"
+    provider.tag_exists.return_value = False
+    return provider
+
+
 class TestMirrorSync(unittest.TestCase):
     def test_only_missing_skips_existing_destination(self) -> None:
         image = ImageRef(
@@ -47,6 +75,188 @@ class TestMirrorSync(unittest.TestCase):
         mock_tag_exists.assert_called_once_with(image)
         mock_mirror.assert_not_called()
 
+    def test_summary_records_every_outcome(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            summary_path = Path(tmp) / "summary.json"
+            with (
+                patch(
+                    "cli.mirror.sync.__main__.iter_role_images",
+                    return_value=[_image("ok"), _image("bad")],
+                ),
+                patch.object(
+                    sync_main.GHCRProvider, "mirror", side_effect=_fail_on_bad
+                ),
+                patch(
+                    "sys.argv",
+                    [
+                        "mirror-sync",
+                        "--ghcr-namespace",
+                        "acme",
+                        "--ghcr-repository",
+                        "myrepo",
+                        "--summary",
+                        str(summary_path),
+                    ],
+                ),
+            ):
+                result = sync_main.main()
+
+            summary = json.loads(summary_path.read_text(encoding="utf-8"))
+
+        self.assertEqual(result, 1)
+        self.assertEqual(
+            (summary["total"], summary["mirrored"], summary["failed"]), (2, 1, 1)
+        )
+        by_image = {entry["image"]: entry for entry in summary["images"]}
+        self.assertEqual(by_image["ok:1"]["status"], "mirrored")
+        self.assertEqual(by_image["bad:1"]["status"], "failed")
+        self.assertIn("exit=1", by_image["bad:1"]["error"])
+
+    def test_shared_images_are_mirrored_once(self) -> None:
+        shared = _image("nginx", "alpine")
+        other_role = ImageRef(
+            role="web-app-other",
+            service="proxy",
+            name=shared.name,
+            version=shared.version,
+            source=shared.source,
+            registry=shared.registry,
+        )
+        with (
+            patch(
+                "cli.mirror.sync.__main__.iter_role_images",
+                return_value=[shared, other_role],
+            ),
+            patch.object(sync_main.GHCRProvider, "mirror") as mock_mirror,
+            patch(
+                "sys.argv",
+                [
+                    "mirror-sync",
+                    "--ghcr-namespace",
+                    "acme",
+                    "--ghcr-repository",
+                    "myrepo",
+                ],
+            ),
+        ):
+            result = sync_main.main()
+
+        self.assertEqual(result, 0)
+        mock_mirror.assert_called_once()
+
+
+class TestMirrorImages(unittest.TestCase):
+    def test_runs_copies_concurrently_and_keeps_input_order(self) -> None:
+        provider = _provider()
+        barrier = threading.Barrier(3, timeout=5)
+        provider.mirror.side_effect = lambda img: barrier.wait()
+
+        images = [_image("a"), _image("b"), _image("c")]
+        results = sync_main.mirror_images(provider, images, jobs=3)
+
+        # All three copies were in flight at the same time, or the barrier
+        # would have timed out and the copies failed.
+        self.assertEqual([r.status for r in results], ["mirrored"] * 3)
+        self.assertEqual([r.image for r in results], ["a:1", "b:1", "c:1"])
+
+    def test_only_missing_does_not_consume_rate_tokens(self) -> None:
+        provider = _provider()
+        provider.tag_exists.side_effect = lambda img: img.name != "new"
+        bucket = MagicMock(return_value=MagicMock(acquire=MagicMock(return_value=0)))
+
+        with patch("cli.mirror.sync.__main__.TokenBucket", bucket):
+            results = sync_main.mirror_images(
+                provider,
+                [_image("old"), _image("new")],
+                jobs=2,
+                copies_per_minute=30,
+                only_missing=True,
+            )
+
+        self.assertEqual([r.status for r in results], ["skipped", "mirrored"])
+        bucket.assert_called_once_with(0.5, capacity=2)
+        self.assertEqual(bucket.return_value.acquire.call_count, 1)
+        provider.mirror.assert_called_once()
+
+    def test_images_per_hour_keeps_copies_spaced(self) -> None:
+        bucket = MagicMock(return_value=MagicMock(acquire=MagicMock(return_value=0)))
+        with (
+            patch(
+                "cli.mirror.sync.__main__.iter_role_images",
+                return_value=[_image("a"), _image("b")],
+            ),
+            patch.object(sync_main.GHCRProvider, "mirror"),
+            patch("cli.mirror.sync.__main__.TokenBucket", bucket),
+            patch(
+                "sys.argv",
+                [
+                    "mirror-sync",
+                    "--ghcr-namespace",
+                    "acme",
+                    "--ghcr-repository",
+                    "myrepo",
+                    "--jobs",
+                    "4",
+                    "--images-per-hour",
+                    "120",
+                ],
+            ),
+        ):
+            result = sync_main.main()
+
+        self.assertEqual(result, 0)
+        # 120/h = 2/min; no burst beyond a single copy.
+        bucket.assert_called_once_with(2 / 60.0, capacity=1)
+
+    def test_skip_identical_skips_unchanged_tags(self) -> None:
+        provider = _provider()
+        provider.is_identical.side_effect = lambda img, before_source: (
+            img.name == "same"
+        )
+
+        results = sync_main.mirror_images(
+            provider, [_image("same"), _image("moved")], jobs=1, skip_identical=True
+        )
+
+        self.assertEqual([r.status for r in results], ["skipped", "mirrored"])
+        provider.mirror.assert_called_once()
+
+    def test_source_digest_lookup_waits_for_a_rate_token(self) -> None:
+        events: list[str] = []
+        bucket = MagicMock(
+            return_value=MagicMock(
+                acquire=MagicMock(side_effect=lambda: events.append("acquire") or 0)
+            )
+        )
+
+        def digest(ref: str) -> str:
+            if ref.startswith("docker://ghcr.io/"):
+                events.append("destination")
+                return "sha256:old"
+            events.append("source")
+            return "sha256:new"
+
+        provider = sync_main.GHCRProvider("acme", "myrepo")
+        images = [_image("a"), _image("b")]
+        with (
+            patch.object(provider, "tags", return_value=frozenset({"1"})),
+            patch.object(provider, "mirror") as mock_mirror,
+            patch("cli.mirror.providers.manifest_digest", side_effect=digest),
+            patch("cli.mirror.sync.__main__.TokenBucket", bucket),
+        ):
+            results = sync_main.mirror_images(
+                provider,
+                images,
+                jobs=1,
+                copies_per_minute=1,
+                skip_identical=True,
+            )
+
+        self.assertEqual([r.status for r in results], ["mirrored"] * 2)
+        self.assertEqual(mock_mirror.call_count, 2)
+        # No source lookup before its token; the copy reuses that token.
+        self.assertEqual(events, ["destination", "acquire", "source"] * 2)
+
 
 if __name__ == "__main__":  # pragma: no cover
     unittest.main()
@@ -39,7 +39,7 @@ class TestValidateInventory(unittest.TestCase):
     def tearDown(self):
         shutil.rmtree(self.temp_dir)
 
-    def run_script(self, expected_code=0):
+    def run_script(self, expected_code=0, extra_args=()):
         result = subprocess.run(
             [
                 sys.executable,
@@ -47,6 +47,7 @@ class TestValidateInventory(unittest.TestCase):
                 str(self.inventory_dir),
                 "--roles-dir",
                 str(self.roles_dir),
+                *extra_args,
             ],
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
@@ -140,6 +141,49 @@ class TestValidateInventory(unittest.TestCase):
         result = self.run_script(expected_code=1)
         self.assertIn("Missing default for app1: services.extra_setting", result.stdout)
 
+    def test_vaulted_values_are_parsed_via_tag(self):
+        (self.inventory_dir / "host_vars").mkdir()
+        (self.inventory_dir / "host_vars" / "localhost.yml").write_text(
+            "applications:\n"
+            "  app1:\n"
+            "    credentials:\n"
+            "      secret: !vault |\n"
+            "        $ANSIBLE_VAULT;1.1;AES256\n"
+            "        6162636465\n"
+            "    services:\n"
+            "      port: 8080\n"
+            "      unknown_key: !vault |\n"
+            "        $ANSIBLE_VAULT;1.1;AES256\n"
+            "        6162636465\n",
+            encoding="utf-8",
+        )
+
+        result = self.run_script(expected_code=1)
+        self.assertNotIn("Could not parse", result.stderr)
+        self.assertIn("Missing default for app1: services.unknown_key", result.stdout)
+        self.assertNotIn("credentials", result.stdout)
+
+    def test_parallel_workers_report_all_files_in_order(self):
+        group_vars = self.inventory_dir / "group_vars"
+        group_vars.mkdir()
+        for name in ("a", "b", "c"):
+            (group_vars / f"{name}.yml").write_text(
+                dump_yaml_str(
+                    {"applications": {"app1": {"services": {f"extra_{name}": 1}}}}
+                ),
+                encoding="utf-8",
+            )
+
+        result = self.run_script(expected_code=1, extra_args=("--workers", "3"))
+        reported = [
+            line for line in result.stdout.splitlines() if "Missing default" in line
+        ]
+        self.assertEqual(len(reported), 3)
+        self.assertEqual(
+            [line.rsplit(".", 1)[-1] for line in reported],
+            ["extra_a", "extra_b", "extra_c"],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
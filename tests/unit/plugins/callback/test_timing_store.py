@@ -0,0 +1,100 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from plugins.callback.timing_store import CallbackModule
+from utils.timing_store import TIMINGS_DB_ENV, TimingStore
+
+
+class _FakeRole:
+    def __init__(self, name):
+        self._name = name
+
+    def get_name(self, include_role_fqcn=True):
+        return self._name
+
+
+class _FakeTask:
+    def __init__(self, uuid, name, role=None):
+        self._uuid = uuid
+        self.name = name
+        self._role = _FakeRole(role) if role else None
+
+    def get_name(self):
+        return f"{self._role._name} : {self.name}" if self._role else self.name
+
+    def get_path(self):
+        return f"roles/x/tasks/main.yml:{self._uuid}"
+
+
+class _FakeHost:
+    def __init__(self, name):
+        self._name = name
+
+    def get_name(self):
+        return self._name
+
+
+def _result(host, task):
+    return SimpleNamespace(_host=host, _task=task)
+
+
+class TestTimingStoreCallback(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db = Path(self._tmp.name) / "timings.sqlite"
+        env = patch.dict(os.environ, {TIMINGS_DB_ENV: str(self.db)})
+        env.start()
+        self.addCleanup(env.stop)
+        self.addCleanup(self._tmp.cleanup)
+
+    def test_records_run_and_task_timings(self):
+        cb = CallbackModule()
+        play = SimpleNamespace(
+            get_variable_manager=lambda: SimpleNamespace(
+                extra_vars={"allowed_applications": "web-app-b,web-app-a"}
+            )
+        )
+        host = _FakeHost("h1")
+        ok_task = _FakeTask("1", "Pull images", role="web-app-a")
+        skipped_task = _FakeTask("2", "Maybe", role="web-app-a")
+        failed_task = _FakeTask("3", "Probe")
+
+        with patch(
+            "plugins.callback.timing_store.current_git_commit", return_value="c0ffee"
+        ):
+            cb.v2_playbook_on_start(SimpleNamespace(_file_name="/repo/playbook.yml"))
+            cb.v2_playbook_on_play_start(play)
+
+        for task in (ok_task, skipped_task, failed_task):
+            cb.v2_runner_on_start(host, task)
+        cb.v2_runner_on_ok(_result(host, ok_task))
+        cb.v2_runner_on_skipped(_result(host, skipped_task))
+        cb.v2_runner_on_failed(_result(host, failed_task), ignore_errors=True)
+        cb.v2_playbook_on_stats(SimpleNamespace(failures={}, dark={}))
+
+        with TimingStore(self.db) as store:
+            runs = store._conn.execute(
+                "SELECT git_commit, playbook, applications, status FROM runs"
+            ).fetchall()
+            rows = store._conn.execute(
+                "SELECT host, role, task, status FROM task_timings ORDER BY task"
+            ).fetchall()
+
+        self.assertEqual(
+            runs, [("c0ffee", "playbook.yml", "web-app-a,web-app-b", "ok")]
+        )
+        self.assertEqual(
+            rows,
+            [
+                ("h1", "", "Probe", "ignored"),
+                ("h1", "web-app-a", "Pull images", "ok"),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
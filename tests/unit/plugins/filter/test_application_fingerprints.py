@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import unittest
+from unittest.mock import patch
+
+from ansible.errors import AnsibleFilterError
+
+from plugins.filter import application_fingerprints as f
+
+
+def _entity(app_id: str) -> str:
+    return app_id.split("-", 2)[-1]
+
+
+@patch.object(f, "get_entity_name", side_effect=_entity)
+class TestApplicationFingerprintFilters(unittest.TestCase):
+    PS = "nextcloud\trunning\tUp 3 hours (healthy)\nmatomo\texited\tExited (1) 1 hour ago\n"
+
+    def test_unchanged_applications(self, _):
+        fingerprints = {"web-app-nextcloud": "n", "web-app-matomo": "m"}
+        state = {
+            "web-app-nextcloud": {"fingerprint": "n", "containers": True},
+            "web-app-matomo": {"fingerprint": "m", "containers": True},
+        }
+        self.assertEqual(
+            f.unchanged_applications_filter(fingerprints, state, self.PS),
+            ["web-app-nextcloud"],
+        )
+
+    def test_missing_state_skips_nothing(self, _):
+        self.assertEqual(
+            f.unchanged_applications_filter({"web-app-nextcloud": "n"}, None, None),
+            [],
+        )
+
+    def test_state_records_only_allowed_applications(self, _):
+        state = f.application_fingerprint_state(
+            {"web-app-nextcloud": "n", "web-app-matomo": "m"},
+            {},
+            self.PS.splitlines(),
+            ["web-app-nextcloud", "web-app-matomo"],
+            ["web-app-nextcloud"],
+        )
+        self.assertEqual(
+            state, {"web-app-nextcloud": {"fingerprint": "n", "containers": True}}
+        )
+
+    def test_rejects_invalid_types(self, _):
+        with self.assertRaises(AnsibleFilterError):
+            f.unchanged_applications_filter(["web-app-x"], {}, "")
+        with self.assertRaises(AnsibleFilterError):
+            f.unchanged_applications_filter({}, {}, 42)
+
+
+if __name__ == "__main__":
+    unittest.main()
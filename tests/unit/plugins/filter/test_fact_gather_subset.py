@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import unittest
+
+from ansible.errors import AnsibleFilterError
+
+from plugins.filter.fact_gather_subset import fact_gather_subset
+
+
+class TestFactGatherSubset(unittest.TestCase):
+    def test_first_stage_gathers_min_and_hardware(self):
+        self.assertEqual(
+            fact_gather_subset(["min", "hardware"], []), ["!all", "min", "hardware"]
+        )
+
+    def test_only_missing_subsets_are_gathered(self):
+        self.assertEqual(
+            fact_gather_subset(["min", "hardware", "virtual"], ["min", "hardware"]),
+            ["!all", "!min", "virtual"],
+        )
+
+    def test_nothing_missing(self):
+        self.assertEqual(fact_gather_subset(["min"], ["min", "hardware"]), [])
+        self.assertEqual(fact_gather_subset(["hardware"], ["all"]), [])
+
+    def test_all(self):
+        self.assertEqual(fact_gather_subset(["all", "min"], ["min"]), ["all"])
+
+    def test_rejects_exclusions(self):
+        with self.assertRaises(AnsibleFilterError):
+            fact_gather_subset(["!hardware"])
+
+
+if __name__ == "__main__":
+    unittest.main()
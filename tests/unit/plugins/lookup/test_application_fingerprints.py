@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import unittest
+from unittest.mock import patch
+
+from plugins.lookup.application_fingerprints import LookupModule
+
+MODULE = "plugins.lookup.application_fingerprints"
+
+
+class TestApplicationFingerprintsLookup(unittest.TestCase):
+    def _run(self, terms, variables):
+        with (
+            patch(f"{MODULE}.get_merged_applications", return_value={"a": {}}),
+            patch(f"{MODULE}.application_fingerprints", return_value={"a": "f"}) as fp,
+        ):
+            result = LookupModule().run(terms, variables=variables)
+        return result, fp
+
+    def test_defaults_to_group_names(self):
+        result, fp = self._run([], {"group_names": ["a", "b"]})
+        self.assertEqual(result, [{"a": "f"}])
+        self.assertEqual(fp.call_args.args[0], ["a", "b"])
+        self.assertEqual(fp.call_args.args[1], {"a": {}})
+
+    def test_accepts_ids_and_lists(self):
+        _, fp = self._run(["a", ["b", "c"]], {"group_names": ["x"]})
+        self.assertEqual(fp.call_args.args[0], ["a", "b", "c"])
+
+
+if __name__ == "__main__":
+    unittest.main()
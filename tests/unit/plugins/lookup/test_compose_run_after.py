@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import unittest
+from unittest.mock import patch
+
+from ansible.errors import AnsibleError
+
+from plugins.lookup.compose_run_after import LookupModule
+
+MODULE = "plugins.lookup.compose_run_after"
+
+RUN_AFTER = {
+    "web-app-jira": ["web-app-keycloak", "web-app-matomo"],
+    "web-app-keycloak": ["svc-db-postgres"],
+    "svc-db-postgres": [],
+}
+
+
+class TestComposeRunAfterLookup(unittest.TestCase):
+    def _run(self, terms, variables):
+        with (
+            patch(f"{MODULE}.os.path.isfile", return_value=True),
+            patch(
+                f"{MODULE}.get_role_run_after",
+                side_effect=lambda path, role_name: RUN_AFTER.get(role_name, []),
+            ),
+            patch(
+                f"{MODULE}.get_entity_name",
+                side_effect=lambda app_id: app_id.rsplit("-", 1)[-1],
+            ),
+        ):
+            return LookupModule().run(terms, variables=variables)
+
+    def test_defaults_to_group_names_and_drops_foreign_edges(self):
+        result = self._run(
+            [],
+            {"group_names": ["web-app-jira", "web-app-keycloak", "svc-db-postgres"]},
+        )
+        # web-app-matomo is not deployed on the host, so jira only waits
+        # for keycloak.
+        self.assertEqual(result, [{"jira": ["keycloak"], "keycloak": ["postgres"]}])
+
+    def test_accepts_ids_and_lists(self):
+        result = self._run(["web-app-jira", ["web-app-matomo"]], {})
+        self.assertEqual(result, [{"jira": ["matomo"]}])
+
+    def test_invalid_run_after_raises_ansible_error(self):
+        with (
+            patch(f"{MODULE}.os.path.isfile", return_value=True),
+            patch(f"{MODULE}.get_role_run_after", side_effect=ValueError("bad")),
+        ):
+            with self.assertRaises(AnsibleError):
+                LookupModule().run(["web-app-jira"], variables={})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import unittest
+from unittest.mock import patch
+
+from plugins.lookup.image_prefetch import LookupModule
+
+MODULE = "plugins.lookup.image_prefetch"
+
+
+class TestImagePrefetchLookup(unittest.TestCase):
+    def _run(self, terms, variables):
+        with (
+            patch(f"{MODULE}.get_merged_applications", return_value={}),
+            patch(f"{MODULE}.get_role_run_after", return_value=[]),
+            patch(f"{MODULE}.os.path.isdir", return_value=True),
+            patch(f"{MODULE}.prefetch_images", return_value=["a:1"]) as plan,
+        ):
+            result = LookupModule().run(terms, variables=variables)
+        return result, plan
+
+    def test_defaults_to_applications_of_the_run(self):
+        result, plan = self._run(
+            [],
+            {
+                "group_names": [
+                    "web-app-a",
+                    "web-app-b",
+                    "web-app-c",
+                    "web-svc-d",
+                    "svc-db-postgres",
+                ],
+                "allowed_applications": ["web-app-a", "web-app-b", "web-svc-d"],
+                "UNCHANGED_APPLICATIONS": ["web-app-b"],
+            },
+        )
+        self.assertEqual(result, [["a:1"]])
+        self.assertEqual(plan.call_args.args[0], ["web-app-a", "web-svc-d"])
+
+    def test_accepts_ids_and_lists(self):
+        _, plan = self._run(["web-app-a", ["svc-db-postgres"]], {"group_names": []})
+        self.assertEqual(plan.call_args.args[0], ["web-app-a", "svc-db-postgres"])
+
+
+if __name__ == "__main__":
+    unittest.main()
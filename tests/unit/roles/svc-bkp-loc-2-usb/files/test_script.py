@@ -0,0 +1,166 @@
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+import types
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+def load_module():
+    """
+    Dynamically load roles/svc-bkp-loc-2-usb/files/script.py relative to
+    this test file.
+    """
+    here = Path(__file__).resolve()
+    # tests/unit/roles/svc-bkp-loc-2-usb/files -> up 5 levels to repo root
+    repo_root = here.parents[5]
+    target_path = repo_root / "roles" / "svc-bkp-loc-2-usb" / "files" / "script.py"
+    if not target_path.exists():
+        raise FileNotFoundError(f"Cannot find script at {target_path}")
+    module = types.ModuleType("backup_to_usb_script")
+    code = target_path.read_text(encoding="utf-8")
+    exec(compile(code, str(target_path), "exec"), module.__dict__)
+    return module
+
+
+class ManifestTests(unittest.TestCase):
+    def setUp(self):
+        self.mod = load_module()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.version = Path(self._tmp.name) / "20250101000000"
+        (self.version / "db").mkdir(parents=True)
+        (self.version / "a.txt").write_text("alpha")
+        (self.version / "db" / "dump.sql").write_text("select 1;")
+
+    def _manifest(self):
+        entries, _ = self.mod.build_manifest(str(self.version))
+        self.mod.write_manifest(str(self.version), entries)
+        return entries
+
+    def test_manifest_round_trip(self):
+        entries, hashed = self.mod.build_manifest(str(self.version))
+        self.assertEqual(hashed, 2)
+        self.mod.write_manifest(str(self.version), entries)
+
+        loaded = self.mod.load_manifest(str(self.version))
+        self.assertEqual(loaded, entries)
+        self.assertEqual(sorted(loaded), ["a.txt", os.path.join("db", "dump.sql")])
+        self.assertEqual(loaded["a.txt"].size, 5)
+
+    def test_manifest_does_not_list_itself(self):
+        self._manifest()
+        entries, _ = self.mod.build_manifest(str(self.version))
+        self.assertNotIn(self.mod.MANIFEST_NAME, entries)
+
+    def test_unchanged_files_reuse_previous_hashes(self):
+        previous = self._manifest()
+        (self.version / "a.txt").write_text("changed")
+
+        entries, hashed = self.mod.build_manifest(str(self.version), previous)
+
+        self.assertEqual(hashed, 1)
+        self.assertNotEqual(entries["a.txt"].hash, previous["a.txt"].hash)
+
+    def test_clean_version_verifies_without_hashing(self):
+        self._manifest()
+        with patch.object(self.mod, "file_hash") as file_hash:
+            report = self.mod.verify_version(str(self.version), sample_rate=0)
+
+        file_hash.assert_not_called()
+        self.assertTrue(report["ok"])
+        self.assertEqual(report["files"], 2)
+
+    def test_touched_file_with_same_content_is_ok(self):
+        self._manifest()
+        os.utime(self.version / "a.txt", ns=(0, 0))
+
+        report = self.mod.verify_version(str(self.version), sample_rate=0)
+
+        self.assertTrue(report["ok"])
+        self.assertEqual(report["rehashed"], 1)
+
+    def test_reports_missing_corrupt_and_unexpected_files(self):
+        self._manifest()
+        (self.version / "db" / "dump.sql").unlink()
+        (self.version / "a.txt").write_text("beta!")  # same size, new mtime
+        os.utime(self.version / "a.txt", ns=(0, 0))
+        (self.version / "new.txt").write_text("x")
+
+        report = self.mod.verify_version(str(self.version), sample_rate=0)
+
+        self.assertFalse(report["ok"])
+        self.assertEqual(report["missing"], [os.path.join("db", "dump.sql")])
+        self.assertEqual(report["corrupt"], ["a.txt"])
+        self.assertEqual(report["unexpected"], ["new.txt"])
+
+    def test_silent_corruption_is_found_by_sampling(self):
+        self._manifest()
+        path = self.version / "a.txt"
+        st = path.stat()
+        path.write_text("ALPHA")
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+        unsampled = self.mod.verify_version(str(self.version), sample_rate=0)
+        sampled = self.mod.verify_version(
+            str(self.version), sample_rate=1, rng=random.Random(0)
+        )
+
+        self.assertTrue(unsampled["ok"])
+        self.assertEqual(sampled["corrupt"], ["a.txt"])
+        self.assertEqual(sampled["sampled"], 2)
+
+    def test_verify_without_manifest_raises(self):
+        with self.assertRaises(FileNotFoundError):
+            self.mod.verify_version(str(self.version))
+
+
+class BackupTests(unittest.TestCase):
+    def setUp(self):
+        self.mod = load_module()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        root = Path(self._tmp.name)
+        self.source = root / "source"
+        self.source.mkdir()
+        (self.source / "a.txt").write_text("alpha")
+        (self.source / "b.txt").write_text("bravo")
+        self.usb = root / "usb"
+        self.usb.mkdir()
+
+    def _backup(self, version):
+        def fake_rsync(command, **kwargs):
+            # Copy with metadata like rsync -a would.
+            shutil.copytree(self.source, command[-1], dirs_exist_ok=True)
+            return ""
+
+        machine_id = subprocess.CompletedProcess([], 0, stdout="f" * 64 + "  -\n")
+        with (
+            patch.object(subprocess, "run", return_value=machine_id),
+            patch.object(subprocess, "check_output", side_effect=fake_rsync),
+            patch.object(self.mod.datetime, "datetime") as fake_datetime,
+        ):
+            fake_datetime.now.return_value.strftime.return_value = version
+            fake_datetime.now.return_value.isoformat.return_value = "now"
+            self.assertEqual(self.mod.backup(str(self.source), str(self.usb)), 0)
+        return self.usb / ("f" * 64) / "svc-bkp-loc-2-usb" / version
+
+    def test_backup_writes_manifest_incrementally(self):
+        first = self._backup("20250101000000")
+        self.assertEqual(sorted(self.mod.load_manifest(str(first))), ["a.txt", "b.txt"])
+
+        (self.source / "b.txt").write_text("bravo, changed")
+        os.utime(first, (1, 1))  # make sure the first version is the previous one
+        with patch.object(self.mod, "file_hash", wraps=self.mod.file_hash) as hashing:
+            second = self._backup("20250102000000")
+
+        hashed = [Path(c.args[0]).name for c in hashing.call_args_list]
+        self.assertEqual(hashed, ["b.txt"])
+        self.assertTrue(self.mod.verify_version(str(second), sample_rate=0)["ok"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,11 @@
-import unittest
+import json
+import os
+import subprocess
+import tempfile
 import types
+import unittest
 from pathlib import Path
 from unittest.mock import patch
-import subprocess
-import os
 
 
 def load_module():
@@ -43,6 +45,20 @@ class PullSpecificHostTests(unittest.TestCase):
         self.last_local = f"{self.type_dir}20250101000000"
         self.last_remote = f"{self.type_dir}20250202000000"
 
+        self.rsync_commands = []
+        self.rsync_exit_codes = []
+
+    def _ssh(self, cmd, remote_command):
+        """True if `cmd` runs `remote_command` on the host through ssh."""
+        return cmd.startswith("ssh ") and cmd.endswith(
+            f'"{self.remote}" {remote_command}'
+        )
+
+    def _rsync(self, cmd, returncode):
+        self.rsync_commands.append(cmd)
+        stdout = "Total bytes received: 1,234\n" if returncode == 0 else ""
+        return self._completed(stdout=stdout, returncode=returncode)
+
     def _completed(self, stdout="", returncode=0):
         return subprocess.CompletedProcess(
             args="mock", returncode=returncode, stdout=stdout, stderr=""
@@ -53,11 +69,11 @@ class PullSpecificHostTests(unittest.TestCase):
     ):
         cmd = command if isinstance(command, str) else " ".join(command)
 
-        if cmd.startswith(f'ssh "{self.remote}" sha256sum /etc/machine-id'):
+        if self._ssh(cmd, "sha256sum /etc/machine-id"):
             return self._completed(stdout=f"{self.hash64}  /etc/machine-id\n")
 
-        if cmd.startswith(
-            f'ssh "{self.remote}" "find {self.base} -maxdepth 1 -type d -execdir basename {{}} ;"'
+        if self._ssh(
+            cmd, f'"find {self.base} -maxdepth 1 -type d -execdir basename {{}} ;"'
         ):
             # find returns the machine-id dir itself and then the backup type dir
             return self._completed(stdout=f"{self.hash64}\n{self.backup_type}\n")
@@ -65,8 +81,8 @@ class PullSpecificHostTests(unittest.TestCase):
         if cmd.startswith(f"ls -d {self.type_dir}* | tail -1"):
             return self._completed(stdout=self.last_local)
 
-        if cmd.startswith(
-            f'ssh "{self.remote}" "ls -d {self.backups_dir}/{self.hash64}/{self.backup_type}/*"'
+        if self._ssh(
+            cmd, f'"ls -d {self.backups_dir}/{self.hash64}/{self.backup_type}/*"'
         ):
             return self._completed(stdout=f"{self.last_remote}\n")
 
@@ -77,14 +93,14 @@ class PullSpecificHostTests(unittest.TestCase):
     ):
         cmd = command if isinstance(command, str) else " ".join(command)
 
-        if cmd.startswith(
-            f'ssh "{self.remote}" "find {self.base} -maxdepth 1 -type d -execdir basename {{}} ;"'
+        if self._ssh(
+            cmd, f'"find {self.base} -maxdepth 1 -type d -execdir basename {{}} ;"'
         ):
             raise subprocess.CalledProcessError(
                 returncode=1, cmd=cmd, output="", stderr="find: error"
             )
 
-        if cmd.startswith(f'ssh "{self.remote}" sha256sum /etc/machine-id'):
+        if self._ssh(cmd, "sha256sum /etc/machine-id"):
             return self._completed(stdout=f"{self.hash64}  /etc/machine-id\n")
 
         return self._completed(stdout="")
@@ -94,11 +110,11 @@ class PullSpecificHostTests(unittest.TestCase):
     ):
         cmd = command if isinstance(command, str) else " ".join(command)
 
-        if cmd.startswith(f'ssh "{self.remote}" sha256sum /etc/machine-id'):
+        if self._ssh(cmd, "sha256sum /etc/machine-id"):
             return self._completed(stdout=f"{self.hash64}  /etc/machine-id\n")
 
-        if cmd.startswith(
-            f'ssh "{self.remote}" "find {self.base} -maxdepth 1 -type d -execdir basename {{}} ;"'
+        if self._ssh(
+            cmd, f'"find {self.base} -maxdepth 1 -type d -execdir basename {{}} ;"'
         ):
             # No backup types found
             return self._completed(stdout="")
@@ -113,11 +129,11 @@ class PullSpecificHostTests(unittest.TestCase):
         """
         cmd = command if isinstance(command, str) else " ".join(command)
 
-        if cmd.startswith(f'ssh "{self.remote}" sha256sum /etc/machine-id'):
+        if self._ssh(cmd, "sha256sum /etc/machine-id"):
             return self._completed(stdout=f"{self.hash64}  /etc/machine-id\n")
 
-        if cmd.startswith(
-            f'ssh "{self.remote}" "find {self.base} -maxdepth 1 -type d -execdir basename {{}} ;"'
+        if self._ssh(
+            cmd, f'"find {self.base} -maxdepth 1 -type d -execdir basename {{}} ;"'
         ):
             return self._completed(stdout=f"{self.hash64}\n{self.backup_type}\n")
 
@@ -125,93 +141,139 @@ class PullSpecificHostTests(unittest.TestCase):
             # local previous backup exists (doesn't matter)
             return self._completed(stdout=self.last_local)
 
-        if cmd.startswith(
-            f'ssh "{self.remote}" "ls -d {self.backups_dir}/{self.hash64}/{self.backup_type}/*"'
+        if self._ssh(
+            cmd, f'"ls -d {self.backups_dir}/{self.hash64}/{self.backup_type}/*"'
         ):
             # no remote backups
             return self._completed(stdout="")
 
         return self._completed(stdout="")
 
-    @patch("time.sleep", new=lambda *a, **k: None)
-    @patch.object(os, "makedirs")
-    @patch.object(os, "system")
-    @patch.object(subprocess, "run")
-    def test_success_rsync_zero_exit(self, mock_run, mock_system, _mkd):
-        mock_run.side_effect = self._run_side_effect_success
-        mock_system.return_value = 0
+    def _pull(self, side_effect, **kwargs):
+        def run(command, *args, **kw):
+            if command.startswith("rsync "):
+                code = self.rsync_exit_codes.pop(0) if self.rsync_exit_codes else 0
+                return self._rsync(command, code)
+            return side_effect(command, *args, **kw)
+
+        with (
+            patch.object(subprocess, "run", side_effect=run),
+            patch.object(os, "makedirs"),
+            patch("time.sleep") as sleep,
+        ):
+            reports = self.mod.pull_backups(self.host, self.backups_dir, **kwargs)
+        self.sleeps = [c.args[0] for c in sleep.call_args_list]
+        return reports
 
+    def test_success_rsync_zero_exit(self):
         # should not raise
-        self.mod.pull_backups(self.host, self.backups_dir)
-
-        self.assertTrue(mock_system.called, "rsync (os.system) should be called")
+        reports = self._pull(self._run_side_effect_success)
+
+        self.assertEqual(len(self.rsync_commands), 1, "rsync should be called")
+        self.assertEqual(len(reports), 1)
+        self.assertEqual(reports[0].backup_type, self.backup_type)
+        self.assertEqual(reports[0].status, "succeeded")
+        self.assertEqual(reports[0].bytes, 1234)
+        self.assertEqual(reports[0].retries, 0)
+
+    def test_rsync_reuses_the_ssh_control_connection(self):
+        self._pull(self._run_side_effect_success)
+
+        rsync = self.rsync_commands[0]
+        self.assertIn("-o ControlMaster=auto", rsync)
+        self.assertIn("-o ControlPath=", rsync)
+        self.assertIn("--partial", rsync)
+        self.assertIn(f'--link-dest="{self.last_local}"', rsync)
+        self.assertNotIn("--bwlimit", rsync)
+
+    def test_bandwidth_budget_is_split_between_transfers(self):
+        second_type = "backup-other"
+
+        def side_effect(command, *args, **kwargs):
+            if self._ssh(
+                command,
+                f'"find {self.base} -maxdepth 1 -type d -execdir basename {{}} ;"',
+            ):
+                return self._completed(
+                    stdout=f"{self.hash64}\n{self.backup_type}\n{second_type}\n"
+                )
+            if self._ssh(
+                command,
+                f'"ls -d {self.backups_dir}/{self.hash64}/{second_type}/*"',
+            ):
+                return self._completed(
+                    stdout=f"{self.base}{second_type}/20250202000000\n"
+                )
+            return self._run_side_effect_success(command, *args, **kwargs)
+
+        reports = self._pull(side_effect, jobs=2, bwlimit=1000)
 
-    @patch("time.sleep", new=lambda *a, **k: None)
-    @patch.object(os, "makedirs")
-    @patch.object(os, "system")
-    @patch.object(subprocess, "run")
-    def test_no_backup_types_exit_zero(self, mock_run, mock_system, _mkd):
-        mock_run.side_effect = self._run_side_effect_no_types
-        mock_system.return_value = 0
+        self.assertEqual(
+            [r.backup_type for r in reports], [self.backup_type, second_type]
+        )
+        self.assertEqual(len(self.rsync_commands), 2)
+        for rsync in self.rsync_commands:
+            self.assertIn("--bwlimit=500 ", rsync)
 
+    def test_no_backup_types_exit_zero(self):
         # should not raise
-        self.mod.pull_backups(self.host, self.backups_dir)
+        self._pull(self._run_side_effect_no_types)
 
-        self.assertFalse(
-            mock_system.called, "rsync should not be called when no types found"
+        self.assertEqual(
+            self.rsync_commands, [], "rsync should not be called when no types found"
         )
 
-    @patch("time.sleep", new=lambda *a, **k: None)
-    @patch.object(os, "makedirs")
-    @patch.object(os, "system")
-    @patch.object(subprocess, "run")
-    def test_find_failure_raises_called_process_error(
-        self, mock_run, mock_system, _mkd
-    ):
-        mock_run.side_effect = self._run_side_effect_find_fail
-        mock_system.return_value = 0
-
+    def test_find_failure_raises_called_process_error(self):
         with self.assertRaises(subprocess.CalledProcessError):
-            self.mod.pull_backups(self.host, self.backups_dir)
+            self._pull(self._run_side_effect_find_fail)
 
-        self.assertFalse(
-            mock_system.called, "rsync should not be called when find fails"
+        self.assertEqual(
+            self.rsync_commands, [], "rsync should not be called when find fails"
         )
 
-    @patch("time.sleep", new=lambda *a, **k: None)
-    @patch.object(os, "makedirs")
-    @patch.object(os, "system")
-    @patch.object(subprocess, "run")
-    def test_rsync_fails_after_retries_raises_runtime_error(
-        self, mock_run, mock_system, _mkd
-    ):
-        mock_run.side_effect = self._run_side_effect_success
-        mock_system.side_effect = [1] * 12  # 12 retries in the script
+    def test_rsync_fails_after_retries_raises_runtime_error(self):
+        self.rsync_exit_codes = [1] * 12  # 12 attempts in the script
 
         with self.assertRaises(RuntimeError):
-            self.mod.pull_backups(self.host, self.backups_dir)
+            self._pull(self._run_side_effect_success)
 
         self.assertEqual(
-            mock_system.call_count, 12, "rsync should have retried 12 times"
+            len(self.rsync_commands), 12, "rsync should have retried 12 times"
         )
 
-    @patch("time.sleep", new=lambda *a, **k: None)
-    @patch.object(os, "makedirs")
-    @patch.object(os, "system")
-    @patch.object(subprocess, "run")
-    def test_no_remote_backups_raises_runtime_error(self, mock_run, mock_system, _mkd):
-        mock_run.side_effect = self._run_side_effect_no_remote_versions
-        mock_system.return_value = 0
+    def test_retries_back_off_exponentially(self):
+        self.rsync_exit_codes = [1, 1, 1, 0]
 
+        reports = self._pull(self._run_side_effect_success, base_delay=10)
+
+        self.assertEqual(self.sleeps, [10, 20, 40])
+        self.assertEqual(reports[0].status, "succeeded")
+        self.assertEqual(reports[0].retries, 3)
+
+    def test_retry_delay_is_capped(self):
+        self.assertEqual(self.mod.retry_delay(1, 30), 30)
+        self.assertEqual(self.mod.retry_delay(20, 30), self.mod.MAX_RETRY_DELAY)
+
+    def test_no_remote_backups_raises_runtime_error(self):
         with self.assertRaises(RuntimeError) as cm:
-            self.mod.pull_backups(self.host, self.backups_dir)
+            self._pull(self._run_side_effect_no_remote_versions)
 
         self.assertIn("No remote backups found", str(cm.exception))
-        self.assertFalse(
-            mock_system.called,
+        self.assertEqual(
+            self.rsync_commands,
+            [],
             "rsync should not be called when no remote backups exist",
         )
 
+    def test_report_is_written(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "report.json"
+            self._pull(self._run_side_effect_success, report_path=str(path))
+            report = json.loads(path.read_text(encoding="utf-8"))
+
+        self.assertEqual(report["host"], self.host)
+        self.assertEqual(report["transfers"][0]["bytes"], 1234)
+
 
 if __name__ == "__main__":
     unittest.main()
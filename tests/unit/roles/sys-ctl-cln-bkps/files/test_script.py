@@ -4,7 +4,9 @@ from __future__ import annotations
 import os
 import io
 import runpy
+import subprocess
 import sys
+import tempfile
 import unittest
 from contextlib import redirect_stdout
 from pathlib import Path
@@ -133,5 +135,89 @@ class TestSysCtlClnBkpsScript(unittest.TestCase):
         rmtree_mock.assert_not_called()
 
 
+class TestSysCtlClnBkpsScriptOnTree(unittest.TestCase):
+    """Runs the script against a real temporary backup tree."""
+
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.backup_dir = Path(self._tmp.name)
+        for app, versions in {"app-a": 4, "app-b": 2}.items():
+            for i in range(1, versions + 1):
+                (self.backup_dir / "host" / app / f"v{i}").mkdir(parents=True)
+        # Plain files next to the version directories are not versions.
+        (self.backup_dir / "host" / "app-a" / "notes.txt").write_text("x")
+
+    def _versions(self, app: str) -> list[str]:
+        return sorted(
+            p.name for p in (self.backup_dir / "host" / app).iterdir() if p.is_dir()
+        )
+
+    def _run_script(self, root: Path | None = None) -> str:
+        root = root or self.backup_dir
+
+        def disk_usage(_: str) -> SimpleNamespace:
+            # 15 % per version directory: 6 versions -> 90 %, 5 -> 75 %.
+            return SimpleNamespace(percent=15 * len(list(root.glob("*/*/v*"))))
+
+        fake_psutil = ModuleType("psutil")
+        fake_psutil.disk_usage = disk_usage
+        argv = [
+            "script.py",
+            "--maximum-backup-size-percent",
+            "75",
+            "--backups-folder-path",
+            str(root),
+        ]
+        buf = io.StringIO()
+        with (
+            patch.dict(sys.modules, {"psutil": fake_psutil}),
+            patch.object(sys, "argv", argv),
+            patch("time.time", return_value=0),
+            redirect_stdout(buf),
+        ):
+            runpy.run_path(str(SCRIPT_PATH), run_name="__main__")
+        return buf.getvalue()
+
+    def test_deletes_oldest_versions_above_average(self) -> None:
+        out = self._run_script()
+
+        # average = 6 versions / 2 applications = 3; app-a keeps 2 versions.
+        self.assertEqual(self._versions("app-a"), ["v3", "v4"])
+        self.assertEqual(self._versions("app-b"), ["v1", "v2"])
+        self.assertIn("Delete Iteration: 1", out)
+        self.assertNotIn("Delete Iteration: 2", out)
+        self.assertIn("Cleaning up finished.", out)
+
+    @unittest.skipUnless(os.path.isdir("/proc/self/fd"), "requires /proc")
+    def test_skips_versions_used_by_another_process(self) -> None:
+        busy = self.backup_dir / "host" / "app-a" / "v1"
+        proc = subprocess.Popen(["sleep", "30"], cwd=busy)
+        self.addCleanup(proc.wait)
+        self.addCleanup(proc.kill)
+
+        out = self._run_script()
+
+        self.assertIn(f"Directory {busy} is used by another process. Skipped.", out)
+        self.assertEqual(self._versions("app-a"), ["v1", "v3", "v4"])
+
+    @unittest.skipUnless(os.path.isdir("/proc/self/fd"), "requires /proc")
+    def test_skips_busy_versions_below_symlinked_backup_root(self) -> None:
+        link = Path(self._tmp.name + "-link")
+        link.symlink_to(self.backup_dir, target_is_directory=True)
+        self.addCleanup(link.unlink)
+        proc = subprocess.Popen(
+            ["sleep", "30"], cwd=self.backup_dir / "host" / "app-a" / "v1"
+        )
+        self.addCleanup(proc.wait)
+        self.addCleanup(proc.kill)
+
+        out = self._run_script(link)
+
+        busy = link / "host" / "app-a" / "v1"
+        self.assertIn(f"Directory {busy} is used by another process. Skipped.", out)
+        self.assertEqual(self._versions("app-a"), ["v1", "v3", "v4"])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,7 +1,9 @@
 # tests/unit/roles/sys-ctl-hlth-csp/files/test_script.py
 from __future__ import annotations
 
+import json
 import sys
+import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -399,5 +401,170 @@ class TestMain(unittest.TestCase):
         mock_run_checker.assert_not_called()
 
 
+class TestSharding(unittest.TestCase):
+    def test_split_shards_round_robin(self) -> None:
+        self.assertEqual(
+            script.split_shards(["a", "b", "c", "d", "e"], 2),
+            [["a", "c", "e"], ["b", "d"]],
+        )
+
+    def test_split_shards_never_returns_empty_shards(self) -> None:
+        self.assertEqual(script.split_shards(["a", "b"], 5), [["a"], ["b"]])
+        self.assertEqual(script.split_shards(["a"], 0), [["a"]])
+
+    @patch("script.run_checker")
+    def test_check_urls_runs_one_container_per_shard(
+        self, mock_run_checker: MagicMock
+    ) -> None:
+        mock_run_checker.return_value = 0
+
+        results = script.check_urls(
+            ["u1", "u2", "u3"], 2, isolate_failures=False, image="img:tag"
+        )
+
+        self.assertEqual(results, {"u1": 0, "u2": 0, "u3": 0})
+        shards = sorted(c.kwargs["urls"] for c in mock_run_checker.call_args_list)
+        self.assertEqual(shards, [["u1", "u3"], ["u2"]])
+        for call in mock_run_checker.call_args_list:
+            self.assertFalse(call.kwargs["always_pull"])
+            self.assertEqual(call.kwargs["image"], "img:tag")
+
+    @patch("script.run_checker")
+    def test_check_urls_isolates_failed_shards(
+        self, mock_run_checker: MagicMock
+    ) -> None:
+        mock_run_checker.side_effect = lambda urls, **_: 2 if "bad" in urls else 0
+
+        results = script.check_urls(
+            ["bad", "good", "other"], 2, isolate_failures=True, image="img:tag"
+        )
+
+        self.assertEqual(results, {"bad": 2, "good": 0, "other": 0})
+
+    @patch("script.run_checker")
+    def test_check_urls_without_isolation_blames_the_whole_shard(
+        self, mock_run_checker: MagicMock
+    ) -> None:
+        mock_run_checker.side_effect = lambda urls, **_: 2 if "bad" in urls else 0
+
+        results = script.check_urls(
+            ["bad", "good", "other"], 2, isolate_failures=False, image="img:tag"
+        )
+
+        self.assertEqual(results, {"bad": 2, "good": 0, "other": 2})
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.dir = Path(self._tmp.name)
+
+    def test_cache_key_changes_with_conf_header_and_checker(self) -> None:
+        conf = self.dir / "example.com.conf"
+        conf.write_text("listen 443 ssl;")
+        key = script.domain_cache_key(conf, "default-src 'self'", "checker")
+
+        self.assertEqual(
+            key, script.domain_cache_key(conf, "default-src 'self'", "checker")
+        )
+        self.assertNotEqual(key, script.domain_cache_key(conf, "", "checker"))
+        self.assertNotEqual(
+            key, script.domain_cache_key(conf, "default-src 'self'", "other")
+        )
+        conf.write_text("listen 443 ssl; # changed")
+        self.assertNotEqual(
+            key, script.domain_cache_key(conf, "default-src 'self'", "checker")
+        )
+        self.assertIsNone(
+            script.domain_cache_key(self.dir / "missing.conf", "", "checker")
+        )
+
+    def test_round_trip_and_expiry(self) -> None:
+        path = self.dir / "sub" / "cache.json"
+        cache = script.ResultCache(str(path), max_age=100)
+        cache.record_pass("example.com", "k1", now=1000)
+        cache.save()
+
+        loaded = script.ResultCache(str(path), max_age=100)
+        self.assertTrue(loaded.is_fresh("example.com", "k1", now=1050))
+        self.assertFalse(loaded.is_fresh("example.com", "k2", now=1050))
+        self.assertFalse(loaded.is_fresh("example.com", "k1", now=1100))
+        loaded.forget("example.com")
+        self.assertFalse(loaded.is_fresh("example.com", "k1", now=1050))
+
+    def test_corrupt_cache_file_is_ignored(self) -> None:
+        path = self.dir / "cache.json"
+        path.write_text("{not json")
+        self.assertEqual(script.ResultCache(str(path)).entries, {})
+
+
+class TestMainWithCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.conf_dir = Path(self._tmp.name) / "servers"
+        self.conf_dir.mkdir()
+        for domain in ("a.example.com", "b.example.com"):
+            (self.conf_dir / f"{domain}.conf").write_text("listen 443 ssl;")
+        self.cache_file = Path(self._tmp.name) / "cache.json"
+
+    def _main(self, run_checker_rc) -> tuple[int, list]:
+        argv = [
+            "script.py",
+            "--nginx-config-dir",
+            str(self.conf_dir),
+            "--image",
+            "img:tag",
+            "--shards",
+            "2",
+            "--cache-file",
+            str(self.cache_file),
+        ]
+        with (
+            patch.object(script.sys, "argv", argv),
+            patch("script.fetch_csp_header", return_value="default-src 'self'"),
+            patch("script.run_checker") as mock_run_checker,
+        ):
+            mock_run_checker.side_effect = lambda urls, **_: run_checker_rc(urls)
+            with self.assertRaises(SystemExit) as cm:
+                script.main()
+        checked = sorted(
+            url for c in mock_run_checker.call_args_list for url in c.kwargs["urls"]
+        )
+        return cm.exception.code, checked
+
+    def test_unchanged_passed_domains_are_skipped(self) -> None:
+        rc, checked = self._main(lambda urls: 0)
+        self.assertEqual(rc, 0)
+        self.assertEqual(checked, ["https://a.example.com/", "https://b.example.com/"])
+        self.assertEqual(
+            sorted(json.loads(self.cache_file.read_text())),
+            ["a.example.com", "b.example.com"],
+        )
+
+        rc, checked = self._main(lambda urls: 0)
+        self.assertEqual(rc, 0)
+        self.assertEqual(checked, [])
+
+    def test_changed_domain_is_checked_again(self) -> None:
+        self._main(lambda urls: 0)
+        (self.conf_dir / "b.example.com.conf").write_text("listen 443 ssl; # new")
+
+        _, checked = self._main(lambda urls: 0)
+
+        self.assertEqual(checked, ["https://b.example.com/"])
+
+    def test_failed_domains_are_not_cached(self) -> None:
+        rc, _ = self._main(lambda urls: 4 if "https://a.example.com/" in urls else 0)
+        self.assertEqual(rc, 4)
+        self.assertEqual(
+            list(json.loads(self.cache_file.read_text())), ["b.example.com"]
+        )
+
+        _, checked = self._main(lambda urls: 0)
+        self.assertEqual(checked, ["https://a.example.com/"])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,12 @@
 from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import io
 import os
+import shutil
+import ssl
+import subprocess
+import tempfile
+import threading
 import unittest
 import importlib.util
 from unittest.mock import patch
@@ -49,7 +55,7 @@ class TestStandaloneCheckerScript(unittest.TestCase):
 
     # ------------- Happy path / mismatches -------
 
-    @patch("requests.head")
+    @patch("requests.Session.head")
     def test_all_ok_returns_zero(self, mock_head):
         def head_side_effect(url, allow_redirects=False, timeout=10, verify=True):
             class R:
@@ -80,7 +86,7 @@ class TestStandaloneCheckerScript(unittest.TestCase):
         self.assertIn("ok1.example.org: OK", output)
         self.assertIn("ok2.example.org: OK", output)
 
-    @patch("requests.head")
+    @patch("requests.Session.head")
     def test_mismatches_counted(self, mock_head):
         def head_side_effect(url, allow_redirects=False, timeout=10, verify=True):
             class R:
@@ -112,7 +118,7 @@ class TestStandaloneCheckerScript(unittest.TestCase):
         self.assertEqual(exit_code, 1)
         self.assertIn("bad.example.org: ERROR: Expected [404]. Got 200.", output)
 
-    @patch("requests.head")
+    @patch("requests.Session.head")
     def test_non_list_values_sanitize_to_empty_and_fail(self, mock_head):
         # If a domain maps to a non-list, it becomes [] and is treated as a failure
         def head_side_effect(url, allow_redirects=False, timeout=10, verify=True):
@@ -141,6 +147,67 @@ class TestStandaloneCheckerScript(unittest.TestCase):
             "bar.example.org: ERROR: No expectations provided. Got 200.", output
         )
 
+    @patch("requests.Session.head")
+    def test_probes_run_concurrently(self, mock_head):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def head_side_effect(url, allow_redirects=False, timeout=10, verify=True):
+            # Only returns once all three probes are in flight.
+            barrier.wait()
+
+            class R:
+                status_code = 200
+
+            return R()
+
+        mock_head.side_effect = head_side_effect
+        exp = {f"d{i}.example.org": [200] for i in range(3)}
+        exit_code, output = self._run_main(
+            ["--workers", "3", "--expectations", self._to_json(exp)]
+        )
+        self.assertEqual(exit_code, 0)
+        # Output stays in domain order.
+        self.assertLess(output.index("d0.example.org"), output.index("d2.example.org"))
+
+    @patch("requests.Session.head")
+    def test_writes_prometheus_textfile(self, mock_head):
+        class R:
+            status_code = 200
+
+        mock_head.return_value = R()
+        exp = {"ok.example.org": [200], "bad.example.org": [301]}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "web_health.prom")
+            exit_code, _ = self._run_main(
+                [
+                    "--expectations",
+                    self._to_json(exp),
+                    "--prometheus-textfile",
+                    path,
+                ]
+            )
+            with open(path, encoding="utf-8") as fh:
+                metrics = fh.read()
+            leftovers = [f for f in os.listdir(tmp) if f != "web_health.prom"]
+
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(leftovers, [])
+        self.assertIn('infinito_web_health_up{domain="ok.example.org"} 1', metrics)
+        self.assertIn('infinito_web_health_up{domain="bad.example.org"} 0', metrics)
+        self.assertIn(
+            'infinito_web_health_status_code{domain="bad.example.org"} 200', metrics
+        )
+        self.assertIn("# TYPE infinito_web_health_latency_seconds gauge", metrics)
+        self.assertIn('infinito_web_health_latency_seconds{domain="ok', metrics)
+        self.assertIn("infinito_web_health_last_run_timestamp_seconds ", metrics)
+
+    def test_label_values_are_escaped(self):
+        result = self.script.ProbeResult(
+            domain='a"b\\c', expected=[200], status_code=200, latency_seconds=0.5
+        )
+        metrics = self.script.prometheus_metrics([result], 0)
+        self.assertIn('{domain="a\\"b\\\\c"} 0.5', metrics)
+
     # ------------- Helpers -----------------------
 
     def _run_main(self, argv):
@@ -156,5 +223,96 @@ class TestStandaloneCheckerScript(unittest.TestCase):
         return json.dumps(obj, separators=(",", ":"))
 
 
+class _Handler(BaseHTTPRequestHandler):
+    def do_HEAD(self):
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestProbeTimings(unittest.TestCase):
+    """Probes against local servers to check the recorded connection timings."""
+
+    @classmethod
+    def setUpClass(cls):
+        here = os.path.abspath(os.path.dirname(__file__))
+        repo_root = os.path.abspath(os.path.join(here, "..", "..", "..", "..", ".."))
+        cls.script = load_module_from_path(
+            "health_script_timings",
+            os.path.join(
+                repo_root, "roles", "sys-ctl-hlth-webserver", "files", "script.py"
+            ),
+        )
+
+    def _serve(self, context=None):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        if context is not None:
+            server.socket = context.wrap_socket(server.socket, server_side=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return f"127.0.0.1:{server.server_address[1]}"
+
+    def test_http_probe_records_latency_and_connect_time(self):
+        domain = self._serve()
+        with self.script.make_session(2) as session:
+            result = self.script.probe(session, "http", domain, [204], True)
+
+        self.assertTrue(result.ok, result)
+        self.assertIsNotNone(result.latency_seconds)
+        self.assertIsNotNone(result.tcp_connect_seconds)
+        self.assertIsNone(result.tls_handshake_seconds)
+
+    @unittest.skipUnless(shutil.which("openssl"), "openssl not found")
+    def test_https_probe_records_tls_handshake(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        cert = os.path.join(tmp.name, "cert.pem")
+        key = os.path.join(tmp.name, "key.pem")
+        subprocess.run(
+            [
+                "openssl",
+                "req",
+                "-x509",
+                "-newkey",
+                "rsa:2048",
+                "-nodes",
+                "-days",
+                "1",
+                "-subj",
+                "/CN=127.0.0.1",
+                "-addext",
+                "subjectAltName=IP:127.0.0.1",
+                "-keyout",
+                key,
+                "-out",
+                cert,
+            ],
+            check=True,
+            capture_output=True,
+        )
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert, key)
+        domain = self._serve(context)
+
+        with self.script.make_session(2) as session:
+            result = self.script.probe(session, "https", domain, [204], cert)
+
+        self.assertTrue(result.ok, result)
+        self.assertIsNotNone(result.tcp_connect_seconds)
+        self.assertIsNotNone(result.tls_handshake_seconds)
+        self.assertGreater(result.tls_handshake_seconds, 0)
+
+    def test_connection_error_is_reported(self):
+        domain = self._serve()
+        with self.script.make_session(1) as session:
+            result = self.script.probe(session, "https", domain, [204], True)
+
+        self.assertFalse(result.ok)
+        self.assertIn("error due to", result.message())
+
+
 if __name__ == "__main__":
     unittest.main()
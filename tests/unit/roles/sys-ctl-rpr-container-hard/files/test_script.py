@@ -1,5 +1,7 @@
-import unittest
+import os
 import sys
+import threading
+import unittest
 from pathlib import Path
 from importlib.util import spec_from_file_location, module_from_spec
 
@@ -121,6 +123,100 @@ class TestRepairDockerHard(unittest.TestCase):
             s.hard_restart_docker_services = old_restart
             sys.argv = sys_argv
 
+    def test_restart_waves_follow_order(self):
+        s = self.script
+        waves = s.restart_waves(
+            ["jira", "keycloak", "mailu", "matomo", "nextcloud"],
+            {
+                "jira": ["keycloak", "mailu"],
+                "keycloak": ["mailu"],
+                "nextcloud": ["not-deployed"],
+            },
+        )
+        self.assertEqual(
+            waves, [["mailu", "matomo", "nextcloud"], ["keycloak"], ["jira"]]
+        )
+
+    def test_restart_waves_ignore_cycles(self):
+        s = self.script
+        waves = s.restart_waves(["a", "b", "c"], {"a": ["b"], "b": ["a"]})
+        self.assertEqual(waves, [["a", "b", "c"]])
+
+    def test_is_settled(self):
+        s = self.script
+        self.assertTrue(s.is_settled("Up 3 minutes"))
+        self.assertTrue(s.is_settled("Up 3 minutes (healthy)"))
+        self.assertTrue(s.is_settled("Exited (0) 2 minutes ago"))
+        self.assertFalse(s.is_settled("Up 5 seconds (health: starting)"))
+        self.assertFalse(s.is_settled("Up 2 minutes (unhealthy)"))
+        self.assertFalse(s.is_settled("Exited (1) 2 minutes ago"))
+        self.assertFalse(s.is_settled("Restarting (1) 3 seconds ago"))
+
+    def test_restart_all_runs_waves_in_parallel_and_in_order(self):
+        s = self.script
+        # The first wave only passes the barrier if its three projects run
+        # at the same time.
+        first_wave = threading.Barrier(3, timeout=5)
+        lock = threading.Lock()
+        finished = []
+
+        def fake_hard_restart(dir_path):
+            name = os.path.basename(dir_path)
+            if name != "late":
+                first_wave.wait()
+            with lock:
+                finished.append(name)
+
+        old_restart = s.hard_restart_docker_services
+        try:
+            s.hard_restart_docker_services = fake_hard_restart
+            results = s.restart_all(
+                "/PARENT",
+                ["app1", "app2", "app3", "late"],
+                jobs=3,
+                order={"late": ["app1"]},
+            )
+        finally:
+            s.hard_restart_docker_services = old_restart
+
+        self.assertEqual(finished[-1], "late")
+        self.assertEqual([r.project for r in results], ["app1", "app2", "app3", "late"])
+        self.assertTrue(all(r.status == "restarted" for r in results))
+
+    def test_restart_project_reports_failures_and_health_timeout(self):
+        s = self.script
+
+        def failing_restart(dir_path):
+            raise s.subprocess.CalledProcessError(1, ["compose", "up", "-d"])
+
+        old_restart = s.hard_restart_docker_services
+        old_states = s.container_states
+        old_interval = s.HEALTH_POLL_INTERVAL
+        try:
+            s.hard_restart_docker_services = failing_restart
+            failed = s.restart_project("/PARENT/app1", health_timeout=10)
+
+            s.hard_restart_docker_services = lambda dir_path: None
+            s.HEALTH_POLL_INTERVAL = 0.01
+            s.container_states = lambda project: ["Up 1 second (health: starting)"]
+            unhealthy = s.restart_project("/PARENT/app2", health_timeout=0.05)
+
+            polls = iter(
+                [["Up 1 second (health: starting)"], ["Up 2 seconds (healthy)"]]
+            )
+            s.container_states = lambda project: next(polls)
+            healthy = s.restart_project("/PARENT/app3", health_timeout=10)
+        finally:
+            s.hard_restart_docker_services = old_restart
+            s.container_states = old_states
+            s.HEALTH_POLL_INTERVAL = old_interval
+
+        self.assertEqual(failed.status, "failed")
+        self.assertIsNotNone(failed.error)
+        self.assertEqual(unhealthy.status, "unhealthy")
+        self.assertEqual(healthy.status, "restarted")
+        self.assertEqual(healthy.project, "app3")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -167,6 +167,81 @@ class TestRepairDockerSoft(unittest.TestCase):
             s.print_bash = old_print_bash
             s.os.path.isfile = old_isfile2
 
+    def test_main_inspects_once_and_restarts_each_project_once(self):
+        s = self.script
+        cmd_log = []
+
+        def fake_print_bash(cmd):
+            cmd_log.append(cmd)
+            if cmd.startswith("container ps") and "health=unhealthy" in cmd:
+                return ["app1-web-1", "db-1"]
+            if cmd.startswith("container ps") and "status=exited" in cmd:
+                return ["app1-worker-1", "app1-web-1"]
+            if cmd.startswith("container inspect -f '{{ .Name }}"):
+                return [
+                    "/app1-web-1\tapp1\t/BASE/app1\tweb",
+                    "/db-1\tdb\t/BASE/db\t<no value>",
+                    "/app1-worker-1\tapp1\t/BASE/app1\tworker",
+                ]
+            return []
+
+        old_print_bash = s.print_bash
+        old_isfile = s.os.path.isfile
+        try:
+            s.print_bash = fake_print_bash
+            s.os.path.isfile = lambda path: (
+                path
+                in (
+                    "/BASE/app1/compose.yml",
+                    "/BASE/db/compose.yml",
+                )
+            )
+
+            errors = s.main("/BASE", manipulation_services=[], timeout=None)
+        finally:
+            s.print_bash = old_print_bash
+            s.os.path.isfile = old_isfile
+
+        self.assertEqual(errors, 0)
+        inspects = [c for c in cmd_log if c.startswith("container inspect")]
+        self.assertEqual(len(inspects), 1)
+        # Each failed container is inspected once, even if listed twice.
+        self.assertEqual(inspects[0].count("app1-web-1"), 1)
+
+        restart_cmds = [c for c in cmd_log if " restart" in c]
+        self.assertEqual(
+            restart_cmds,
+            [
+                'compose --chdir "/BASE/app1" --project "app1" restart web worker',
+                # No service label: the whole project is restarted.
+                'compose --chdir "/BASE/db" --project "db" restart',
+            ],
+        )
+
+    def test_group_by_project_falls_back_to_single_inspect(self):
+        s = self.script
+
+        def fake_print_bash(cmd):
+            if cmd.startswith("container inspect -f '{{ .Name }}"):
+                raise Exception("Error: No such object: gone-1")
+            if "working_dir" in cmd:
+                return ["/BASE/app1"]
+            if "compose.project" in cmd:
+                if cmd.split()[-1] == "gone-1":
+                    raise Exception("Error: No such object: gone-1")
+                return ["app1"]
+            return []
+
+        old_print_bash = s.print_bash
+        try:
+            s.print_bash = fake_print_bash
+            groups, errors = s.group_by_project(["app1-web-1", "gone-1"])
+        finally:
+            s.print_bash = old_print_bash
+
+        self.assertEqual(groups, {("app1", "/BASE/app1"): []})
+        self.assertEqual(errors, 1)
+
 
 if __name__ == "__main__":
     unittest.main()
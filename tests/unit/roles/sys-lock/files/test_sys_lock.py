@@ -0,0 +1,135 @@
+import types
+import unittest
+from pathlib import Path
+from importlib.util import spec_from_file_location, module_from_spec
+
+
+def load_script_module():
+    """
+    Import the script under test from roles/sys-lock/files/sys-lock.py
+    """
+    test_file = Path(__file__).resolve()
+    repo_root = test_file.parents[5]
+    script_path = repo_root / "roles" / "sys-lock" / "files" / "sys-lock.py"
+    spec = spec_from_file_location("sys_lock_script", str(script_path))
+    mod = module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(mod)  # type: ignore[attr-defined]
+    return mod
+
+
+class FakeSystemctl:
+    """Answers `systemctl show` from a list of {unit: state} rounds."""
+
+    def __init__(self, rounds):
+        self.rounds = list(rounds)
+        self.calls = []
+
+    def __call__(self, cmd, stdout=None):
+        self.calls.append(cmd)
+        states = self.rounds.pop(0) if len(self.rounds) > 1 else self.rounds[0]
+        units = cmd[cmd.index("--") + 1 :]
+        out = "\n\n".join(f"ActiveState={states.get(u, 'inactive')}" for u in units)
+        return types.SimpleNamespace(stdout=(out + "\n").encode("utf-8"))
+
+
+class TestSysLock(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.script = load_script_module()
+
+    def setUp(self):
+        s = self.script
+        self._old = (s.subprocess.run, s.time.sleep)
+        s.time.sleep = lambda _secs: None
+
+    def tearDown(self):
+        self.script.subprocess.run, self.script.time.sleep = self._old
+
+    def test_query_unit_states_uses_one_call(self):
+        s = self.script
+        fake = FakeSystemctl([{"a.service": "active", "b.service": "activating"}])
+        s.subprocess.run = fake
+
+        states = s.query_unit_states(["a.service", "b.service", "c.service"])
+
+        self.assertEqual(
+            states,
+            {"a.service": "active", "b.service": "activating", "c.service": "inactive"},
+        )
+        self.assertEqual(len(fake.calls), 1)
+        self.assertEqual(
+            fake.calls[0][:3], ["systemctl", "show", "--property=ActiveState"]
+        )
+
+    def test_unit_object_path(self):
+        s = self.script
+        self.assertEqual(
+            s.unit_object_path("dbus.service"),
+            "/org/freedesktop/systemd1/unit/dbus_2eservice",
+        )
+        self.assertEqual(
+            s.unit_object_path("sys-ctl-bkp.infinito.service"),
+            "/org/freedesktop/systemd1/unit/sys_2dctl_2dbkp_2einfinito_2eservice",
+        )
+        self.assertEqual(
+            s.unit_object_path("2fa.service"),
+            "/org/freedesktop/systemd1/unit/_32fa_2eservice",
+        )
+
+    def test_polling_waits_for_all_units_and_reports_wait_times(self):
+        s = self.script
+        fake = FakeSystemctl(
+            [
+                {"a": "active", "b": "activating"},
+                {"b": "active"},
+                {},
+            ]
+        )
+        s.subprocess.run = fake
+
+        waited = s.wait_for_all_services_to_stop(["a", "b", "c"], timeout_sec=60)
+
+        # One systemctl call per round, not one per unit.
+        self.assertEqual(len(fake.calls), 3)
+        self.assertEqual(set(waited), {"a", "b", "c"})
+        self.assertEqual(waited["c"], 0.0)
+        self.assertGreaterEqual(waited["b"], waited["a"])
+
+    def test_signals_replace_polling(self):
+        s = self.script
+        s.subprocess.run = FakeSystemctl([{"a": "active"}, {}])
+        s.time.sleep = lambda _secs: self.fail("must not poll with signals")
+        waits = []
+        signals = types.SimpleNamespace(wait=lambda timeout: waits.append(timeout))
+
+        s.wait_for_all_services_to_stop(["a"], timeout_sec=600, signals=signals)
+
+        self.assertEqual(len(waits), 1)
+        self.assertLessEqual(waits[0], s.SIGNAL_RECHECK_SECONDS)
+
+    def test_timeout_raises(self):
+        s = self.script
+        s.subprocess.run = FakeSystemctl([{"a": "active"}])
+
+        with self.assertRaises(s.AttemptException):
+            s.wait_for_all_services_to_stop(["a"], timeout_sec=0)
+
+    def test_open_without_jeepney_falls_back_to_polling(self):
+        s = self.script
+        old = s.open_dbus_connection
+        try:
+            s.open_dbus_connection = None
+            self.assertIsNone(s.UnitSignals.open(["a"]))
+
+            def broken(bus):
+                raise OSError("no bus")
+
+            s.open_dbus_connection = broken
+            self.assertIsNone(s.UnitSignals.open(["a"]))
+        finally:
+            s.open_dbus_connection = old
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 # tests/unit/roles/sys-svc-compose-ca/files/test_compose_ca_inject.py
 import importlib.util
 import json
+import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import patch
@@ -30,6 +31,17 @@ class TestComposeCaInject(unittest.TestCase):
             "compose_ca_inject_mod",
         )
 
+    def _inspected(self, entrypoint, cmd):
+        """Fake docker_images_inspect(): every image exists with this config."""
+
+        def fake(images, *, cwd, env):
+            return {
+                image: self.m.ImageInfo(f"sha256:{image}", entrypoint, cmd)
+                for image in images
+            }
+
+        return fake
+
     def test_normalize_cmd(self):
         self.assertEqual(self.m.normalize_cmd(["a", "b"]), ["a", "b"])
         self.assertEqual(self.m.normalize_cmd("echo hi"), ["/bin/sh", "-lc", "echo hi"])
@@ -390,7 +402,9 @@ class TestComposeCaInject(unittest.TestCase):
         with (
             patch.object(self.m, "ensure_image_available", return_value=None),
             patch.object(
-                self.m, "docker_image_inspect", return_value=(["/entry"], ["run"])
+                self.m,
+                "docker_images_inspect",
+                side_effect=self._inspected(["/entry"], ["run"]),
             ),
             patch.object(self.m, "docker_image_has_bin_sh", return_value=False),
         ):
@@ -441,8 +455,8 @@ class TestComposeCaInject(unittest.TestCase):
             patch.object(self.m, "ensure_image_available", return_value=None),
             patch.object(
                 self.m,
-                "docker_image_inspect",
-                return_value=(["/entry"], ["run", "--flag"]),
+                "docker_images_inspect",
+                side_effect=self._inspected(["/entry"], ["run", "--flag"]),
             ),
             patch.object(self.m, "docker_image_has_bin_sh", return_value=True),
         ):
@@ -478,8 +492,8 @@ class TestComposeCaInject(unittest.TestCase):
             patch.object(self.m, "ensure_image_available", return_value=None),
             patch.object(
                 self.m,
-                "docker_image_inspect",
-                return_value=(["/img-entry"], ["img-run"]),
+                "docker_images_inspect",
+                side_effect=self._inspected(["/img-entry"], ["img-run"]),
             ),
             patch.object(self.m, "docker_image_has_bin_sh", return_value=True),
         ):
@@ -533,8 +547,8 @@ class TestComposeCaInject(unittest.TestCase):
             patch.object(self.m, "ensure_image_available", return_value=None),
             patch.object(
                 self.m,
-                "docker_image_inspect",
-                return_value=(["/entry"], ["run"]),
+                "docker_images_inspect",
+                side_effect=self._inspected(["/entry"], ["run"]),
             ),
             patch.object(self.m, "docker_image_has_bin_sh", return_value=True),
         ):
@@ -572,7 +586,9 @@ class TestComposeCaInject(unittest.TestCase):
         with (
             patch.object(self.m, "ensure_image_available", return_value=None),
             patch.object(
-                self.m, "docker_image_inspect", return_value=(["/entry"], ["run"])
+                self.m,
+                "docker_images_inspect",
+                side_effect=self._inspected(["/entry"], ["run"]),
             ),
             patch.object(
                 self.m, "docker_image_has_bin_sh", return_value=True
@@ -706,8 +722,10 @@ class TestComposeCaInject(unittest.TestCase):
             patch.object(self.m, "ensure_image_available", return_value=None),
             patch.object(
                 self.m,
-                "docker_image_inspect",
-                return_value=([], ["sh", "-lc", 'exec "$CHESS_ENTRYPOINT_INT"']),
+                "docker_images_inspect",
+                side_effect=self._inspected(
+                    [], ["sh", "-lc", 'exec "$CHESS_ENTRYPOINT_INT"']
+                ),
             ),
             patch.object(self.m, "docker_image_has_bin_sh", return_value=True),
         ):
@@ -740,8 +758,10 @@ class TestComposeCaInject(unittest.TestCase):
             patch.object(self.m, "ensure_image_available", return_value=None),
             patch.object(
                 self.m,
-                "docker_image_inspect",
-                return_value=([], ["sh", "-lc", 'exec "$CHESS_ENTRYPOINT_INT"']),
+                "docker_images_inspect",
+                side_effect=self._inspected(
+                    [], ["sh", "-lc", 'exec "$CHESS_ENTRYPOINT_INT"']
+                ),
             ),
             patch.object(self.m, "docker_image_has_bin_sh", return_value=False),
         ):
@@ -857,5 +877,132 @@ class TestComposeCaInject(unittest.TestCase):
         )
 
 
+class TestComposeCaImageMetadata(unittest.TestCase):
+    def setUp(self):
+        self.m = _load_module(
+            "roles/sys-svc-compose-ca/files/compose_ca.py",
+            "compose_ca_inject_mod",
+        )
+        self.calls = []
+        # image -> inspect object; images not listed are missing
+        self.local = {}
+
+    def _inspect_obj(self, image):
+        return {
+            "Id": self.local[image],
+            "Config": {"Entrypoint": ["/entry"], "Cmd": [image]},
+        }
+
+    def fake_run(self, cmd, *, cwd, env):
+        self.calls.append(cmd)
+        if cmd[:3] == ["docker", "image", "inspect"]:
+            found = [self._inspect_obj(i) for i in cmd[3:] if i in self.local]
+            rc = 0 if len(found) == len(cmd[3:]) else 1
+            return rc, json.dumps(found), "" if rc == 0 else "No such image"
+        if cmd[:2] == ["docker", "compose"] and cmd[-2] == "pull":
+            service = cmd[-1]
+            self.local[f"{service}:1"] = f"sha256:{service}"
+            return 0, "", ""
+        if cmd[:2] == ["docker", "run"]:
+            return 0, "", ""
+        return 1, "", "unexpected"
+
+    def _count(self, prefix):
+        return len([c for c in self.calls if c[: len(prefix)] == prefix])
+
+    def test_docker_images_inspect_uses_one_call(self):
+        self.local = {"a:1": "sha256:a", "b:1": "sha256:b"}
+        with patch.object(self.m, "run", side_effect=self.fake_run):
+            infos = self.m.docker_images_inspect(
+                ["a:1", "b:1", "a:1"], cwd=Path("/tmp"), env={}
+            )
+
+        self.assertEqual(self._count(["docker", "image", "inspect"]), 1)
+        self.assertEqual(infos["a:1"].id, "sha256:a")
+        self.assertEqual(infos["b:1"].cmd, ["b:1"])
+
+    def test_docker_images_inspect_skips_missing_images(self):
+        self.local = {"a:1": "sha256:a"}
+        with patch.object(self.m, "run", side_effect=self.fake_run):
+            infos = self.m.docker_images_inspect(
+                ["a:1", "gone:1"], cwd=Path("/tmp"), env={}
+            )
+
+        self.assertEqual(list(infos), ["a:1"])
+
+    def test_resolve_images_pulls_missing_and_probes_each_id_once(self):
+        # "alias:1" is another tag of the same image as "a:1".
+        self.local = {"a:1": "sha256:a", "alias:1": "sha256:a"}
+        services = {
+            "a": {"image": "a:1"},
+            "alias": {"image": "alias:1"},
+            "web": {"image": "web:1"},
+            "worker": {"image": "worker:1"},
+        }
+        base_cmd = ["docker", "compose", "-p", "p", "-f", "compose.yml"]
+        service_to_cmd = {name: base_cmd for name in services}
+
+        with patch.object(self.m, "run", side_effect=self.fake_run):
+            images = self.m.resolve_images(
+                services, service_to_cmd, cwd=Path("/tmp"), env={}, jobs=2
+            )
+
+        self.assertEqual(set(images), {"a:1", "alias:1", "web:1", "worker:1"})
+        self.assertEqual(images["web:1"][0].id, "sha256:web")
+        self.assertTrue(all(has_sh for _info, has_sh in images.values()))
+        pulls = sorted(c[-1] for c in self.calls if c[-2:-1] == ["pull"])
+        self.assertEqual(pulls, ["web", "worker"])
+        # a:1 and alias:1 share an id: three probes for four images.
+        self.assertEqual(self._count(["docker", "run"]), 3)
+
+    def test_image_cache_skips_shell_probe(self):
+        self.local = {"a:1": "sha256:a"}
+        services = {"a": {"image": "a:1"}}
+        service_to_cmd = {"a": ["docker", "compose", "-p", "p"]}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "cache" / "images.json"
+            with patch.object(self.m, "run", side_effect=self.fake_run):
+                cache = self.m.ImageCache(path)
+                self.m.resolve_images(
+                    services, service_to_cmd, cwd=Path("/tmp"), env={}, cache=cache
+                )
+                cache.save()
+                self.assertEqual(self._count(["docker", "run"]), 1)
+
+                cache = self.m.ImageCache(path)
+                images = self.m.resolve_images(
+                    services, service_to_cmd, cwd=Path("/tmp"), env={}, cache=cache
+                )
+
+            self.assertEqual(self._count(["docker", "run"]), 1)
+            self.assertTrue(images["a:1"][1])
+            saved = json.loads(path.read_text(encoding="utf-8"))
+            self.assertEqual(saved["sha256:a"]["cmd"], ["a:1"])
+
+    def test_image_cache_drops_stale_and_invalid_entries(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "images.json"
+            path.write_text(
+                json.dumps(
+                    {
+                        "sha256:old": {"has_sh": True, "seen": 0},
+                        "sha256:bad": {"has_sh": "yes"},
+                    }
+                ),
+                encoding="utf-8",
+            )
+            cache = self.m.ImageCache(path)
+            self.assertEqual(list(cache.entries), ["sha256:old"])
+            cache.record(self.m.ImageInfo("sha256:new", [], ["run"]), False)
+            cache.save()
+
+            saved = json.loads(path.read_text(encoding="utf-8"))
+            self.assertEqual(list(saved), ["sha256:new"])
+
+            path.write_text("not json", encoding="utf-8")
+            self.assertEqual(self.m.ImageCache(path).entries, {})
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -97,6 +97,7 @@ class ComposeCaInjectCmdLookupTests(unittest.TestCase):
                     "cert_host": "/etc/infinito.nexus/ca/root-ca.crt",
                     "wrapper_host": "/usr/local/bin/with-ca-trust.sh",
                     "trust_name": "infinito-root-ca",
+                    "image_cache": "/var/lib/infinito/ca-inject-images.json",
                 }
             }
 
@@ -147,6 +148,11 @@ class ComposeCaInjectCmdLookupTests(unittest.TestCase):
                     cmd,
                 )
 
+                # optional image cache is passed through
+                self.assertIn(
+                    "--image-cache '/var/lib/infinito/ca-inject-images.json'", cmd
+                )
+
                 # ensure compose_file_args called with include_ca=False
                 self.assertTrue(compose_file_args.calls)
                 self.assertEqual(
@@ -200,6 +206,8 @@ class ComposeCaInjectCmdLookupTests(unittest.TestCase):
 
                 # env file missing -> not included
                 self.assertNotIn("--env-file", cmd)
+                # no image cache configured -> not included
+                self.assertNotIn("--image-cache", cmd)
 
     def test_raises_when_missing_ca_trust(self):
         lk = self._mk_lookup_module()
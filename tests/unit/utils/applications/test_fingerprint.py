@@ -0,0 +1,159 @@
+"""Unit tests for ``utils.applications.fingerprint``."""
+
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from utils.applications import fingerprint
+
+
+def _write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+class TestApplicationFingerprints(unittest.TestCase):
+    def setUp(self):
+        fingerprint._reset()
+        self.addCleanup(fingerprint._reset)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        roles = self.root / "roles"
+        _write(roles / "web-app-a" / "tasks" / "main.yml", "- debug: msg=a\n")
+        _write(
+            roles / "web-app-a" / "meta" / "main.yml",
+            "dependencies:\n  - sys-helper\n",
+        )
+        _write(roles / "sys-helper" / "tasks" / "main.yml", "- debug: msg=h\n")
+        _write(roles / "web-app-b" / "tasks" / "main.yml", "- debug: msg=b\n")
+        _write(self.root / "utils" / "x.py", "X = 1\n")
+        self.applications = {"web-app-a": {"port": 1}, "web-app-b": {"port": 2}}
+        self.variables = {"DOMAIN_PRIMARY": "example.com", "group_names": ["web-app-a"]}
+
+    def _fingerprints(self, applications=None, variables=None):
+        fingerprint._reset()
+        return fingerprint.application_fingerprints(
+            ["web-app-a", "web-app-b", "not-a-role"],
+            applications if applications is not None else self.applications,
+            project_root=str(self.root),
+            variables=variables if variables is not None else self.variables,
+            service_registry={},
+        )
+
+    def test_only_roles_get_stable_fingerprints(self):
+        first = self._fingerprints()
+        self.assertEqual(sorted(first), ["web-app-a", "web-app-b"])
+        self.assertEqual(first, self._fingerprints())
+        self.assertNotEqual(first["web-app-a"], first["web-app-b"])
+
+    def test_dependency_role_change_only_affects_dependents(self):
+        before = self._fingerprints()
+        _write(self.root / "roles" / "sys-helper" / "tasks" / "main.yml", "- x\n")
+        after = self._fingerprints()
+        self.assertNotEqual(before["web-app-a"], after["web-app-a"])
+        self.assertEqual(before["web-app-b"], after["web-app-b"])
+
+    def test_config_change_only_affects_that_application(self):
+        before = self._fingerprints()
+        after = self._fingerprints(
+            applications={"web-app-a": {"port": 1}, "web-app-b": {"port": 3}}
+        )
+        self.assertEqual(before["web-app-a"], after["web-app-a"])
+        self.assertNotEqual(before["web-app-b"], after["web-app-b"])
+
+    def test_shared_code_and_inventory_vars_affect_all(self):
+        before = self._fingerprints()
+        _write(self.root / "utils" / "x.py", "X = 2\n")
+        after_code = self._fingerprints()
+        after_vars = self._fingerprints(
+            variables={**self.variables, "DOMAIN_PRIMARY": "example.org"}
+        )
+        for app_id in before:
+            self.assertNotEqual(before[app_id], after_code[app_id])
+            self.assertNotEqual(after_code[app_id], after_vars[app_id])
+
+    def test_run_control_and_runtime_vars_are_ignored(self):
+        before = self._fingerprints()
+        after = self._fingerprints(
+            variables={
+                **self.variables,
+                "MODE_INCREMENTAL": True,
+                "allowed_applications": ["web-app-a"],
+                "ansible_date_time": {"epoch": "1"},
+            }
+        )
+        self.assertEqual(before, after)
+
+    def test_tree_digest_ignores_bytecode(self):
+        role = self.root / "roles" / "web-app-b"
+        before = fingerprint.tree_digest(str(role))
+        _write(role / "__pycache__" / "m.cpython-311.pyc", "junk")
+        fingerprint._reset()
+        self.assertEqual(before, fingerprint.tree_digest(str(role)))
+
+
+class TestRuntimeState(unittest.TestCase):
+    PS = [
+        "a\trunning\tUp 2 hours (healthy)",
+        "a\texited\tExited (0) 2 hours ago",
+        "b\trunning\tUp 1 minute (unhealthy)",
+        "c\texited\tExited (137) 5 minutes ago",
+    ]
+    NAMES = {"web-app-a": "a", "web-app-b": "b", "web-app-c": "c", "web-app-d": "d"}
+
+    def test_compose_project_health(self):
+        self.assertEqual(
+            fingerprint.compose_project_health(self.PS + ["", "garbage"]),
+            {"a": True, "b": False, "c": False},
+        )
+
+    def test_unchanged_requires_matching_fingerprint_and_health(self):
+        fingerprints = {
+            "web-app-a": "1",
+            "web-app-b": "2",
+            "web-app-d": "4",
+            "web-app-e": "5",
+            "svc-db-x": "6",
+        }
+        state = {
+            "web-app-a": {"fingerprint": "1", "containers": True},
+            "web-app-b": {"fingerprint": "2", "containers": True},
+            "web-app-d": {"fingerprint": "4", "containers": False},
+            "web-app-e": {"fingerprint": "old", "containers": False},
+            "svc-db-x": {"fingerprint": "6", "containers": False},
+        }
+        health = fingerprint.compose_project_health(self.PS)
+        self.assertEqual(
+            fingerprint.unchanged_applications(fingerprints, state, health, self.NAMES),
+            ["web-app-a", "web-app-d"],
+        )
+
+    def test_recorded_state_replaces_deployed_entries_only(self):
+        previous = {
+            "web-app-a": {"fingerprint": "old", "containers": True},
+            "web-app-x": {"fingerprint": "9", "containers": False},
+            "broken": "not-a-mapping",
+        }
+        health = fingerprint.compose_project_health(self.PS)
+        state = fingerprint.recorded_state(
+            previous,
+            {"web-app-a": "1", "web-app-d": "4", "web-app-z": "7"},
+            ["web-app-a", "web-app-d"],
+            health,
+            self.NAMES,
+        )
+        self.assertEqual(
+            state,
+            {
+                "web-app-a": {"fingerprint": "1", "containers": True},
+                "web-app-d": {"fingerprint": "4", "containers": False},
+                "web-app-x": {"fingerprint": "9", "containers": False},
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
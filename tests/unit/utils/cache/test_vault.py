@@ -0,0 +1,135 @@
+"""Unit tests for ``utils.cache.vault`` and the EncryptedString walk in
+``utils.cache.base`` that routes through it."""
+
+from __future__ import annotations
+
+import os
+import stat
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from utils.cache import _reset_cache_for_tests
+from utils.cache import base, vault
+
+
+class _FakeEncryptedString:
+    """Stands in for ansible's EncryptedString: str() decrypts."""
+
+    decryptions = 0
+
+    def __init__(self, ciphertext: str, plaintext: str) -> None:
+        self._ciphertext = ciphertext
+        self._plaintext = plaintext
+
+    def __str__(self) -> str:
+        type(self).decryptions += 1
+        return self._plaintext
+
+
+class TestDecryptCached(unittest.TestCase):
+    def setUp(self):
+        _reset_cache_for_tests()
+        self.env = mock.patch.dict(os.environ, {}, clear=False)
+        self.env.start()
+        os.environ.pop(vault.VAULT_CACHE_DIR_ENV, None)
+
+    def tearDown(self):
+        self.env.stop()
+        _reset_cache_for_tests()
+
+    def test_memory_layer_decrypts_each_ciphertext_once(self):
+        decrypt = mock.Mock(return_value="secret")
+        self.assertEqual(vault.decrypt_cached("$ANSIBLE_VAULT;a", decrypt), "secret")
+        self.assertEqual(vault.decrypt_cached("$ANSIBLE_VAULT;a", decrypt), "secret")
+        decrypt.assert_called_once()
+
+    def test_failed_decrypt_is_not_cached(self):
+        failing = mock.Mock(side_effect=ValueError("bad password"))
+        with self.assertRaises(ValueError):
+            vault.decrypt_cached("$ANSIBLE_VAULT;b", failing)
+        self.assertEqual(vault.decrypt_cached("$ANSIBLE_VAULT;b", lambda: "ok"), "ok")
+
+    def test_run_store_is_shared_across_processes(self):
+        store = vault.create_run_store(tempfile.gettempdir())
+        try:
+            self.assertEqual(stat.S_IMODE(store.stat().st_mode), 0o700)
+            os.environ[vault.VAULT_CACHE_DIR_ENV] = str(store)
+            vault.decrypt_cached("$ANSIBLE_VAULT;c", lambda: "from-disk")
+
+            entry = store / vault.ciphertext_key("$ANSIBLE_VAULT;c")
+            self.assertEqual(entry.read_text(encoding="utf-8"), "from-disk")
+            self.assertEqual(stat.S_IMODE(entry.stat().st_mode), 0o600)
+
+            # A fresh process (empty memory layer) is served from disk.
+            vault._reset()
+            decrypt = mock.Mock()
+            self.assertEqual(
+                vault.decrypt_cached("$ANSIBLE_VAULT;c", decrypt), "from-disk"
+            )
+            decrypt.assert_not_called()
+        finally:
+            vault.wipe_run_store(store)
+        self.assertFalse(store.exists())
+
+    def test_no_tmpfs_candidate_creates_no_store(self):
+        with mock.patch.object(vault, "_TMPFS_CANDIDATES", ("/nonexistent-tmpfs",)):
+            with mock.patch.object(vault.tempfile, "mkdtemp") as mkdtemp:
+                self.assertIsNone(vault.create_run_store())
+        mkdtemp.assert_not_called()
+
+    def test_world_readable_store_is_ignored(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chmod(tmp, 0o755)
+            os.environ[vault.VAULT_CACHE_DIR_ENV] = tmp
+            vault.decrypt_cached("$ANSIBLE_VAULT;d", lambda: "secret")
+            self.assertEqual(list(Path(tmp).iterdir()), [])
+
+
+class TestDecryptAnsibleEncryptedStrings(unittest.TestCase):
+    def setUp(self):
+        _reset_cache_for_tests()
+        _FakeEncryptedString.decryptions = 0
+        patcher = mock.patch.object(
+            base, "_AnsibleEncryptedString", _FakeEncryptedString
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(_reset_cache_for_tests)
+
+    def test_decrypts_nested_values(self):
+        data = {
+            "app": {"credentials": {"pw": _FakeEncryptedString("ct-1", "pw1")}},
+            "list": [_FakeEncryptedString("ct-2", "pw2"), "plain"],
+            "tuple": (_FakeEncryptedString("ct-1", "pw1"),),
+        }
+        result = base._decrypt_ansible_encrypted_strings(data)
+        self.assertEqual(
+            result,
+            {
+                "app": {"credentials": {"pw": "pw1"}},
+                "list": ["pw2", "plain"],
+                "tuple": ("pw1",),
+            },
+        )
+        # Two distinct ciphertexts -> two decryptions, however often used.
+        self.assertEqual(_FakeEncryptedString.decryptions, 2)
+
+    def test_plain_subtrees_are_returned_as_is(self):
+        plain = {"domains": ["a.example", "b.example"], "port": 80}
+        data = {"plain": plain, "secret": _FakeEncryptedString("ct-3", "x")}
+        result = base._decrypt_ansible_encrypted_strings(data)
+        self.assertIsNot(result, data)
+        self.assertIs(result["plain"], plain)
+        self.assertIs(base._decrypt_ansible_encrypted_strings(plain), plain)
+
+    def test_shared_subtree_is_converted_once(self):
+        shared = {"pw": _FakeEncryptedString("ct-4", "pw4")}
+        result = base._decrypt_ansible_encrypted_strings({"a": shared, "b": shared})
+        self.assertIs(result["a"], result["b"])
+        self.assertEqual(result["a"], {"pw": "pw4"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from utils.docker.image.catalogue import (
+    DigestCache,
+    build_catalogue,
+    catalogue_to_json,
+    resolve_digests,
+)
+from utils.docker.image.discovery import ImageRef
+
+
+def _ref(role: str, service: str, source: str, **kwargs) -> ImageRef:
+    name, _, version = source.rpartition(":")
+    return ImageRef(
+        role=role,
+        service=service,
+        name=name.split("/", 1)[1],
+        version=version,
+        source=source,
+        **kwargs,
+    )
+
+
+class TestBuildCatalogue(unittest.TestCase):
+    def test_collapses_shared_sources_and_records_uses(self) -> None:
+        catalogue = build_catalogue(
+            [
+                _ref("web-app-b", "proxy", "docker.io/library/nginx:alpine"),
+                _ref("web-app-a", "app", "docker.io/library/nginx:alpine"),
+                _ref("web-app-a", "db", "docker.io/library/postgres:16"),
+                _ref("web-app-a", "app", "docker.io/library/nginx:alpine"),
+            ]
+        )
+
+        self.assertEqual(
+            [e.source for e in catalogue],
+            ["docker.io/library/nginx:alpine", "docker.io/library/postgres:16"],
+        )
+        self.assertEqual(
+            [(u.role, u.service) for u in catalogue[0].uses],
+            [("web-app-a", "app"), ("web-app-b", "proxy")],
+        )
+        data = catalogue_to_json(catalogue)
+        self.assertEqual((data["total"], data["references"]), (2, 3))
+
+
+class TestResolveDigests(unittest.TestCase):
+    def test_uses_fresh_cache_entries_and_persists_new_ones(self) -> None:
+        now = [1000.0]
+        catalogue = build_catalogue(
+            [
+                _ref("web-app-a", "app", "docker.io/library/nginx:alpine"),
+                _ref("web-app-a", "db", "docker.io/library/postgres:16"),
+            ]
+        )
+        calls: list[str] = []
+
+        def _resolve(ref: str) -> str:
+            calls.append(ref)
+            return "sha256:" + ref.rsplit(":", 1)[1]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "digests.json"
+            path.write_text(
+                json.dumps(
+                    {
+                        "docker.io/library/nginx:alpine": {
+                            "digest": "sha256:cached",
+                            "resolved_at": 900.0,
+                        }
+                    }
+                ),
+                encoding="utf-8",
+            )
+            cache = DigestCache(path, ttl=300, clock=lambda: now[0])
+            resolved = resolve_digests(catalogue, cache, resolve=_resolve)
+            cache.save()
+
+            self.assertEqual(
+                [e.digest for e in resolved], ["sha256:cached", "sha256:16"]
+            )
+            self.assertEqual(calls, ["docker://docker.io/library/postgres:16"])
+
+            # Past the TTL the cached digest is resolved again.
+            now[0] = 2000.0
+            reloaded = DigestCache(path, ttl=300, clock=lambda: now[0])
+            self.assertIsNone(reloaded.get("docker.io/library/nginx:alpine"))
+            self.assertIsNone(reloaded.get("docker.io/library/postgres:16"))
+            now[0] = 1100.0
+            self.assertEqual(reloaded.get("docker.io/library/postgres:16"), "sha256:16")
+
+    def test_unresolvable_digest_stays_empty(self) -> None:
+        catalogue = build_catalogue(
+            [_ref("web-app-a", "app", "docker.io/library/nginx:alpine")]
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = DigestCache(Path(tmp) / "missing" / "digests.json")
+            resolved = resolve_digests(catalogue, cache, resolve=lambda ref: None)
+        self.assertIsNone(resolved[0].digest)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import unittest
+
+from utils.docker.image.prefetch import application_images, prefetch_images
+
+
+def _app(**services):
+    return {"services": services}
+
+
+class TestApplicationImages(unittest.TestCase):
+    def test_skips_shared_and_disabled_services(self) -> None:
+        config = _app(
+            nextcloud={"image": "nextcloud", "version": "33-fpm-alpine"},
+            proxy={"image": "nginx"},
+            mariadb={"enabled": True, "shared": True},
+            talk={"image": "talk", "version": "1", "enabled": False},
+        )
+        self.assertEqual(
+            application_images(config), ["nextcloud:33-fpm-alpine", "nginx"]
+        )
+
+    def test_keeps_the_primary_entity_when_disabled_for_consumers(self) -> None:
+        config = _app(matomo={"enabled": False, "image": "matomo", "version": "5"})
+        self.assertEqual(application_images(config, "matomo"), ["matomo:5"])
+        self.assertEqual(application_images(config), [])
+
+    def test_ignores_malformed_config(self) -> None:
+        self.assertEqual(application_images(None), [])
+        self.assertEqual(application_images({"services": []}), [])
+
+
+class TestPrefetchImages(unittest.TestCase):
+    def test_orders_by_group_then_run_after_wave(self) -> None:
+        applications = {
+            "web-app-a": _app(a={"image": "a", "version": "1"}),
+            "web-app-b": _app(b={"image": "b", "version": "1"}),
+            "web-app-c": _app(c={"image": "c", "version": "1"}),
+            "web-svc-z": _app(z={"image": "z", "version": "1"}),
+            "web-opt-o": _app(o={"image": "o", "version": "1"}),
+        }
+        refs = prefetch_images(
+            applications,
+            applications,
+            {"web-app-a": ["web-app-c"], "web-app-b": []},
+        )
+        self.assertEqual(refs, ["z:1", "b:1", "c:1", "a:1", "o:1"])
+
+    def test_deduplicates_shared_images(self) -> None:
+        applications = {
+            "web-app-a": _app(redis={"image": "redis", "version": "7"}),
+            "web-app-b": _app(redis={"image": "redis", "version": "7"}),
+        }
+        self.assertEqual(prefetch_images(applications, applications, {}), ["redis:7"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+from utils.docker.registry_http import RegistryClient, ResponseCache
+from utils.docker.version_updater import (
+    fetch_dockerhub_tags,
+    fetch_ghcr_tags,
+    fetch_image_tags,
+)
+
+
+class FakeRegistry:
+    """
+    Local HTTP/1.1 server mimicking the registry APIs: serves JSON
+    documents by path, answers conditional requests with 304 and can be
+    told to throttle the next requests with 429.
+    """
+
+    def __init__(self) -> None:
+        self.documents: dict[str, object] = {}
+        self.requests: list[tuple[str, dict[str, str]]] = []
+        self.throttle = 0
+        self.connections: set[int] = set()
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _send(self, status: int, body: bytes = b"", headers=None) -> None:
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                registry.requests.append((self.path, dict(self.headers)))
+                registry.connections.add(self.client_address[1])
+                if registry.throttle > 0:
+                    registry.throttle -= 1
+                    self._send(429, headers={"Retry-After": "0"})
+                    return
+                doc = registry.documents.get(self.path)
+                if doc is None:
+                    self._send(404)
+                    return
+                body = json.dumps(doc).encode()
+                etag = '"' + str(abs(hash(body))) + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    self._send(304, headers={"ETag": etag})
+                    return
+                self._send(
+                    200, body, {"ETag": etag, "Content-Type": "application/json"}
+                )
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self) -> "FakeRegistry":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def paths(self) -> list[str]:
+        return [path for path, _ in self.requests]
+
+
+class TestRegistryClient(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(Path(self._tmp.name))
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_reuses_one_connection(self) -> None:
+        with FakeRegistry() as registry:
+            registry.documents["/a"] = {"n": 1}
+            registry.documents["/b"] = {"n": 2}
+            client = RegistryClient()
+            self.assertEqual(client.get(f"{registry.url}/a").json(), {"n": 1})
+            self.assertEqual(client.get(f"{registry.url}/b").json(), {"n": 2})
+            client.close()
+
+        self.assertEqual(len(registry.connections), 1)
+
+    def test_unchanged_document_is_served_from_cache_after_304(self) -> None:
+        with FakeRegistry() as registry:
+            registry.documents["/tags"] = {"tags": ["1", "2"]}
+            client = RegistryClient(cache=self.cache)
+            first = client.get(f"{registry.url}/tags")
+            second = client.get(f"{registry.url}/tags")
+            client.close()
+
+        self.assertFalse(first.from_cache)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.json(), {"tags": ["1", "2"]})
+        self.assertIn("If-None-Match", registry.requests[1][1])
+
+    def test_empty_cache_key_bypasses_the_cache(self) -> None:
+        with FakeRegistry() as registry:
+            registry.documents["/token"] = {"token": "t"}
+            client = RegistryClient(cache=self.cache)
+            client.get(f"{registry.url}/token", cache_key="")
+            client.get(f"{registry.url}/token", cache_key="")
+            client.close()
+
+        self.assertNotIn("If-None-Match", registry.requests[1][1])
+
+    def test_retries_throttled_requests(self) -> None:
+        sleeps: list[float] = []
+        with FakeRegistry() as registry:
+            registry.documents["/a"] = {"n": 1}
+            registry.throttle = 2
+            client = RegistryClient(sleep=sleeps.append)
+            resp = client.get(f"{registry.url}/a")
+            client.close()
+
+        self.assertEqual(resp.status, 200)
+        self.assertEqual(sleeps, [0.0, 0.0])
+
+    def test_unreachable_host_returns_none(self) -> None:
+        client = RegistryClient(max_retries=1, timeout=1)
+        self.assertIsNone(client.get("http://127.0.0.1:9/unreachable"))
+
+
+class TestTagFetchers(unittest.TestCase):
+    HUB_PAGE_1 = (
+        "/v2/repositories/library/nginx/tags/?page_size=100&ordering=last_updated"
+    )
+    HUB_PAGE_2 = "/v2/repositories/library/nginx/tags/?page=2"
+
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(Path(self._tmp.name))
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _hub(self, registry: FakeRegistry) -> None:
+        registry.documents[self.HUB_PAGE_1] = {
+            "results": [{"name": "1.27"}, {"name": "1.26"}],
+            "next": f"{registry.url}{self.HUB_PAGE_2}",
+        }
+        registry.documents[self.HUB_PAGE_2] = {
+            "results": [{"name": "1.25"}],
+            "next": None,
+        }
+
+    def test_dockerhub_pages_once_then_costs_a_single_304(self) -> None:
+        with FakeRegistry() as registry:
+            self._hub(registry)
+            client = RegistryClient(cache=self.cache)
+            first = fetch_dockerhub_tags("nginx", client=client, base_url=registry.url)
+            second = fetch_dockerhub_tags("nginx", client=client, base_url=registry.url)
+            client.close()
+
+        self.assertEqual(first, ["1.27", "1.26", "1.25"])
+        self.assertEqual(second, first)
+        self.assertEqual(
+            registry.paths(), [self.HUB_PAGE_1, self.HUB_PAGE_2, self.HUB_PAGE_1]
+        )
+
+    def test_dockerhub_changed_first_page_is_paged_again(self) -> None:
+        with FakeRegistry() as registry:
+            self._hub(registry)
+            client = RegistryClient(cache=self.cache)
+            fetch_dockerhub_tags("nginx", client=client, base_url=registry.url)
+            registry.documents[self.HUB_PAGE_1]["results"].insert(0, {"name": "1.28"})
+            tags = fetch_dockerhub_tags("nginx", client=client, base_url=registry.url)
+            client.close()
+
+        self.assertEqual(tags, ["1.28", "1.27", "1.26", "1.25"])
+
+    def test_dockerhub_truncated_tag_list_is_not_reused(self) -> None:
+        with FakeRegistry() as registry:
+            self._hub(registry)
+            page_2 = registry.documents.pop(self.HUB_PAGE_2)
+            client = RegistryClient(cache=self.cache)
+            first = fetch_dockerhub_tags("nginx", client=client, base_url=registry.url)
+            registry.documents[self.HUB_PAGE_2] = page_2
+            second = fetch_dockerhub_tags("nginx", client=client, base_url=registry.url)
+            client.close()
+
+        self.assertEqual(first, ["1.27", "1.26"])
+        # Page 1 is unchanged (304), but the stored list was incomplete.
+        self.assertEqual(second, ["1.27", "1.26", "1.25"])
+        self.assertEqual(
+            registry.paths(),
+            [self.HUB_PAGE_1, self.HUB_PAGE_2, self.HUB_PAGE_1, self.HUB_PAGE_2],
+        )
+
+    def test_ghcr_fetches_token_then_tags(self) -> None:
+        with FakeRegistry() as registry:
+            registry.documents[
+                "/token?scope=repository%3Aacme%2Fapp%3Apull&service=ghcr.io"
+            ] = {"token": "secret"}
+            registry.documents["/v2/acme/app/tags/list"] = {"tags": ["1.0", "1.1"]}
+            client = RegistryClient(cache=self.cache)
+            tags = fetch_ghcr_tags(
+                "ghcr.io/acme/app", client=client, base_url=registry.url
+            )
+            client.close()
+
+        self.assertEqual(tags, ["1.0", "1.1"])
+        self.assertEqual(registry.requests[1][1].get("Authorization"), "Bearer secret")
+
+    def test_fetch_image_tags_skips_unsupported_registries(self) -> None:
+        with patch(
+            "utils.docker.version_updater.fetch_dockerhub_tags",
+            side_effect=lambda image, client: [image],
+        ):
+            result = fetch_image_tags(
+                ["nginx", "nginx", "quay.io/keycloak/keycloak", "postgres"],
+                client=RegistryClient(),
+                workers=2,
+            )
+
+        self.assertEqual(result, {"nginx": ["nginx"], "postgres": ["postgres"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
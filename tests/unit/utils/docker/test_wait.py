@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import io
+import subprocess
+import unittest
+from unittest.mock import MagicMock, patch
+
+from utils.docker.wait import backoff_delays, poll_until, wait_for_health
+
+
+def _inspect(*statuses: str):
+    """subprocess.run side effect returning `statuses` one per call."""
+    it = iter(statuses)
+
+    def _run(cmd, **kwargs):
+        status = next(it)
+        return subprocess.CompletedProcess(cmd, 0, stdout=f"{status}\n", stderr="")
+
+    return _run
+
+
+def _events(*lines: str) -> MagicMock:
+    proc = MagicMock()
+    proc.stdout = io.StringIO("".join(f"{line}\n" for line in lines))
+    return proc
+
+
+class TestPollUntil(unittest.TestCase):
+    def test_backoff_doubles_up_to_the_cap(self) -> None:
+        delays = backoff_delays(0.5, 3.0)
+        self.assertEqual([next(delays) for _ in range(5)], [0.5, 1.0, 2.0, 3.0, 3.0])
+
+    def test_returns_first_value_and_sleeps_with_backoff(self) -> None:
+        values = iter([None, None, "ok"])
+        sleeps: list[float] = []
+        value, _ = poll_until(lambda: next(values), timeout_s=60, sleep=sleeps.append)
+        self.assertEqual(value, "ok")
+        self.assertEqual(sleeps, [0.25, 0.5])
+
+    def test_times_out(self) -> None:
+        now = [0.0]
+
+        def _sleep(seconds: float) -> None:
+            now[0] += seconds
+
+        value, elapsed = poll_until(
+            lambda: None, timeout_s=2, clock=lambda: now[0], sleep=_sleep
+        )
+        self.assertIsNone(value)
+        self.assertGreaterEqual(elapsed, 2)
+
+
+class TestWaitForHealth(unittest.TestCase):
+    @patch("utils.docker.wait.subprocess.Popen")
+    @patch("utils.docker.wait.subprocess.run")
+    def test_returns_on_healthy_event_without_polling(
+        self, run_mock: MagicMock, popen_mock: MagicMock
+    ) -> None:
+        run_mock.side_effect = _inspect("starting")
+        popen_mock.return_value = _events(
+            "health_status: unhealthy", "health_status: healthy"
+        )
+        seen: list[str] = []
+
+        result = wait_for_health("c1", timeout_s=30, on_status=seen.append)
+
+        self.assertTrue(result.ready)
+        self.assertEqual(result.status, "healthy")
+        self.assertEqual(result.via, "events")
+        self.assertEqual(seen, ["starting", "unhealthy", "healthy"])
+        # Only the initial inspect; the flip came from the event stream.
+        self.assertEqual(run_mock.call_count, 1)
+        cmd = popen_mock.call_args.args[0]
+        self.assertIn("container=c1", cmd)
+        self.assertIn("event=health_status", cmd)
+
+    @patch("utils.docker.wait.subprocess.Popen")
+    @patch("utils.docker.wait.subprocess.run")
+    def test_already_healthy_container_returns_immediately(
+        self, run_mock: MagicMock, popen_mock: MagicMock
+    ) -> None:
+        run_mock.side_effect = _inspect("healthy")
+        popen_mock.return_value = _events()
+
+        result = wait_for_health("c1", timeout_s=30)
+
+        self.assertTrue(result.ready)
+        popen_mock.return_value.kill.assert_called_once()
+
+    @patch("utils.docker.wait.subprocess.Popen")
+    @patch("utils.docker.wait.subprocess.run")
+    def test_die_event_ends_the_wait(
+        self, run_mock: MagicMock, popen_mock: MagicMock
+    ) -> None:
+        run_mock.side_effect = _inspect("starting")
+        popen_mock.return_value = _events("die")
+
+        result = wait_for_health("c1", timeout_s=30)
+
+        self.assertFalse(result.ready)
+        self.assertEqual(result.status, "exited")
+
+    @patch("utils.docker.wait.time.sleep")
+    @patch("utils.docker.wait.subprocess.Popen", side_effect=FileNotFoundError)
+    @patch("utils.docker.wait.subprocess.run")
+    def test_falls_back_to_polling_without_event_stream(
+        self, run_mock: MagicMock, _popen_mock: MagicMock, sleep_mock: MagicMock
+    ) -> None:
+        run_mock.side_effect = _inspect("starting", "starting", "healthy")
+
+        result = wait_for_health("c1", timeout_s=30)
+
+        self.assertTrue(result.ready)
+        self.assertEqual(result.via, "polling")
+        self.assertEqual(sleep_mock.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
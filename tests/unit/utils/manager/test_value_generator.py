@@ -1,6 +1,7 @@
 import base64
 import re
 import unittest
+from unittest import mock
 
 from utils.manager.value_generator import ValueGenerator
 
@@ -52,6 +53,35 @@ class TestValueGenerator(unittest.TestCase):
         self.assertNotIn("$", v)
         self.assertGreater(len(v), 20)
 
+    def test_generate_strong_password_meets_policy(self):
+        for length in (12, 13, 32, 64):
+            pw = self.vg.generate_strong_password(length)
+            self.assertEqual(len(pw), length)
+            self.assertTrue(self.vg._is_valid_password(pw))
+
+    def test_generate_strong_password_rejects_short_length(self):
+        with self.assertRaises(ValueError):
+            self.vg.generate_strong_password(11)
+
+    def test_generate_values_preserves_order(self):
+        algorithms = ["random_hex_16", "bcrypt", "sha1", "bcrypt", "alphanumeric"]
+        values = self.vg.generate_values(algorithms, workers=2)
+        self.assertEqual(len(values), len(algorithms))
+        self.assertTrue(re.fullmatch(r"[0-9a-f]{32}", values[0]))
+        self.assertTrue(re.fullmatch(r"[0-9a-f]{40}", values[2]))
+        self.assertTrue(re.fullmatch(r"[A-Za-z0-9]{64}", values[4]))
+        for v in (values[1], values[3]):
+            self.assertNotIn("$", v)
+            self.assertEqual(len(v), 60)
+        self.assertNotEqual(values[1], values[3])
+
+    def test_generate_values_sequential_uses_generate_value(self):
+        with mock.patch.object(
+            ValueGenerator, "generate_value", side_effect=lambda alg: f"GEN_{alg}"
+        ):
+            values = self.vg.generate_values(["bcrypt", "sha256"], workers=1)
+        self.assertEqual(values, ["GEN_bcrypt", "GEN_sha256"])
+
     def test_generate_value_unknown(self):
         v = self.vg.generate_value("does_not_exist")
         self.assertEqual(v, "undefined")
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import unittest
+
+from utils.roles.run_after_dag import run_after_waves
+
+
+class TestRunAfterWaves(unittest.TestCase):
+    def test_independent_roles_share_a_wave(self) -> None:
+        waves = run_after_waves(
+            {
+                "web-app-b": [],
+                "web-app-a": [],
+                "web-app-c": ["web-app-a"],
+                "web-app-d": ["web-app-c", "web-app-b"],
+            }
+        )
+        self.assertEqual(
+            waves, [["web-app-a", "web-app-b"], ["web-app-c"], ["web-app-d"]]
+        )
+
+    def test_edges_outside_the_selection_are_ignored(self) -> None:
+        waves = run_after_waves({"web-app-a": ["web-app-missing"], "web-app-b": []})
+        self.assertEqual(waves, [["web-app-a", "web-app-b"]])
+
+    def test_cycle_raises(self) -> None:
+        with self.assertRaisesRegex(ValueError, "web-app-a, web-app-b"):
+            run_after_waves({"web-app-a": ["web-app-b"], "web-app-b": ["web-app-a"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
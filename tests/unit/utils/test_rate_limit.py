@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import unittest
+
+from utils.rate_limit import TokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_allows_a_burst_then_paces_to_the_rate(self) -> None:
+        now = [0.0]
+        sleeps: list[float] = []
+
+        def _sleep(seconds: float) -> None:
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        bucket = TokenBucket(0.5, capacity=2, clock=lambda: now[0], sleep=_sleep)
+
+        waits = [bucket.acquire() for _ in range(4)]
+
+        self.assertEqual(waits[:2], [0.0, 0.0])
+        self.assertAlmostEqual(waits[2], 2.0)
+        self.assertAlmostEqual(waits[3], 2.0)
+        self.assertAlmostEqual(now[0], 4.0)
+
+    def test_rejects_invalid_settings(self) -> None:
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+        with self.assertRaises(ValueError):
+            TokenBucket(1, capacity=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from utils.timing_store import TaskTiming, TimingStore
+
+
+def _timing(task, seconds, role="web-app-foo", host="h1"):
+    return TaskTiming(
+        host=host, role=role, task=task, path="", duration=seconds, status="ok"
+    )
+
+
+class TestTimingStore(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.store = TimingStore(Path(self._tmp.name) / "sub" / "timings.sqlite")
+
+    def tearDown(self):
+        self.store.close()
+        self._tmp.cleanup()
+
+    def _run(self, timings, commit="abc"):
+        run_id = self.store.start_run(git_commit=commit, applications=["web-app-foo"])
+        self.store.finish_run(run_id, timings, status="ok")
+        return run_id
+
+    def test_slowest_roles_sums_tasks_and_takes_slowest_host(self):
+        self._run(
+            [
+                _timing("pull", 4.0, host="h1"),
+                _timing("pull", 6.0, host="h2"),
+                _timing("start", 1.0, host="h1"),
+                _timing("start", 1.0, host="h1"),  # second include of the task
+                _timing("tiny", 0.5, role="web-app-bar"),
+            ]
+        )
+        roles = self.store.slowest_roles()
+        self.assertEqual([r.role for r in roles], ["web-app-foo", "web-app-bar"])
+        self.assertEqual(roles[0].last, 8.0)
+        self.assertEqual(roles[0].runs, 1)
+
+    def test_role_trend_is_chronological(self):
+        self._run([_timing("pull", 2.0)], commit="c1")
+        self._run([_timing("pull", 3.0)], commit="c2")
+        trend = self.store.role_trend("web-app-foo")
+        self.assertEqual([p.git_commit for p in trend], ["c1", "c2"])
+        self.assertEqual([p.seconds for p in trend], [2.0, 3.0])
+        self.assertEqual(self.store.role_trend("unknown"), [])
+
+    def test_task_regressions_against_rolling_median(self):
+        for seconds in (10.0, 11.0, 9.0, 10.0):
+            self._run([_timing("pull", seconds), _timing("start", 2.0)])
+        self._run([_timing("pull", 13.0), _timing("start", 2.1)])
+
+        found = self.store.task_regressions(threshold_pct=20.0, window=10)
+        self.assertEqual([(r.role, r.task) for r in found], [("web-app-foo", "pull")])
+        self.assertAlmostEqual(found[0].median, 10.0)
+        self.assertAlmostEqual(found[0].slowdown_pct, 30.0)
+
+        self.assertEqual(self.store.task_regressions(threshold_pct=50.0), [])
+
+    def test_task_regressions_need_history(self):
+        self._run([_timing("pull", 1.0)])
+        self._run([_timing("pull", 50.0)])
+        self.assertEqual(self.store.task_regressions(), [])
+
+    def test_unfinished_runs_are_ignored(self):
+        self.store.start_run()
+        self.assertEqual(self.store.slowest_roles(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
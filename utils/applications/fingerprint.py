@@ -0,0 +1,280 @@
+"""Per-application input fingerprints for skipping unchanged redeploys.
+
+A fingerprint is a SHA-256 over everything that decides what deploying an
+application does on a host:
+
+- the files of its role and of every role it pulls in (transitively) via
+  meta dependencies and service dependencies,
+- the shared code and defaults every role uses (`SHARED_DIRS`),
+- the rendered merged `applications` entries of all those roles,
+- the host's configuration variables (see `inventory_vars`).
+
+`run_after` only orders roles and is deliberately not an input: a change
+in a role that merely runs earlier does not change what this one deploys.
+
+The last successful fingerprint of every application is kept on the
+target host (`FILE_APPLICATION_FINGERPRINTS`). With `MODE_INCREMENTAL`
+an application is skipped when its fingerprint matches and its compose
+project is healthy (see `unchanged_applications`).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from utils.applications.in_group_deps import (
+    _collect_reachable_roles,
+    meta_deps_from_disk,
+)
+from utils.service_registry import build_service_registry_from_applications
+
+# Bump to invalidate every stored fingerprint after changing the inputs.
+FINGERPRINT_VERSION = 1
+
+# Repository directories (relative to the project root) shared by all roles.
+SHARED_DIRS: tuple[str, ...] = (
+    "group_vars",
+    "library",
+    "plugins",
+    "tasks/utils",
+    "templates",
+    "utils",
+)
+
+# Only application roles are skipped; host-level roles (updates, drivers,
+# databases, proxies, ...) always run.
+SKIPPABLE_PREFIXES: tuple[str, ...] = ("web-app-", "web-svc-", "web-opt-")
+
+# Lower-case inventory variables that feed into application templates.
+# Upper-case variables are the repository's configuration constants and
+# are always included.
+INVENTORY_VARS: tuple[str, ...] = (
+    "deprecated_domains",
+    "design",
+    "group_names",
+    "networks",
+    "redirect_domain_mappings",
+    "service_provider",
+)
+
+# Variables that steer the run itself rather than what gets deployed.
+IGNORED_VARS = frozenset(
+    {
+        "APPLICATION_FINGERPRINTS",
+        "GATHERED_FACT_SUBSETS",
+        "IMAGE_PREFETCH_TIMEOUT",
+        "IMAGE_PREFETCH_WORKERS",
+        "MODE_BACKUP",
+        "MODE_INCREMENTAL",
+        "MODE_PREFETCH",
+        "UNCHANGED_APPLICATIONS",
+    }
+)
+
+_CONSTANT_NAME = re.compile(r"^[A-Z][A-Z0-9_]*$")
+_SKIPPED_NAMES = frozenset({"__pycache__", ".git"})
+
+_TREE_DIGESTS: dict[str, str] = {}
+
+
+def _reset() -> None:
+    """Test-only helper: clear the per-process tree digest cache."""
+    _TREE_DIGESTS.clear()
+
+
+def _canonical(value: Any) -> bytes:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode(
+        "utf-8"
+    )
+
+
+def tree_digest(path: str) -> str:
+    """
+    Return a content digest of all files below `path`.
+
+    Relative file names are part of the digest, so renames count as
+    changes. Byte-code caches are ignored. A missing path has a fixed
+    digest. Results are memoised per process.
+    """
+    key = os.path.abspath(path)
+    cached = _TREE_DIGESTS.get(key)
+    if cached is not None:
+        return cached
+
+    h = hashlib.sha256()
+    for root, dirs, files in os.walk(key):
+        dirs[:] = sorted(d for d in dirs if d not in _SKIPPED_NAMES)
+        for name in sorted(files):
+            if name.endswith(".pyc"):
+                continue
+            full = os.path.join(root, name)
+            h.update(os.path.relpath(full, key).encode("utf-8") + b"\0")
+            try:
+                with open(full, "rb") as fh:
+                    for chunk in iter(lambda: fh.read(1 << 16), b""):
+                        h.update(chunk)
+            except OSError:
+                h.update(b"<unreadable>")
+            h.update(b"\0")
+
+    digest = h.hexdigest()
+    _TREE_DIGESTS[key] = digest
+    return digest
+
+
+def dependency_roles(
+    application_id: str,
+    applications: Mapping[str, Any],
+    roles_dir: str,
+    service_registry: dict[str, Any],
+) -> list[str]:
+    """Roles `application_id` pulls in via meta and service dependencies."""
+    seen: set[str] = set()
+    _collect_reachable_roles(
+        application_id,
+        dict(applications),
+        service_registry,
+        roles_dir,
+        seen,
+        meta_deps_from_disk,
+    )
+    seen.discard(application_id)
+    return sorted(seen)
+
+
+def inventory_vars(variables: Mapping[str, Any]) -> dict[str, Any]:
+    """Pick the variables that are part of every fingerprint."""
+    return {
+        name: value
+        for name, value in variables.items()
+        if name not in IGNORED_VARS
+        and (name in INVENTORY_VARS or _CONSTANT_NAME.match(name))
+    }
+
+
+def application_fingerprints(
+    application_ids: Iterable[str],
+    applications: Mapping[str, Any],
+    *,
+    project_root: str,
+    variables: Mapping[str, Any] | None = None,
+    service_registry: dict[str, Any] | None = None,
+) -> dict[str, str]:
+    """
+    Return {application_id: fingerprint} for every id that has a role.
+
+    `applications` must be the rendered merged configuration (see
+    `utils.cache.applications.get_merged_applications`); `variables` are
+    the host's variables, filtered through `inventory_vars`.
+    """
+    roles_dir = os.path.join(project_root, "roles")
+    if service_registry is None:
+        service_registry = build_service_registry_from_applications(dict(applications))
+
+    shared = {d: tree_digest(os.path.join(project_root, d)) for d in SHARED_DIRS}
+    host_vars_digest = hashlib.sha256(
+        _canonical(inventory_vars(variables or {}))
+    ).hexdigest()
+
+    result: dict[str, str] = {}
+    for app_id in sorted(set(application_ids)):
+        if not os.path.isdir(os.path.join(roles_dir, app_id)):
+            continue
+        roles = [app_id] + dependency_roles(
+            app_id, applications, roles_dir, service_registry
+        )
+        payload = {
+            "version": FINGERPRINT_VERSION,
+            "shared": shared,
+            "vars": host_vars_digest,
+            "roles": {r: tree_digest(os.path.join(roles_dir, r)) for r in roles},
+            "config": {r: applications.get(r) for r in roles},
+        }
+        result[app_id] = hashlib.sha256(_canonical(payload)).hexdigest()
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Runtime health and host state
+# ---------------------------------------------------------------------------
+
+
+def compose_project_health(ps_lines: Iterable[str]) -> dict[str, bool]:
+    """
+    Parse `container ps -a` lines of the form
+    "<compose project>\\t<state>\\t<status>" into {project: healthy}.
+
+    A project is healthy when all of its containers are running without an
+    unhealthy or still-starting health check, or exited successfully.
+    """
+    health: dict[str, bool] = {}
+    for line in ps_lines:
+        parts = line.rstrip("\n").split("\t")
+        if len(parts) < 3 or not parts[0]:
+            continue
+        project, state, status = parts[0], parts[1].lower(), parts[2].lower()
+        if state == "running":
+            ok = "(unhealthy)" not in status and "(health: starting)" not in status
+        else:
+            # One-shot init containers legitimately exit with code 0.
+            ok = state == "exited" and status.startswith("exited (0)")
+        health[project] = health.get(project, True) and ok
+    return health
+
+
+def unchanged_applications(
+    fingerprints: Mapping[str, str],
+    state: Mapping[str, Any],
+    project_health: Mapping[str, bool],
+    project_names: Mapping[str, str],
+) -> list[str]:
+    """
+    Applications whose fingerprint equals the last recorded one and whose
+    runtime is healthy.
+
+    Applications recorded with containers need a healthy compose project
+    (`project_names` maps application ids to project names); applications
+    without containers only need a matching fingerprint.
+    """
+    unchanged = []
+    for app_id, fingerprint in sorted(fingerprints.items()):
+        if not app_id.startswith(SKIPPABLE_PREFIXES):
+            continue
+        entry = state.get(app_id)
+        if not isinstance(entry, Mapping) or entry.get("fingerprint") != fingerprint:
+            continue
+        if entry.get("containers") and not project_health.get(
+            project_names.get(app_id, app_id), False
+        ):
+            continue
+        unchanged.append(app_id)
+    return unchanged
+
+
+def recorded_state(
+    previous: Mapping[str, Any],
+    fingerprints: Mapping[str, str],
+    deployed: Iterable[str],
+    project_health: Mapping[str, bool],
+    project_names: Mapping[str, str],
+) -> dict[str, Any]:
+    """
+    Return the host state after a successful run: `previous` with the
+    entries of all `deployed` applications replaced by their current
+    fingerprint and whether their compose project has containers.
+    """
+    state = {k: v for k, v in previous.items() if isinstance(v, Mapping)}
+    for app_id in deployed:
+        fingerprint = fingerprints.get(app_id)
+        if fingerprint is None:
+            continue
+        state[app_id] = {
+            "fingerprint": fingerprint,
+            "containers": project_names.get(app_id, app_id) in project_health,
+        }
+    return dict(sorted(state.items()))
@@ -14,6 +14,8 @@ Domain modules:
 - ``utils.cache.files``        — process-wide project-tree walk +
   file-content cache (``read_text``, ``iter_project_files``,
   ``iter_non_ignored_files``).
+- ``utils.cache.vault``        — vault plaintext cache keyed by
+  ciphertext hash, optionally shared by forks via a per-run tmpfs store.
 - ``utils.cache.gitignore``    — cached ``.gitignore`` pattern loader
   + path matcher used by lint/integration tests that need a
   "files git would track" view without spawning git.
@@ -31,7 +33,7 @@ def _reset_cache_for_tests() -> None:
     """Orchestrate per-domain cache resets plus the shared fingerprint
     memo. Test fixtures rely on a single entry point so they can stay
     agnostic of how the cache is partitioned across modules."""
-    from . import applications, base, domains, files, gitignore, users
+    from . import applications, base, domains, files, gitignore, users, vault
     from . import yaml as _yaml_cache
 
     applications._reset()
@@ -41,3 +43,4 @@ def _reset_cache_for_tests() -> None:
     _yaml_cache._reset()
     files._reset()
     gitignore._reset()
+    vault._reset()
@@ -17,6 +17,7 @@ from __future__ import annotations
 
 import copy
 import os
+import sys
 import threading
 from pathlib import Path
 from typing import Any, Mapping, Optional
@@ -25,33 +26,85 @@ from typing import Any, Mapping, Optional
 # so it stays at module scope.
 from plugins.filter.merge_with_defaults import merge_with_defaults  # noqa: F401  re-exported
 
+from .vault import decrypt_cached
 
-try:
-    from ansible.parsing.vault import EncryptedString as _AnsibleEncryptedString
-except Exception:
-    _AnsibleEncryptedString = None
 
+# Resolved lazily by `_encrypted_string_type`; importing
+# `ansible.parsing.vault` eagerly would pull the whole ansible templating
+# stack into every importer of this module.
+_AnsibleEncryptedString: Any = None
 
-def _decrypt_ansible_encrypted_strings(value: Any) -> Any:
+
+def _encrypted_string_type() -> Any:
+    """Return ansible's EncryptedString class once ansible has loaded it.
+
+    EncryptedString instances can only exist after `ansible.parsing.vault`
+    was imported by someone else, so peeking at `sys.modules` is enough
+    and never triggers the import ourselves.
+    """
+    global _AnsibleEncryptedString
+    if _AnsibleEncryptedString is None:
+        module = sys.modules.get("ansible.parsing.vault")
+        if module is not None:
+            _AnsibleEncryptedString = getattr(module, "EncryptedString", None)
+    return _AnsibleEncryptedString
+
+
+def _decrypt_encrypted_string(value: Any) -> Any:
+    ciphertext = getattr(value, "_ciphertext", None)
+    try:
+        if isinstance(ciphertext, str):
+            return decrypt_cached(ciphertext, lambda: str(value))
+        return str(value)
+    except Exception:
+        return value
+
+
+def _decrypt_ansible_encrypted_strings(value: Any, _memo: Optional[dict] = None) -> Any:
     """Recursively convert Ansible EncryptedString values to plaintext str.
 
     Ansible 2.19+ refuses to store EncryptedString as an intermediate variable
     during task arg finalization, so decrypt at the lookup boundary.
+
+    Plaintexts are memoised by ciphertext hash (see `utils.cache.vault`), so
+    each vaulted scalar pays its key derivation once. Within one call,
+    already-converted subtrees are memoised by identity, and plain
+    dict/list/tuple subtrees without any EncryptedString are returned as-is
+    instead of being rebuilt.
     """
-    if _AnsibleEncryptedString is not None and isinstance(
-        value, _AnsibleEncryptedString
-    ):
-        try:
-            return str(value)
-        except Exception:
-            return value
+    encrypted_string = _encrypted_string_type()
+    if encrypted_string is not None and isinstance(value, encrypted_string):
+        return _decrypt_encrypted_string(value)
+    if not isinstance(value, (Mapping, list, tuple)):
+        return value
+
+    if _memo is None:
+        _memo = {}
+    cached = _memo.get(id(value))
+    if cached is not None:
+        return cached
+
     if isinstance(value, Mapping):
-        return {k: _decrypt_ansible_encrypted_strings(v) for k, v in value.items()}
-    if isinstance(value, list):
-        return [_decrypt_ansible_encrypted_strings(v) for v in value]
-    if isinstance(value, tuple):
-        return tuple(_decrypt_ansible_encrypted_strings(v) for v in value)
-    return value
+        items = [
+            (k, v, _decrypt_ansible_encrypted_strings(v, _memo))
+            for k, v in value.items()
+        ]
+        if type(value) is dict and all(new is old for _k, old, new in items):
+            result: Any = value
+        else:
+            result = {k: new for k, _old, new in items}
+    else:
+        converted = [_decrypt_ansible_encrypted_strings(v, _memo) for v in value]
+        if type(value) in (list, tuple) and all(
+            new is old for new, old in zip(converted, value)
+        ):
+            result = value
+        elif isinstance(value, tuple):
+            result = tuple(converted)
+        else:
+            result = converted
+    _memo[id(value)] = result
+    return result
 
 
 # `utils/cache/base.py` lives two levels deep: utils/cache/base.py -> repo
@@ -0,0 +1,145 @@
+"""Vault plaintext cache keyed by ciphertext hash.
+
+Every vaulted scalar costs a full PBKDF2 key derivation the first time a
+process decrypts it. Ansible forks a worker per host/task, so the same
+`host_vars` credential is decrypted over and over during one playbook
+run. This module memoises `ciphertext -> plaintext` in two layers:
+
+- In-memory, per process (always on).
+- Optionally on disk, in a per-run directory named by the
+  ``INFINITO_VAULT_CACHE_DIR`` environment variable. Forked workers
+  inherit the variable and share the store. The directory holds
+  plaintext secrets, so it MUST live on tmpfs, is created ``0700`` with
+  ``0600`` entries, and MUST be wiped when the run ends. Use
+  :func:`create_run_store` / :func:`wipe_run_store` rather than
+  creating it by hand; `cli.deploy.dedicated` does this for
+  ``--vault-cache``.
+
+CACHE SEMANTICS
+- Cache key: SHA-256 of the ciphertext envelope. A ciphertext only
+  decrypts under the password that produced it, so the key does not
+  need to include the vault secret.
+- Stores are only trusted when they are directories owned by the
+  current user and not accessible by group/other. Anything else is
+  ignored and the cache degrades to in-memory only.
+- Disk I/O errors never fail a decryption; they only cost a cache miss.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import stat
+import tempfile
+from pathlib import Path
+from typing import Callable, Optional
+
+VAULT_CACHE_DIR_ENV = "INFINITO_VAULT_CACHE_DIR"
+
+# Parents for per-run stores, first writable one wins. Both are tmpfs on
+# systemd hosts, so plaintext never reaches persistent storage.
+_TMPFS_CANDIDATES: tuple[str, ...] = ("/dev/shm", "/run/user/{uid}")
+
+_PLAINTEXT_CACHE: dict[str, str] = {}
+
+
+def ciphertext_key(ciphertext: str) -> str:
+    return hashlib.sha256(ciphertext.encode("utf-8", errors="replace")).hexdigest()
+
+
+def _store_dir() -> Optional[Path]:
+    raw = os.environ.get(VAULT_CACHE_DIR_ENV)
+    if not raw:
+        return None
+    path = Path(raw)
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid():
+        return None
+    if st.st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+        return None
+    return path
+
+
+def _read_store(store: Path, key: str) -> Optional[str]:
+    try:
+        return (store / key).read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _write_store(store: Path, key: str, plaintext: str) -> None:
+    # Write to a private temp file and rename, so concurrent forks never
+    # observe a half-written entry.
+    try:
+        fd, tmp = tempfile.mkstemp(dir=store, prefix=f".{key}.")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(plaintext)
+        os.replace(tmp, store / key)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
+
+def decrypt_cached(ciphertext: str, decrypt: Callable[[], str]) -> str:
+    """Return the plaintext for *ciphertext*, calling *decrypt* only on a
+    miss in both the in-memory and the per-run disk layer.
+
+    Exceptions raised by *decrypt* propagate and nothing is cached.
+    """
+    key = ciphertext_key(ciphertext)
+    cached = _PLAINTEXT_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    store = _store_dir()
+    if store is not None:
+        cached = _read_store(store, key)
+        if cached is not None:
+            _PLAINTEXT_CACHE[key] = cached
+            return cached
+
+    plaintext = str(decrypt())
+    _PLAINTEXT_CACHE[key] = plaintext
+    if store is not None:
+        _write_store(store, key, plaintext)
+    return plaintext
+
+
+def create_run_store(
+    parent: Optional[str | os.PathLike[str]] = None,
+) -> Optional[Path]:
+    """Create a private per-run store directory on tmpfs.
+
+    Without an explicit *parent*, returns None when no tmpfs candidate is
+    writable; callers then run with the in-memory cache only instead of
+    writing plaintext to the default (possibly persistent) temp dir.
+    """
+    if parent is None:
+        for candidate in _TMPFS_CANDIDATES:
+            candidate = candidate.format(uid=os.getuid())
+            if os.path.isdir(candidate) and os.access(candidate, os.W_OK):
+                parent = candidate
+                break
+        else:
+            return None
+    # mkdtemp creates the directory with mode 0700.
+    return Path(tempfile.mkdtemp(prefix="infinito-vault-", dir=parent))
+
+
+def wipe_run_store(path: str | os.PathLike[str]) -> None:
+    """Remove a store created by :func:`create_run_store`."""
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def _reset() -> None:
+    """Test-only helper: clear the in-memory plaintext cache."""
+    _PLAINTEXT_CACHE.clear()
@@ -0,0 +1,183 @@
+"""Deduplicated catalogue of the images referenced by the roles.
+
+`iter_role_images` yields one `ImageRef` per role service, so an upstream
+image:tag used by several roles shows up several times. `build_catalogue`
+collapses those references by their pull source and records which roles
+and services use each one, so mirroring and resolving tools work on every
+image exactly once.
+
+Manifest digests can be resolved through `DigestCache`, a JSON file in
+``$INFINITO_IMAGE_DIGEST_CACHE`` or
+``$XDG_CACHE_HOME/infinito-nexus/image-digests.json`` (``~/.cache/...``
+by default). Entries are reused until they are older than the TTL.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import subprocess
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from utils.docker.image.discovery import ImageRef
+
+DIGEST_CACHE_ENV = "INFINITO_IMAGE_DIGEST_CACHE"
+DEFAULT_DIGEST_TTL = 6 * 3600
+
+
+@dataclass(frozen=True)
+class ImageUse:
+    role: str
+    service: str
+    source_file: str
+
+
+@dataclass(frozen=True)
+class CatalogueEntry:
+    # Representative reference (the first use in discovery order).
+    ref: ImageRef
+    uses: Tuple[ImageUse, ...]
+    digest: Optional[str] = None
+
+    @property
+    def source(self) -> str:
+        return self.ref.source
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "source": self.ref.source,
+            "registry": self.ref.registry,
+            "name": self.ref.name,
+            "version": self.ref.version,
+            "digest": self.digest,
+            "used_by": [
+                {"role": u.role, "service": u.service, "source_file": u.source_file}
+                for u in self.uses
+            ],
+        }
+
+
+def build_catalogue(images: Iterable[ImageRef]) -> List[CatalogueEntry]:
+    """Collapse `images` by pull source; entries are sorted by source."""
+    refs: Dict[str, ImageRef] = {}
+    uses: Dict[str, List[ImageUse]] = {}
+    for img in images:
+        refs.setdefault(img.source, img)
+        use = ImageUse(role=img.role, service=img.service, source_file=img.source_file)
+        if use not in uses.setdefault(img.source, []):
+            uses[img.source].append(use)
+    return [
+        CatalogueEntry(
+            ref=refs[source],
+            uses=tuple(sorted(uses[source], key=lambda u: (u.role, u.service))),
+        )
+        for source in sorted(refs)
+    ]
+
+
+def manifest_digest(ref: str) -> Optional[str]:
+    """
+    Return the digest of the manifest (or manifest list) behind *ref*, a
+    skopeo transport reference such as ``docker://ghcr.io/a/b:1``.
+
+    Uses ``skopeo inspect --raw``, which only fetches the manifest itself.
+    Returns None when the manifest cannot be read.
+    """
+    r = subprocess.run(
+        ["skopeo", "inspect", "--raw", ref],
+        check=False,
+        capture_output=True,
+    )
+    if r.returncode != 0:
+        return None
+    return "sha256:" + hashlib.sha256(r.stdout).hexdigest()
+
+
+def default_digest_cache_path() -> Path:
+    override = os.environ.get(DIGEST_CACHE_ENV)
+    if override:
+        return Path(override).expanduser()
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join("~", ".cache")
+    return Path(cache_home).expanduser() / "infinito-nexus" / "image-digests.json"
+
+
+class DigestCache:
+    """On-disk {source: {"digest", "resolved_at"}} map with a TTL."""
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        ttl: float = DEFAULT_DIGEST_TTL,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        if isinstance(data, dict):
+            self._entries = {
+                k: v
+                for k, v in data.items()
+                if isinstance(v, dict) and isinstance(v.get("digest"), str)
+            }
+
+    def get(self, source: str) -> Optional[str]:
+        entry = self._entries.get(source)
+        if entry is None:
+            return None
+        if self._clock() - float(entry.get("resolved_at", 0)) > self.ttl:
+            return None
+        return entry["digest"]
+
+    def put(self, source: str, digest: str) -> None:
+        self._entries[source] = {"digest": digest, "resolved_at": self._clock()}
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=str(self.path.parent), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(self._entries, fh, indent=2, sort_keys=True)
+            fh.write("\n")
+        os.replace(tmp, self.path)
+
+
+def resolve_digests(
+    entries: Iterable[CatalogueEntry],
+    cache: DigestCache,
+    *,
+    resolve: Optional[Callable[[str], Optional[str]]] = None,
+) -> List[CatalogueEntry]:
+    """
+    Return `entries` with their source manifest digest filled in, from
+    `cache` where fresh and via `resolve` (default: `manifest_digest`)
+    otherwise. Entries whose digest cannot be resolved keep None.
+    """
+    resolve = resolve or manifest_digest
+    result: List[CatalogueEntry] = []
+    for entry in entries:
+        digest = cache.get(entry.source)
+        if digest is None:
+            digest = resolve(f"docker://{entry.source}")
+            if digest is not None:
+                cache.put(entry.source, digest)
+        result.append(CatalogueEntry(ref=entry.ref, uses=entry.uses, digest=digest))
+    return result
+
+
+def catalogue_to_json(entries: Iterable[CatalogueEntry]) -> Dict[str, Any]:
+    items = [entry.to_dict() for entry in entries]
+    return {
+        "images": items,
+        "total": len(items),
+        "references": sum(len(item["used_by"]) for item in items),
+    }
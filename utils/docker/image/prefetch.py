@@ -0,0 +1,95 @@
+"""Plan the background image prefetch of a server stage.
+
+Ansible deploys the application roles of a host one after another. The
+slowest part of a fresh deploy is usually `docker compose pull`, which
+only starts once the role reaches its compose handler. `prefetch_images`
+lists the images of all applications of the run in the order the roles
+will need them, so a bounded pool of `container pull` workers can warm
+the image store while earlier roles are still being deployed.
+
+The order follows the deploy order: group by group (`GROUP_ORDER`), and
+within a group by `run_after` wave (see `utils.roles.run_after_dag`), so
+the images of roles that do not depend on each other are pulled side by
+side and no role's images are queued behind those of a role that runs
+after it.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import Any, List, Optional
+
+from utils.entity_name_utils import get_entity_name
+from utils.roles.run_after_dag import run_after_waves
+
+# Order in which tasks/stages/02_server.yml includes the role groups.
+GROUP_ORDER: tuple[str, ...] = ("web-svc-", "web-app-", "web-opt-")
+
+
+def group_rank(application_id: str) -> int:
+    """Position of the role group `application_id` is deployed in."""
+    for rank, prefix in enumerate(GROUP_ORDER):
+        if application_id.startswith(prefix):
+            return rank
+    return len(GROUP_ORDER)
+
+
+def application_images(app_config: Any, primary: Optional[str] = None) -> List[str]:
+    """
+    Return the "image:version" references of an application's own
+    services. Services without an image (shared services provided by
+    other roles) and services disabled with `enabled: false` are skipped.
+    The `primary` entity is always kept: its `enabled` flag only tells
+    other applications whether they consume it.
+    """
+    if not isinstance(app_config, Mapping):
+        return []
+    services = app_config.get("services")
+    if not isinstance(services, Mapping):
+        return []
+
+    refs: List[str] = []
+    for name, service in services.items():
+        if not isinstance(service, Mapping):
+            continue
+        if service.get("enabled") is False and name != primary:
+            continue
+        image = service.get("image")
+        if not isinstance(image, str) or not image.strip():
+            continue
+        version = service.get("version")
+        ref = image.strip()
+        if version not in (None, ""):
+            ref = f"{ref}:{version}"
+        refs.append(ref)
+    return refs
+
+
+def prefetch_images(
+    application_ids: Iterable[str],
+    applications: Mapping[str, Any],
+    run_after: Mapping[str, Iterable[str]],
+) -> List[str]:
+    """
+    Return the distinct image references of `application_ids` in deploy
+    order. `run_after` maps application ids to the roles they run after.
+    """
+    app_ids = sorted(set(application_ids))
+    wave_of = {
+        app_id: index
+        for index, wave in enumerate(
+            run_after_waves({app_id: run_after.get(app_id, []) for app_id in app_ids})
+        )
+        for app_id in wave
+    }
+
+    refs: List[str] = []
+    seen: set[str] = set()
+    for app_id in sorted(app_ids, key=lambda a: (group_rank(a), wave_of[a], a)):
+        for ref in application_images(
+            applications.get(app_id), get_entity_name(app_id)
+        ):
+            if ref not in seen:
+                seen.add(ref)
+                refs.append(ref)
+    return refs
@@ -0,0 +1,234 @@
+"""HTTP client for registry APIs with keep-alive, rate limits and caching.
+
+`RegistryClient` keeps one persistent connection per host and thread,
+limits the request rate per host with a token bucket and retries on 429
+and 5xx (honouring ``Retry-After``).
+
+GET responses that carry an ``ETag`` or ``Last-Modified`` header are kept
+in a `ResponseCache`, one JSON file per URL in ``$INFINITO_REGISTRY_CACHE_DIR``
+or ``$XDG_CACHE_HOME/infinito-nexus/registry-http`` (``~/.cache/...`` by
+default). Later requests for the same URL are sent conditionally, and a
+``304 Not Modified`` is answered with the cached body.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import http.client
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+from utils.rate_limit import TokenBucket
+
+USER_AGENT = "infinito-nexus-version-updater"
+CACHE_DIR_ENV = "INFINITO_REGISTRY_CACHE_DIR"
+
+# Requests per second and host. Docker Hub throttles anonymous API use.
+DEFAULT_RATES: Dict[str, float] = {"hub.docker.com": 5.0, "ghcr.io": 10.0}
+
+
+def default_cache_dir() -> Path:
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return Path(override).expanduser()
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join("~", ".cache")
+    return Path(cache_home).expanduser() / "infinito-nexus" / "registry-http"
+
+
+class ResponseCache:
+    """One JSON file per key with the body and its validators."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    def _path(self, key: str) -> Path:
+        return self.directory / (hashlib.sha256(key.encode()).hexdigest() + ".json")
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            data = json.loads(self._path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("key") != key:
+            return None
+        return data
+
+    def store(
+        self,
+        key: str,
+        body: str,
+        *,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=str(self.directory), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(
+                    {
+                        "key": key,
+                        "etag": etag,
+                        "last_modified": last_modified,
+                        "body": body,
+                    },
+                    fh,
+                )
+            os.replace(tmp, self._path(key))
+        except OSError:
+            # The cache is an optimisation; a read-only home must not fail the run.
+            pass
+
+
+@dataclass
+class Response:
+    status: int
+    body: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    # True when the server answered 304 and `body` comes from the cache.
+    from_cache: bool = False
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class RegistryClient:
+    def __init__(
+        self,
+        *,
+        cache: Optional[ResponseCache] = None,
+        rates: Mapping[str, float] = DEFAULT_RATES,
+        timeout: float = 15.0,
+        max_retries: int = 3,
+        sleep: Optional[Callable[[float], None]] = None,
+    ) -> None:
+        self.cache = cache
+        self.rates = dict(rates)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self._sleep = sleep or time.sleep
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._connections: List[http.client.HTTPConnection] = []
+
+    def _bucket(self, host: str) -> Optional[TokenBucket]:
+        rate = self.rates.get(host)
+        if not rate:
+            return None
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(rate, capacity=max(1, int(rate)))
+                self._buckets[host] = bucket
+            return bucket
+
+    def _connection(self, scheme: str, host: str) -> http.client.HTTPConnection:
+        conns = self._local.__dict__.setdefault("conns", {})
+        conn = conns.get((scheme, host))
+        if conn is None:
+            cls = (
+                http.client.HTTPSConnection
+                if scheme == "https"
+                else http.client.HTTPConnection
+            )
+            conn = cls(host, timeout=self.timeout)
+            conns[(scheme, host)] = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _drop(self, scheme: str, host: str) -> None:
+        conn = self._local.__dict__.get("conns", {}).pop((scheme, host), None)
+        if conn is not None:
+            conn.close()
+
+    def _request(
+        self, scheme: str, host: str, path: str, headers: Dict[str, str]
+    ) -> Tuple[int, Dict[str, str], str]:
+        conn = self._connection(scheme, host)
+        conn.request("GET", path, headers=headers)
+        resp = conn.getresponse()
+        body = resp.read().decode("utf-8", errors="replace")
+        resp_headers = {k.lower(): v for k, v in resp.getheaders()}
+        if resp_headers.get("connection", "").lower() == "close":
+            self._drop(scheme, host)
+        return resp.status, resp_headers, body
+
+    def _retry_delay(self, headers: Mapping[str, str], attempt: int) -> float:
+        try:
+            return max(0.0, float(headers.get("retry-after", "")))
+        except ValueError:
+            return min(2.0**attempt, 30.0)
+
+    def get(
+        self,
+        url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        *,
+        cache_key: Optional[str] = None,
+    ) -> Optional[Response]:
+        """
+        GET `url`; returns None when the host cannot be reached.
+
+        Responses are cached under `cache_key` (default: the URL); pass
+        an empty string to bypass the cache, e.g. for token requests.
+        """
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        key = url if cache_key is None else cache_key
+        cached = self.cache.load(key) if (self.cache and key) else None
+
+        request_headers = {
+            "User-Agent": USER_AGENT,
+            "Accept": "application/json",
+            **(headers or {}),
+        }
+        if cached:
+            if cached.get("etag"):
+                request_headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                request_headers["If-Modified-Since"] = cached["last_modified"]
+
+        bucket = self._bucket(parts.netloc)
+        for attempt in range(self.max_retries + 1):
+            if bucket is not None:
+                bucket.acquire()
+            try:
+                status, resp_headers, body = self._request(
+                    parts.scheme, parts.netloc, path, request_headers
+                )
+            except (OSError, http.client.HTTPException):
+                # Stale keep-alive connection or network error: reconnect.
+                self._drop(parts.scheme, parts.netloc)
+                if attempt < self.max_retries:
+                    continue
+                return None
+
+            if status == 304 and cached:
+                return Response(200, cached["body"], resp_headers, from_cache=True)
+            if (status == 429 or status >= 500) and attempt < self.max_retries:
+                self._sleep(self._retry_delay(resp_headers, attempt))
+                continue
+            if status == 200 and self.cache and key:
+                etag = resp_headers.get("etag")
+                last_modified = resp_headers.get("last-modified")
+                if etag or last_modified:
+                    self.cache.store(key, body, etag=etag, last_modified=last_modified)
+            return Response(status, body, resp_headers)
+        return None
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
@@ -2,11 +2,11 @@ from __future__ import annotations
 
 import json
 import re
-import time
-import urllib.error
-import urllib.request
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterable
 from urllib.parse import quote, urlencode
 
 import yaml
@@ -19,6 +19,19 @@ from utils.docker.image.ref import (
     GHCR_REGISTRY,
     split_registry_and_name,
 )
+from utils.docker.registry_http import (
+    RegistryClient,
+    Response,
+    ResponseCache,
+    default_cache_dir,
+)
+
+DOCKERHUB_URL = "https://hub.docker.com"
+GHCR_URL = f"https://{GHCR_REGISTRY}"
+DEFAULT_FETCH_WORKERS = 8
+
+_CLIENT: RegistryClient | None = None
+_CLIENT_LOCK = threading.Lock()
 
 _SEMVER_CORE = r"v?\d+(?:\.\d+){0,3}"
 # Tags that extend a semver with a `-<flavor>` suffix, e.g. the Docker
@@ -116,28 +129,66 @@ def dockerhub_repo(image: str) -> str:
     return name if "/" in name else f"library/{name}"
 
 
-def fetch_dockerhub_tags(image: str, max_pages: int = 5) -> list[str]:
+def _default_client() -> RegistryClient:
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            _CLIENT = RegistryClient(cache=ResponseCache(default_cache_dir()))
+        return _CLIENT
+
+
+def fetch_dockerhub_tags(
+    image: str,
+    max_pages: int = 5,
+    *,
+    client: RegistryClient | None = None,
+    base_url: str = DOCKERHUB_URL,
+) -> list[str]:
+    """
+    Return up to `max_pages` pages of tags, most recently updated first.
+
+    Because of that ordering any new or moved tag changes the first page.
+    When the first page is answered from the cache (304), the complete tag
+    list of the previous run is reused without paging further.
+    """
+    client = client or _default_client()
     repo = dockerhub_repo(image)
+    url = f"{base_url}/v2/repositories/{repo}/tags/?page_size=100&ordering=last_updated"
+    all_key = f"{url}#all-pages={max_pages}"
+
     tags: list[str] = []
-    for page in range(1, max_pages + 1):
-        url = (
-            f"https://hub.docker.com/v2/repositories/{repo}/tags/"
-            f"?page_size=100&page={page}"
-        )
-        req = urllib.request.Request(
-            url, headers={"User-Agent": "infinito-nexus-version-updater"}
-        )
+    first: Response | None = None
+    # Only a list that ended on the last page or at max_pages may be reused;
+    # a failed later page would otherwise pin a truncated list to page 1.
+    complete = True
+    for _page in range(max_pages):
+        resp = client.get(url)
+        if resp is None or resp.status != 200:
+            complete = False
+            break
+        if first is None:
+            first = resp
+            if resp.from_cache and client.cache is not None:
+                previous = client.cache.load(all_key)
+                if previous is not None:
+                    return json.loads(previous["body"])
         try:
-            with urllib.request.urlopen(req, timeout=15) as resp:
-                if resp.status == 429:
-                    time.sleep(2)
-                    continue
-                body = json.loads(resp.read().decode())
-        except (urllib.error.URLError, OSError, json.JSONDecodeError):
+            body = resp.json()
+        except ValueError:
+            complete = False
             break
         tags.extend(item["name"] for item in body.get("results", []))
-        if not body.get("next"):
+        url = body.get("next") or ""
+        if not url:
             break
+
+    if complete and first is not None and client.cache is not None:
+        client.cache.store(
+            all_key,
+            json.dumps(tags),
+            etag=first.headers.get("etag"),
+            last_modified=first.headers.get("last-modified"),
+        )
     return tags
 
 
@@ -153,40 +204,61 @@ def ghcr_repo(image: str) -> str:
     return parsed[1]
 
 
-def fetch_ghcr_tags(image: str) -> list[str]:
+def fetch_ghcr_tags(
+    image: str,
+    *,
+    client: RegistryClient | None = None,
+    base_url: str = GHCR_URL,
+) -> list[str]:
+    client = client or _default_client()
     name = ghcr_repo(image)
     token_query = urlencode(
         {"scope": f"repository:{name}:pull", "service": GHCR_REGISTRY}
     )
-    token_url = f"https://{GHCR_REGISTRY}/token?{token_query}"
+    token_resp = client.get(f"{base_url}/token?{token_query}", cache_key="")
+    if token_resp is None or token_resp.status != 200:
+        return []
     try:
-        req = urllib.request.Request(
-            token_url, headers={"User-Agent": "infinito-nexus-version-updater"}
-        )
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            token_body = json.loads(resp.read().decode())
-        token = token_body.get("token") or token_body.get("access_token")
-    except (urllib.error.URLError, OSError, json.JSONDecodeError):
+        token_body = token_resp.json()
+    except ValueError:
         return []
-
+    token = token_body.get("token") or token_body.get("access_token")
     if not token:
         return []
 
-    tags_url = f"https://{GHCR_REGISTRY}/v2/{quote(name, safe='/')}/tags/list"
-    req = urllib.request.Request(
-        tags_url,
-        headers={
-            "Authorization": f"Bearer {token}",
-            "User-Agent": "infinito-nexus-version-updater",
-        },
+    resp = client.get(
+        f"{base_url}/v2/{quote(name, safe='/')}/tags/list",
+        {"Authorization": f"Bearer {token}"},
     )
+    if resp is None or resp.status != 200:
+        return []
     try:
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            body = json.loads(resp.read().decode())
-    except (urllib.error.URLError, OSError, json.JSONDecodeError):
+        return resp.json().get("tags") or []
+    except ValueError:
         return []
 
-    return body.get("tags") or []
+
+def fetch_image_tags(
+    images: Iterable[str],
+    *,
+    client: RegistryClient | None = None,
+    workers: int = DEFAULT_FETCH_WORKERS,
+) -> dict[str, list[str]]:
+    """
+    Fetch the tags of every distinct Docker Hub / GHCR image concurrently.
+
+    Images of other registries are left out of the result.
+    """
+    client = client or _default_client()
+    supported = sorted({i for i in images if is_dockerhub(i) or is_ghcr(i)})
+
+    def _fetch(image: str) -> list[str]:
+        if is_dockerhub(image):
+            return fetch_dockerhub_tags(image, client=client)
+        return fetch_ghcr_tags(image, client=client)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        return dict(zip(supported, pool.map(_fetch, supported)))
 
 
 def suppressed_services(config_path: Path) -> set[str]:
@@ -262,17 +334,9 @@ def collect_entries(repo_root: Path) -> list[DockerImageVersionEntry]:
 
 def find_outdated_updates(repo_root: Path) -> list[DockerImageVersionUpdate]:
     entries = collect_entries(repo_root)
-    image_tags: dict[str, list[str]] = {}
+    image_tags = fetch_image_tags(entry.image for entry in entries)
     updates: list[DockerImageVersionUpdate] = []
 
-    for entry in entries:
-        if entry.image in image_tags:
-            continue
-        if is_dockerhub(entry.image):
-            image_tags[entry.image] = fetch_dockerhub_tags(entry.image)
-        elif is_ghcr(entry.image):
-            image_tags[entry.image] = fetch_ghcr_tags(entry.image)
-
     for entry in entries:
         tags = image_tags.get(entry.image, [])
         if not tags:
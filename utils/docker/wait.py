@@ -0,0 +1,219 @@
+"""Wait for containers to become ready.
+
+`wait_for_health` subscribes to `docker events` for the container's
+health_status/start/die events and returns as soon as the state flips,
+instead of calling `docker inspect` at a fixed interval. The current state
+is inspected once after subscribing and again every `recheck_s` seconds
+as a safety net for events sent before the subscription was in place.
+When the event stream cannot be opened (or ends) the wait falls back to
+`poll_until` with exponential backoff.
+
+Both report how long the wait took, so callers can log the
+time-to-healthy per container.
+"""
+
+from __future__ import annotations
+
+import queue
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Prints the health status for containers with a health check and the
+# plain state (running, exited, ...) for containers without one.
+_STATUS_FORMAT = (
+    "{{if .State.Health}}{{.State.Health.Status}}{{else}}{{.State.Status}}{{end}}"
+)
+
+READY_STATES = frozenset({"healthy", "running"})
+# States a container does not leave on its own.
+FINAL_STATES = frozenset({"exited", "dead", "removing"})
+
+
+@dataclass(frozen=True)
+class WaitResult:
+    container: str
+    status: str
+    ready: bool
+    seconds: float
+    # "events" or "polling": how the final state was observed.
+    via: str
+
+
+def backoff_delays(
+    initial: float = 0.25, maximum: float = 4.0, factor: float = 2.0
+) -> Iterator[float]:
+    """Yield initial, initial*factor, ... capped at `maximum`, forever."""
+    delay = initial
+    while True:
+        yield delay
+        delay = min(delay * factor, maximum)
+
+
+def poll_until(
+    probe: Callable[[], Optional[T]],
+    *,
+    timeout_s: float,
+    initial_delay: float = 0.25,
+    max_delay: float = 4.0,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Optional[Callable[[float], None]] = None,
+) -> Tuple[Optional[T], float]:
+    """
+    Call `probe` until it returns something other than None or `timeout_s`
+    has passed, sleeping with exponential backoff in between.
+
+    Returns (value or None on timeout, elapsed seconds).
+    """
+    sleep = sleep or time.sleep
+    start = clock()
+    for delay in backoff_delays(initial_delay, max_delay):
+        value = probe()
+        elapsed = clock() - start
+        if value is not None:
+            return value, elapsed
+        if elapsed >= timeout_s:
+            return None, elapsed
+        sleep(min(delay, timeout_s - elapsed))
+    raise AssertionError("unreachable")
+
+
+def container_status(
+    container: str, *, docker: Sequence[str] = ("docker",), cwd: Optional[str] = None
+) -> str:
+    """Current health (or state) of `container`; '' when it cannot be inspected."""
+    r = subprocess.run(
+        [*docker, "inspect", "-f", _STATUS_FORMAT, container],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    return r.stdout.strip() if r.returncode == 0 else ""
+
+
+def _event_status(action: str) -> Optional[str]:
+    action = action.strip()
+    if action.startswith("health_status:"):
+        return action.split(":", 1)[1].strip()
+    if action == "die":
+        return "exited"
+    return None
+
+
+def _open_events(
+    container: str, docker: Sequence[str], cwd: Optional[str]
+) -> Optional[subprocess.Popen]:
+    try:
+        return subprocess.Popen(
+            [
+                *docker,
+                "events",
+                "--filter",
+                "type=container",
+                "--filter",
+                f"container={container}",
+                "--filter",
+                "event=health_status",
+                "--filter",
+                "event=start",
+                "--filter",
+                "event=die",
+                "--format",
+                "{{.Action}}",
+            ],
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+    except OSError:
+        return None
+
+
+def _pump(stream, lines: "queue.Queue[Optional[str]]") -> None:
+    try:
+        for line in stream:
+            lines.put(line)
+    except (OSError, ValueError):
+        pass
+    finally:
+        lines.put(None)
+
+
+def wait_for_health(
+    container: str,
+    *,
+    timeout_s: float,
+    docker: Sequence[str] = ("docker",),
+    cwd: Optional[str] = None,
+    recheck_s: float = 5.0,
+    on_status: Optional[Callable[[str], None]] = None,
+    clock: Callable[[], float] = time.monotonic,
+) -> WaitResult:
+    """
+    Wait until `container` is healthy (or running, without a health check).
+
+    Returns early with ready=False when the container stops. `on_status`
+    is called for every observed status change.
+    """
+    start = clock()
+    last = ""
+
+    def _seen(status: str) -> str:
+        nonlocal last
+        if status != last and on_status is not None:
+            on_status(status)
+        last = status
+        return status
+
+    def _result(status: str, via: str) -> WaitResult:
+        return WaitResult(
+            container=container,
+            status=status,
+            ready=status in READY_STATES,
+            seconds=clock() - start,
+            via=via,
+        )
+
+    events = _open_events(container, docker, cwd)
+    if events is not None and events.stdout is not None:
+        lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        threading.Thread(target=_pump, args=(events.stdout, lines), daemon=True).start()
+        try:
+            status = _seen(container_status(container, docker=docker, cwd=cwd))
+            while status not in READY_STATES and status not in FINAL_STATES:
+                remaining = timeout_s - (clock() - start)
+                if remaining <= 0:
+                    return _result(status, "events")
+                try:
+                    line = lines.get(timeout=min(remaining, recheck_s))
+                except queue.Empty:
+                    status = _seen(container_status(container, docker=docker, cwd=cwd))
+                    continue
+                if line is None:
+                    # Event stream gone; poll for the rest of the time.
+                    break
+                status = _seen(
+                    _event_status(line)
+                    or container_status(container, docker=docker, cwd=cwd)
+                )
+            else:
+                return _result(status, "events")
+        finally:
+            events.kill()
+            events.wait()
+
+    def _probe() -> Optional[str]:
+        status = _seen(container_status(container, docker=docker, cwd=cwd))
+        if status in READY_STATES or status in FINAL_STATES:
+            return status
+        return None
+
+    remaining = max(0.0, timeout_s - (clock() - start))
+    status, _ = poll_until(_probe, timeout_s=remaining, clock=clock)
+    return _result(status or last, "polling")
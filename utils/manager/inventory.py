@@ -68,6 +68,9 @@ class InventoryManager:
         self.vault_handler = VaultHandler(vault_pw)
         self.roles_root = self.role_path.parent
         self.value_generator = ValueGenerator()
+        # Values generated ahead of time by `_prefetch_generated_values`,
+        # keyed by algorithm and consumed in schema order.
+        self._generated: Dict[str, List[str]] = {}
 
     # ---------------------------------------------------------------------
     # File loading helpers
@@ -188,8 +191,11 @@ class InventoryManager:
           1) all recursively discovered shared-provider roles
           2) this role itself
         """
+        provider_roles = self.resolve_schema_includes_recursive(self.role_path.name)
+        self._prefetch_generated_values(provider_roles)
+
         # 1) Provider roles (transitive)
-        for role_name in self.resolve_schema_includes_recursive(self.role_path.name):
+        for role_name in provider_roles:
             role_path = self.roles_root / role_name
             self._apply_one_role_special_rules(role_path)
             self._apply_one_role_schema(role_name)
@@ -203,6 +209,66 @@ class InventoryManager:
 
         return self.inventory
 
+    def _prefetch_generated_values(self, provider_roles: List[str]) -> None:
+        """
+        Generate every value the schemas below will ask for in one batch,
+        so expensive algorithms (bcrypt) run in parallel instead of one
+        after another during the recursion.
+        """
+        apps = self.inventory.get("applications") or {}
+        pending: List[str] = []
+        for role_name in provider_roles:
+            schema = self.load_role_schema(role_name)
+            if schema:
+                app_id = self.load_application_id(self.roles_root / role_name)
+                pending.extend(self._pending_algorithms(schema, apps.get(app_id)))
+        pending.extend(self._pending_algorithms(self.schema, apps.get(self.app_id)))
+
+        self._generated = {}
+        if not pending:
+            return
+        for algorithm, value in zip(
+            pending, self.value_generator.generate_values(pending)
+        ):
+            self._generated.setdefault(algorithm, []).append(value)
+
+    def _pending_algorithms(
+        self, branch: Any, dest: Any, prefix: str = ""
+    ) -> List[str]:
+        """Read-only mirror of `recurse_credentials` listing the algorithms
+        of every leaf that will need a freshly generated value."""
+        dest = dest if isinstance(dest, dict) else {}
+        pending: List[str] = []
+        for key, meta in (branch or {}).items():
+            full_key = f"{prefix}.{key}" if prefix else key
+            inside_credentials = prefix == "credentials" or prefix.startswith(
+                "credentials."
+            )
+            existing_value = dest.get(key)
+
+            if inside_credentials and _is_credential_leaf(meta):
+                algorithm = meta.get("algorithm") or "plain"
+                if (
+                    algorithm != "plain"
+                    and "default" not in meta
+                    and full_key not in self.overrides
+                    and not isinstance(existing_value, dict)
+                    and not (existing_value and isinstance(existing_value, VaultScalar))
+                ):
+                    pending.append(algorithm)
+                continue
+
+            if isinstance(meta, dict):
+                pending.extend(self._pending_algorithms(meta, existing_value, full_key))
+        return pending
+
+    def _take_generated(self, algorithm: str) -> str:
+        """Pop a prefetched value, generating on demand when none is left."""
+        prefetched = self._generated.get(algorithm)
+        if prefetched:
+            return prefetched.pop(0)
+        return self.value_generator.generate_value(algorithm)
+
     # ---------------------------------------------------------------------
     # Credential recursion
     # ---------------------------------------------------------------------
@@ -285,10 +351,10 @@ class InventoryManager:
                     file=sys.stderr,
                 )
                 sys.exit(1)
+        elif full_key in self.overrides:
+            plain = self.overrides[full_key]
         else:
-            plain = self.overrides.get(
-                full_key, self.value_generator.generate_value(algorithm)
-            )
+            plain = self._take_generated(algorithm)
 
         if plain == "":
             dest[key] = ""
@@ -1,9 +1,66 @@
 import base64
 import bcrypt
 import hashlib
+import os
 import re
 import secrets
 import string
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional
+
+_LOWER = string.ascii_lowercase
+_UPPER = string.ascii_uppercase
+_DIGITS = string.digits
+_SPECIAL = "!@#$%^&*()-_=+[]{}:,.?"
+_PASSWORD_ALPHABET = string.ascii_letters + _DIGITS + _SPECIAL
+_ALNUM_ALPHABET = string.ascii_letters + _DIGITS
+_BCRYPT_ESCAPE_ALPHABET = _DIGITS + _LOWER
+
+
+def _random_chars(alphabet: str, length: int) -> List[str]:
+    """Draw *length* uniformly distributed characters from *alphabet*.
+
+    Randomness is fetched with one ``secrets.token_bytes`` call per round
+    instead of one ``secrets.choice`` call per character. Bytes at or above
+    the largest multiple of ``len(alphabet)`` are discarded so the modulo
+    mapping stays unbiased.
+    """
+    size = len(alphabet)
+    limit = 256 - (256 % size)
+    out: List[str] = []
+    while len(out) < length:
+        # Over-fetch slightly so one round almost always suffices.
+        for byte in secrets.token_bytes(length - len(out) + 16):
+            if byte < limit:
+                out.append(alphabet[byte % size])
+                if len(out) == length:
+                    break
+    return out
+
+
+def _secure_shuffle(chars: List[str]) -> None:
+    """In-place Fisher-Yates shuffle driven by ``secrets``."""
+    for i in range(len(chars) - 1, 0, -1):
+        j = secrets.randbelow(i + 1)
+        chars[i], chars[j] = chars[j], chars[i]
+
+
+def _escape_bcrypt_hash(raw_hash: str) -> str:
+    # '$' breaks Jinja/shell consumers downstream, so every occurrence is
+    # replaced by a random [0-9a-z] character.
+    replacements = iter(_random_chars(_BCRYPT_ESCAPE_ALPHABET, raw_hash.count("$")))
+    return "".join(next(replacements) if ch == "$" else ch for ch in raw_hash)
+
+
+def _bcrypt_value() -> str:
+    """Module-level so it can be shipped to a process pool."""
+    pw = secrets.token_urlsafe(16).encode()
+    raw_hash = bcrypt.hashpw(pw, bcrypt.gensalt()).decode()
+    return _escape_bcrypt_hash(raw_hash)
+
+
+# Algorithms whose cost justifies farming them out to worker processes.
+_POOLED_GENERATORS = {"bcrypt": _bcrypt_value}
 
 
 class ValueGenerator:
@@ -21,22 +78,29 @@ class ValueGenerator:
         if length < 12:
             raise ValueError("Password length must be at least 12 characters")
 
-        characters = string.ascii_letters + string.digits + "!@#$%^&*()-_=+[]{}:,.?"
-
-        for _ in range(10_000):  # defensive upper bound
-            password = "".join(secrets.choice(characters) for _ in range(length))
-            if self._is_valid_password(password):
-                return password
+        # Construct to policy: one character from every required class,
+        # the rest from the full alphabet, then shuffle so the guaranteed
+        # characters do not sit at predictable positions.
+        chars = [
+            _random_chars(_LOWER, 1)[0],
+            _random_chars(_UPPER, 1)[0],
+            _random_chars(_DIGITS, 1)[0],
+            _random_chars(_SPECIAL, 1)[0],
+        ]
+        chars.extend(_random_chars(_PASSWORD_ALPHABET, length - len(chars)))
+        _secure_shuffle(chars)
+        password = "".join(chars)
 
-        raise RuntimeError("Failed to generate a valid password after many attempts")
+        if not self._is_valid_password(password):
+            raise RuntimeError("Generated password violates the password policy")
+        return password
 
     def _is_valid_password(self, password: str) -> bool:
         return bool(self.PASSWORD_REGEX.match(password))
 
     def generate_secure_alphanumeric(self, length: int) -> str:
         """Generate a cryptographically secure random alphanumeric string of the given length."""
-        characters = string.ascii_letters + string.digits  # a-zA-Z0-9
-        return "".join(secrets.choice(characters) for _ in range(length))
+        return "".join(_random_chars(_ALNUM_ALPHABET, length))
 
     def generate_value(self, algorithm: str) -> str:
         """
@@ -66,15 +130,44 @@ class ValueGenerator:
         if algorithm == "strong_password":
             return self.generate_strong_password(32)
         if algorithm == "bcrypt":
-            pw = secrets.token_urlsafe(16).encode()
-            raw_hash = bcrypt.hashpw(pw, bcrypt.gensalt()).decode()
-            alnum = string.digits + string.ascii_lowercase
-            escaped = "".join(
-                secrets.choice(alnum) if ch == "$" else ch for ch in raw_hash
-            )
-            return escaped
+            return _bcrypt_value()
         if algorithm == "alphanumeric":
             return self.generate_secure_alphanumeric(64)
         if algorithm == "base64_prefixed_32":
             return "base64:" + base64.b64encode(secrets.token_bytes(32)).decode()
         return "undefined"
+
+    def generate_values(
+        self, algorithms: Iterable[str], workers: Optional[int] = None
+    ) -> List[str]:
+        """
+        Generate one value per entry of *algorithms*, in the same order.
+
+        Cheap algorithms are produced inline through :meth:`generate_value`.
+        Expensive ones (bcrypt hashing) run across a process pool
+        when more than one is requested; ``workers=1`` keeps everything in
+        the calling process.
+        """
+        algorithms = list(algorithms)
+        values: List[Optional[str]] = [None] * len(algorithms)
+
+        pooled = [i for i, alg in enumerate(algorithms) if alg in _POOLED_GENERATORS]
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = max(1, min(workers, len(pooled)))
+
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    i: executor.submit(_POOLED_GENERATORS[algorithms[i]])
+                    for i in pooled
+                }
+                for i, alg in enumerate(algorithms):
+                    if i not in futures:
+                        values[i] = self.generate_value(alg)
+                for i, future in futures.items():
+                    values[i] = future.result()
+        else:
+            values = [self.generate_value(alg) for alg in algorithms]
+
+        return values
@@ -0,0 +1,58 @@
+"""Rate limiting shared by the registry tools (mirror sync, version updater)."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    The bucket holds up to `capacity` tokens and refills at `rate` tokens
+    per second. `acquire()` takes one token and blocks until one is
+    available, so at most `capacity` copies start back to back and the
+    long-run start rate never exceeds `rate`.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: int = 1,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Optional[Callable[[float], None]] = None,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.rate = float(rate)
+        self.capacity = int(capacity)
+        self._clock = clock
+        self._sleep = sleep or time.sleep
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            float(self.capacity), self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Take one token; return the seconds spent waiting for it."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return waited
+                delay = (1.0 - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
@@ -0,0 +1,43 @@
+"""Group roles into waves along their ``run_after`` edges.
+
+Wave 0 holds every role that runs after none of the other given roles,
+wave N every role whose ``run_after`` roles all sit in earlier waves.
+Roles within one wave do not depend on each other and can be worked on
+concurrently; every edge points from a later wave to an earlier one.
+
+Only edges between the given roles count: a ``run_after`` entry naming a
+role that is not part of the selection (not deployed on this host) does
+not hold anything back.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import List
+
+
+def run_after_waves(run_after: Mapping[str, Iterable[str]]) -> List[List[str]]:
+    """
+    Return the roles of `run_after` ({role: [roles it runs after]}) as a
+    list of waves, each sorted by name.
+
+    Raises ValueError when the selected roles form a cycle.
+    """
+    pending = {
+        role: {dep for dep in deps if dep in run_after and dep != role}
+        for role, deps in run_after.items()
+    }
+
+    waves: List[List[str]] = []
+    while pending:
+        wave = sorted(role for role, deps in pending.items() if not deps)
+        if not wave:
+            raise ValueError(
+                "run_after cycle between: " + ", ".join(sorted(pending.keys()))
+            )
+        waves.append(wave)
+        for role in wave:
+            del pending[role]
+        for deps in pending.values():
+            deps.difference_update(wave)
+    return waves
@@ -0,0 +1,328 @@
+"""SQLite-backed history of deploy timings.
+
+Fed by the ``timing_store`` callback plugin (``plugins/callback/``) and
+read by ``infinito meta timings``. One row per run (git commit, deployed
+applications) plus one row per (host, task) result with its duration.
+
+Roles are recorded by name; in this repository the role name is the
+application id.
+
+The database lives at ``$INFINITO_TIMINGS_DB`` or
+``$XDG_STATE_HOME/infinito-nexus/timings.sqlite``
+(``~/.local/state/...`` by default).
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+TIMINGS_DB_ENV = "INFINITO_TIMINGS_DB"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at   REAL NOT NULL,
+    finished_at  REAL,
+    git_commit   TEXT NOT NULL DEFAULT '',
+    playbook     TEXT NOT NULL DEFAULT '',
+    applications TEXT NOT NULL DEFAULT '',
+    status       TEXT NOT NULL DEFAULT 'running'
+);
+CREATE TABLE IF NOT EXISTS task_timings (
+    run_id   INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    host     TEXT NOT NULL,
+    role     TEXT NOT NULL DEFAULT '',
+    task     TEXT NOT NULL,
+    path     TEXT NOT NULL DEFAULT '',
+    duration REAL NOT NULL,
+    status   TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS task_timings_run ON task_timings(run_id);
+CREATE INDEX IF NOT EXISTS task_timings_role_task ON task_timings(role, task);
+"""
+
+
+def default_timings_db_path() -> Path:
+    override = os.environ.get(TIMINGS_DB_ENV)
+    if override:
+        return Path(override).expanduser()
+    state_home = os.environ.get("XDG_STATE_HOME") or os.path.join(
+        "~", ".local", "state"
+    )
+    return Path(state_home).expanduser() / "infinito-nexus" / "timings.sqlite"
+
+
+def current_git_commit(cwd: Optional[str] = None) -> str:
+    """Return HEAD of the checkout at cwd, or '' outside a git tree."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    except OSError:
+        return ""
+    return result.stdout.strip() if result.returncode == 0 else ""
+
+
+@dataclass(frozen=True)
+class TaskTiming:
+    host: str
+    role: str
+    task: str
+    path: str
+    duration: float
+    status: str
+
+
+@dataclass(frozen=True)
+class RoleSummary:
+    role: str
+    runs: int
+    median: float
+    last: float
+    slowest: float
+
+
+@dataclass(frozen=True)
+class TrendPoint:
+    run_id: int
+    started_at: float
+    git_commit: str
+    seconds: float
+
+
+@dataclass(frozen=True)
+class Regression:
+    role: str
+    task: str
+    seconds: float
+    median: float
+    history: int
+
+    @property
+    def slowdown_pct(self) -> float:
+        return (self.seconds / self.median - 1.0) * 100.0 if self.median else 0.0
+
+
+class TimingStore:
+    """Thin wrapper around the timings database."""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path or default_timings_db_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Several deploys may finish at the same time; wait for the lock
+        # instead of failing the callback.
+        self._conn = sqlite3.connect(str(self.path), timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "TimingStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def start_run(
+        self,
+        *,
+        git_commit: str = "",
+        playbook: str = "",
+        applications: Iterable[str] = (),
+        started_at: Optional[float] = None,
+    ) -> int:
+        with self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO runs (started_at, git_commit, playbook, applications) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    started_at if started_at is not None else time.time(),
+                    git_commit,
+                    playbook,
+                    ",".join(sorted(applications)),
+                ),
+            )
+        return int(cur.lastrowid)
+
+    def finish_run(
+        self,
+        run_id: int,
+        timings: Iterable[TaskTiming],
+        *,
+        status: str,
+        finished_at: Optional[float] = None,
+    ) -> None:
+        """Store all task timings of a run in one transaction."""
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO task_timings "
+                "(run_id, host, role, task, path, duration, status) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (run_id, t.host, t.role, t.task, t.path, t.duration, t.status)
+                    for t in timings
+                ),
+            )
+            self._conn.execute(
+                "UPDATE runs SET finished_at = ?, status = ? WHERE id = ?",
+                (
+                    finished_at if finished_at is not None else time.time(),
+                    status,
+                    run_id,
+                ),
+            )
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def _recent_run_ids(self, last_runs: int) -> List[int]:
+        rows = self._conn.execute(
+            "SELECT id FROM runs WHERE status != 'running' ORDER BY id DESC LIMIT ?",
+            (last_runs,),
+        ).fetchall()
+        return sorted(r[0] for r in rows)
+
+    def _task_durations(
+        self, run_ids: List[int], role: Optional[str] = None
+    ) -> List[Tuple[int, str, str, float]]:
+        """
+        Return (run_id, role, task, seconds) per run.
+
+        Repeated executions of a task on one host (includes, loops) are
+        summed; across hosts the slowest host counts, since that is what
+        the linear strategy waits for.
+        """
+        if not run_ids:
+            return []
+        marks = ",".join("?" * len(run_ids))
+        params: List[object] = list(run_ids)
+        role_clause = ""
+        if role is not None:
+            role_clause = "AND role = ?"
+            params.append(role)
+        return self._conn.execute(
+            f"""
+            WITH per_host AS (
+                SELECT run_id, host, role, task, SUM(duration) AS d
+                FROM task_timings
+                WHERE run_id IN ({marks}) {role_clause}
+                GROUP BY run_id, host, role, task
+            )
+            SELECT run_id, role, task, MAX(d)
+            FROM per_host
+            GROUP BY run_id, role, task
+            ORDER BY run_id
+            """,
+            params,
+        ).fetchall()
+
+    def _role_durations(
+        self, run_ids: List[int], role: Optional[str] = None
+    ) -> Dict[str, Dict[int, float]]:
+        per_role: Dict[str, Dict[int, float]] = {}
+        for run_id, role_name, _task, seconds in self._task_durations(run_ids, role):
+            if not role_name:
+                continue
+            runs = per_role.setdefault(role_name, {})
+            runs[run_id] = runs.get(run_id, 0.0) + seconds
+        return per_role
+
+    def slowest_roles(self, limit: int = 10, last_runs: int = 20) -> List[RoleSummary]:
+        """Roles ordered by their median duration over the last runs."""
+        run_ids = self._recent_run_ids(last_runs)
+        summaries = []
+        for role, runs in self._role_durations(run_ids).items():
+            values = [runs[r] for r in sorted(runs)]
+            summaries.append(
+                RoleSummary(
+                    role=role,
+                    runs=len(values),
+                    median=statistics.median(values),
+                    last=values[-1],
+                    slowest=max(values),
+                )
+            )
+        summaries.sort(key=lambda s: s.median, reverse=True)
+        return summaries[:limit]
+
+    def role_trend(self, role: str, last_runs: int = 20) -> List[TrendPoint]:
+        """Duration of one role per run, oldest first."""
+        run_ids = self._recent_run_ids(last_runs)
+        runs = self._role_durations(run_ids, role).get(role, {})
+        if not runs:
+            return []
+        marks = ",".join("?" * len(runs))
+        meta = {
+            row[0]: row[1:]
+            for row in self._conn.execute(
+                f"SELECT id, started_at, git_commit FROM runs WHERE id IN ({marks})",
+                list(runs),
+            )
+        }
+        return [
+            TrendPoint(run_id, meta[run_id][0], meta[run_id][1], runs[run_id])
+            for run_id in sorted(runs)
+        ]
+
+    def task_regressions(
+        self,
+        *,
+        threshold_pct: float = 20.0,
+        window: int = 10,
+        min_seconds: float = 1.0,
+        min_history: int = 3,
+    ) -> List[Regression]:
+        """
+        Tasks of the latest run that are more than `threshold_pct` slower
+        than their median over the previous `window` runs they appeared in.
+
+        Tasks faster than `min_seconds` and tasks with fewer than
+        `min_history` earlier samples are ignored as noise.
+        """
+        # Enough runs so that every task can collect `window` samples even
+        # when not every run deploys every application.
+        run_ids = self._recent_run_ids(max(window * 5, 50))
+        if not run_ids:
+            return []
+        latest = run_ids[-1]
+
+        history: Dict[Tuple[str, str], List[float]] = {}
+        current: Dict[Tuple[str, str], float] = {}
+        for run_id, role, task, seconds in self._task_durations(run_ids):
+            if run_id == latest:
+                current[(role, task)] = seconds
+            else:
+                history.setdefault((role, task), []).append(seconds)
+
+        regressions = []
+        for key, seconds in current.items():
+            if seconds < min_seconds:
+                continue
+            previous = history.get(key, [])[-window:]
+            if len(previous) < min_history:
+                continue
+            median = statistics.median(previous)
+            if median > 0 and seconds > median * (1.0 + threshold_pct / 100.0):
+                regressions.append(
+                    Regression(key[0], key[1], seconds, median, len(previous))
+                )
+        regressions.sort(key=lambda r: r.slowdown_pct, reverse=True)
+        return regressions